@@ -5,10 +5,11 @@ import json
 import os
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, Union, cast
+from typing import Any, BinaryIO, Dict, Optional, Union, cast
 
 from restmachine import Adapter, Request, Response, HTTPMethod, BytesStreamBuffer, RestApplication
-from restmachine.models import MultiValueHeaders
+from restmachine.models import MultiValueHeaders, QueryParams
+from restmachine.streaming import collect_iterator_body, is_iterator_body
 from restmachine.metrics_handler import MetricsHandler
 from restmachine.metrics import MetricsPublisher, METRICS
 from restmachine_aws.metrics import CloudWatchEMFPublisher
@@ -258,8 +259,8 @@ class AwsApiGatewayAdapter(Adapter):
         # Extract headers using common helper
         headers = self._extract_headers_from_event(event, use_multivalue=False)
 
-        # Extract query parameters using common helper
-        query_params = self._extract_query_params_from_event(event, use_multivalue=False)
+        # Extract query parameters using common helper - v1 also sends multiValueQueryStringParameters
+        query_params = self._extract_query_params_from_event(event, use_multivalue=True)
 
         # Extract path parameters using common helper
         path_params = self._extract_path_params_from_event(event)
@@ -278,11 +279,12 @@ class AwsApiGatewayAdapter(Adapter):
             method=method,
             path=path,
             headers=headers,
-            body=body,
+            body=cast(Optional[BinaryIO], body),
             query_params=query_params,
             path_params=path_params,
             tls=tls,
-            client_cert=client_cert
+            client_cert=client_cert,
+            client_ip=(request_context.get("identity") or {}).get("sourceIp")
         )
 
     def _parse_apigw_v2_event(self, event: Dict[str, Any], context: Optional[Any] = None) -> Request:
@@ -313,8 +315,12 @@ class AwsApiGatewayAdapter(Adapter):
             cookie_value = "; ".join(event["cookies"])
             headers.add("cookie", cookie_value)
 
-        # Extract query parameters using common helper
-        query_params = self._extract_query_params_from_event(event, use_multivalue=False)
+        # Prefer rawQueryString, which keeps repeated parameters (queryStringParameters
+        # joins them with commas); it is parsed when the handler first uses it
+        raw_query_string = event.get("rawQueryString") or None
+        query_params = None
+        if raw_query_string is None:
+            query_params = self._extract_query_params_from_event(event, use_multivalue=False)
 
         # Extract path parameters using common helper
         path_params = self._extract_path_params_from_event(event)
@@ -332,11 +338,13 @@ class AwsApiGatewayAdapter(Adapter):
             method=method,
             path=path,
             headers=headers,
-            body=body,
+            body=cast(Optional[BinaryIO], body),
             query_params=query_params,
+            query_string=raw_query_string,
             path_params=path_params,
             tls=tls,
-            client_cert=client_cert
+            client_cert=client_cert,
+            client_ip=http_context.get("sourceIp")
         )
 
     def _parse_alb_event(self, event: Dict[str, Any], context: Optional[Any] = None) -> Request:
@@ -377,23 +385,29 @@ class AwsApiGatewayAdapter(Adapter):
         # Extract client certificate from ALB mTLS headers (verify or passthrough mode)
         client_cert = self._extract_alb_client_cert(headers)
 
+        # ALB appends the address it received the request from to X-Forwarded-For
+        forwarded_for = headers.get("x-forwarded-for")
+        client_ip = forwarded_for.rsplit(",", 1)[-1].strip() if forwarded_for else None
+
         return Request(
             method=method,
             path=path,
             headers=headers,
-            body=body,
+            body=cast(Optional[BinaryIO], body),
             query_params=query_params,
             path_params=path_params,
             tls=tls,
-            client_cert=client_cert
+            client_cert=client_cert,
+            client_ip=client_ip
         )
 
     def convert_from_response(self, response: Response, event: Dict[str, Any], context: Optional[Any] = None) -> Dict[str, Any]:
         """
         Convert Response object to AWS API Gateway response format.
 
-        Handles proper JSON serialization, header encoding, streaming bodies, and file paths.
-        For streaming bodies and Path objects, reads the entire content since Lambda requires complete responses.
+        Handles proper JSON serialization, header encoding, streaming bodies, generators, and file paths.
+        For streaming bodies, generators, and Path objects, reads the entire content since Lambda
+        requires complete responses.
 
         Range Request Support:
         - Detects 206 Partial Content responses (response.is_range_response())
@@ -443,6 +457,15 @@ class AwsApiGatewayAdapter(Adapter):
                 import base64
                 body_str = base64.b64encode(body_bytes).decode('ascii')
                 is_base64 = True
+        elif is_iterator_body(response.body):
+            # Generator body - collect the chunks since Lambda requires complete response
+            body_bytes = collect_iterator_body(response.body)
+            try:
+                body_str = body_bytes.decode('utf-8')
+            except UnicodeDecodeError:
+                import base64
+                body_str = base64.b64encode(body_bytes).decode('ascii')
+                is_base64 = True
         elif isinstance(response.body, bytes):
             # Raw bytes - try to decode as UTF-8, otherwise base64
             try:
@@ -593,28 +616,20 @@ class AwsApiGatewayAdapter(Adapter):
         Returns:
             MultiValueHeaders object
         """
-        headers = MultiValueHeaders()
-
         if use_multivalue and "multiValueHeaders" in event and event["multiValueHeaders"]:
             # ALB with multi-value headers (preferred)
-            for key, values in event["multiValueHeaders"].items():
-                if values:  # Skip None or empty lists
-                    for value in values:
-                        if value is not None:
-                            headers.add(key.lower(), str(value))
+            return MultiValueHeaders.from_dict(event["multiValueHeaders"], lowercase=True)
         elif "headers" in event and event["headers"]:
             # Single-value headers (API Gateway v1/v2, ALB fallback)
-            for key, value in event["headers"].items():
-                if value is not None:
-                    headers.add(key.lower(), str(value))
+            return MultiValueHeaders.from_dict(event["headers"], lowercase=True)
 
-        return headers
+        return MultiValueHeaders()
 
     def _extract_query_params_from_event(
         self,
         event: Dict[str, Any],
         use_multivalue: bool = False
-    ) -> Dict[str, str]:
+    ) -> QueryParams:
         """
         Extract query parameters from AWS event.
 
@@ -622,23 +637,23 @@ class AwsApiGatewayAdapter(Adapter):
 
         Args:
             event: AWS event dictionary
-            use_multivalue: If True, use multiValueQueryStringParameters (ALB feature)
+            use_multivalue: If True, use multiValueQueryStringParameters (ALB, API Gateway v1)
 
         Returns:
-            Dictionary of query parameters (first value if multivalue)
+            QueryParams with every value of repeated parameters
         """
         if use_multivalue and "multiValueQueryStringParameters" in event and event["multiValueQueryStringParameters"]:
-            # ALB with multi-value query params - take first value for compatibility
-            return {
-                k: v[0]
+            # Multi-value query params keep every value of repeated names
+            return QueryParams({
+                k: [value for value in v if value is not None]
                 for k, v in event["multiValueQueryStringParameters"].items()
-                if v and v[0] is not None
-            }
+                if v
+            })
         elif "queryStringParameters" in event and event["queryStringParameters"]:
             # Single-value query parameters
-            return {k: v for k, v in event["queryStringParameters"].items() if v is not None}
+            return QueryParams({k: v for k, v in event["queryStringParameters"].items() if v is not None})
 
-        return {}
+        return QueryParams()
 
     def _extract_path_params_from_event(self, event: Dict[str, Any]) -> Optional[Dict[str, str]]:
         """
@@ -28,6 +28,22 @@ from restmachine.testing.multi_driver_base import MultiDriverTestBase  # noqa: E
 # Add tests directory to path for framework imports
 sys.path.insert(0, os.path.dirname(__file__))
 from framework.driver import AwsLambdaDriver  # noqa: E402
+from tests.performance.allocation_tracking import (  # noqa: E402, F401
+    add_allocation_options,
+    allocation_baselines,
+    allocation_summary,
+    allocation_tracker,
+)
+
+
+def pytest_addoption(parser):
+    """Register the allocation benchmark options."""
+    add_allocation_options(parser)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report allocation measurements taken during the session."""
+    allocation_summary(terminalreporter, config)
 
 
 def pytest_generate_tests(metafunc):
@@ -78,6 +94,12 @@ def pytest_collection_modifyitems(config, items):
         'TestDeletePath',
         'TestErrorPaths',
         'TestCRUDCyclePath',
+        'TestSimpleGetAllocations',
+        'TestValidatedPostAllocations',
+        'TestConditionalAllocations',
+        'TestRangeAllocations',
+        'TestCorsPreflightAllocations',
+        'TestErrorAllocations',
     }
 
     for item in items:
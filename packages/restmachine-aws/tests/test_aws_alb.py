@@ -113,14 +113,13 @@ class TestAwsALBBasic:
         assert "text/html" in body["accept_values"]
 
     def test_alb_multivalue_query_parameters(self):
-        """ALB multi-value query parameters should use first value."""
+        """ALB multi-value query parameters keep every value; get() returns the first."""
         app = RestApplication()
 
         @app.get("/search")
         def search_route(request):
-            # query_params is a dict, so we get the first value
             tag = request.query_params.get("tag")
-            return {"tag": tag}
+            return {"tag": tag, "tags": request.query_params.getlist("tag")}
 
         adapter = AwsApiGatewayAdapter(app)
 
@@ -146,6 +145,7 @@ class TestAwsALBBasic:
         body = json.loads(response["body"])
         # Should get the first tag
         assert body["tag"] == "python"
+        assert body["tags"] == ["python", "aws"]
 
 
 class TestAwsALBmTLS:
@@ -276,6 +276,20 @@ class TestAwsALBmTLS:
         assert body["tls"] is True
         assert body["client_cert"] is None
 
+    def test_alb_client_ip(self):
+        """ALB events take the client address from the last X-Forwarded-For entry."""
+        adapter = AwsApiGatewayAdapter(RestApplication())
+
+        request = adapter.convert_to_request({
+            "requestContext": {"elb": {"targetGroupArn": "arn:aws:elasticloadbalancing:..."}},
+            "httpMethod": "GET",
+            "path": "/test",
+            "headers": {"x-forwarded-for": "198.51.100.1, 203.0.113.7"},
+            "body": None,
+        })
+
+        assert request.client_ip == "203.0.113.7"
+
     def test_alb_mtls_verify_partial_headers(self):
         """ALB mTLS with only some headers should still work."""
         app = RestApplication()
@@ -138,6 +138,44 @@ class TestAwsApiGatewayV2Basic:
         assert body["query"] == "test"
         assert body["limit"] == "20"
 
+    def test_v2_repeated_query_parameters(self):
+        """Repeated query parameters come from rawQueryString, not the comma-joined queryStringParameters."""
+        app = RestApplication()
+
+        @app.get("/search")
+        def search(query_params):
+            return {"tags": query_params.getlist("tag")}
+
+        adapter = AwsApiGatewayAdapter(app)
+
+        event = {
+            "version": "2.0",
+            "routeKey": "GET /search",
+            "rawPath": "/search",
+            "rawQueryString": "tag=a%2Cb&tag=c",
+            "headers": {
+                "accept": "application/json"
+            },
+            "queryStringParameters": {
+                "tag": "a,b,c"
+            },
+            "requestContext": {
+                "http": {
+                    "method": "GET",
+                    "path": "/search"
+                },
+                "requestId": "test-request-id",
+                "stage": "$default"
+            },
+            "isBase64Encoded": False
+        }
+
+        response = adapter.handle_event(event)
+        assert response["statusCode"] == 200
+
+        import json
+        assert json.loads(response["body"]) == {"tags": ["a,b", "c"]}
+
     def test_v2_post_with_json_body(self):
         """v2 POST events with JSON body should work."""
         app = RestApplication()
@@ -329,6 +367,22 @@ class TestAwsApiGatewayV2mTLS:
         assert body["tls"] is True
         assert body["client_cert"] is None
 
+    def test_v2_client_ip(self):
+        """v2 events report the caller's address as request.client_ip."""
+        adapter = AwsApiGatewayAdapter(RestApplication())
+
+        request = adapter.convert_to_request({
+            "version": "2.0",
+            "rawPath": "/test",
+            "rawQueryString": "",
+            "headers": {},
+            "requestContext": {
+                "http": {"method": "GET", "path": "/test", "sourceIp": "203.0.113.7"},
+            },
+        })
+
+        assert request.client_ip == "203.0.113.7"
+
 
 class TestV1vsV2Compatibility:
     """Test that both v1 and v2 work with the same adapter."""
@@ -0,0 +1,55 @@
+"""
+Tests for generator response bodies in the API Gateway adapter.
+"""
+
+import base64
+
+from restmachine import RestApplication, Response
+from restmachine_aws import AwsApiGatewayAdapter
+
+
+def make_event(path):
+    return {
+        "httpMethod": "GET",
+        "path": path,
+        "headers": {"Accept": "text/plain"},
+        "queryStringParameters": None,
+        "pathParameters": None,
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+class TestIteratorBodies:
+    """Generators are collected into a complete Lambda response."""
+
+    def test_sync_generator(self):
+        app = RestApplication()
+
+        @app.get("/export")
+        def export():
+            def rows():
+                for i in range(3):
+                    yield f"row {i}\n"
+            return Response(200, body=rows(), content_type="text/csv")
+
+        response = AwsApiGatewayAdapter(app).handle_event(make_event("/export"))
+
+        assert response["statusCode"] == 200
+        assert response["body"] == "row 0\nrow 1\nrow 2\n"
+        assert response["isBase64Encoded"] is False
+
+    def test_async_generator_binary(self):
+        app = RestApplication()
+
+        @app.get("/blob")
+        def blob():
+            async def chunks():
+                yield b"\xff\xfe"
+                yield b"\x00"
+            return Response(200, body=chunks(), content_type="application/octet-stream")
+
+        response = AwsApiGatewayAdapter(app).handle_event(make_event("/blob"))
+
+        assert response["isBase64Encoded"] is True
+        assert base64.b64decode(response["body"]) == b"\xff\xfe\x00"
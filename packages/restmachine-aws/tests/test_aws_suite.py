@@ -29,6 +29,30 @@ from tests.test_content_negotiation import (
     TestResponseRendering
 )
 
+from tests.test_streaming_renderers import (
+    TestStreamingRenderers
+)
+
+from tests.test_request_body_limits import (
+    TestBodyLimits
+)
+
+from tests.test_multipart import (
+    TestMultipartBody
+)
+
+from tests.test_compression import (
+    TestResponseCompression
+)
+
+from tests.test_query_params import (
+    TestQueryParamsAcrossDrivers
+)
+
+from tests.test_request_body_cache import (
+    TestSharedBodyParsing
+)
+
 from tests.test_custom_error_handlers import (
     TestBasicErrorHandlers,
     TestContentTypeErrorHandlers,
@@ -99,18 +123,40 @@ from tests.test_validation import (
     TestValidationDependencies
 )
 
+from tests.test_type_adapters import TestTypedBodiesAndResults
+
+from tests.test_concurrency_limit import TestLoadShedding
+
+from tests.test_rate_limit import TestRateLimiting
+
+from tests.test_coalescing import TestCoalescedRoutes
+
+from tests.test_validator_cache import TestCachedConditionalGet
+from tests.test_auto_etag import TestAutoETagRoutes
+from tests.test_background_tasks import TestBackgroundTaskRoutes
+
 # Performance benchmarks
 from tests.performance.test_state_machine_paths import (
     TestSimpleGetPath,
     TestAuthenticatedGetPath,
     TestConditionalGetPath,
     TestPostCreatePath,
+    TestPydanticPayloadPath,
     TestPutUpdatePath,
     TestDeletePath,
     TestErrorPaths,
     TestCRUDCyclePath
 )
 
+from tests.performance.test_allocations import (
+    TestSimpleGetAllocations,
+    TestValidatedPostAllocations,
+    TestConditionalAllocations,
+    TestRangeAllocations,
+    TestCorsPreflightAllocations,
+    TestErrorAllocations
+)
+
 # Note: We don't import tests from test_router.py, test_http_servers.py, or test_template_rendering.py
 # because their test classes don't inherit from MultiDriverTestBase and won't work with the driver framework
 
@@ -12,9 +12,13 @@ from http import HTTPStatus
 from .application import RestApplication
 from .content_renderers import (
     ContentRenderer,
+    CSVRenderer,
     HTMLRenderer,
     JSONRenderer,
+    NDJSONRenderer,
     PlainTextRenderer,
+    StreamingJSONRenderer,
+    StreamingRenderer,
 )
 from .adapters import Adapter, ASGIAdapter, create_asgi_app
 from .dependencies import DependencyScope
@@ -57,6 +61,10 @@ __all__ = [
     "HTMLRenderer",
     "PlainTextRenderer",
     "ContentRenderer",
+    "StreamingRenderer",
+    "StreamingJSONRenderer",
+    "NDJSONRenderer",
+    "CSVRenderer",
     "DependencyScope",
     "ErrorResponse",
     "ValidationError",
@@ -0,0 +1,185 @@
+"""Structured access logging for RestMachine.
+
+Emits one structured record per request with the route template, status code,
+duration and request/response sizes. Records are handed to a queue and written
+by a background thread (``logging.handlers.QueueListener``), so request threads
+never block on I/O. Access logging is disabled unless configured, in which case
+the framework does no access log work at all.
+
+Example:
+    app = RestApplication()
+
+    # Log every error, but only 1% of successful requests
+    app.access_log(sample_rates={"2xx": 0.01, "3xx": 0.01})
+
+Each record is written as a single JSON line by default::
+
+    {"timestamp": "2025-01-01T12:00:00.000000+00:00", "method": "GET", "path": "/users/42",
+     "route": "/users/{user_id}", "status": 200, "duration_ms": 1.42,
+     "request_bytes": 0, "response_bytes": 27, "request_id": "...", "trace_id": "..."}
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+
+ACCESS_LOGGER_NAME = "restmachine.access"
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+def _default_sample_rates() -> Dict[str, float]:
+    return {status_class: 1.0 for status_class in STATUS_CLASSES}
+
+
+@dataclass
+class AccessLogConfig:
+    """Configuration for structured access logging.
+
+    Attributes:
+        sample_rates: Fraction of requests to log per status class ("2xx", "4xx", ...),
+                      from 0.0 (never) to 1.0 (always). Missing classes default to 1.0.
+        handlers: Handlers that write records. Defaults to a handler on stderr. Handlers
+                  without a formatter get an AccessLogFormatter (JSON lines).
+        logger_name: Name of the logger records are emitted on.
+        queue_size: Maximum number of records waiting to be written. When the queue is
+                    full, new records are dropped rather than blocking the request.
+        include_ids: Whether to add request_id and trace_id to each record.
+    """
+    sample_rates: Dict[str, float] = field(default_factory=_default_sample_rates)
+    handlers: Optional[List[logging.Handler]] = None
+    logger_name: str = ACCESS_LOGGER_NAME
+    queue_size: int = 10000
+    include_ids: bool = True
+
+    def validate(self):
+        """Validate the configuration.
+
+        Raises:
+            ValueError: If a status class or sample rate is invalid
+        """
+        for status_class, rate in self.sample_rates.items():
+            if status_class not in STATUS_CLASSES:
+                raise ValueError(
+                    f"Access log: unknown status class '{status_class}', expected one of {', '.join(STATUS_CLASSES)}"
+                )
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"Access log: sample rate for {status_class} must be between 0.0 and 1.0")
+        if self.queue_size <= 0:
+            raise ValueError("Access log: queue_size must be positive")
+
+    def get_sample_rate(self, status_code: int) -> float:
+        """Get the sample rate that applies to a status code."""
+        return self.sample_rates.get(f"{status_code // 100}xx", 1.0)
+
+
+class AccessLogFormatter(logging.Formatter):
+    """Formats access log records as JSON lines."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "access", None)
+        if fields is None:
+            return super().format(record)
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc).isoformat()
+        return json.dumps({"timestamp": timestamp, **fields}, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, record_queue: "queue.Queue[Any]"):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; nothing to prepare here
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AccessLogger:
+    """Samples access log records and writes them on a background thread.
+
+    Args:
+        config: Access log configuration
+    """
+
+    def __init__(self, config: AccessLogConfig):
+        config.validate()
+        self.config = config
+        self.logger = logging.getLogger(config.logger_name)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=config.queue_size)
+        self._queue_handler = _DroppingQueueHandler(self._queue)
+        self._listener: Optional[QueueListener] = None
+        # Requests on several worker threads may start the writer at once
+        self._listener_lock = threading.Lock()
+
+        handlers = config.handlers if config.handlers is not None else [logging.StreamHandler(sys.stderr)]
+        for handler in handlers:
+            if handler.formatter is None:
+                handler.setFormatter(AccessLogFormatter())
+        self._handlers = handlers
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full."""
+        return self._queue_handler.dropped
+
+    def start(self) -> None:
+        """Attach the queue handler and start the background writer."""
+        with self._listener_lock:
+            if self._listener is not None:
+                return
+            self.logger.addHandler(self._queue_handler)
+            if self.logger.level == logging.NOTSET:
+                self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+            self._listener = QueueListener(self._queue, *self._handlers, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Flush pending records and stop the background writer."""
+        with self._listener_lock:
+            if self._listener is None:
+                return
+            self._listener.stop()
+            self._listener = None
+            self.logger.removeHandler(self._queue_handler)
+            atexit.unregister(self.stop)
+
+    def should_log(self, status_code: int) -> bool:
+        """Decide whether a request with this status code is sampled."""
+        if self._listener is None:
+            self.start()
+        if not self.logger.isEnabledFor(logging.INFO):
+            return False
+        rate = self.config.get_sample_rate(status_code)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        return random.random() < rate
+
+    def log(self, fields: Dict[str, Any]) -> None:
+        """Emit an access log record.
+
+        Args:
+            fields: Structured fields for the record
+        """
+        if self._listener is None:
+            self.start()
+        self.logger.info("access", extra={"access": fields})
@@ -10,25 +10,47 @@ Adapters convert between external platform formats and RestMachine's internal
 Request/Response models.
 """
 
+import asyncio
+import contextvars
+import functools
 import io
 import json
 import logging
 import os
-import urllib.parse
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Awaitable, BinaryIO, Callable, Dict, Optional, Union, cast
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Awaitable, BinaryIO, Callable, Dict, Iterable, Optional, Tuple, Union, cast
 
 from .models import HTTPMethod, MultiValueHeaders, Request, Response
-from .streaming import BytesStreamBuffer
+from .streaming import (
+    DEFAULT_HIGH_WATER,
+    DEFAULT_SPOOL_THRESHOLD,
+    BytesStreamBuffer,
+    encode_chunk,
+    is_iterator_body,
+)
+from .executor import INLINE, THREAD, HandlerExecutor
+from .cancellation import CancellationToken, ClientDisconnected
+from .coalescing import SingleFlight
 from .metrics import MetricsCollector, MetricsPublisher, METRICS
 
 if TYPE_CHECKING:
-    from .application import RestApplication
+    from .application import RestApplication, RouteHandler
 
 logger = logging.getLogger(__name__)
 
 
+# ASGI extensions for serving files without copying them through the application
+PATHSEND_EXTENSION = "http.response.pathsend"
+ZEROCOPYSEND_EXTENSION = "http.response.zerocopysend"
+
+# Chunk size for reading files when the server offers neither extension
+DEFAULT_FILE_CHUNK_SIZE = 256 * 1024
+
+
 # Sentinel for default metrics publisher
 class _DefaultPublisher:
     pass
@@ -113,6 +135,20 @@ class ASGIAdapter:
       application can start processing before all data has arrived.
     - Response bodies: File-like objects are streamed in 8KB chunks with proper
       ASGI more_body signaling.
+    - Path bodies: Served with http.response.pathsend or http.response.zerocopysend
+      when the server advertises them in scope["extensions"], otherwise read in
+      large chunks (see file_chunk_size).
+
+    Client disconnects:
+    - While a handler runs in the thread pool and while a streamed body is sent, the
+      adapter watches receive() for http.disconnect. On disconnect it cancels requests
+      still queued for a worker, sets the request's CancellationToken (the built-in
+      `cancellation` dependency) for handlers already running, closes response streams
+      and counts the request in `aborted_requests`.
+
+    Background tasks:
+    - Tasks queued on the built-in `background` dependency run after the last
+      response body message has been sent (see restmachine.background).
 
     Metrics behavior:
     - **AWS auto-detection**: When AWS environment is detected (via AWS_REGION or
@@ -147,7 +183,13 @@ class ASGIAdapter:
                  enable_metrics: Optional[bool] = None,
                  namespace: Optional[str] = None,
                  service_name: Optional[str] = None,
-                 metrics_resolution: int = 60):
+                 metrics_resolution: int = 60,
+                 file_chunk_size: int = DEFAULT_FILE_CHUNK_SIZE,
+                 executor: Union[Executor, HandlerExecutor, None] = None,
+                 max_workers: Optional[int] = None,
+                 execution: str = THREAD,
+                 body_spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+                 body_high_water: int = DEFAULT_HIGH_WATER):
         """
         Initialize the ASGI adapter with optional metrics support.
 
@@ -164,6 +206,20 @@ class ASGIAdapter:
             namespace: CloudWatch namespace (used if AWS detected, default: "RestMachine")
             service_name: Service name dimension (default: from env or "asgi-app")
             metrics_resolution: Metric resolution in seconds, 1 or 60 (default: 60)
+            file_chunk_size: Chunk size used to stream Path bodies when the server
+                            supports neither pathsend nor zerocopysend (default: 256KB)
+            executor: Executor for synchronous request handling. Either a
+                     concurrent.futures.Executor or a configured HandlerExecutor.
+                     Default: the event loop's default executor.
+            max_workers: Size of a dedicated thread pool for request handling
+                        (instead of the event loop's default executor)
+            execution: Default execution mode for routes: "thread" (default) or
+                      "inline" to run on the event loop. Routes can override it
+                      with the @app.execution() decorator.
+            body_spool_threshold: Request bodies larger than this many bytes are
+                                 moved from memory to a temporary file (default: 1MB)
+            body_high_water: Stop receiving a request body while this many bytes
+                            are buffered but not yet read by the handler (default: 1MB)
 
         Examples:
             # Auto-detect AWS and enable EMF
@@ -177,8 +233,31 @@ class ASGIAdapter:
 
             # Disable metrics
             adapter = ASGIAdapter(app, enable_metrics=False)
+
+            # Dedicated pool of 32 threads for handlers
+            adapter = ASGIAdapter(app, max_workers=32)
         """
+        if file_chunk_size <= 0:
+            raise ValueError("file_chunk_size must be positive")
+        if body_spool_threshold <= 0:
+            raise ValueError("body_spool_threshold must be positive")
+        if body_high_water <= 0:
+            raise ValueError("body_high_water must be positive")
+
         self.app = app
+        self.file_chunk_size = file_chunk_size
+        self.body_spool_threshold = body_spool_threshold
+        self.body_high_water = body_high_water
+
+        # Requests abandoned because the client disconnected
+        self.aborted_requests = 0
+
+        if isinstance(executor, HandlerExecutor):
+            if max_workers is not None or execution != THREAD:
+                raise ValueError("Configure max_workers and execution on the HandlerExecutor instead")
+            self.executor = executor
+        else:
+            self.executor = HandlerExecutor(max_workers=max_workers, executor=executor, default_mode=execution)
 
         # Determine if metrics should be enabled
         metrics_enabled = self._should_enable_metrics(enable_metrics)
@@ -358,55 +437,99 @@ class ASGIAdapter:
         metrics = MetricsCollector()
         metrics.start_timer("adapter.total_time")
 
+        # Watches receive() for http.disconnect while the handler runs and the response is sent
+        watcher: Optional["asyncio.Task[bool]"] = None
+        # Receives the rest of a streamed request body while the handler runs
+        receive_task: Optional["asyncio.Task[bool]"] = None
+
         try:
             # Start the request and get the first body chunk
             metrics.start_timer("adapter.scope_to_request")
+            parse_start = time.time_ns()
             request, more_body = await self._start_request(scope, receive)
+            parse_end = time.time_ns()
             metrics.stop_timer("adapter.scope_to_request")
+            request.cancellation = CancellationToken()
 
             # Inject metrics into dependency cache
             self.app._dependency_cache.set("metrics", metrics)
 
-            # Execute the request through RestMachine
-            # If there's more body data to stream, run execute in thread pool
-            # and continue receiving body chunks in background
-            metrics.start_timer("application.execute")
-            try:
-                if more_body and request.body is not None:
-                    # Start background task to continue receiving body chunks
-                    import asyncio
-                    receive_task = asyncio.create_task(
-                        self._continue_receiving_body(request.body, receive)
-                    )
-
-                    # Run synchronous execute in thread pool to avoid blocking
-                    loop = asyncio.get_event_loop()
-                    response = await loop.run_in_executor(None, self.app.execute, request)
-
-                    # Ensure body receiving is complete
-                    await receive_task
-                else:
-                    # No streaming needed, run execute in thread pool
-                    import asyncio
-                    loop = asyncio.get_event_loop()
-                    response = await loop.run_in_executor(None, self.app.execute, request)
-            finally:
-                metrics.stop_timer("application.execute")
-
-            # Add response metrics
-            metrics.start_timer("adapter.response_conversion")
-            metrics.add_metadata("status_code", response.status_code)
-            metrics.add_dimension("method", request.method.value)
-            metrics.add_dimension("path", request.path)
-
-            # Convert RestMachine Response to ASGI response
-            await self._response_to_asgi(response, send)
-            metrics.stop_timer("adapter.response_conversion")
-            metrics.stop_timer("adapter.total_time")
+            with self.app._trace_request(request, parse_start, parse_end):
+                # Execute the request through RestMachine
+                # If there's more body data to stream, run execute in thread pool
+                # and continue receiving body chunks in background
+                metrics.start_timer("application.execute")
+                try:
+                    # Copy the context so the active trace span follows the request into the thread pool
+                    execute = functools.partial(contextvars.copy_context().run, self.app.execute, request)
+                    shared = None
+                    if more_body and request.body is not None:
+                        # Start background task to continue receiving body chunks.
+                        # The handler blocks on the body stream, so it must run in a thread.
+                        receive_task = asyncio.create_task(
+                            self._continue_receiving_body(request.body, receive)
+                        )
+                        mode = THREAD
+                    else:
+                        match = self.app._match_request(request)
+                        route = match[0] if match else None
+                        mode = self.executor.resolve_mode(route.execution_mode if route else None)
+                        if route is not None and route.single_flight is not None:
+                            shared = await self._follow_in_flight(route, request)
+
+                    if shared is not None:
+                        response, wait = shared, 0.0
+                        metrics.add_metadata("execution", "coalesced")
+                    elif mode == INLINE:
+                        response, wait = await self.executor.run(execute, INLINE)
+                        metrics.add_metadata("execution", INLINE)
+                    else:
+                        watcher = asyncio.create_task(self._watch_disconnect(receive, receive_task))
+                        response, wait = await self._run_until_disconnect(execute, watcher)
+
+                    # Ensure body receiving is complete, discarding anything the handler didn't read
+                    if receive_task is not None:
+                        cast(BytesStreamBuffer, request.body).release()
+                        await receive_task
+                    metrics.add_metric("executor.wait_time", wait * 1000, unit="Milliseconds")
+                finally:
+                    metrics.stop_timer("application.execute")
+
+                # Add response metrics
+                metrics.start_timer("adapter.response_conversion")
+                metrics.add_metadata("status_code", response.status_code)
+                metrics.add_dimension("method", request.method.value)
+                metrics.add_dimension("path", request.path)
+
+                # Stop sending streamed bodies early if the client goes away
+                is_streamed = isinstance(response.body, (io.IOBase, Path)) or is_iterator_body(response.body)
+                if watcher is None and is_streamed:
+                    watcher = asyncio.create_task(self._watch_disconnect(receive))
+                if watcher is not None:
+                    send = self._disconnect_aware_send(send, watcher)
+
+                # Convert RestMachine Response to ASGI response
+                with self.app._start_span("adapter.send"):
+                    await self._response_to_asgi(response, send, scope.get("extensions"))
+                metrics.stop_timer("adapter.response_conversion")
+                metrics.stop_timer("adapter.total_time")
 
             # Publish metrics (if enabled)
             await self._safe_publish(metrics, request, response)
 
+            # The client has the whole response; run the tasks the handler queued
+            tasks = self.app._take_background_tasks(request, response)
+            if tasks is not None:
+                await self.app._background.run_async(tasks)
+
+        except ClientDisconnected:
+            # Nothing more can be sent; let the handler know and record the abort
+            request.cancellation.cancel()
+            self.app._take_background_tasks(request, None)
+            self.aborted_requests += 1
+            metrics.add_metric("aborted", 1, unit="Count")
+            await self._safe_publish(metrics, request)
+
         except Exception as e:
             # Record error metrics
             metrics.add_metric("errors", 1, unit="Count")
@@ -424,6 +547,81 @@ class ASGIAdapter:
             )
             await self._response_to_asgi(response, send)
 
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            if receive_task is not None and not receive_task.done():
+                receive_task.cancel()
+
+    async def _watch_disconnect(self, receive, body_task: Optional["asyncio.Task[bool]"] = None) -> bool:
+        """
+        Wait for the client to disconnect.
+
+        Once the request body has been received, ASGI servers only return from
+        receive() when the client disconnects (or the response is complete).
+
+        Args:
+            receive: ASGI receive callable
+            body_task: Task still receiving the request body, if any. It owns
+                      receive() until the body is complete.
+
+        Returns:
+            True when the client disconnected, False if the server sent something
+            else and disconnects can't be detected
+        """
+        if body_task is not None and await body_task:
+            return True
+        message = await receive()
+        return bool(message["type"] == "http.disconnect")
+
+    async def _run_until_disconnect(self, execute: Callable[[], Any], watcher: "asyncio.Task[bool]"):
+        """
+        Run execute in the thread pool, giving up if the client disconnects first.
+
+        A request still waiting for a worker is cancelled outright. One that is
+        already running can't be interrupted, so its CancellationToken is set
+        instead and its result is discarded.
+
+        Raises:
+            ClientDisconnected: If the client disconnected before execute finished
+        """
+        handler = asyncio.ensure_future(self.executor.run(execute, THREAD))
+        await asyncio.wait((handler, watcher), return_when=asyncio.FIRST_COMPLETED)
+        if not handler.done() and watcher.result():
+            handler.cancel()
+            # Let the cancellation reach the executor so a queued request is dropped now
+            await asyncio.wait((handler,))
+            raise ClientDisconnected("Client disconnected")
+        return await handler
+
+    def _disconnect_aware_send(self, send, watcher: "asyncio.Task[bool]"):
+        """Wrap send so it raises ClientDisconnected once the watcher has seen a disconnect."""
+        async def disconnect_aware_send(message: Dict[str, Any]):
+            if watcher.done() and not watcher.cancelled() and watcher.exception() is None and watcher.result():
+                raise ClientDisconnected("Client disconnected")
+            await send(message)
+        return disconnect_aware_send
+
+    async def _follow_in_flight(self, route: "RouteHandler", request: Request) -> Optional[Response]:
+        """
+        Wait on the event loop for an identical request already being handled.
+
+        Coalesced duplicates don't take a worker thread. Routes with a rate limit
+        are left to the state machine, which checks the limit before coalescing.
+
+        Returns:
+            A copy of the in-flight request's response, or None if the request
+            must be executed itself
+        """
+        single_flight = cast(SingleFlight, route.single_flight)
+        if self.app._get_rate_limit(route) is not None:
+            return None
+        start = time.perf_counter()
+        response = await single_flight.follow(request)
+        if response is not None and self.app._access_logger is not None:
+            self.app._log_access(request, response, time.perf_counter() - start)
+        return response
+
     async def _safe_publish(self, metrics: MetricsCollector, request: Any = None, response: Any = None):
         """Safely publish metrics without breaking the request.
 
@@ -437,8 +635,7 @@ class ASGIAdapter:
 
         try:
             # Run publish in thread pool to avoid blocking
-            import asyncio
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(
                 None,
                 self.metrics_publisher.publish,
@@ -482,6 +679,7 @@ class ASGIAdapter:
                 try:
                     # Run all registered shutdown handlers
                     await self.app.shutdown()
+                    self.executor.shutdown(wait=False)
                     await send({"type": "lifespan.shutdown.complete"})
                 except Exception as e:
                     # Log error but don't fail shutdown
@@ -512,36 +710,36 @@ class ASGIAdapter:
         method = HTTPMethod(scope["method"])
         path = scope["path"]
 
-        # Parse query string
-        query_string = scope.get("query_string", b"").decode("utf-8")
-        query_params = {}
-        if query_string:
-            # Parse into dict (takes first value for duplicate keys)
-            query_params = dict(urllib.parse.parse_qsl(query_string))
-
-        # Parse headers - ASGI uses lowercase names and bytes
-        # Use MultiValueHeaders to support duplicate header names
-        headers = MultiValueHeaders()
-        for header_name, header_value in scope.get("headers", []):
-            name = header_name.decode("latin-1").lower()
-            value = header_value.decode("latin-1")
-            headers.add(name, value)
-
-        # Create a streaming body buffer and receive ONLY the first chunk
-        # This allows the application to start processing immediately
-        body_stream_temp = BytesStreamBuffer()
-        message = await receive()
-        chunk = message.get("body", b"")
-        if chunk:
-            body_stream_temp.write(chunk)
-        more_body = message.get("more_body", False)
+        # Headers and query parameters are decoded when first used
+        raw_headers = scope.get("headers", [])
+        headers = MultiValueHeaders.from_asgi(raw_headers)
+
+        # Bodies past the route's size limit are rejected (413) by the state machine
+        match = self.app._find_route(method, path)
+        max_body_size = self.app._get_max_body_size(match[0] if match else None)
+
+        body_stream: Optional[BytesStreamBuffer] = None
+        more_body = False
+        # Don't receive a body that is already known to be too large
+        if max_body_size is None or _declared_length(raw_headers) <= max_body_size:
+            # Create a streaming body buffer and receive ONLY the first chunk
+            # This allows the application to start processing immediately
+            body_stream_temp = BytesStreamBuffer(self.body_spool_threshold, max_body_size, self.body_high_water)
+            message = await receive()
+            chunk = message.get("body", b"")
+            if chunk:
+                body_stream_temp.write(chunk)
+            # Stop receiving once the body has passed the size limit
+            more_body = message.get("more_body", False) and not body_stream_temp.writing_finished
 
-        # If no more body, close the stream now
-        if not more_body:
-            body_stream_temp.close_writing()
+            # If no more body, close the stream now
+            if not more_body and not body_stream_temp.writing_finished:
+                body_stream_temp.close_writing()
 
-        # If there's no content, set body to None instead of empty stream
-        body_stream: Optional[BytesStreamBuffer] = None if body_stream_temp.tell() == 0 else body_stream_temp
+            # If there's no content, set body to None instead of empty stream.
+            # close_writing() rewinds the stream, so check the chunk rather than tell()
+            has_body = bool(chunk) or more_body
+            body_stream = body_stream_temp if has_body else None
 
         # Extract TLS information (ASGI TLS extension)
         # Check if connection is using TLS (https)
@@ -555,15 +753,21 @@ class ASGIAdapter:
             # ASGI TLS extension format
             client_cert = tls_info.get("client_cert")
 
+        # ASGI "client" is a (host, port) pair, or None when unknown
+        client = scope.get("client")
+
         request = Request(
             method=method,
             path=path,
             headers=headers,
-            query_params=query_params,
-            body=body_stream,
+            query_string=scope.get("query_string", b""),
+            body=cast(Optional[BinaryIO], body_stream),
             tls=tls,
-            client_cert=client_cert
+            client_cert=client_cert,
+            client_ip=client[0] if client else None
         )
+        # Reused for the execution mode, coalescing and the state machine
+        request._route_match = (method, path, match)
 
         return request, more_body
 
@@ -572,21 +776,37 @@ class ASGIAdapter:
         Continue receiving body chunks and writing to the stream.
 
         This runs in the background while the application processes the request,
-        allowing true streaming of request bodies.
+        allowing true streaming of request bodies. Receiving pauses while the
+        stream holds more than its high-water mark of unread data, and stops
+        early if the body passes the stream's max_size.
 
         Args:
             body_stream: The stream to write chunks to
             receive: ASGI receive callable
+
+        Returns:
+            True if the client disconnected before the body was complete
         """
-        while True:
-            message = await receive()
-            chunk = message.get("body", b"")
-            if chunk:
-                body_stream.write(chunk)
-            more_body = message.get("more_body", False)
-            if not more_body:
-                body_stream.close_writing()
-                break
+        try:
+            while True:
+                await body_stream.wait_for_space()
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    # Wake the handler if it is waiting for the rest of the body
+                    body_stream.abort(ClientDisconnected("Client disconnected"))
+                    return True
+                chunk = message.get("body", b"")
+                if chunk:
+                    body_stream.write(chunk)
+                    if body_stream.writing_finished:
+                        # Passed the size limit; reading the body now raises RequestEntityTooLarge
+                        return False
+                if not message.get("more_body", False):
+                    body_stream.close_writing()
+                    return False
+        except asyncio.CancelledError:
+            body_stream.abort(ClientDisconnected("Request cancelled"))
+            raise
 
     def _convert_body_to_bytes(self, body: Any) -> bytes:
         """
@@ -626,17 +846,9 @@ class ASGIAdapter:
         content_length_set = False
 
         if response.headers and isinstance(response.headers, MultiValueHeaders):
-            for name, value in response.headers.items_all():
-                name_lower = name.lower()
-                if name_lower == "content-type":
-                    content_type_set = True
-                elif name_lower == "content-length":
-                    content_length_set = True
-
-                headers.append([
-                    name.encode("latin-1"),
-                    str(value).encode("latin-1")
-                ])
+            headers = response.headers.to_asgi()
+            content_type_set = "content-type" in response.headers
+            content_length_set = "content-length" in response.headers
 
         # Set Content-Type for JSON responses if not already set
         if not content_type_set and isinstance(response.body, (dict, list)):
@@ -657,44 +869,99 @@ class ASGIAdapter:
             send: ASGI send callable
         """
         chunk_size = 8192  # 8KB chunks
-        while True:
-            chunk = body_stream.read(chunk_size)
-            if not chunk:
-                break
+        try:
+            while True:
+                chunk = body_stream.read(chunk_size)
+                if not chunk:
+                    break
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": True,
+                })
+            # Send final empty chunk to signal end
             await send({
                 "type": "http.response.body",
-                "body": chunk,
-                "more_body": True,
+                "body": b"",
+                "more_body": False,
             })
-        # Send final empty chunk to signal end
-        await send({
-            "type": "http.response.body",
-            "body": b"",
-            "more_body": False,
-        })
+        finally:
+            # Also closes the stream early if the client disconnected
+            body_stream.close()
+
+    async def _send_iterator_body(self, body: Any, send):
+        """
+        Send a sync or async iterator body to ASGI, one message per chunk.
+
+        Async iterators are consumed on the event loop. Sync iterators may block
+        between chunks (e.g. on a database cursor), so each chunk is produced in
+        the handler thread pool. Empty chunks are skipped and str chunks are
+        encoded as UTF-8. The iterator is closed afterwards, including when the
+        client disconnects part way through.
 
-    async def _response_to_asgi(self, response: Response, send):
+        Args:
+            body: Iterator or async iterator of bytes/str chunks
+            send: ASGI send callable
+        """
+        if isinstance(body, AsyncIterator):
+            try:
+                async for chunk in body:
+                    data = encode_chunk(chunk)
+                    if data:
+                        await send({"type": "http.response.body", "body": data, "more_body": True})
+            finally:
+                aclose = getattr(body, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+        else:
+            loop = asyncio.get_running_loop()
+            done = object()
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(self.executor.executor, next, body, done)
+                    if chunk is done:
+                        break
+                    data = encode_chunk(chunk)
+                    if data:
+                        await send({"type": "http.response.body", "body": data, "more_body": True})
+            finally:
+                close = getattr(body, "close", None)
+                if close is not None:
+                    await loop.run_in_executor(self.executor.executor, close)
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _response_to_asgi(self, response: Response, send, extensions: Optional[Dict[str, Any]] = None):
         """
         Convert RestMachine Response to ASGI response format.
 
         Handles proper encoding, Content-Type, and Content-Length headers.
         Supports streaming response bodies and efficient file serving via Path objects.
 
-        For Path objects, uses the ASGI http.response.pathsend or http.response.zerocopysend
-        extensions for efficient file serving when supported by the server.
+        For Path objects, the body is sent with the best mechanism the server
+        advertises in scope["extensions"]:
+        - http.response.pathsend: the server reads the file itself (full files only)
+        - http.response.zerocopysend: the server sends from an open file with offset/count
+        - Otherwise the file is read and sent in file_chunk_size chunks
+
+        Iterator bodies (generators and async generators) are sent chunk by
+        chunk with more_body=True and no Content-Length.
 
         Range Request Support:
-        - For Path ranges: Uses http.response.zerocopysend with offset/count (zero-copy)
+        - For Path ranges: Uses http.response.zerocopysend with offset/count when available
         - For stream ranges: Seeks and streams the requested range
         - For byte ranges: Slices and sends the requested bytes
 
         Args:
             response: RestMachine Response object
             send: ASGI send callable
+            extensions: The "extensions" entry of the ASGI scope, if any
         """
+        extensions = extensions or {}
+
         # Check for range response - handle specially
         if response.is_range_response():
-            await self._send_range_response(response, send)
+            await self._send_range_response(response, send, extensions)
             return
 
         # Check if body is a Path (file to serve)
@@ -703,43 +970,29 @@ class ASGIAdapter:
         # Check if body is a stream
         is_stream = isinstance(response.body, io.IOBase)
 
+        # Check if body is a sync or async generator of chunks
+        is_iterator = is_iterator_body(response.body)
+
         # For non-streaming, non-Path bodies, convert to bytes
         body = None
-        if not is_stream and not is_path:
+        if not is_stream and not is_path and not is_iterator:
             body = self._convert_body_to_bytes(response.body)
 
         # Prepare headers
-        headers = self._prepare_asgi_headers(response, is_stream or is_path, body)
+        headers = self._prepare_asgi_headers(response, is_stream or is_path or is_iterator, body)
 
-        # Build response start message
-        response_start = {
+        # Send response start
+        await send({
             "type": "http.response.start",
             "status": response.status_code,
             "headers": headers,
-        }
-
-        # For Path objects, add the pathsend extension
-        if is_path:
-            path_obj = cast(Path, response.body)
-            response_start["extensions"] = {
-                "http.response.pathsend": {
-                    "path": str(path_obj.absolute())
-                }
-            }
-
-        # Send response start
-        await send(response_start)
+        })
 
         # Send response body
         if is_path:
-            # For Path, send empty body - the server will serve the file using the extension
-            # If the server doesn't support the extension, we fall back to reading the file
             path_obj = cast(Path, response.body)
-            if path_obj.exists() and path_obj.is_file():
-                # Open and stream the file as fallback
-                # Most ASGI servers that support pathsend will ignore the body we send
-                with path_obj.open('rb') as f:
-                    await self._send_streaming_body(f, send)
+            if path_obj.is_file():
+                await self._send_file(path_obj, send, extensions)
             else:
                 # File doesn't exist, send empty body
                 await send({
@@ -748,6 +1001,8 @@ class ASGIAdapter:
                 })
         elif is_stream:
             await self._send_streaming_body(cast(BinaryIO, response.body), send)
+        elif is_iterator:
+            await self._send_iterator_body(response.body, send)
         else:
             # Send entire body at once for non-streaming responses
             await send({
@@ -755,11 +1010,49 @@ class ASGIAdapter:
                 "body": body,
             })
 
-    async def _send_range_response(self, response: Response, send):
+    async def _send_file(self, path: Path, send, extensions: Dict[str, Any],
+                         offset: int = 0, count: Optional[int] = None):
+        """
+        Send a file, or part of one, as the response body.
+
+        Args:
+            path: File to send
+            send: ASGI send callable
+            extensions: The "extensions" entry of the ASGI scope
+            offset: First byte to send
+            count: Number of bytes to send (default: to the end of the file)
+        """
+        # pathsend can only serve whole files
+        if PATHSEND_EXTENSION in extensions and offset == 0 and count is None:
+            await send({
+                "type": PATHSEND_EXTENSION,
+                "path": str(path.absolute()),
+            })
+            return
+
+        with path.open('rb') as f:
+            if count is None:
+                count = max(os.fstat(f.fileno()).st_size - offset, 0)
+
+            if ZEROCOPYSEND_EXTENSION in extensions:
+                # The server reads from the file object, so it must stay open until send returns
+                await send({
+                    "type": ZEROCOPYSEND_EXTENSION,
+                    "file": f,
+                    "offset": offset,
+                    "count": count,
+                    "more_body": False,
+                })
+                return
+
+            f.seek(offset)
+            await self._send_chunked_bytes(f, send, count, self.file_chunk_size)
+
+    async def _send_range_response(self, response: Response, send, extensions: Optional[Dict[str, Any]] = None):
         """
         Send a 206 Partial Content response.
 
-        Uses zero-copy extensions when possible for efficient file serving.
+        Uses zero-copy extensions when the server advertises them.
 
         RFC 9110 Section 14: Range requests allow partial content transfer.
         https://www.rfc-editor.org/rfc/rfc9110.html#section-14
@@ -767,6 +1060,7 @@ class ASGIAdapter:
         Args:
             response: Response with range_start and range_end set
             send: ASGI send callable
+            extensions: The "extensions" entry of the ASGI scope, if any
         """
         from .models import is_seekable_stream
         from typing import cast, BinaryIO
@@ -778,39 +1072,19 @@ class ASGIAdapter:
         # Prepare headers (already includes Content-Range, Content-Length)
         headers = self._prepare_asgi_headers(response, False, None)
 
-        # Check if body is a Path (file)
-        is_path = isinstance(response.body, Path)
-
-        # Try zero-copy send for file ranges
-        if is_path:
-            path_obj = cast(Path, response.body)
-
-            # Build response start with zerocopysend extension
-            response_start = {
+        # Send file ranges with zerocopysend when available
+        if isinstance(response.body, Path):
+            await send({
                 "type": "http.response.start",
                 "status": 206,
                 "headers": headers,
-            }
-
-            # Send response start
-            await send(response_start)
-
-            # Try zero-copy send (supported by uvicorn, hypercorn)
-            try:
-                await send({
-                    "type": "http.response.zerocopysend",
-                    "file": str(path_obj.absolute()),
-                    "offset": response.range_start,
-                    "count": response.range_end - response.range_start + 1
-                })
-                return
-            except (KeyError, TypeError):
-                # Server doesn't support zerocopysend - fall back to reading
-                with path_obj.open('rb') as f:
-                    f.seek(response.range_start)
-                    remaining = response.range_end - response.range_start + 1
-                    await self._send_chunked_bytes(f, send, remaining)
-                return
+            })
+            await self._send_file(
+                response.body, send, extensions or {},
+                offset=response.range_start,
+                count=response.range_end - response.range_start + 1,
+            )
+            return
 
         # Handle stream ranges
         if is_seekable_stream(response.body):
@@ -823,13 +1097,14 @@ class ASGIAdapter:
 
             # Seek and stream the range
             stream = cast(BinaryIO, response.body)
-            stream.seek(response.range_start)
-            remaining = response.range_end - response.range_start + 1
-            await self._send_chunked_bytes(stream, send, remaining)
-
-            # Close stream if it's a file
-            if hasattr(stream, 'close'):
-                stream.close()
+            try:
+                stream.seek(response.range_start)
+                remaining = response.range_end - response.range_start + 1
+                await self._send_chunked_bytes(stream, send, remaining)
+            finally:
+                # Close stream if it's a file
+                if hasattr(stream, 'close'):
+                    stream.close()
             return
 
         # Handle bytes ranges
@@ -883,13 +1158,32 @@ class ASGIAdapter:
             if isinstance(chunk, str):
                 chunk = chunk.encode('utf-8')
 
+            remaining -= len(chunk)
+
             await send({
                 "type": "http.response.body",
                 "body": chunk,
-                "more_body": remaining > len(chunk)
+                "more_body": remaining > 0
             })
 
-            remaining -= len(chunk)
+            if remaining <= 0:
+                return
+
+        # Nothing to send, or the stream ended early - close the response
+        await send({
+            "type": "http.response.body",
+            "body": b"",
+            "more_body": False
+        })
+
+
+def _declared_length(raw_headers: Iterable[Tuple[bytes, bytes]]) -> int:
+    """Content-Length from raw ASGI headers, or 0 if it is missing or invalid."""
+    for name, value in raw_headers:
+        if name.lower() == b"content-length":
+            value = value.strip()
+            return int(value) if value.isdigit() else 0
+    return 0
 
 
 def create_asgi_app(app: "RestApplication", **adapter_kwargs: Any) -> ASGIAdapter:
@@ -907,6 +1201,10 @@ def create_asgi_app(app: "RestApplication", **adapter_kwargs: Any) -> ASGIAdapte
             - namespace: CloudWatch namespace (if AWS detected)
             - service_name: Service name dimension
             - metrics_resolution: Metric resolution (1 or 60 seconds)
+            - file_chunk_size: Read size for Path bodies without server extensions
+            - executor: Executor (or HandlerExecutor) for request handling
+            - max_workers: Size of a dedicated handler thread pool
+            - execution: Default execution mode ("thread" or "inline")
 
     Returns:
         An ASGI-compatible application
@@ -932,6 +1230,9 @@ def create_asgi_app(app: "RestApplication", **adapter_kwargs: Any) -> ASGIAdapte
         # Disable metrics
         asgi_app = create_asgi_app(app, enable_metrics=False)
 
+        # Dedicated handler pool of 32 threads
+        asgi_app = create_asgi_app(app, max_workers=32)
+
         # Run with uvicorn
         # uvicorn module:asgi_app --reload
         ```
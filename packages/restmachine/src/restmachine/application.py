@@ -3,11 +3,13 @@ Main application class for the REST framework.
 """
 
 import inspect
+import io
 import json
 import logging
 import os
 import re
-from urllib.parse import parse_qs
+import time
+from contextlib import nullcontext
 from typing import (
     Any,
     Callable,
@@ -15,6 +17,7 @@ from typing import (
     List,
     Literal,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
@@ -39,15 +42,62 @@ from .dependencies import (
     HeadersWrapper,
     ValidationWrapper,
 )
-from .exceptions import PYDANTIC_AVAILABLE, AcceptsParsingError
+from .exceptions import PYDANTIC_AVAILABLE, AcceptsParsingError, RequestEntityTooLarge, ValidationError
 from .models import HTTPMethod, Request, Response
 from .router import Router
 from .cors import CORSConfig
 from .csp import CSPConfig
+from .tracing import Tracer
+from .access_log import AccessLogConfig, AccessLogger
+from .profiling import PROFILE_HEADER, PROFILE_ID_HEADER, RequestProfiler
+from .background import DEFAULT_DRAIN_TIMEOUT, DEFAULT_MAX_CONCURRENCY, BackgroundRunner, BackgroundTasks
+from .cancellation import CancellationToken
+from .streaming import DEFAULT_SPOOL_THRESHOLD, validate_body_size
+from .auto_etag import AutoETagConfig
+from .coalescing import SingleFlight
+from .concurrency import ConcurrencyLimitConfig, ConcurrencyLimiter
+from .validator_cache import DEFAULT_MAX_ENTRIES, ValidatorCache
+from .rate_limit import (
+    DEFAULT_API_KEY_HEADER,
+    RateLimitConfig,
+    RateLimitKey,
+    RateLimitStore,
+    make_rate_limit_config,
+)
+from .compression import (
+    DEFAULT_CONTENT_TYPES,
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
+    DEFAULT_MINIMUM_SIZE,
+    CompressionConfig,
+    default_encodings,
+)
+from .multipart import (
+    DEFAULT_MAX_FIELD_SIZE,
+    DEFAULT_MAX_PARTS,
+    FileSink,
+    MultipartConfig,
+    parse_multipart,
+)
+from .request_body import RequestBodyCache
+from .type_adapters import model_type_adapter
+from .state_machine import RequestStateMachine
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+# Marks functions without a json_body adapter compiled at registration
+_NOT_COMPILED = object()
+
+
+def _content_length(value: Optional[str]) -> Optional[int]:
+    """Parse a Content-Length header value, returning None if missing or invalid."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
 
 class ErrorHandler:
     """Represents a custom error handler."""
@@ -100,12 +150,37 @@ class RouteHandler:
             for name, param in self.handler_signature.parameters.items()
         }
 
+        # Compiled Pydantic adapters for the return annotation and a typed json_body parameter
+        self.return_adapter = model_type_adapter(self.handler_signature.return_annotation)
+        self.json_body_adapter = model_type_adapter(self.param_info.get("json_body"))
+
         # CORS configuration for this route (overrides router/app-level)
         self.cors_config: Optional[CORSConfig] = None
 
         # CSP configuration for this route (overrides router/app-level)
         self.csp_config: Optional[CSPConfig] = None
 
+        # ASGI execution mode for this route (overrides the adapter default)
+        self.execution_mode: Optional[str] = None
+
+        # Maximum request body size for this route (overrides the app-level limit)
+        self.max_body_size: Optional[int] = None
+
+        # Token-bucket rate limit for this route (overrides the app-level one), or exempt from it
+        self.rate_limit: Optional[RateLimitConfig] = None
+        self.rate_limit_exempt = False
+
+        # ETags hashed from the response body for this route (overrides the app setting), or disabled
+        self.auto_etag: Optional[AutoETagConfig] = None
+        self.auto_etag_exempt = False
+
+        # Shares responses between identical concurrent requests, when coalescing is enabled
+        self.single_flight: Optional[SingleFlight] = None
+
+        # Admission under load: priority class and an optional route-level limiter
+        self.concurrency_priority = "normal"
+        self.concurrency_limiter: Optional[ConcurrencyLimiter] = None
+
         # State machine callbacks resolved from handler dependencies
         # These are the ONLY route-specific lookups we maintain
         self.state_callbacks: Dict[str, Callable] = {}
@@ -179,6 +254,39 @@ class RestApplication:
         self._shutdown_handlers: List[Callable] = []
         self._startup_executed = False  # Guard to prevent double execution
 
+        # Request tracing (disabled unless a tracer is configured)
+        self._tracer: Optional[Tracer] = None
+
+        # Structured access logging (disabled unless configured)
+        self._access_logger: Optional[AccessLogger] = None
+
+        # Per-request profiling (disabled unless configured)
+        self._profiler: Optional[RequestProfiler] = None
+
+        # Maximum request body size in bytes (app-level, None for unlimited)
+        self._max_body_size: Optional[int] = None
+
+        # Limits and file storage for the multipart_body parser
+        self._multipart_config = MultipartConfig()
+
+        # Runs the tasks handlers queue on the `background` dependency after responding
+        self._background = BackgroundRunner()
+
+        # Response compression and request decompression (disabled unless enabled)
+        self._compression: Optional[CompressionConfig] = None
+
+        # Token-bucket rate limit (disabled unless enabled)
+        self._rate_limit: Optional[RateLimitConfig] = None
+
+        # ETags hashed from response bodies (disabled unless enabled)
+        self._auto_etag: Optional[AutoETagConfig] = None
+
+        # Cross-request ETag/Last-Modified cache for conditional GETs (disabled unless enabled)
+        self._validator_cache: Optional[ValidatorCache] = None
+
+        # Adaptive concurrency limit (disabled unless enabled)
+        self._concurrency_limiter: Optional[ConcurrencyLimiter] = None
+
         # CORS configuration (app-level)
         self._cors_config: Optional[CORSConfig] = None
 
@@ -189,6 +297,9 @@ class RestApplication:
         # Create default root router - all routes go through this
         self._root_router = Router(app=self)
 
+        # The state machine is stateless (each request gets its own StateContext), so one serves every request
+        self._state_machine = RequestStateMachine(self)
+
         # Add default content renderers
         self.add_content_renderer(JSONRenderer())
         self.add_content_renderer(HTMLRenderer())
@@ -201,6 +312,148 @@ class RestApplication:
         """Add a global content renderer."""
         self._content_renderers[renderer.media_type] = renderer
 
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """Enable request tracing with the given tracer, or disable it with None.
+
+        When enabled, every request produces a span tree covering adapter parsing,
+        route matching, each state machine state, each dependency, the handler,
+        rendering and sending the response.
+
+        Example:
+            from restmachine.tracing import InMemorySpanExporter, Tracer
+
+            exporter = InMemorySpanExporter()
+            app.set_tracer(Tracer(exporter))
+        """
+        self._tracer = tracer
+
+    def access_log(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        handlers: Optional[List[logging.Handler]] = None,
+        logger_name: Optional[str] = None,
+        queue_size: int = 10000,
+        include_ids: bool = True,
+    ) -> AccessLogger:
+        """Enable structured access logging.
+
+        One record is emitted per request with the route template, status code,
+        duration and request/response sizes. Records are written by a background
+        thread so request handling never blocks on log I/O.
+
+        Example:
+            ```python
+            # Log every error, but only 1% of successful requests
+            app.access_log(sample_rates={"2xx": 0.01, "3xx": 0.01})
+            ```
+
+        Args:
+            sample_rates: Fraction of requests to log per status class ("1xx" to "5xx").
+                          Classes that are not listed are always logged.
+            handlers: Logging handlers that write the records (default: JSON lines on stderr).
+            logger_name: Logger to emit records on (default: "restmachine.access").
+            queue_size: Maximum number of pending records before new ones are dropped.
+            include_ids: Whether to include request_id and trace_id in each record.
+
+        Returns:
+            The configured AccessLogger.
+        """
+        config = AccessLogConfig(
+            sample_rates=sample_rates if sample_rates is not None else {},
+            handlers=handlers,
+            queue_size=queue_size,
+            include_ids=include_ids,
+        )
+        if logger_name is not None:
+            config.logger_name = logger_name
+
+        if self._access_logger is not None:
+            self._access_logger.stop()
+        self._access_logger = AccessLogger(config)
+        return self._access_logger
+
+    def enable_profiling(
+        self,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        header: str = PROFILE_HEADER,
+        capacity: int = 50,
+        admin_path: Optional[str] = None,
+    ) -> RequestProfiler:
+        """Enable on-demand cProfile profiling of individual requests.
+
+        A request is profiled when it carries ``header`` set to ``token``, or when
+        it is picked by random sampling. Profiled requests get an
+        ``X-Restmachine-Profile-Id`` response header when triggered by the header.
+        The most recent profiles are kept in memory on the returned profiler.
+
+        Example:
+            ```python
+            profiler = app.enable_profiling(token=os.environ["PROFILE_TOKEN"], admin_path="/_profiles")
+
+            # curl -H "X-Restmachine-Profile: $PROFILE_TOKEN" https://api.example.com/slow
+            # curl -H "X-Restmachine-Profile: $PROFILE_TOKEN" https://api.example.com/_profiles/1
+            ```
+
+        Args:
+            token: Shared secret that enables the header trigger and admin routes.
+            sample_rate: Fraction of all requests to profile (0.0 to 1.0).
+            header: Request header carrying the token.
+            capacity: Number of profiles to keep before the oldest are discarded.
+            admin_path: If set, register routes that list profiles (``admin_path``) and
+                        show one profile as text (``admin_path/{profile_id}``). Requires a token.
+
+        Returns:
+            The configured RequestProfiler.
+        """
+        if admin_path is not None and token is None:
+            raise ValueError("Profiling: admin_path requires a token")
+
+        profiler = RequestProfiler(header=header, token=token, sample_rate=sample_rate, capacity=capacity)
+        if admin_path is not None:
+            admin_path = admin_path.rstrip("/")
+            profiler.excluded_paths.append(admin_path)
+            self._add_profiling_routes(profiler, admin_path)
+        self._profiler = profiler
+        return profiler
+
+    def _add_profiling_routes(self, profiler: RequestProfiler, admin_path: str) -> None:
+        """Register the admin routes for listing and viewing profiles."""
+        def forbidden() -> Response:
+            # A new Response each time: the state machine adds per-request headers to it
+            return Response(403, json.dumps({"error": "Forbidden"}), content_type="application/json")
+
+        @self.get(admin_path)
+        def list_profiles(request):
+            if not profiler.is_authorized(request):
+                return forbidden()
+            return {"profiles": [record.to_dict() for record in profiler.records()], "skipped": profiler.skipped}
+
+        @self.get(admin_path + "/{profile_id}")
+        def get_profile(request, path_params):
+            if not profiler.is_authorized(request):
+                return forbidden()
+            profile_id = path_params["profile_id"]
+            if profile_id == "aggregate":
+                text = profiler.format_stats(route=(request.query_params or {}).get("route"))
+            elif profile_id.isdigit() and profiler.get(int(profile_id)) is not None:
+                text = profiler.format_stats(profile_id=int(profile_id))
+            else:
+                return Response(404, json.dumps({"error": "Profile not found"}), content_type="application/json")
+            return Response(200, text, content_type="text/plain")
+
+    def _start_span(self, name: str):
+        """Start a child span of the active span, or do nothing if tracing is disabled."""
+        if self._tracer is None:
+            return nullcontext()
+        return self._tracer.start_span(name)
+
+    def _trace_request(self, request: Request, parse_start: Optional[int] = None, parse_end: Optional[int] = None):
+        """Start the root span for a request, or do nothing if tracing is disabled."""
+        if self._tracer is None:
+            return nullcontext()
+        return self._tracer.request_span(request, parse_start, parse_end)
+
     def mount(self, prefix: str, router: Router):
         """Mount a router with a given prefix.
 
@@ -231,6 +484,11 @@ class RestApplication:
         self._dependencies["query_params"] = Dependency(lambda request: request.query_params or {}, scope="request")
         self._dependencies["path_params"] = Dependency(lambda request: request.path_params or {}, scope="request")
         self._dependencies["request_headers"] = Dependency(lambda request: request.headers, scope="request")
+        self._dependencies["cancellation"] = Dependency(
+            lambda request: request.cancellation if request.cancellation is not None else CancellationToken(),
+            scope="request"
+        )
+        self._dependencies["background"] = Dependency(self._get_background_tasks, scope="request")
         self._dependencies["headers"] = Dependency(lambda request: request.headers, scope="request")  # Deprecated
 
         # Built-in dependencies that need application context
@@ -251,106 +509,18 @@ class RestApplication:
             scope="request"
         )
 
-    @staticmethod
-    def _extract_charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
-        """Extract the charset parameter from a Content-Type header.
-
-        Args:
-            content_type: Content-Type header value (e.g., "application/json; charset=utf-8")
-
-        Returns:
-            The charset parameter value, or None if not specified
-
-        Examples:
-            >>> _extract_charset_from_content_type("application/json; charset=utf-8")
-            "utf-8"
-            >>> _extract_charset_from_content_type("text/html; charset=iso-8859-1")
-            "iso-8859-1"
-            >>> _extract_charset_from_content_type("application/json")
-            None
-        """
-        if not content_type:
-            return None
-
-        # Split on semicolon to get parameters
-        parts = content_type.split(';')
-        for part in parts[1:]:  # Skip the media type itself
-            part = part.strip()
-            if part.lower().startswith('charset='):
-                charset = part.split('=', 1)[1].strip()
-                # Remove quotes if present
-                if charset.startswith('"') and charset.endswith('"'):
-                    charset = charset[1:-1]
-                if charset.startswith("'") and charset.endswith("'"):
-                    charset = charset[1:-1]
-                return charset
-        return None
-
-    @staticmethod
-    def _decode_bytes_with_fallback(data: bytes, content_type: Optional[str] = None) -> str:
-        """Decode bytes using charset from Content-Type, with UTF-8 and Latin1 fallback.
-
-        Args:
-            data: Bytes to decode
-            content_type: Optional Content-Type header value with charset parameter
-
-        Returns:
-            Decoded string
-
-        Raises:
-            UnicodeDecodeError: If all decoding attempts fail
-
-        The decoding strategy is:
-        1. If charset specified in Content-Type, try that first
-        2. Fall back to UTF-8
-        3. Fall back to Latin1 (ISO-8859-1) which never fails for valid bytes
-        """
-        if not data:
-            return ""
-
-        # Try charset from Content-Type first
-        charset = RestApplication._extract_charset_from_content_type(content_type)
-        if charset:
-            try:
-                return data.decode(charset)
-            except (UnicodeDecodeError, LookupError):
-                # Charset specified but failed - continue to fallbacks
-                pass
-
-        # Try UTF-8
-        try:
-            return data.decode('utf-8')
-        except UnicodeDecodeError:
-            pass
-
-        # Fall back to Latin1 (ISO-8859-1) - this should always succeed
-        # since Latin1 maps all byte values to Unicode code points
-        return data.decode('latin1')
-
     def _get_body_as_string(self, request: Request) -> Optional[str]:
         """Built-in dependency provider for body as string.
 
-        Reads from the request body stream and decodes using charset from Content-Type header.
-        Falls back to UTF-8, then Latin1 if charset not specified.
+        Decodes the body using the charset from the Content-Type header, falling
+        back to UTF-8, then Latin1. The text comes from the request's body cache,
+        so it is shared with json_body, form_body and text_body.
         For backward compatibility with custom @app.accepts parsers.
         """
-        if request.body is None:
+        cache = request.body_cache
+        if cache is None:
             return None
-
-        content_type = request.get_content_type()
-
-        # If it's a stream, read and decode
-        if hasattr(request.body, 'read'):
-            raw_bytes = request.body.read()
-            # Reset stream position for potential re-reading
-            if hasattr(request.body, 'seek'):
-                request.body.seek(0)
-            return self._decode_bytes_with_fallback(raw_bytes, content_type) if raw_bytes else None
-
-        # Legacy support for string/bytes (shouldn't happen with new code)
-        if isinstance(request.body, bytes):
-            return self._decode_bytes_with_fallback(request.body, content_type)
-        return str(request.body) if request.body else None
+        return cache.text() or None
 
     def _get_response_headers(self, request: Request) -> Dict[str, str]:
         """Built-in dependency provider for response_headers."""
@@ -363,7 +533,12 @@ class RestApplication:
         return cast(Dict[str, str], headers)
 
     def _get_request_id(self, request: Request) -> str:
-        """Built-in dependency provider for request_id."""
+        """Built-in dependency provider for request_id, resolved once per request."""
+        if request._request_id is None:
+            request._request_id = self._new_request_id(request)
+        return request._request_id
+
+    def _new_request_id(self, request: Request) -> str:
         if self._request_id_provider:
             # Get current route from cache
             route = self._dependency_cache.get("__current_route__")
@@ -373,14 +548,21 @@ class RestApplication:
             return str(uuid.uuid4())
 
     def _get_trace_id(self, request: Request) -> str:
-        """Built-in dependency provider for trace_id."""
+        """Built-in dependency provider for trace_id, resolved once per request."""
+        if request._trace_id is None:
+            request._trace_id = self._new_trace_id(request)
+        return request._trace_id
+
+    def _new_trace_id(self, request: Request) -> str:
         if self._trace_id_provider:
             # Get current route from cache
             route = self._dependency_cache.get("__current_route__")
             return cast(str, self._call_with_injection(self._trace_id_provider, request, route))
-        else:
-            import uuid
-            return str(uuid.uuid4())
+        span = self._tracer.current_span() if self._tracer is not None else None
+        if span is not None:
+            return cast(str, span.trace_id)
+        import uuid
+        return str(uuid.uuid4())
 
     def _get_json_body(self, request: Request) -> Any:
         """Built-in dependency provider for json_body."""
@@ -911,6 +1093,501 @@ class RestApplication:
         # Return decorator function
         return decorator
 
+    def execution(self, mode: str):
+        """Route decorator choosing how the ASGI adapter runs this route.
+
+        Usage:
+            ```python
+            @app.get("/health")
+            @app.execution("inline")
+            def health():
+                return {"status": "ok"}
+            ```
+
+        Args:
+            mode: "inline" to run on the event loop (only for CPU-trivial handlers
+                  that never block on I/O) or "thread" to run in the thread pool
+
+        Returns:
+            Decorator function
+        """
+        return self._root_router.execution(mode)
+
+    def set_max_body_size(self, limit: Optional[int]):
+        """Set the maximum request body size for all routes, or remove it with None.
+
+        Requests whose Content-Length exceeds the limit are rejected with
+        413 Payload Too Large before the body is read. The ASGI adapter also
+        counts bytes as they arrive and stops receiving a body (e.g. a chunked
+        upload) as soon as it passes the limit. Routes can override the limit
+        with the max_body_size() decorator.
+
+        Example:
+            ```python
+            app.set_max_body_size(10 * 1024 * 1024)  # 10MB
+            ```
+
+        Args:
+            limit: Maximum body size in bytes, or None for no limit
+        """
+        validate_body_size(limit)
+        self._max_body_size = limit
+
+    def max_body_size(self, limit: int):
+        """Route decorator overriding the maximum request body size for this route.
+
+        Usage:
+            ```python
+            @app.post("/videos")
+            @app.max_body_size(2 * 1024 * 1024 * 1024)
+            def upload_video(request):
+                ...
+            ```
+
+        Args:
+            limit: Maximum body size in bytes
+
+        Returns:
+            Decorator function
+        """
+        return self._root_router.max_body_size(limit)
+
+    def _get_max_body_size(self, route: Optional[RouteHandler]) -> Optional[int]:
+        """Maximum body size for a route: the route's own limit, else the app-level one."""
+        if route is not None and route.max_body_size is not None:
+            return route.max_body_size
+        return self._max_body_size
+
+    def configure_multipart(
+        self,
+        max_parts: int = DEFAULT_MAX_PARTS,
+        max_part_size: Optional[int] = None,
+        max_field_size: int = DEFAULT_MAX_FIELD_SIZE,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+        file_sink: Optional[FileSink] = None,
+    ) -> MultipartConfig:
+        """Configure how the multipart_body dependency parses multipart/form-data bodies.
+
+        Bodies are parsed as they stream in. Form fields become strings and file
+        parts UploadFile objects, whose content is in a temporary file (held in
+        memory up to spool_threshold bytes) or written to file_sink. Bodies with
+        too many parts, or a part that is too large, are rejected with 413.
+
+        Example:
+            ```python
+            # Stream uploads straight to storage instead of temporary files
+            app.configure_multipart(
+                max_parts=10,
+                max_part_size=500 * 1024 * 1024,
+                file_sink=lambda upload: storage.open_writer(upload.filename),
+            )
+            ```
+
+        Args:
+            max_parts: Maximum number of parts in a body.
+            max_part_size: Maximum size of a file part in bytes, or None for no limit.
+            max_field_size: Maximum size of a (non-file) form field in bytes.
+            spool_threshold: File parts larger than this move from memory to disk.
+            file_sink: Called with each UploadFile; returns an object with write(bytes)
+                       that receives the content instead of a temporary file.
+
+        Returns:
+            The MultipartConfig in use.
+        """
+        config = MultipartConfig(
+            max_parts=max_parts,
+            max_part_size=max_part_size,
+            max_field_size=max_field_size,
+            spool_threshold=spool_threshold,
+            file_sink=file_sink,
+        )
+        config.validate()
+        self._multipart_config = config
+        return config
+
+    def configure_background_tasks(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+    ) -> BackgroundRunner:
+        """Configure how tasks queued on the `background` dependency are run.
+
+        Handlers queue follow-up work that shouldn't delay the response; it runs
+        once the response has been sent (see restmachine.background).
+
+        Example:
+            ```python
+            runner = app.configure_background_tasks(max_concurrency=4)
+
+            @app.post("/orders")
+            def create_order(json_body, background):
+                order = save_order(json_body)
+                background.add(send_confirmation_email, order)
+                return order
+            ```
+
+        Args:
+            max_concurrency: Maximum number of tasks running at once across all requests.
+            drain_timeout: Seconds shutdown waits for pending tasks.
+
+        Returns:
+            The BackgroundRunner in use; its completed and failed attributes count task outcomes.
+        """
+        self._background = BackgroundRunner(max_concurrency=max_concurrency, drain_timeout=drain_timeout)
+        return self._background
+
+    def _get_background_tasks(self, request: Request) -> BackgroundTasks:
+        """Background tasks of a request, created the first time a handler asks for them."""
+        if request.background is None:
+            request.background = BackgroundTasks()
+        return request.background
+
+    def _take_background_tasks(self, request: Request, response: Optional[Response]) -> Optional[BackgroundTasks]:
+        """Tasks to run after sending response, or None.
+
+        Tasks queued by a request that failed (or got no response) are dropped.
+        """
+        tasks = request.background
+        if not tasks:
+            return None
+        request.background = None
+        if response is None or response.status_code >= 400:
+            tasks.discard()
+            return None
+        return tasks
+
+    def _run_background_tasks(self, request: Request, response: Response) -> None:
+        """Run the tasks of a request that has been answered, waiting for them to finish."""
+        tasks = self._take_background_tasks(request, response)
+        if tasks is not None:
+            self._background.run(tasks)
+
+    def enable_compression(
+        self,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        content_types: Optional[Sequence[str]] = None,
+        encodings: Optional[Sequence[str]] = None,
+        level: Optional[int] = None,
+        decompress_requests: bool = True,
+        max_decompressed_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE,
+    ) -> CompressionConfig:
+        """Compress responses and decompress request bodies.
+
+        Responses are compressed with the best encoding in the request's
+        Accept-Encoding (zstd when available, gzip, deflate) if their content
+        type is on the allowlist and their size is at least minimum_size.
+        Streaming bodies are compressed chunk by chunk. Request bodies with
+        Content-Encoding gzip or deflate are decompressed as they are read;
+        other encodings are rejected with 415.
+
+        Example:
+            ```python
+            app.enable_compression(minimum_size=1024, encodings=["gzip"])
+            ```
+
+        Args:
+            minimum_size: Smallest response body, in bytes, worth compressing.
+            content_types: Compressible content types; entries ending in "/" match a
+                           top-level type and entries starting with "+" a suffix.
+                           Defaults to text, JSON, JavaScript, XML and SVG.
+            encodings: Response encodings to offer, most preferred first.
+            level: Compression level, or None for each encoding's default.
+            decompress_requests: Decompress request bodies that have a Content-Encoding.
+            max_decompressed_size: Largest decompressed request body, in bytes (413 beyond it).
+
+        Returns:
+            The CompressionConfig in use.
+        """
+        config = CompressionConfig(
+            minimum_size=minimum_size,
+            content_types=tuple(content_types) if content_types is not None else DEFAULT_CONTENT_TYPES,
+            encodings=tuple(encodings) if encodings is not None else default_encodings(),
+            level=level,
+            decompress_requests=decompress_requests,
+            max_decompressed_size=max_decompressed_size,
+        )
+        config.validate()
+        self._compression = config
+        return config
+
+    def enable_rate_limit(
+        self,
+        limit: int,
+        period: float = 60.0,
+        burst: Optional[int] = None,
+        key: RateLimitKey = "ip",
+        api_key_header: str = DEFAULT_API_KEY_HEADER,
+        store: Optional[RateLimitStore] = None,
+        send_headers: bool = True,
+    ) -> RateLimitConfig:
+        """Rate limit every route with a token bucket per client.
+
+        Each client may make burst requests at once, refilled at limit requests
+        per period. The check runs right after the route is matched; requests
+        over the limit get 429 Too Many Requests with Retry-After and
+        RateLimit-* headers before any other state or dependency runs. Routes can
+        set their own limit, or opt out, with the rate_limit() decorator.
+
+        Example:
+            ```python
+            # 100 requests a minute per API key, falling back to the client address
+            app.enable_rate_limit(100, period=60, key=("api_key", "ip"))
+            ```
+
+        Args:
+            limit: Requests allowed per period.
+            period: Length of the period in seconds.
+            burst: Requests allowed at once after a quiet spell (defaults to limit).
+            key: What identifies a client: "ip" (request.client_ip), "api_key" (the
+                 api_key_header value), "route" (the route template), a sequence of
+                 those, or a function from the Request to a key.
+            api_key_header: Header holding the API key for the "api_key" key part.
+            store: Where buckets are kept. Defaults to an in-process store holding
+                   the 10,000 most recently used keys; implement
+                   restmachine.rate_limit.RateLimitStore to share state between processes.
+            send_headers: Whether to add RateLimit-* headers to admitted responses.
+
+        Returns:
+            The RateLimitConfig in use.
+        """
+        config = make_rate_limit_config(limit, period, burst, key, api_key_header, store, send_headers)
+        self._rate_limit = config
+        return config
+
+    def rate_limit(
+        self,
+        limit: Optional[int],
+        period: float = 60.0,
+        burst: Optional[int] = None,
+        key: RateLimitKey = "ip",
+        api_key_header: str = DEFAULT_API_KEY_HEADER,
+        store: Optional[RateLimitStore] = None,
+        send_headers: bool = True,
+    ):
+        """Route decorator setting this route's own rate limit, or exempting it with None.
+
+        Usage:
+            ```python
+            @app.post("/login")
+            @app.rate_limit(5, period=60)
+            def login(json_body):
+                ...
+
+            @app.get("/health")
+            @app.rate_limit(None)
+            def health():
+                return {"status": "ok"}
+            ```
+
+        Returns:
+            Decorator function
+        """
+        return self._root_router.rate_limit(limit, period, burst, key, api_key_header, store, send_headers)
+
+    def _get_rate_limit(self, route: Optional[RouteHandler]) -> Optional[RateLimitConfig]:
+        """Rate limit for a route: the route's own limit, else the app-level one."""
+        if route is not None:
+            if route.rate_limit is not None:
+                return route.rate_limit
+            if route.rate_limit_exempt:
+                return None
+        return self._rate_limit
+
+    def coalesce(
+        self,
+        vary: Sequence[str] = (),
+        headers: Optional[Callable[[Request], Dict[str, str]]] = None,
+    ):
+        """Route decorator coalescing identical concurrent GET requests.
+
+        The first request runs as usual. Identical requests (same path, query
+        parameters, Accept*, Authorization, Cookie, Origin, Range and
+        conditional headers, client address, TLS state and client certificate)
+        that arrive before it finishes wait for it and get a copy of its
+        response, instead of running the handler again. Responses with a
+        streamed body, Set-Cookie or a CSP nonce aren't shared.
+
+        Waiting requests skip the whole state machine, including the
+        service_available, authorized and forbidden callbacks. Routes that
+        authorize on anything else must name it in ``vary``.
+
+        Usage:
+            ```python
+            @app.get("/catalog")
+            @app.coalesce(headers=lambda request: {"X-Request-ID": str(uuid.uuid4())})
+            def catalog(products):
+                ...
+            ```
+
+        Args:
+            vary: Additional request headers that select the response
+            headers: Function from the Request to headers that must differ per
+                     request, set on every response including shared copies
+
+        Returns:
+            Decorator function
+        """
+        return self._root_router.coalesce(vary, headers)
+
+    def enable_auto_etag(self, weak: bool = False) -> AutoETagConfig:
+        """Send ETags hashed from the response body and answer matching requests with 304.
+
+        Successful GET responses without an ETag of their own (from a
+        generate_etag callback or the handler) get one computed from the
+        rendered body with a fast non-cryptographic hash. If the request's
+        If-None-Match matches it, the body is replaced with 304 Not Modified.
+        The handler still runs; what is saved is sending the body. Routes can
+        opt out with @app.auto_etag(False).
+
+        Args:
+            weak: Send weak ETags (W/"...") instead of strong ones.
+
+        Returns:
+            The AutoETagConfig in use.
+        """
+        self._auto_etag = AutoETagConfig(weak=weak)
+        return self._auto_etag
+
+    def auto_etag(self, enabled: bool = True, weak: bool = False):
+        """Route decorator turning automatic ETags on or off for this route.
+
+        Usage:
+            ```python
+            @app.get("/report")
+            @app.auto_etag()
+            def report():
+                ...
+            ```
+
+        Returns:
+            Decorator function
+        """
+        return self._root_router.auto_etag(enabled, weak)
+
+    def _get_auto_etag(self, route: Optional[RouteHandler]) -> Optional[AutoETagConfig]:
+        """Automatic ETag setting for a route: the route's own, else the app-level one."""
+        if route is not None:
+            if route.auto_etag is not None:
+                return route.auto_etag
+            if route.auto_etag_exempt:
+                return None
+        return self._auto_etag
+
+    def enable_validator_cache(self, ttl: float = 60.0, max_entries: int = DEFAULT_MAX_ENTRIES) -> ValidatorCache:
+        """Remember ETags and Last-Modified times across requests to answer 304 cheaply.
+
+        The validators computed by generate_etag and last_modified callbacks
+        are kept for ttl seconds per route and path parameters. A GET whose
+        If-None-Match or If-Modified-Since matches a fresh entry gets 304 Not
+        Modified without calling resource_exists or the validator callbacks.
+        Successful POST, PUT, PATCH and DELETE requests to the same route and
+        path parameters drop the entry; invalidate changes made elsewhere with
+        the returned cache.
+
+        Example:
+            ```python
+            validators = app.enable_validator_cache(ttl=30)
+
+            @event.listens_for(Item, "after_update")
+            def item_updated(mapper, connection, item):
+                validators.invalidate("/items/{item_id}", item_id=item.id)
+            ```
+
+        Args:
+            ttl: Seconds an entry is used for after the validators were last computed.
+            max_entries: Maximum number of resources remembered (least recently used dropped first).
+
+        Returns:
+            The ValidatorCache, for explicit invalidation.
+        """
+        self._validator_cache = ValidatorCache(ttl=ttl, max_entries=max_entries)
+        return self._validator_cache
+
+    def enable_concurrency_limit(
+        self,
+        algorithm: str = "aimd",
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        latency_threshold: float = 1.0,
+        low_priority_ratio: float = 0.8,
+        retry_after: int = 1,
+    ) -> ConcurrencyLimiter:
+        """Limit the number of requests in flight, adapting the limit to latency.
+
+        Requests that arrive while the limit is in use are rejected with
+        503 Service Unavailable and a Retry-After header before the service_available
+        callback or any handler dependency runs. Routes marked critical with the
+        concurrency_limit() decorator are never rejected, and low priority routes
+        are rejected first. When metrics are enabled, each request records
+        ``concurrency.limit``, and rejected ones ``concurrency.shed``.
+
+        Example:
+            ```python
+            limiter = app.enable_concurrency_limit(algorithm="gradient", max_limit=200)
+
+            @app.get("/health")
+            @app.concurrency_limit(priority="critical")
+            def health():
+                return {"status": "ok", "concurrency": limiter.stats()}
+            ```
+
+        Args:
+            algorithm: "aimd" (grow by one, shrink on slow or failed requests) or
+                       "gradient" (follow the ratio of baseline to recent latency).
+            initial_limit: Requests allowed in flight before latency is measured.
+            min_limit: Lower bound for the limit.
+            max_limit: Upper bound for the limit.
+            latency_threshold: AIMD only; seconds after which a request counts as slow.
+            low_priority_ratio: Fraction of the limit low priority routes may use.
+            retry_after: Seconds sent in the Retry-After header of rejected requests.
+
+        Returns:
+            The ConcurrencyLimiter in use. For the other tuning settings, pass a
+            ConcurrencyLimitConfig to a ConcurrencyLimiter and use set_concurrency_limiter().
+        """
+        limiter = ConcurrencyLimiter(ConcurrencyLimitConfig(
+            algorithm=algorithm,
+            initial_limit=initial_limit,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            latency_threshold=latency_threshold,
+            low_priority_ratio=low_priority_ratio,
+            retry_after=retry_after,
+        ))
+        self._concurrency_limiter = limiter
+        return limiter
+
+    def set_concurrency_limiter(self, limiter: Optional[ConcurrencyLimiter]):
+        """Use limiter for all routes without their own, or disable the app-level limit with None."""
+        self._concurrency_limiter = limiter
+
+    def concurrency_limit(self, priority: str = "normal", limiter: Optional[ConcurrencyLimiter] = None):
+        """Route decorator setting how this route is admitted under load.
+
+        Usage:
+            ```python
+            @app.get("/admin/stats")
+            @app.concurrency_limit(priority="critical")
+            def admin_stats():
+                ...
+            ```
+
+        Args:
+            priority: "critical" (never shed), "normal", or "low" (shed first)
+            limiter: A ConcurrencyLimiter for this route instead of the app-level one
+
+        Returns:
+            Decorator function
+        """
+        return self._root_router.concurrency_limit(priority, limiter)
+
+    def _get_concurrency_limiter(self, route: Optional[RouteHandler]) -> Optional[ConcurrencyLimiter]:
+        """Concurrency limiter for a route: the route's own limiter, else the app-level one."""
+        if route is not None and route.concurrency_limiter is not None:
+            return route.concurrency_limiter
+        return self._concurrency_limiter
+
     def csp_provider(self, func: Callable):
         """Register a per-request CSP provider.
 
@@ -972,13 +1649,21 @@ class RestApplication:
 
         # Check if this is a registered dependency (built-in or custom)
         if self._dependency_exists(param_name, route):
-            resolved_value = self._resolve_registered_dependency(param_name, request, route)
+            if self._tracer is None:
+                resolved_value = self._resolve_registered_dependency(param_name, request, route)
+            else:
+                with self._tracer.start_span(f"dependency.{param_name}"):
+                    resolved_value = self._resolve_registered_dependency(param_name, request, route)
             self._dependency_cache.set(param_name, resolved_value, dep_scope)
             return resolved_value
 
         # Check if this is an accepts parser dependency (only if we have a request)
         if request is not None and self._accepts_dependency_exists(param_name, request, route):
-            accepts_value = self._resolve_accepts_dependency(param_name, request, route)
+            if self._tracer is None:
+                accepts_value = self._resolve_accepts_dependency(param_name, request, route)
+            else:
+                with self._tracer.start_span(f"dependency.{param_name}"):
+                    accepts_value = self._resolve_accepts_dependency(param_name, request, route)
             self._dependency_cache.set(param_name, accepts_value, dep_scope)
             return accepts_value
 
@@ -1028,7 +1713,7 @@ class RestApplication:
         elif isinstance(dep_or_wrapper, Dependency):
             # Unwrap the Dependency wrapper
             if validation_dependency is not None:
-                result = self._call_with_injection(dep_or_wrapper.func, request, route)
+                result = self._call_with_injection(dep_or_wrapper.func, request, route, validation_dependency)
                 if hasattr(result, "model_validate") or hasattr(result, "model_dump"):
                     return result
                 else:
@@ -1036,7 +1721,7 @@ class RestApplication:
             else:
                 return self._call_with_injection(dep_or_wrapper.func, request, route)
         elif validation_dependency is not None:
-            result = self._call_with_injection(dep_or_wrapper, request, route)
+            result = self._call_with_injection(dep_or_wrapper, request, route, validation_dependency)
             if hasattr(result, "model_validate") or hasattr(result, "model_dump"):
                 return result
             else:
@@ -1083,13 +1768,23 @@ class RestApplication:
                 original_exception=e
             )
 
-    def _call_with_injection(self, func: Callable, request: Optional[Request], route: Optional[RouteHandler] = None) -> Any:
+    def _call_with_injection(
+        self,
+        func: Callable,
+        request: Optional[Request],
+        route: Optional[RouteHandler] = None,
+        validator: Optional[ValidationWrapper] = None,
+    ) -> Any:
         """Call a function with dependency injection."""
-        # Use cached signature if this is the route handler
+        # Use the cached signature and json_body adapter if this is the route handler or a validator
+        json_body_adapter: Any = _NOT_COMPILED
         if route and func == route.handler:
             sig = route.handler_signature
+            json_body_adapter = route.json_body_adapter
         else:
             sig = inspect.signature(func)
+            if validator is not None:
+                json_body_adapter = validator.json_body_adapter
 
         kwargs = {}
 
@@ -1099,6 +1794,11 @@ class RestApplication:
                 if param.annotation != inspect.Parameter.empty
                 else None
             )
+            if param_name == "json_body" and request is not None:
+                adapter = model_type_adapter(param_type) if json_body_adapter is _NOT_COMPILED else json_body_adapter
+                if adapter is not None:
+                    kwargs[param_name] = self._validate_json_body(request, route, adapter)
+                    continue
             resolved_value = self._resolve_dependency(param_name, param_type, request, route)
             kwargs[param_name] = resolved_value
 
@@ -1134,6 +1834,8 @@ class RestApplication:
         if accepts_wrapper:
             try:
                 return self._call_with_injection(accepts_wrapper.func, request, route)
+            except RequestEntityTooLarge:
+                raise
             except Exception as e:
                 raise AcceptsParsingError(
                     f"Failed to parse {base_content_type} request body: {str(e)}",
@@ -1146,8 +1848,36 @@ class RestApplication:
             if base_content_type not in supported_types:
                 raise ValueError("Unsupported Media Type - 415")
 
-        # Use built-in parsers
-        return self._parse_with_builtin_parser(request.body, expected_content_type)
+        # Use built-in parsers, keeping the request's parameters (e.g. the multipart boundary)
+        if base_content_type == expected_content_type:
+            return self._parse_with_builtin_parser(request, content_type)
+        return self._parse_with_builtin_parser(request, expected_content_type)
+
+    def _validate_json_body(self, request: Request, route: Optional[RouteHandler], adapter: Any) -> Any:
+        """Validate the body for a json_body parameter annotated with a Pydantic model.
+
+        JSON bodies are validated by the compiled adapter straight from the raw
+        bytes, and the validated value is shared through the request's body
+        cache. Bodies handled by a custom @app.accepts parser, or sent in
+        another supported content type, are parsed as usual and then validated.
+        """
+        if not request.body:
+            return None
+
+        content_type = request.get_content_type() or "application/octet-stream"
+        base_content_type = content_type.split(';')[0].strip().lower()
+        if base_content_type != "application/json" or self._get_accepts_wrapper(base_content_type, route):
+            return adapter.validate_python(self._resolve_dependency("json_body", None, request, route))
+
+        try:
+            return cast(RequestBodyCache, request.body_cache).validate_json(adapter)
+        except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                raise AcceptsParsingError(
+                    f"Failed to parse application/json request body: Invalid JSON - {str(e)}",
+                    original_exception=e
+                )
+            raise
 
     def _get_accepts_wrapper(self, content_type: str, route: Optional[RouteHandler]):
         """Get accepts wrapper for content type from global dependencies."""
@@ -1164,89 +1894,48 @@ class RestApplication:
         ])
         return supported_types
 
-    def _parse_json_from_stream(self, body, content_type: str) -> Any:
-        """Parse JSON from a stream."""
-        import io
-        # Extract charset from Content-Type, default to UTF-8, fallback to Latin1
-        charset = self._extract_charset_from_content_type(content_type) or 'utf-8'
-        try:
-            # Wrap bytes stream with TextIOWrapper for JSON parser
-            text_stream = io.TextIOWrapper(body, encoding=charset)
-            return json.load(text_stream)
-        except (UnicodeDecodeError, LookupError):
-            # If charset fails, try UTF-8
-            body.seek(0)  # Reset stream
-            try:
-                text_stream = io.TextIOWrapper(body, encoding='utf-8')
-                return json.load(text_stream)
-            except UnicodeDecodeError:
-                # Fall back to Latin1
-                body.seek(0)
-                text_stream = io.TextIOWrapper(body, encoding='latin1')
-                return json.load(text_stream)
-
-    def _parse_form_from_stream(self, body, content_type: str) -> dict:
-        """Parse form data from a stream."""
-        raw_bytes = body.read()
-        body_str = self._decode_bytes_with_fallback(raw_bytes, content_type)
-        parsed = parse_qs(body_str, keep_blank_values=True)
-        return {key: values[0] if len(values) == 1 else values for key, values in parsed.items()}
-
-    def _parse_text_from_stream(self, body, content_type: str) -> str:
-        """Parse text from a stream."""
-        raw_bytes: bytes = body.read()
-        return self._decode_bytes_with_fallback(raw_bytes, content_type)
-
-    def _parse_multipart_from_stream(self, body) -> dict:
+    def _parse_multipart_from_stream(self, body, content_type: str) -> dict:
         """Parse multipart data from a stream."""
-        raw_bytes = body.read()
-        return {"_raw_body": raw_bytes, "_content_type": "multipart/form-data"}
+        return parse_multipart(body, content_type, self._multipart_config)
+
+    def _parse_cached_body(self, request: Request, content_type: str) -> Any:
+        """Parse the body with the built-in parser for content_type.
 
-    def _parse_stream_body(self, body, content_type: str) -> Any:
-        """Parse body from a stream based on content type.
+        JSON, form and text bodies are read once into the request's body cache
+        and parsed from there, so asking for the same representation again
+        reuses the parsed value. Multipart bodies are parsed from the stream.
 
         Args:
-            body: The body stream to parse
+            request: The request whose body to parse
             content_type: Full Content-Type header value (may include charset parameter)
         """
         # Extract base content type (without parameters like charset)
         base_content_type = content_type.split(';')[0].strip()
 
+        if base_content_type == "multipart/form-data":
+            body = request.body
+            if not hasattr(body, 'read'):
+                # Legacy string/bytes body
+                raw_bytes = body if isinstance(body, bytes) else str(body).encode("utf-8")
+                body = io.BytesIO(raw_bytes)
+            return self._parse_multipart_from_stream(body, content_type)
+
+        cache = cast(RequestBodyCache, request.body_cache)
         if base_content_type == "application/json":
-            return self._parse_json_from_stream(body, content_type)
+            return cache.json()
         elif base_content_type == "application/x-www-form-urlencoded":
-            return self._parse_form_from_stream(body, content_type)
-        elif base_content_type == "multipart/form-data":
-            return self._parse_multipart_from_stream(body)
+            return cache.form()
         elif base_content_type == "text/plain":
-            return self._parse_text_from_stream(body, content_type)
+            return cache.text()
         else:
             # Unknown content type - return raw bytes
-            return body.read()
-
-    def _parse_legacy_body(self, body, content_type: str) -> Any:
-        """Parse legacy string/bytes body (for backwards compatibility)."""
-        body_str = self._decode_bytes_with_fallback(body, content_type) if isinstance(body, bytes) else body
-
-        # Extract base content type (without parameters like charset)
-        base_content_type = content_type.split(';')[0].strip()
-
-        if base_content_type == "application/json":
-            return json.loads(body_str)
-        elif base_content_type == "application/x-www-form-urlencoded":
-            parsed = parse_qs(body_str, keep_blank_values=True)
-            return {key: values[0] if len(values) == 1 else values for key, values in parsed.items()}
-        elif base_content_type == "multipart/form-data":
-            return {"_raw_body": body_str, "_content_type": "multipart/form-data"}
-        elif base_content_type == "text/plain":
-            return body_str
-        return body_str
+            return cache.raw()
 
-    def _parse_with_builtin_parser(self, body, content_type: str) -> Any:
+    def _parse_with_builtin_parser(self, request: Request, content_type: str) -> Any:
         """Parse body using built-in parsers.
 
         Args:
-            body: BinaryIO stream or bytes-like object containing the request body
+            request: The request whose body to parse
             content_type: The expected content type
 
         Returns:
@@ -1254,15 +1943,13 @@ class RestApplication:
         """
         try:
             # Handle None/empty body
-            if body is None:
+            if request.body is None:
                 return None
 
-            # Parse stream or legacy body
-            if hasattr(body, 'read'):
-                return self._parse_stream_body(body, content_type)
-            else:
-                return self._parse_legacy_body(body, content_type)
+            return self._parse_cached_body(request, content_type)
 
+        except RequestEntityTooLarge:
+            raise
         except json.JSONDecodeError as e:
             raise AcceptsParsingError(
                 f"Failed to parse {content_type} request body: Invalid JSON - {str(e)}",
@@ -1294,6 +1981,15 @@ class RestApplication:
         """
         return self._root_router.match_route(path, method)
 
+    def _match_request(self, request: Request) -> Optional[Tuple[RouteHandler, Dict[str, str]]]:
+        """Find the route for a request, reusing the match if an adapter already looked it up."""
+        cached = request._route_match
+        if cached is not None and cached[0] is request.method and cached[1] == request.path:
+            return cast(Optional[Tuple[RouteHandler, Dict[str, str]]], cached[2])
+        match = self._find_route(request.method, request.path)
+        request._route_match = (request.method, request.path, match)
+        return match
+
     def _path_has_routes(self, path: str) -> bool:
         """Check if any route exists for the given path (regardless of method).
 
@@ -1464,8 +2160,13 @@ class RestApplication:
         inject session-scoped dependencies (like database connections from
         startup handlers) for proper cleanup.
 
+        Pending background tasks are given up to their drain_timeout to finish first.
+
         Logs exceptions from shutdown handlers but does not raise them.
         """
+        import anyio.to_thread
+        await anyio.to_thread.run_sync(self._background.shutdown)
+
         for handler in self._shutdown_handlers:
             try:
                 # Resolve dependencies for the shutdown handler
@@ -1490,6 +2191,10 @@ class RestApplication:
             except Exception as e:
                 logger.error(f"Error in shutdown handler: {e}", exc_info=True)
 
+        # Flush any access log records still waiting to be written
+        if self._access_logger is not None:
+            self._access_logger.stop()
+
     def startup_sync(self):
         """Synchronous wrapper for startup().
 
@@ -1514,11 +2219,58 @@ class RestApplication:
 
     def execute(self, request: Request) -> Response:
         """Execute a request through the state machine."""
+        if self._tracer is None and self._access_logger is None and self._profiler is None:
+            return self._execute(request)
+
+        start = time.perf_counter()
+        trigger = self._profiler.get_trigger(request) if self._profiler is not None else None
+        if trigger is not None:
+            response = self._execute_profiled(request, trigger)
+        else:
+            response = self._execute_traced(request)
+
+        if self._access_logger is not None:
+            self._log_access(request, response, time.perf_counter() - start)
+        return response
+
+    def _execute_traced(self, request: Request) -> Response:
+        """Run the request inside a request span if tracing is enabled."""
+        # Adapters open the request span themselves so it covers parsing and sending;
+        # only start one here when the request was handed to us directly.
+        if self._tracer is not None and self._tracer.current_span() is None:
+            with self._tracer.request_span(request):
+                return self._execute(request)
+        return self._execute(request)
+
+    def _execute_profiled(self, request: Request, trigger: str) -> Response:
+        """Run the request under cProfile and store the profile."""
+        profiler = cast(RequestProfiler, self._profiler)
+        response, stats, duration = profiler.run(lambda: self._execute_traced(request))
+        if stats is None:
+            return response
+
+        route = self._dependency_cache.get("__current_route__")
+        record = profiler.add(
+            stats,
+            timestamp=time.time() - duration,
+            method=request.method.value,
+            path=request.path,
+            route=route.path if route is not None else None,
+            status=response.status_code,
+            duration_ms=round(duration * 1000, 3),
+            trigger=trigger,
+        )
+        if trigger == "header" and response.headers is not None:
+            response.headers[PROFILE_ID_HEADER] = str(record.profile_id)
+        return response
+
+    def _execute(self, request: Request) -> Response:
+        """Run the state machine, converting unhandled errors into a 500 response."""
         try:
-            # Create a new state machine for each request to avoid state pollution
-            from restmachine.state_machine import RequestStateMachine
-            state_machine = RequestStateMachine(self)
-            return state_machine.process_request(request)
+            response = self._state_machine.process_request(request)
+            if self._tracer is not None:
+                self._annotate_request_span(request, response)
+            return response
         except Exception as e:
             logger.error(f"Unhandled exception processing {request.method.value} {request.path}: {e}")
             return Response(
@@ -1527,6 +2279,55 @@ class RestApplication:
                 content_type="application/json"
             )
 
+    def _log_access(self, request: Request, response: Response, duration: float) -> None:
+        """Write a sampled access log record for a completed request."""
+        access_logger = self._access_logger
+        if access_logger is None or not access_logger.should_log(response.status_code):
+            return
+
+        route = self._dependency_cache.get("__current_route__")
+        fields: Dict[str, Any] = {
+            "method": request.method.value,
+            "path": request.path,
+            "route": route.path if route is not None else None,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "request_bytes": _content_length(request.headers.get("content-length")),
+            "response_bytes": _content_length(response.headers.get("Content-Length") if response.headers else None),
+        }
+        if access_logger.config.include_ids:
+            try:
+                # Read the IDs captured for this request rather than calling the providers again
+                fields["request_id"] = self._get_request_id(request)
+                fields["trace_id"] = self._get_trace_id(request)
+            except Exception as e:
+                logger.warning("Failed to resolve request_id/trace_id for access log: %s", e)
+
+        try:
+            access_logger.log(fields)
+        except Exception as e:
+            logger.warning("Failed to write access log record: %s", e)
+
+    def _annotate_request_span(self, request: Request, response: Response) -> None:
+        """Record route, status and request/trace IDs on the active request span."""
+        from .tracing import StatusCode
+
+        span = self._tracer.current_span() if self._tracer is not None else None
+        if span is None:
+            return
+
+        span.set_attribute("http.response.status_code", response.status_code)
+        route = self._dependency_cache.get("__current_route__")
+        if route is not None:
+            span.set_attribute("http.route", route.path)
+        try:
+            span.set_attribute("restmachine.request_id", self._get_request_id(request))
+            span.set_attribute("restmachine.trace_id", self._get_trace_id(request))
+        except Exception as e:
+            logger.warning(f"Failed to resolve request_id/trace_id for tracing: {e}")
+        if response.status_code >= 500:
+            span.set_status(StatusCode.ERROR)
+
     def _is_pydantic_model(self, annotation) -> bool:
         """Check if the annotation is a Pydantic model."""
         if not PYDANTIC_AVAILABLE or annotation is None:
@@ -0,0 +1,113 @@
+"""Automatic ETags computed from the response body.
+
+Routes without a ``generate_etag`` callback normally send no ETag, so clients
+download the full body every time. With automatic ETags enabled, the body of
+each successful GET response is hashed once after rendering and the hash is
+sent as the ETag. When the request's ``If-None-Match`` matches, the body is
+dropped and 304 Not Modified is sent instead, saving the bandwidth even for
+handlers that can't compute validators cheaply.
+
+The hash is xxHash (XXH3, 64-bit) when the ``xxhash`` package is installed
+(``pip install restmachine[xxhash]``), otherwise BLAKE2b with an 8-byte
+digest. Neither is cryptographic; they only need to detect changes. Run the
+same choice on every instance behind a load balancer, or the ETags won't
+match between them.
+
+File and seekable stream bodies are hashed chunk by chunk, without reading
+them into memory at once. Iterator bodies can only be consumed once and are
+sent without an ETag.
+
+Example:
+    app = RestApplication()
+    app.enable_auto_etag()
+
+    @app.get("/report")
+    def report(database):
+        return build_report(database)
+
+    @app.get("/events")
+    @app.auto_etag(False)
+    def events(database):
+        return recent_events(database)
+"""
+
+import hashlib
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    import xxhash as _xxhash  # type: ignore[import-not-found]
+except ImportError:
+    _xxhash = None
+
+XXHASH_AVAILABLE = _xxhash is not None
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def _blake2b() -> Any:
+    return hashlib.blake2b(digest_size=8)
+
+
+_new_hasher: Callable[[], Any] = _xxhash.xxh3_64 if _xxhash is not None else _blake2b
+
+
+@dataclass
+class AutoETagConfig:
+    """Configuration for automatic ETags.
+
+    Attributes:
+        weak: Send weak (W/"...") ETags. Strong ETags are correct for a hash of
+            the exact bytes; weak ones let caches treat differently encoded
+            versions of the same content as equivalent.
+    """
+
+    weak: bool = False
+
+    def etag_for(self, body: Any) -> Optional[str]:
+        """ETag for a response body, or None if it can't be hashed."""
+        digest = content_hash(body)
+        if digest is None:
+            return None
+        return f'W/"{digest}"' if self.weak else f'"{digest}"'
+
+
+def content_hash(body: Any) -> Optional[str]:
+    """Hex digest of a response body.
+
+    Returns:
+        The digest, or None for bodies that can't be hashed without consuming
+        them (iterators and unseekable streams) and unsupported body types
+    """
+    if isinstance(body, bytes):
+        hasher = _new_hasher()
+        hasher.update(body)
+    elif isinstance(body, str):
+        hasher = _new_hasher()
+        hasher.update(body.encode("utf-8"))
+    elif isinstance(body, Path):
+        hasher = _new_hasher()
+        with body.open("rb") as file:
+            _hash_stream(hasher, file)
+    elif isinstance(body, io.IOBase):
+        if not body.seekable():
+            return None
+        hasher = _new_hasher()
+        position = body.tell()
+        try:
+            _hash_stream(hasher, body)
+        finally:
+            body.seek(position)
+    else:
+        return None
+    return str(hasher.hexdigest())
+
+
+def _hash_stream(hasher: Any, stream: Any) -> None:
+    while True:
+        chunk = stream.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            return
+        hasher.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
@@ -0,0 +1,229 @@
+"""Background tasks run after the response has been sent.
+
+Follow-up work such as audit logging, cache warming or webhook delivery
+shouldn't delay the response. Handlers inject the built-in ``background``
+dependency and queue functions or coroutines on it:
+
+    @app.post("/orders")
+    def create_order(json_body, background):
+        order = save_order(json_body)
+        background.add(notify_webhooks, "order.created", order.id)
+        background.add(audit_log.write("order.created", order.id))
+        return order
+
+The tasks of a request run once its response is complete: the ASGI adapter
+runs them after the last body chunk is sent, and the AWS Lambda adapter after
+the response has been built, before the invocation returns (Lambda freezes
+the environment as soon as it does). Tasks only run for successful (below
+400) responses; those queued by a request that fails, or whose client
+disconnects, are dropped.
+
+Functions run in a bounded pool of worker threads, so at most
+``max_concurrency`` run at once across all requests; coroutines run on the
+event loop under the ASGI adapter and in a worker thread otherwise.
+Exceptions are logged and counted in ``BackgroundRunner.failed``, and never
+affect the response. On shutdown, the application waits up to
+``drain_timeout`` seconds for pending tasks before running shutdown handlers.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_DRAIN_TIMEOUT = 30.0
+
+# A queued task: the function or coroutine, and the arguments to call it with
+_Task = Tuple[Any, Tuple[Any, ...], Dict[str, Any]]
+
+
+class BackgroundTasks:
+    """Tasks queued by one request, run after its response is sent."""
+
+    __slots__ = ("_tasks",)
+
+    def __init__(self):
+        self._tasks: List[_Task] = []
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def add(self, func: Any, *args: Any, **kwargs: Any) -> None:
+        """Queue a task.
+
+        Args:
+            func: A function (sync or async) to call with args and kwargs, or a
+                  coroutine object to await
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        """
+        if inspect.iscoroutine(func):
+            if args or kwargs:
+                raise TypeError("Arguments can't be passed with a coroutine object")
+        elif not callable(func):
+            raise TypeError(f"Background task must be callable or a coroutine, not {type(func).__name__}")
+        self._tasks.append((func, args, kwargs))
+
+    def take(self) -> List[_Task]:
+        """Remove and return the queued tasks."""
+        tasks, self._tasks = self._tasks, []
+        return tasks
+
+    def discard(self) -> None:
+        """Drop the queued tasks without running them."""
+        for func, _, _ in self.take():
+            if inspect.iscoroutine(func):
+                # Avoid "coroutine was never awaited" warnings
+                func.close()
+
+
+class BackgroundRunner:
+    """Runs background tasks with bounded concurrency and records their outcome.
+
+    Attributes:
+        max_concurrency: Maximum number of worker threads running tasks.
+        drain_timeout: Seconds shutdown waits for pending tasks.
+        completed: Number of tasks that finished successfully.
+        failed: Number of tasks that raised an exception.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, drain_timeout: float = DEFAULT_DRAIN_TIMEOUT):
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer")
+        if drain_timeout < 0:
+            raise ValueError("drain_timeout must not be negative")
+        self.max_concurrency = max_concurrency
+        self.drain_timeout = drain_timeout
+        self.completed = 0
+        self.failed = 0
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks queued or running."""
+        return self._pending
+
+    def submit(self, tasks: BackgroundTasks) -> List["Future[None]"]:
+        """Start tasks on the worker threads without waiting for them."""
+        queued = tasks.take()
+        if not queued:
+            return []
+        self._add_pending(len(queued))
+        executor = self._get_executor()
+        return [executor.submit(self._run_task, task) for task in queued]
+
+    def run(self, tasks: BackgroundTasks) -> None:
+        """Run tasks on the worker threads and wait until all have finished."""
+        for future in self.submit(tasks):
+            future.result()
+
+    async def run_async(self, tasks: BackgroundTasks) -> None:
+        """Run tasks from the event loop and wait until all have finished.
+
+        Coroutines run on the running loop; functions on the worker threads.
+        """
+        queued = tasks.take()
+        if not queued:
+            return
+        self._add_pending(len(queued))
+        loop = asyncio.get_running_loop()
+        waits: List[Awaitable[None]] = []
+        for task in queued:
+            func, args, kwargs = task
+            if inspect.iscoroutine(func) or inspect.iscoroutinefunction(func):
+                waits.append(self._run_coroutine_task(task))
+            else:
+                waits.append(asyncio.wrap_future(self._get_executor().submit(self._run_task, task), loop=loop))
+        await asyncio.gather(*waits)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for pending tasks to finish.
+
+        Args:
+            timeout: Seconds to wait at most (default: drain_timeout)
+
+        Returns:
+            True if no tasks are pending, False if the timeout expired first
+        """
+        deadline = time.monotonic() + (self.drain_timeout if timeout is None else timeout)
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"{self._pending} background task(s) still pending after drain timeout")
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """Drain pending tasks and stop the worker threads.
+
+        Returns:
+            True if all tasks finished before the timeout
+        """
+        drained = self.drain(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return drained
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._idle:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="restmachine-background"
+                )
+            return self._executor
+
+    def _add_pending(self, count: int) -> None:
+        with self._idle:
+            self._pending += count
+
+    def _task_done(self, ok: bool) -> None:
+        with self._idle:
+            self._pending -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            if not self._pending:
+                self._idle.notify_all()
+
+    def _run_task(self, task: _Task) -> None:
+        """Run a task in a worker thread, logging and counting failures."""
+        func, args, kwargs = task
+        ok = False
+        try:
+            result = func if inspect.iscoroutine(func) else func(*args, **kwargs)
+            if inspect.iscoroutine(result):
+                asyncio.run(result)
+            ok = True
+        except Exception:
+            logger.exception(f"Background task {_task_name(func)} failed")
+        finally:
+            self._task_done(ok)
+
+    async def _run_coroutine_task(self, task: _Task) -> None:
+        """Await a coroutine task on the event loop, logging and counting failures."""
+        func, args, kwargs = task
+        ok = False
+        try:
+            await (func if inspect.iscoroutine(func) else func(*args, **kwargs))
+            ok = True
+        except Exception:
+            logger.exception(f"Background task {_task_name(func)} failed")
+        finally:
+            # Also reached when the task is cancelled, so drain() doesn't wait for it
+            self._task_done(ok)
+
+
+def _task_name(func: Any) -> str:
+    return str(getattr(func, "__qualname__", None) or repr(func))
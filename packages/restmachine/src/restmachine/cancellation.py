@@ -0,0 +1,57 @@
+"""Cooperative cancellation for requests whose client has disconnected.
+
+Handlers run synchronously in a worker thread and can't be interrupted, so the
+ASGI adapter signals a disconnect through a ``CancellationToken`` instead. Long
+running handlers inject it as the built-in ``cancellation`` dependency and
+check it between units of work:
+
+    @app.get("/report")
+    def report(cancellation):
+        rows = []
+        for chunk in expensive_query():
+            cancellation.raise_if_cancelled()
+            rows.extend(chunk)
+        return rows
+
+The adapter discards the response of a cancelled request, so it doesn't
+matter what the handler returns or raises once the client has gone.
+"""
+
+import threading
+from typing import Optional
+
+
+class ClientDisconnected(Exception):
+    """The client disconnected before the response was complete."""
+
+
+class CancellationToken:
+    """Thread-safe flag set when the client of a request disconnects."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the request has been cancelled."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Mark the request as cancelled."""
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise ClientDisconnected if the request has been cancelled."""
+        if self._event.is_set():
+            raise ClientDisconnected("Client disconnected")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or the timeout expires.
+
+        Useful in place of time.sleep() in polling loops, so the wait ends as
+        soon as the client goes away.
+
+        Returns:
+            True if the request was cancelled
+        """
+        return self._event.wait(timeout)
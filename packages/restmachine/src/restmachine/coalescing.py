@@ -0,0 +1,217 @@
+"""Request coalescing (single-flight) for identical concurrent GET requests.
+
+When a popular resource becomes uncacheable upstream (a CDN entry expires,
+a deploy purges a cache), many identical requests arrive at once and each
+one runs the full state machine, handler and renderer. With coalescing
+enabled on a route, the first request runs as usual while identical
+requests that arrive before it finishes wait for it and are answered with a
+copy of its response.
+
+Requests are identical when they have the same method, path, query
+parameters and values for the headers a response may vary on (Accept,
+Accept-Encoding, Accept-Language, Authorization, Cookie, Origin, Range and
+the conditional request headers, plus any named in ``vary``), and come from
+the same client address with the same TLS state and client certificate.
+Waiting requests don't run the state machine, so they skip the
+service_available, authorized and forbidden callbacks; the key is what
+keeps one client's response from another. Only GET requests
+without a body are coalesced. Responses with streamed bodies,
+Set-Cookie headers or a CSP nonce are never shared; requests waiting on one
+run on their own instead.
+
+Example:
+    app = RestApplication()
+
+    @app.get("/catalog")
+    @app.coalesce(headers=lambda request: {"X-Request-ID": new_request_id()})
+    def catalog(products):
+        return render_catalog(products)
+
+Waiting requests block their worker thread. The ASGI adapter instead waits
+for the response on the event loop, so duplicates don't take a worker.
+"""
+
+import asyncio
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .models import HTTPMethod, Request, Response
+
+# Request headers that select between representations of a resource
+DEFAULT_VARY = (
+    "Accept",
+    "Accept-Encoding",
+    "Accept-Language",
+    "Authorization",
+    "Cookie",
+    "Origin",
+    "Range",
+    "If-Match",
+    "If-None-Match",
+    "If-Modified-Since",
+    "If-Unmodified-Since",
+)
+
+class _Call:
+    """A request in flight and the requests waiting for its response."""
+
+    __slots__ = ("done", "response", "waiters", "futures")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[Response] = None
+        self.waiters = 0
+        self.futures: List["asyncio.Future[Optional[Response]]"] = []
+
+
+class SingleFlight:
+    """Runs one request at a time per key and shares its response with duplicates.
+
+    Attributes:
+        vary: Request headers that are part of the key.
+        headers: Optional function from the Request to headers set on every response,
+            including shared copies (e.g. a request ID).
+        shared_count: Number of requests answered with another request's response.
+    """
+
+    def __init__(
+        self,
+        vary: Sequence[str] = (),
+        headers: Optional[Callable[[Request], Dict[str, str]]] = None,
+    ):
+        if isinstance(vary, str):
+            vary = (vary,)
+        self.vary: Tuple[str, ...] = DEFAULT_VARY + tuple(name for name in vary if name not in DEFAULT_VARY)
+        self.headers = headers
+        self.shared_count = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def key_for(self, request: Request) -> Optional[Hashable]:
+        """Key identifying duplicates of request, or None if it can't be coalesced."""
+        if request.method is not HTTPMethod.GET or request.body:
+            return None
+        query_params = request.query_params
+        get = request.headers.get
+        client_cert = request.client_cert
+        return (
+            request.method,
+            request.path,
+            tuple(query_params.multi_items()) if query_params else (),
+            tuple(get(name) for name in self.vary),
+            # Followers skip the authorization callbacks, so the client's identity must match too
+            request.tls,
+            request.client_ip,
+            json.dumps(client_cert, sort_keys=True, default=str) if client_cert else None,
+        )
+
+    def run(self, request: Request, execute: Callable[[], Response]) -> Response:
+        """Run execute for request, or wait for an identical request already running.
+
+        Args:
+            request: The request being handled
+            execute: Produces the response when this request runs itself
+
+        Returns:
+            This request's response, or a copy of the response to an identical one
+        """
+        key = self.key_for(request)
+        if key is None:
+            return self._personalize(execute(), request)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.response is not None:
+                return self.share(call.response, request)
+            return self._personalize(execute(), request)
+
+        response = None
+        try:
+            response = execute()
+        finally:
+            self._finish(key, call, request, response)
+        return self._personalize(response, request)
+
+    async def follow(self, request: Request) -> Optional[Response]:
+        """Wait on the event loop for an identical request that is already running.
+
+        Returns:
+            A copy of its response, or None if nothing identical is in flight or
+            its response can't be shared (the request should then run itself)
+        """
+        key = self.key_for(request)
+        if key is None:
+            return None
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                return None
+            future: "asyncio.Future[Optional[Response]]" = asyncio.get_running_loop().create_future()
+            call.futures.append(future)
+
+        response = await future
+        return self.share(response, request) if response is not None else None
+
+    def share(self, response: Response, request: Request) -> Response:
+        """Copy a shared response for request."""
+        with self._lock:
+            self.shared_count += 1
+        return self._personalize(_copy_response(response), request)
+
+    def _finish(self, key: Hashable, call: _Call, request: Request, response: Optional[Response]) -> None:
+        """Hand the leader's response to every waiting request."""
+        with self._lock:
+            del self._calls[key]
+            waiting = call.waiters or call.futures
+
+        if waiting and response is not None and _is_shareable(request, response):
+            # The leader's response is still modified after this; share a snapshot
+            call.response = _copy_response(response)
+        call.done.set()
+        for future in call.futures:
+            future.get_loop().call_soon_threadsafe(_resolve, future, call.response)
+
+    def _personalize(self, response: Response, request: Request) -> Response:
+        """Set the per-request headers on response."""
+        if self.headers is not None:
+            headers = self.headers(request)
+            if headers:
+                if response.headers is None:
+                    response.headers = {}
+                response.headers.update(headers)
+        return response
+
+
+def _copy_response(response: Response) -> Response:
+    """Shallow copy of response with its own headers object."""
+    shared = copy.copy(response)
+    if response.headers is not None:
+        shared.headers = response.headers.copy()
+    return shared
+
+
+def _is_shareable(request: Request, response: Response) -> bool:
+    """Check whether response can be sent to other clients as well."""
+    body = response.body
+    if body is not None and not isinstance(body, (bytes, str, Path)):
+        return False
+    if request.csp_nonce is not None:
+        return False
+    return response.headers is None or "Set-Cookie" not in response.headers
+
+
+def _resolve(future: "asyncio.Future[Any]", response: Optional[Response]) -> None:
+    if not future.done():
+        future.set_result(response)
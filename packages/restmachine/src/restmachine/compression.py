@@ -0,0 +1,456 @@
+"""HTTP compression for RestMachine.
+
+When enabled, response bodies are compressed with the best encoding the
+client accepts (``Accept-Encoding``): gzip, deflate, and zstd when Python's
+``compression.zstd`` module (3.14+) or the ``zstandard`` package is available.
+Streaming bodies are compressed chunk by chunk, flushing after each chunk so
+clients still receive data as it is produced. Request bodies sent with
+``Content-Encoding: gzip`` or ``deflate`` are decompressed as the handler reads
+them, with a limit on the decompressed size to guard against decompression
+bombs.
+
+Example:
+    app = RestApplication()
+    app.enable_compression(minimum_size=1024)
+
+Only responses whose Content-Type is on the allowlist and whose size is at
+least ``minimum_size`` (when known in advance) are compressed. Responses that
+already have a Content-Encoding, file (Path) responses and partial content are
+sent unchanged.
+"""
+
+import io
+import zlib
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Iterator, List, Optional, Sequence, Tuple, Union, cast
+
+from .exceptions import RequestEntityTooLarge
+from .models import MultiValueHeaders, Response
+from .streaming import encode_chunk, is_iterator_body
+
+try:
+    from compression import zstd as _zstd  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - Python < 3.14
+    _zstd = None
+
+try:
+    import zstandard as _zstandard  # type: ignore[import-not-found]
+except ImportError:
+    _zstandard = None
+
+ZSTD_AVAILABLE = _zstd is not None or _zstandard is not None
+
+DEFAULT_MINIMUM_SIZE = 500
+DEFAULT_MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Entries ending in "/" match a top-level type, entries starting with "+" a
+# structured syntax suffix (application/problem+json), others an exact type.
+DEFAULT_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "+json",
+    "+xml",
+)
+
+# Codings usable for responses, in the server's order of preference
+RESPONSE_ENCODINGS = ("zstd", "gzip", "deflate")
+
+# Codings accepted in request Content-Encoding
+REQUEST_ENCODINGS = ("gzip", "x-gzip", "deflate")
+
+_ZLIB_WBITS = {"gzip": 31, "x-gzip": 31, "deflate": 15}
+
+
+def default_encodings() -> Tuple[str, ...]:
+    """Response encodings supported in this environment, most preferred first."""
+    return tuple(name for name in RESPONSE_ENCODINGS if name != "zstd" or ZSTD_AVAILABLE)
+
+
+@dataclass
+class CompressionConfig:
+    """Settings for response compression and request decompression.
+
+    Attributes:
+        minimum_size: Responses smaller than this many bytes are sent uncompressed.
+            Streaming bodies, whose size is unknown, are always compressed.
+        content_types: Content types eligible for compression (see DEFAULT_CONTENT_TYPES).
+        encodings: Response encodings to offer, most preferred first. Ties in the
+            client's q-values are broken by this order.
+        level: Compression level, or None for each encoding's default.
+        decompress_requests: Whether to decompress request bodies with a Content-Encoding.
+            When False, request bodies are passed to handlers as sent.
+        max_decompressed_size: Largest decompressed request body in bytes; larger
+            bodies are rejected with 413.
+        chunk_size: Read size when compressing file-like bodies and decompressing requests.
+    """
+
+    minimum_size: int = DEFAULT_MINIMUM_SIZE
+    content_types: Tuple[str, ...] = DEFAULT_CONTENT_TYPES
+    encodings: Tuple[str, ...] = field(default_factory=default_encodings)
+    level: Optional[int] = None
+    decompress_requests: bool = True
+    max_decompressed_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    def validate(self) -> None:
+        """Validate the configuration.
+
+        Raises:
+            ValueError: If a setting is out of range or an encoding is unsupported.
+        """
+        if not isinstance(self.minimum_size, int) or self.minimum_size < 0:
+            raise ValueError("minimum_size must be a non-negative integer")
+        if not self.encodings:
+            raise ValueError("At least one encoding is required")
+        for name in self.encodings:
+            if name not in RESPONSE_ENCODINGS:
+                raise ValueError(f"Unsupported encoding: {name!r} (expected one of {', '.join(RESPONSE_ENCODINGS)})")
+            if name == "zstd" and not ZSTD_AVAILABLE:
+                raise ValueError("zstd compression requires Python 3.14+ or the zstandard package")
+        if self.level is not None and (not isinstance(self.level, int) or self.level < 0):
+            raise ValueError("level must be a non-negative integer")
+        if not isinstance(self.max_decompressed_size, int) or self.max_decompressed_size <= 0:
+            raise ValueError("max_decompressed_size must be a positive integer")
+        if not isinstance(self.chunk_size, int) or self.chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+    def is_compressible(self, content_type: Optional[str]) -> bool:
+        """Check whether a response Content-Type is on the allowlist."""
+        if not content_type:
+            return False
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        for allowed in self.content_types:
+            if allowed.endswith("/"):
+                if media_type.startswith(allowed):
+                    return True
+            elif allowed.startswith("+"):
+                if media_type.endswith(allowed):
+                    return True
+            elif media_type == allowed:
+                return True
+        return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> Optional[str]:
+    """Choose a response encoding from an Accept-Encoding header.
+
+    The encoding with the highest q-value wins; ties go to the earlier entry in
+    ``available``. A ``*`` entry applies to encodings not listed explicitly.
+
+    Args:
+        accept_encoding: Accept-Encoding header value, or None if absent
+        available: Encodings the server can produce, most preferred first
+
+    Returns:
+        The chosen encoding, or None to send the body unencoded
+    """
+    if not accept_encoding:
+        return None
+
+    qvalues = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        qvalues[name] = q
+
+    best = None
+    best_q = 0.0
+    for name in available:
+        q = qvalues.get(name, qvalues.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class _ZlibEncoder:
+    """gzip or deflate (zlib format) stream encoder."""
+
+    def __init__(self, encoding: str, level: Optional[int]):
+        self._compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, _ZLIB_WBITS[encoding]
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far without ending the stream."""
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _ZstdEncoder:
+    """zstd stream encoder, using compression.zstd or the zstandard package."""
+
+    def __init__(self, level: Optional[int]):
+        self._compressor: Any
+        if _zstd is not None:
+            self._compressor = _zstd.ZstdCompressor(level=level)
+            self._flush_block = _zstd.ZstdCompressor.FLUSH_BLOCK
+        else:
+            self._compressor = _zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+            self._flush_block = _zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, self._compressor.compress(data))
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far without ending the frame."""
+        return cast(bytes, self._compressor.flush(self._flush_block))
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._compressor.flush())
+
+
+def _create_encoder(encoding: str, level: Optional[int]) -> Union[_ZlibEncoder, _ZstdEncoder]:
+    if encoding == "zstd":
+        return _ZstdEncoder(level)
+    return _ZlibEncoder(encoding, level)
+
+
+def compress_bytes(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a complete body with the given encoding."""
+    encoder = _create_encoder(encoding, level)
+    return encoder.compress(data) + encoder.finish()
+
+
+def _compress_iterator(body: Iterator, encoder: Union[_ZlibEncoder, _ZstdEncoder]) -> Iterator[bytes]:
+    try:
+        for chunk in body:
+            data = encoder.compress(encode_chunk(chunk)) + encoder.flush()
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+
+
+async def _compress_async_iterator(
+    body: AsyncIterator, encoder: Union[_ZlibEncoder, _ZstdEncoder]
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            data = encoder.compress(encode_chunk(chunk)) + encoder.flush()
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        aclose = getattr(body, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def _read_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        stream.close()
+
+
+def _known_size(body: Any) -> Optional[int]:
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    return None
+
+
+def add_vary(headers: Any, value: str) -> None:
+    """Add a field name to the Vary header unless it is already listed."""
+    vary = headers.get("Vary", "")
+    names = [name.strip().lower() for name in vary.split(",")]
+    if "*" in names or value.lower() in names:
+        return
+    headers["Vary"] = f"{vary}, {value}" if vary else value
+
+
+def compress_response(response: Response, accept_encoding: Optional[str], config: CompressionConfig) -> Response:
+    """Compress a finalized response for the client's Accept-Encoding.
+
+    Eligible responses get ``Vary: Accept-Encoding`` whether or not they are
+    compressed, so caches keep encoded and unencoded copies apart. A strong
+    ETag is weakened, since the compressed bytes differ from the identity
+    representation it was computed for.
+
+    Args:
+        response: Response whose headers and body are final
+        accept_encoding: The request's Accept-Encoding header
+        config: Compression settings
+
+    Returns:
+        The same response, compressed in place when an encoding was chosen
+    """
+    status = response.status_code
+    if status < 200 or status in (HTTPStatus.NO_CONTENT, HTTPStatus.PARTIAL_CONTENT, HTTPStatus.NOT_MODIFIED):
+        return response
+    if response.range_start is not None or status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+        return response
+
+    body: Any = response.body
+    # Finalized responses always have MultiValueHeaders
+    headers = cast(MultiValueHeaders, response.headers)
+    if body is None or isinstance(body, (Path, dict, list)) or "Content-Encoding" in headers:
+        return response
+    if not config.is_compressible(headers.get("Content-Type") or response.content_type):
+        return response
+    size = _known_size(body)
+    if size is not None and size < config.minimum_size:
+        return response
+
+    add_vary(headers, "Accept-Encoding")
+    encoding = negotiate_encoding(accept_encoding, config.encodings)
+    if encoding is None:
+        return response
+
+    encoder = _create_encoder(encoding, config.level)
+    if size is not None:
+        data = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+        response.body = encoder.compress(data) + encoder.finish()
+        headers["Content-Length"] = str(len(response.body))
+    elif isinstance(body, io.IOBase):
+        response.body = _compress_iterator(_read_chunks(cast(BinaryIO, body), config.chunk_size), encoder)
+    elif is_iterator_body(body):
+        if isinstance(body, AsyncIterator):
+            response.body = _compress_async_iterator(body, encoder)
+        else:
+            response.body = _compress_iterator(body, encoder)
+    else:
+        return response
+
+    if size is None and "Content-Length" in headers:
+        del headers["Content-Length"]
+    headers["Content-Encoding"] = encoding
+    # Byte ranges would refer to the compressed bytes, which are not stable
+    headers["Accept-Ranges"] = "none"
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+    return response
+
+
+def parse_content_encoding(header: str) -> List[str]:
+    """Split a Content-Encoding header into codings, in the order they were applied."""
+    codings = [coding.strip().lower() for coding in header.split(",")]
+    return [coding for coding in codings if coding and coding != "identity"]
+
+
+def is_supported_content_encoding(header: str) -> bool:
+    """Check whether every coding in a request Content-Encoding can be decoded."""
+    return all(coding in REQUEST_ENCODINGS for coding in parse_content_encoding(header))
+
+
+class DecompressingStream(io.RawIOBase):
+    """Readable stream that decompresses a gzip or deflate body as it is read.
+
+    Reads pull compressed data from ``source`` only as needed, and at most
+    ``max_size`` decompressed bytes are produced before RequestEntityTooLarge is
+    raised, so small bodies that expand enormously are rejected without being
+    decompressed in full. If ``source`` is seekable, ``seek(0)`` restarts
+    decompression from the beginning.
+    """
+
+    def __init__(self, source: BinaryIO, encoding: str, max_size: int, read_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__()
+        self._source = source
+        self._encoding = encoding
+        self._max_size = max_size
+        self._read_size = read_size
+        self._start = source.tell() if source.seekable() else 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._decompressor = zlib.decompressobj(_ZLIB_WBITS[self._encoding])
+        self._pending = b""
+        self._source_done = False
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._source.seekable()
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._position
+        if whence != io.SEEK_SET or offset != 0 or not self.seekable():
+            raise io.UnsupportedOperation("Decompressed request bodies can only be rewound to the start")
+        self._source.seek(self._start)
+        self._reset()
+        return 0
+
+    def read1(self, size: int = -1) -> bytes:
+        """Read up to size bytes with at most one read from the source (like BufferedReader.read1)."""
+        return self.read(size if size is not None and size >= 0 else self._read_size)
+
+    def readinto(self, buffer: Any) -> int:
+        size = len(buffer)
+        while size:
+            if self._decompressor.eof:
+                return 0
+            if not self._pending and not self._source_done:
+                read = getattr(self._source, "read1", self._source.read)
+                self._pending = read(self._read_size)
+                if not self._pending:
+                    self._source_done = True
+            # Never produce more than one byte past the limit
+            limit = min(size, self._max_size - self._position + 1)
+            data = self._decompressor.decompress(self._pending, limit)
+            self._pending = self._decompressor.unconsumed_tail
+            if data:
+                self._position += len(data)
+                if self._position > self._max_size:
+                    raise RequestEntityTooLarge(
+                        self._max_size, f"Decompressed request body exceeds {self._max_size} bytes"
+                    )
+                buffer[:len(data)] = data
+                return len(data)
+            if self._source_done and not self._pending:
+                if not self._decompressor.eof:
+                    raise ValueError(f"Truncated {self._encoding} request body")
+                return 0
+        return 0
+
+
+def decompress_request_body(body: BinaryIO, content_encoding: str, config: CompressionConfig) -> BinaryIO:
+    """Wrap a request body so reads return the decompressed content.
+
+    Args:
+        body: The request body stream
+        content_encoding: The request's Content-Encoding header (all codings supported)
+        config: Compression settings (for the decompressed size limit)
+
+    Returns:
+        A stream of the decompressed body
+    """
+    for coding in reversed(parse_content_encoding(content_encoding)):
+        body = DecompressingStream(body, coding, config.max_decompressed_size, config.chunk_size)  # type: ignore[assignment]
+    return body
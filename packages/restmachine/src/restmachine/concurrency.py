@@ -0,0 +1,237 @@
+"""Adaptive concurrency limiting and load shedding for RestMachine.
+
+A concurrency limiter tracks the number of requests in flight and adjusts
+the number it allows from the latency of recent requests. When a request
+arrives while the limit is in use, it is rejected straight away with
+503 Service Unavailable and a ``Retry-After`` header, before any handler
+dependencies run. Rejecting excess work quickly keeps latency bounded for
+the requests that are admitted, instead of queueing everything until every
+request is slow.
+
+Two algorithms are available:
+
+- ``"aimd"`` (additive increase, multiplicative decrease): the limit grows by
+  one while requests complete within ``latency_threshold``, and shrinks by
+  ``backoff_ratio`` when one is slower or fails with a 5xx status.
+- ``"gradient"``: the limit follows the ratio of the long-term latency
+  baseline to recent latency, shrinking as soon as latency rises above the
+  baseline, with no threshold to tune.
+
+Routes are admitted by priority: ``"critical"`` routes (health checks, admin
+endpoints) are never shed, ``"normal"`` routes are shed when the limit is
+reached, and ``"low"`` routes are shed first, once ``low_priority_ratio`` of
+the limit is in use.
+
+Example:
+    app = RestApplication()
+    app.enable_concurrency_limit(algorithm="gradient", max_limit=200)
+
+    @app.get("/health")
+    @app.concurrency_limit(priority="critical")
+    def health():
+        return {"status": "ok"}
+
+    # A separate, smaller limit for an expensive endpoint
+    reports = ConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=4, max_limit=8))
+
+    @app.get("/reports")
+    @app.concurrency_limit(limiter=reports)
+    def build_report():
+        ...
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+ALGORITHMS = ("aimd", "gradient")
+PRIORITIES = ("critical", "normal", "low")
+
+
+def validate_priority(priority: str) -> None:
+    """Raise ValueError unless priority is one of PRIORITIES."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Invalid priority: {priority!r} (expected one of {', '.join(PRIORITIES)})")
+
+
+@dataclass
+class ConcurrencyLimitConfig:
+    """Settings for a concurrency limiter.
+
+    Attributes:
+        algorithm: "aimd" or "gradient" (see the module docstring).
+        initial_limit: Requests allowed in flight before any latency is measured.
+        min_limit: The limit never drops below this.
+        max_limit: The limit never grows above this.
+        latency_threshold: AIMD only; requests slower than this many seconds shrink the limit.
+        backoff_ratio: AIMD only; factor applied to the limit when it shrinks.
+        tolerance: Gradient only; how far recent latency may rise above the baseline
+            (as a ratio) before the limit shrinks.
+        smoothing: Gradient only; weight of each new estimate (0 to 1).
+        queue_size: Gradient only; headroom added to the estimate so the limit can grow.
+        low_priority_ratio: Fraction of the limit that "low" priority routes may use.
+        retry_after: Seconds sent in the Retry-After header of shed requests.
+    """
+
+    algorithm: str = "aimd"
+    initial_limit: int = 20
+    min_limit: int = 1
+    max_limit: int = 1000
+    latency_threshold: float = 1.0
+    backoff_ratio: float = 0.9
+    tolerance: float = 1.5
+    smoothing: float = 0.2
+    queue_size: int = 4
+    low_priority_ratio: float = 0.8
+    retry_after: int = 1
+
+    def validate(self) -> None:
+        """Validate the configuration.
+
+        Raises:
+            ValueError: If the algorithm is unknown or a setting is out of range.
+        """
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {self.algorithm!r} (expected one of {', '.join(ALGORITHMS)})")
+        if not isinstance(self.min_limit, int) or self.min_limit < 1:
+            raise ValueError("min_limit must be a positive integer")
+        if not isinstance(self.max_limit, int) or self.max_limit < self.min_limit:
+            raise ValueError("max_limit must be an integer no smaller than min_limit")
+        if not isinstance(self.initial_limit, int) or not self.min_limit <= self.initial_limit <= self.max_limit:
+            raise ValueError("initial_limit must be an integer between min_limit and max_limit")
+        if self.latency_threshold <= 0:
+            raise ValueError("latency_threshold must be positive")
+        if not 0 < self.backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        if self.tolerance < 1:
+            raise ValueError("tolerance must be at least 1")
+        if not 0 < self.smoothing <= 1:
+            raise ValueError("smoothing must be between 0 and 1")
+        if not isinstance(self.queue_size, int) or self.queue_size < 0:
+            raise ValueError("queue_size must be a non-negative integer")
+        if not 0 < self.low_priority_ratio <= 1:
+            raise ValueError("low_priority_ratio must be between 0 and 1")
+        if not isinstance(self.retry_after, int) or self.retry_after < 0:
+            raise ValueError("retry_after must be a non-negative integer")
+
+
+class AIMDLimit:
+    """Additive increase, multiplicative decrease limit algorithm."""
+
+    def __init__(self, config: ConcurrencyLimitConfig):
+        self.config = config
+
+    def update(self, limit: float, latency: float, inflight: int, dropped: bool) -> float:
+        """Return the new limit after a request that took latency seconds completes."""
+        config = self.config
+        if dropped or latency > config.latency_threshold:
+            return max(float(config.min_limit), math.floor(limit * config.backoff_ratio))
+        # Only grow while the limit is actually in use
+        if inflight * 2 >= limit:
+            return min(float(config.max_limit), limit + 1)
+        return limit
+
+
+class GradientLimit:
+    """Latency-gradient limit algorithm.
+
+    Keeps an exponentially weighted long-term latency baseline and scales the
+    limit by baseline / recent latency (capped to [0.5, 1]), then adds
+    queue_size so the limit can grow while latency stays at the baseline.
+    """
+
+    # Number of samples the long-term baseline averages over
+    LONG_WINDOW = 600
+
+    def __init__(self, config: ConcurrencyLimitConfig):
+        self.config = config
+        self.long_latency: Optional[float] = None
+
+    def update(self, limit: float, latency: float, inflight: int, dropped: bool) -> float:
+        """Return the new limit after a request that took latency seconds completes."""
+        config = self.config
+        if latency <= 0:
+            return limit
+
+        if self.long_latency is None:
+            self.long_latency = latency
+        else:
+            self.long_latency += (latency - self.long_latency) / self.LONG_WINDOW
+            # Let the baseline recover quickly after a latency spike ends
+            if self.long_latency / latency > 2:
+                self.long_latency *= 0.95
+
+        # Don't grow the limit while most of it is unused
+        if inflight * 2 < limit:
+            return limit
+
+        gradient = max(0.5, min(1.0, config.tolerance * self.long_latency / latency))
+        estimate = limit * gradient + config.queue_size
+        estimate = limit * (1 - config.smoothing) + estimate * config.smoothing
+        return max(float(config.min_limit), min(float(config.max_limit), estimate))
+
+
+class ConcurrencyLimiter:
+    """Thread-safe adaptive limit on the number of requests in flight.
+
+    Attributes:
+        config: The ConcurrencyLimitConfig in use.
+        shed_count: Number of requests rejected since the limiter was created.
+    """
+
+    def __init__(self, config: Optional[ConcurrencyLimitConfig] = None):
+        self.config = config if config is not None else ConcurrencyLimitConfig()
+        self.config.validate()
+        self._algorithm = AIMDLimit(self.config) if self.config.algorithm == "aimd" else GradientLimit(self.config)
+        self._limit = float(self.config.initial_limit)
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self.shed_count = 0
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        """The number of admitted requests that haven't completed."""
+        return self._inflight
+
+    def try_acquire(self, priority: str = "normal") -> bool:
+        """Admit a request, or return False if it should be shed.
+
+        Critical requests are always admitted, but count towards the requests
+        in flight. Every admitted request must be followed by release().
+        """
+        with self._lock:
+            if priority != "critical":
+                capacity = self._limit if priority == "normal" else self._limit * self.config.low_priority_ratio
+                if self._inflight >= max(1, int(capacity)):
+                    self.shed_count += 1
+                    return False
+            self._inflight += 1
+            return True
+
+    def release(self, latency: float, dropped: bool = False) -> None:
+        """Record the completion of an admitted request.
+
+        Args:
+            latency: Seconds from admission to completion.
+            dropped: Whether the request failed in a way that signals overload
+                (e.g. a 5xx response).
+        """
+        with self._lock:
+            inflight = self._inflight
+            self._inflight = inflight - 1
+            self._limit = self._algorithm.update(self._limit, latency, inflight, dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the limiter for health and metrics endpoints."""
+        return {
+            "algorithm": self.config.algorithm,
+            "limit": self.limit,
+            "inflight": self._inflight,
+            "shed": self.shed_count,
+        }
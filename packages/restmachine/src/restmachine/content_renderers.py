@@ -2,8 +2,10 @@
 Content renderers for different media types.
 """
 
+import csv
+import io
 import json
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional, Sequence
 
 from .models import Request
 from .template_helpers import render
@@ -63,6 +65,10 @@ class JSONRenderer(ContentRenderer):
             return data
 
 
+# Shared by the streaming renderers for values that aren't streamed
+_JSON_RENDERER = JSONRenderer()
+
+
 class HTMLRenderer(ContentRenderer):
     """HTML content renderer with Jinja2 template support."""
 
@@ -152,3 +158,161 @@ class PlainTextRenderer(ContentRenderer):
             return "\n".join(str(item) for item in data)
         else:
             return str(data)
+
+
+class StreamingRenderer(ContentRenderer):
+    """Base class for renderers that encode iterables incrementally.
+
+    When the handler returns an iterable of items (a list, a generator, or an
+    ORM query/result iterator), render() returns a generator of text chunks
+    instead of a string, and the adapters send each chunk as it is produced.
+    Items are encoded one at a time and buffered into chunks of roughly
+    chunk_size characters, so memory use doesn't grow with the number of items.
+
+    Subclasses implement the per-item encoding in _encode_items, and
+    _render_value for data that isn't a collection of items.
+    """
+
+    def __init__(self, media_type: str, chunk_size: int = 64 * 1024):
+        super().__init__(media_type)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+
+    def render(self, data: Any, request: Request) -> Any:
+        """Render data, as a generator of chunks if it is a collection of items."""
+        if not self.is_streamable(data):
+            return self._render_value(data, request)
+        return self._chunked(self._encode_items(data, request))
+
+    @staticmethod
+    def is_streamable(data: Any) -> bool:
+        """Check if data is an iterable of items rather than a single value."""
+        if isinstance(data, (str, bytes, bytearray, dict)) or hasattr(data, "model_dump"):
+            return False
+        return isinstance(data, Iterable)
+
+    def _encode_items(self, items: Iterable[Any], request: Request) -> Iterator[str]:
+        """Yield the encoded text for each item (plus any framing)."""
+        raise NotImplementedError
+
+    def _render_value(self, data: Any, request: Request) -> str:
+        """Render data that isn't a collection of items."""
+        raise NotImplementedError
+
+    def _chunked(self, pieces: Iterator[str]) -> Iterator[str]:
+        """Join encoded pieces into chunks of about chunk_size characters."""
+        buffer = []
+        size = 0
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def _serialize_item(self, item: Any) -> Any:
+        """Convert Pydantic models in an item to dictionaries."""
+        return _JSON_RENDERER._serialize_pydantic(item)
+
+
+class StreamingJSONRenderer(StreamingRenderer):
+    """JSON renderer that encodes collections as a streamed JSON array.
+
+    Register it in place of JSONRenderer to stream every application/json
+    response that returns a collection:
+
+        app.add_content_renderer(StreamingJSONRenderer())
+
+    Arrays are written compactly, one item per line. Other data (dicts,
+    Pydantic models, strings) is rendered exactly as JSONRenderer does.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024):
+        super().__init__("application/json", chunk_size)
+
+    def _render_value(self, data: Any, request: Request) -> str:
+        return _JSON_RENDERER.render(data, request)
+
+    def _encode_items(self, items: Iterable[Any], request: Request) -> Iterator[str]:
+        separator = "[\n"
+        for item in items:
+            yield separator + json.dumps(self._serialize_item(item), default=str)
+            separator = ",\n"
+        yield "\n]" if separator != "[\n" else "[]"
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Newline-delimited JSON renderer (application/x-ndjson).
+
+    Each item of a collection is written as one line of compact JSON. Any
+    other data is written as a single line.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024):
+        super().__init__("application/x-ndjson", chunk_size)
+
+    def _render_value(self, data: Any, request: Request) -> str:
+        if isinstance(data, str):
+            return data
+        return json.dumps(self._serialize_item(data), default=str) + "\n"
+
+    def _encode_items(self, items: Iterable[Any], request: Request) -> Iterator[str]:
+        for item in items:
+            yield json.dumps(self._serialize_item(item), default=str) + "\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    """CSV renderer (text/csv).
+
+    Items may be dicts (or Pydantic models), which are written under a header
+    row, or sequences, which are written as plain rows. The header comes from
+    fieldnames, or from the keys of the first item; keys missing from an item
+    are left empty and keys not in the header are ignored. A single dict is
+    written as a one-row table.
+    """
+
+    def __init__(self, fieldnames: Optional[Sequence[str]] = None, chunk_size: int = 64 * 1024, **fmtparams: Any):
+        super().__init__("text/csv", chunk_size)
+        self.fieldnames = list(fieldnames) if fieldnames is not None else None
+        self.fmtparams = fmtparams
+
+    def _render_value(self, data: Any, request: Request) -> str:
+        if isinstance(data, str):
+            return data
+        if isinstance(data, (bytes, bytearray)):
+            return data.decode("utf-8")
+        return "".join(self._encode_items([data], request))
+
+    def _encode_items(self, items: Iterable[Any], request: Request) -> Iterator[str]:
+        line = _LineBuffer()
+        writer = csv.writer(line, **self.fmtparams)
+        fieldnames = self.fieldnames
+
+        if fieldnames is not None:
+            writer.writerow(fieldnames)
+            yield line.take()
+
+        for item in items:
+            item = self._serialize_item(item)
+            if isinstance(item, dict):
+                if fieldnames is None:
+                    fieldnames = list(item.keys())
+                    writer.writerow(fieldnames)
+                writer.writerow([item.get(name, "") for name in fieldnames])
+            else:
+                writer.writerow(item)
+            yield line.take()
+
+
+class _LineBuffer(io.StringIO):
+    """StringIO that hands back and forgets what csv.writer wrote to it."""
+
+    def take(self) -> str:
+        value = self.getvalue()
+        self.seek(0)
+        self.truncate()
+        return value
@@ -4,6 +4,8 @@ Dependency injection system for the REST framework.
 
 from typing import Any, Callable, Dict, Literal, Optional
 
+from .type_adapters import model_type_adapter
+
 DependencyScope = Literal["request", "session"]
 
 
@@ -78,6 +80,10 @@ class ValidationWrapper:
             else None
         )
 
+        # Compiled adapter for a json_body parameter annotated with a Pydantic model
+        json_body = sig.parameters.get("json_body")
+        self.json_body_adapter = model_type_adapter(json_body.annotation) if json_body else None
+
         # Track which built-in dependencies this validator uses
         self.depends_on_body = False
         self.depends_on_query_params = False
@@ -2,7 +2,7 @@
 Custom exceptions for the REST framework.
 """
 import logging
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -65,3 +65,19 @@ class AcceptsParsingError(RestFrameworkError):
         self.message = message
         self.original_exception = original_exception
         super().__init__(self.message)
+
+
+class RequestEntityTooLarge(Exception):
+    """Raised when a request body exceeds the maximum body size for its route.
+
+    Raised by reads of a request body the adapter stopped receiving, so it
+    surfaces from inside body parsers and handlers and is turned into a 413.
+    """
+
+    def __init__(self, limit: int, message: Optional[str] = None):
+        self.limit = limit
+        super().__init__(message or f"Request body exceeds the maximum size of {limit} bytes")
+
+
+class MultipartError(ValueError):
+    """Raised when a multipart/form-data request body is malformed."""
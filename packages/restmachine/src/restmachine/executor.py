@@ -0,0 +1,206 @@
+"""Executor strategy for running synchronous request handling from the ASGI adapter.
+
+RestMachine handlers are synchronous, so ``ASGIAdapter`` runs ``app.execute`` off
+the event loop. ``HandlerExecutor`` decides where:
+
+- ``"thread"`` (default): in a thread pool. With ``max_workers`` set the adapter
+  owns a dedicated, explicitly sized pool; otherwise the event loop's default
+  executor is used.
+- ``"inline"``: directly on the event loop. This skips the thread hop, which
+  costs more than the handler itself for CPU-trivial routes (health checks,
+  static lookups), but blocks the loop for the duration of the request, so it
+  must only be used for routes that never wait on I/O.
+
+The default mode applies to every route; individual routes override it with
+the ``execution`` decorator:
+
+    @app.get("/health")
+    @app.execution("inline")
+    def health():
+        return {"status": "ok"}
+
+    asgi_app = create_asgi_app(app, max_workers=32)
+
+Queue depth and time spent waiting for a worker are tracked and available from
+``HandlerExecutor.stats()``.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+THREAD = "thread"
+INLINE = "inline"
+EXECUTION_MODES = (THREAD, INLINE)
+
+
+def validate_execution_mode(mode: str) -> str:
+    """Return mode if it is a known execution mode, otherwise raise ValueError."""
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}', expected one of {', '.join(EXECUTION_MODES)}")
+    return mode
+
+
+@dataclass
+class ExecutorStats:
+    """Snapshot of handler executor activity.
+
+    Attributes:
+        max_workers: Size of the dedicated pool, or None for the loop's default executor
+        submitted: Requests handed to the thread pool
+        inline: Requests run directly on the event loop
+        completed: Thread pool requests that have finished
+        queue_depth: Requests waiting for a worker thread
+        max_queue_depth: Highest queue depth seen
+        running: Requests currently running on a worker thread
+        wait_time_ms_total: Total time requests spent waiting for a worker
+        wait_time_ms_max: Longest time a request waited for a worker
+    """
+    max_workers: Optional[int]
+    submitted: int
+    inline: int
+    completed: int
+    queue_depth: int
+    max_queue_depth: int
+    running: int
+    wait_time_ms_total: float
+    wait_time_ms_max: float
+
+    @property
+    def wait_time_ms_mean(self) -> float:
+        """Mean time requests waited for a worker."""
+        started = self.completed + self.running
+        return self.wait_time_ms_total / started if started > 0 else 0.0
+
+
+class HandlerExecutor:
+    """Runs synchronous request handling inline or in a thread pool.
+
+    Args:
+        max_workers: Size of a dedicated thread pool. None uses the event loop's
+                     default executor.
+        executor: An existing executor to use instead of creating one. It is not
+                  shut down by shutdown().
+        default_mode: Execution mode for routes without an override ("thread" or "inline")
+        thread_name_prefix: Name prefix for threads in the dedicated pool
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        default_mode: str = THREAD,
+        thread_name_prefix: str = "restmachine-handler",
+    ):
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if max_workers is not None and executor is not None:
+            raise ValueError("Pass either max_workers or executor, not both")
+
+        self.max_workers = max_workers
+        self.default_mode = validate_execution_mode(default_mode)
+        self.thread_name_prefix = thread_name_prefix
+
+        self._executor = executor
+        self._owns_executor = False
+        self._lock = threading.Lock()
+
+        self._submitted = 0
+        self._inline = 0
+        self._completed = 0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._running = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        """The executor used for thread mode, creating the dedicated pool on first use."""
+        if self._executor is None and self.max_workers is not None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.thread_name_prefix)
+                    self._owns_executor = True
+        return self._executor
+
+    def resolve_mode(self, route_mode: Optional[str]) -> str:
+        """Execution mode for a route, given its override (if any)."""
+        return route_mode or self.default_mode
+
+    async def run(self, func: Callable[[], Any], mode: str = THREAD) -> Tuple[Any, float]:
+        """Call func according to mode.
+
+        Returns:
+            The result of func and the time in seconds it waited for a worker thread
+            (0.0 when run inline)
+        """
+        if mode == INLINE:
+            with self._lock:
+                self._inline += 1
+            return func(), 0.0
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        # Shared with the worker so a request cancelled while queued is only counted once
+        state = {"started": False, "abandoned": False}
+
+        with self._lock:
+            self._submitted += 1
+            self._queue_depth += 1
+            if self._queue_depth > self._max_queue_depth:
+                self._max_queue_depth = self._queue_depth
+
+        def call() -> Tuple[Any, float]:
+            wait = time.perf_counter() - submitted_at
+            with self._lock:
+                state["started"] = True
+                if not state["abandoned"]:
+                    self._queue_depth -= 1
+                self._running += 1
+                self._wait_total += wait
+                if wait > self._wait_max:
+                    self._wait_max = wait
+            try:
+                return func(), wait
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        try:
+            return await loop.run_in_executor(self.executor, call)
+        except asyncio.CancelledError:
+            with self._lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    self._queue_depth -= 1
+            raise
+
+    def stats(self) -> ExecutorStats:
+        """Current counters, queue depth and wait times."""
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self.max_workers,
+                submitted=self._submitted,
+                inline=self._inline,
+                completed=self._completed,
+                queue_depth=self._queue_depth,
+                max_queue_depth=self._max_queue_depth,
+                running=self._running,
+                wait_time_ms_total=self._wait_total * 1000,
+                wait_time_ms_max=self._wait_max * 1000,
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the dedicated pool, if this executor created one."""
+        with self._lock:
+            executor, owned = self._executor, self._owns_executor
+            if owned:
+                self._executor = None
+                self._owns_executor = False
+        if owned and executor is not None:
+            executor.shutdown(wait=wait)
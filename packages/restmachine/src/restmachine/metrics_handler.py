@@ -6,6 +6,7 @@ This module provides metrics lifecycle management for platform adapters
 
 from typing import Any, Optional, Callable
 import logging
+import time
 
 from restmachine.metrics import MetricsCollector, MetricsPublisher
 
@@ -79,21 +80,25 @@ class MetricsHandler:
         try:
             # Convert event to request
             metrics.start_timer("adapter.event_to_request")
+            parse_start = time.time_ns()
             request = convert_fn(event, context)
+            parse_end = time.time_ns()
             metrics.stop_timer("adapter.event_to_request")
 
             # Store in app cache for injection
             self.app._dependency_cache.set("metrics", metrics)
 
-            # Execute application
-            metrics.start_timer("application.execute")
-            response = execute_fn(request)
-            metrics.stop_timer("application.execute")
-
-            # Convert response
-            metrics.start_timer("adapter.response_conversion")
-            platform_response = response_fn(response, event, context)
-            metrics.stop_timer("adapter.response_conversion")
+            with self.app._trace_request(request, parse_start, parse_end):
+                # Execute application
+                metrics.start_timer("application.execute")
+                response = execute_fn(request)
+                metrics.stop_timer("application.execute")
+
+                # Convert response
+                metrics.start_timer("adapter.response_conversion")
+                with self.app._start_span("adapter.send"):
+                    platform_response = response_fn(response, event, context)
+                metrics.stop_timer("adapter.response_conversion")
             metrics.stop_timer("adapter.total_time")
 
             # Add response context
@@ -104,6 +109,9 @@ class MetricsHandler:
             # Publish (only if enabled)
             self._safe_publish(metrics, request, response, context)
 
+            # Run the tasks the handler queued on `background` now that the response is built
+            self.app._run_background_tasks(request, response)
+
             return platform_response
 
         except Exception as e:
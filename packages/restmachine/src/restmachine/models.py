@@ -6,12 +6,17 @@ import hashlib
 import io
 import logging
 import mimetypes
-from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from http import HTTPStatus
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterable, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+from .background import BackgroundTasks
+from .cancellation import CancellationToken
+from .request_body import RequestBodyCache
+from .streaming import is_iterator_body
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -44,8 +49,19 @@ class MultiValueHeaders:
         # Dict-like iteration (returns first value for each header)
         for name, value in headers.items():
             print(f"{name}: {value}")
+
+    Headers are stored as one list of (name, value) pairs in the order they were
+    added. The lowercase-name index used for lookups is built on the first lookup,
+    and ASGI header bytes are only decoded when the headers are first used, so
+    headers that are built and sent without being read cost little more than
+    the list itself.
     """
 
+    __slots__ = ("_items", "_index", "_raw", "_encoded")
+
+    # Undecoded ASGI headers; only set between from_asgi() and first access
+    _raw: Iterable[Tuple[bytes, bytes]]
+
     def __init__(self, data=None):
         """
         Initialize headers from dict, list of tuples, or another MultiValueHeaders.
@@ -57,22 +73,95 @@ class MultiValueHeaders:
                 - Another MultiValueHeaders instance
                 - None
         """
-        # Internal storage: Dict[lowercase_name, List[Tuple[original_name, value]]]
-        self._headers: Dict[str, List[Tuple[str, str]]] = {}
+        # (original_name, value) pairs in insertion order
+        self._items: List[Tuple[str, str]] = []
+        # Lowercase name -> positions in _items; None until first needed
+        self._index: Optional[Dict[str, List[int]]] = None
+        # ASGI [name, value] byte pairs, cached by to_asgi()
+        self._encoded: Optional[List[List[bytes]]] = None
 
         if data is not None:
             if isinstance(data, MultiValueHeaders):
-                self._headers = {k: list(v) for k, v in data._headers.items()}
+                self._items = list(data._items)
             elif isinstance(data, dict):
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        for v in value:
-                            self.add(key, v)
-                    else:
-                        self.add(key, value)
+                self._items = _pairs_from_dict(data, lowercase=False)
             elif isinstance(data, (list, tuple)):
-                for key, value in data:
-                    self.add(key, value)
+                self._items = [(key, value) for key, value in data]
+
+    @classmethod
+    def from_asgi(cls, raw_headers: Iterable[Tuple[bytes, bytes]]) -> 'MultiValueHeaders':
+        """
+        Create headers from ASGI scope headers, decoding them on first access.
+
+        Args:
+            raw_headers: (name, value) byte pairs from scope["headers"]
+        """
+        headers = cls.__new__(cls)
+        headers._raw = raw_headers
+        headers._index = None
+        headers._encoded = None
+        return headers
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], lowercase: bool = False) -> 'MultiValueHeaders':
+        """
+        Create headers from a dict of values or lists of values in one pass.
+
+        Suitable for API Gateway and ALB events (``headers`` or
+        ``multiValueHeaders``). None values are skipped.
+
+        Args:
+            data: Mapping of header name to a value or a list of values
+            lowercase: Store names lowercased, as ASGI servers provide them
+        """
+        headers = cls.__new__(cls)
+        headers._items = _pairs_from_dict(data, lowercase)
+        headers._index = None
+        headers._encoded = None
+        return headers
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when _items is unset, i.e. for from_asgi() headers not yet decoded
+        if name != "_items":
+            raise AttributeError(name)
+        try:
+            raw = object.__getattribute__(self, "_raw")
+        except AttributeError:
+            raise AttributeError(name) from None
+        items: List[Tuple[str, str]] = []
+        index: Dict[str, List[int]] = {}
+        for position, (raw_name, raw_value) in enumerate(raw):
+            header_name = raw_name.decode("latin-1").lower()
+            items.append((header_name, raw_value.decode("latin-1")))
+            if header_name in index:
+                index[header_name].append(position)
+            else:
+                index[header_name] = [position]
+        self._items = items
+        self._index = index
+        del self._raw
+        return items
+
+    def _lookup(self) -> Dict[str, List[int]]:
+        """The lowercase-name index, building it if needed."""
+        index = self._index
+        if index is None:
+            index = {}
+            for position, (name, _) in enumerate(self._items):
+                name_lower = name.lower()
+                if name_lower in index:
+                    index[name_lower].append(position)
+                else:
+                    index[name_lower] = [position]
+            self._index = index
+        return index
+
+    def _remove(self, positions: List[int]) -> None:
+        """Remove the items at positions (ascending) and drop the stale index."""
+        items = self._items
+        for position in reversed(positions):
+            del items[position]
+        self._index = None
 
     def add(self, name: str, value: str) -> None:
         """
@@ -82,10 +171,16 @@ class MultiValueHeaders:
             name: Header name (case-insensitive)
             value: Header value
         """
-        name_lower = name.lower()
-        if name_lower not in self._headers:
-            self._headers[name_lower] = []
-        self._headers[name_lower].append((name, value))
+        items = self._items
+        index = self._index
+        if index is not None:
+            name_lower = name.lower()
+            if name_lower in index:
+                index[name_lower].append(len(items))
+            else:
+                index[name_lower] = [len(items)]
+        items.append((name, value))
+        self._encoded = None
 
     def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -102,9 +197,9 @@ class MultiValueHeaders:
         if not isinstance(name, str):
             return default
 
-        name_lower = name.lower()
-        if name_lower in self._headers and self._headers[name_lower]:
-            return self._headers[name_lower][0][1]
+        positions = self._lookup().get(name.lower())
+        if positions:
+            return self._items[positions[0]][1]
         return default
 
     def get_all(self, name: str) -> List[str]:
@@ -117,9 +212,10 @@ class MultiValueHeaders:
         Returns:
             List of all values for this header (empty list if not found)
         """
-        name_lower = name.lower()
-        if name_lower in self._headers:
-            return [value for _, value in self._headers[name_lower]]
+        positions = self._lookup().get(name.lower())
+        if positions:
+            items = self._items
+            return [items[position][1] for position in positions]
         return []
 
     def set(self, name: str, value: str) -> None:
@@ -130,8 +226,15 @@ class MultiValueHeaders:
             name: Header name (case-insensitive)
             value: Header value
         """
-        name_lower = name.lower()
-        self._headers[name_lower] = [(name, value)]
+        positions = self._lookup().get(name.lower())
+        if not positions:
+            self.add(name, value)
+            return
+        # Keep the header's position; drop any later values
+        self._items[positions[0]] = (name, value)
+        if len(positions) > 1:
+            self._remove(positions[1:])
+        self._encoded = None
 
     def __setitem__(self, name: str, value: str) -> None:
         """Set a header to a single value (dict-like interface)."""
@@ -157,24 +260,24 @@ class MultiValueHeaders:
         """Check if header exists (case-insensitive)."""
         if not isinstance(name, str):
             return False
-        return name.lower() in self._headers
+        return name.lower() in self._lookup()
 
     def __delitem__(self, name: str) -> None:
         """Delete all values for a header."""
         if not isinstance(name, str):
             raise KeyError(name)
 
-        name_lower = name.lower()
-        if name_lower in self._headers:
-            del self._headers[name_lower]
-        else:
+        positions = self._lookup().get(name.lower())
+        if not positions:
             raise KeyError(name)
+        self._remove(positions)
+        self._encoded = None
 
     def __iter__(self):
         """Iterate over header names (using original casing of first occurrence)."""
-        for values in self._headers.values():
-            if values:
-                yield values[0][0]
+        items = self._items
+        for positions in self._lookup().values():
+            yield items[positions[0]][0]
 
     def keys(self):
         """Return header names (using original casing of first occurrence)."""
@@ -182,11 +285,13 @@ class MultiValueHeaders:
 
     def values(self):
         """Return first value for each header."""
-        return [values[0][1] for values in self._headers.values() if values]
+        items = self._items
+        return [items[positions[0]][1] for positions in self._lookup().values()]
 
     def items(self):
         """Return (name, first_value) pairs."""
-        return [(values[0][0], values[0][1]) for values in self._headers.values() if values]
+        items = self._items
+        return [items[positions[0]] for positions in self._lookup().values()]
 
     def items_all(self):
         """
@@ -194,10 +299,23 @@ class MultiValueHeaders:
 
         Useful for serialization to formats that support multiple headers.
         """
-        result = []
-        for values in self._headers.values():
-            result.extend(values)
-        return result
+        return list(self._items)
+
+    def to_asgi(self) -> List[List[bytes]]:
+        """
+        Return all headers as ASGI [name, value] byte pairs.
+
+        The encoded pairs are cached until the headers change, so sending the
+        same headers again doesn't re-encode them. Names keep their casing.
+        """
+        encoded = self._encoded
+        if encoded is None:
+            encoded = [
+                [name.encode("latin-1"), str(value).encode("latin-1")]
+                for name, value in self._items
+            ]
+            self._encoded = encoded
+        return list(encoded)
 
     def to_dict(self) -> Dict[str, str]:
         """
@@ -206,7 +324,7 @@ class MultiValueHeaders:
         Returns:
             Dict with lowercase keys and first values
         """
-        return {values[0][0]: values[0][1] for values in self._headers.values() if values}
+        return dict(self.items())
 
     def to_multidict(self) -> Dict[str, List[str]]:
         """
@@ -215,9 +333,10 @@ class MultiValueHeaders:
         Returns:
             Dict with lowercase keys and lists of all values
         """
+        items = self._items
         return {
-            values[0][0]: [v for _, v in values]
-            for values in self._headers.values() if values
+            items[positions[0]][0]: [items[position][1] for position in positions]
+            for positions in self._lookup().values()
         }
 
     def update(self, other) -> None:
@@ -228,15 +347,26 @@ class MultiValueHeaders:
         rather than adding to them. Use add() directly if you want to append values.
         """
         if isinstance(other, MultiValueHeaders):
-            # For MultiValueHeaders, we need to handle multi-value headers properly
-            # Group by header name first, then set all values at once
-            for name_lower, values in other._headers.items():
-                # Clear existing values for this header
-                if name_lower in self._headers:
-                    del self._headers[name_lower]
-                # Add all new values
-                for original_name, value in values:
-                    self.add(original_name, value)
+            other_index = other._lookup()
+            if not self._items:
+                # Common case: filling empty headers (e.g. pre-calculated response headers)
+                self._items = list(other._items)
+                self._index = None
+                self._encoded = None
+                return
+            # Replace each header with all of its values from other
+            index = self._lookup()
+            replaced = sorted(
+                position
+                for name_lower in other_index
+                for position in index.get(name_lower, ())
+            )
+            if replaced:
+                self._remove(replaced)
+            other_items = other._items
+            for positions in other_index.values():
+                for position in positions:
+                    self.add(*other_items[position])
         elif isinstance(other, dict):
             for key, value in other.items():
                 if isinstance(value, list):
@@ -253,6 +383,7 @@ class MultiValueHeaders:
                 # But since we process sequentially, we just set each one
                 # which means last one wins for simple cases
                 self.set(key, value)
+        self._encoded = None
 
     def __repr__(self):
         """String representation showing all headers."""
@@ -261,13 +392,29 @@ class MultiValueHeaders:
 
     def __len__(self):
         """Return number of distinct header names."""
-        return len(self._headers)
+        return len(self._lookup())
+
+    def __bool__(self):
+        """Return True if any header is set, without building the index."""
+        return bool(self._items)
 
     def copy(self):
         """Return a shallow copy of the headers."""
         return MultiValueHeaders(self)
 
 
+def _pairs_from_dict(data: Dict[str, Any], lowercase: bool) -> List[Tuple[str, str]]:
+    """Flatten a dict of values or lists of values into (name, value) pairs, skipping None."""
+    pairs: List[Tuple[str, str]] = []
+    for key, value in data.items():
+        name = key.lower() if lowercase else key
+        if isinstance(value, list):
+            pairs.extend((name, v) for v in value if v is not None)
+        elif value is not None:
+            pairs.append((name, value))
+    return pairs
+
+
 # Backward compatibility alias
 CaseInsensitiveDict = MultiValueHeaders
 
@@ -283,7 +430,87 @@ class HTTPMethod(Enum):
     OPTIONS = "OPTIONS"
 
 
-@dataclass
+class QueryParams(Dict[str, str]):
+    """Query string parameters.
+
+    Maps each name to its first value, so query parameters can still be used as
+    a plain dict, and keeps every value of a repeated parameter for getlist()::
+
+        # ?tag=a&tag=b&page=2
+        query_params["tag"]          # 'a'
+        query_params.getlist("tag")  # ['a', 'b']
+        query_params.getlist("page") # ['2']
+    """
+
+    def __init__(self, data=None):
+        """
+        Initialize from a dict (values may be lists) or a list of (name, value) pairs.
+        """
+        super().__init__()
+        # Every value of names that appear more than once
+        self._lists: Dict[str, List[str]] = {}
+
+        if data is not None:
+            items = data.items() if isinstance(data, dict) else data
+            for name, value in items:
+                if isinstance(value, list):
+                    for v in value:
+                        self.add(name, v)
+                else:
+                    self.add(name, value)
+
+    @classmethod
+    def from_query_string(cls, query_string: Union[bytes, str]) -> 'QueryParams':
+        """Parse a URL-encoded query string (blank values are dropped)."""
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode("utf-8")
+        return cls(parse_qsl(query_string))
+
+    def add(self, name: str, value: str) -> None:
+        """Add a value, keeping any existing values for the name."""
+        if name not in self:
+            super().__setitem__(name, value)
+        elif name in self._lists:
+            self._lists[name].append(value)
+        else:
+            self._lists[name] = [super().__getitem__(name), value]
+
+    def getlist(self, name: str) -> List[str]:
+        """All values for a name, in the order they were sent (empty if it is missing)."""
+        if name in self._lists:
+            return list(self._lists[name])
+        if name in self:
+            return [super().__getitem__(name)]
+        return []
+
+    def multi_items(self) -> List[Tuple[str, str]]:
+        """All (name, value) pairs, including repeated names."""
+        return [(name, value) for name in self for value in self.getlist(name)]
+
+    def __setitem__(self, name: str, value: str) -> None:
+        """Set a name to a single value, replacing any existing values."""
+        super().__setitem__(name, value)
+        self._lists.pop(name, None)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._lists.pop(name, None)
+
+    def pop(self, name, *default):
+        self._lists.pop(name, None)
+        return super().pop(name, *default)
+
+    def update(self, *args, **kwargs) -> None:
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def copy(self) -> 'QueryParams':
+        return QueryParams(self.multi_items())
+
+    def __repr__(self):
+        return f"QueryParams({self.multi_items()!r})"
+
+
 class Request:
     """Represents an HTTP request.
 
@@ -292,21 +519,98 @@ class Request:
     The body is a file-like stream of bytes that can be read by content parsers.
     This allows efficient handling of large request bodies without loading
     everything into memory.
+
+    Adapters can pass the raw query string instead of query_params; it is
+    parsed into QueryParams the first time query_params is used, so requests
+    that never look at their query string (404s, cached responses) don't pay
+    for parsing it.
     """
 
-    method: HTTPMethod
-    path: str
-    headers: Union[Dict[str, str], 'MultiValueHeaders']
-    body: Optional[BinaryIO] = None
-    query_params: Optional[Dict[str, str]] = None
-    path_params: Optional[Dict[str, str]] = None
-    tls: bool = False  # ASGI TLS extension: whether connection uses TLS
-    client_cert: Optional[Dict[str, Any]] = None  # ASGI TLS extension: client certificate info
-
-    def __post_init__(self):
-        """Ensure headers is a MultiValueHeaders for case-insensitive header lookups."""
-        if not isinstance(self.headers, MultiValueHeaders):
-            self.headers = MultiValueHeaders(self.headers)
+    __slots__ = (
+        "method", "path", "_headers", "_body", "_body_cache", "_query_params", "_query_string",
+        "path_params", "tls", "client_cert", "client_ip", "cancellation", "csp_nonce", "background",
+        "_route_match", "_request_id", "_trace_id",
+    )
+
+    def __init__(
+        self,
+        method: HTTPMethod,
+        path: str,
+        headers: Union[Dict[str, str], 'MultiValueHeaders', None] = None,
+        body: Optional[BinaryIO] = None,
+        query_params: Optional[Dict[str, Any]] = None,
+        path_params: Optional[Dict[str, str]] = None,
+        tls: bool = False,
+        client_cert: Optional[Dict[str, Any]] = None,
+        cancellation: Optional[CancellationToken] = None,
+        query_string: Optional[Union[bytes, str]] = None,
+        client_ip: Optional[str] = None,
+    ):
+        self.method = method
+        self.path = path
+        self.headers = headers  # type: ignore[assignment]
+        self._body_cache: Optional[RequestBodyCache] = None
+        self.body = body
+        self._query_params: Optional[QueryParams] = None
+        self.query_params = query_params
+        self.path_params = path_params
+        self.tls = tls  # ASGI TLS extension: whether connection uses TLS
+        self.client_cert = client_cert  # ASGI TLS extension: client certificate info
+        self.client_ip = client_ip  # Address of the connecting client, as reported by the server
+        self.cancellation = cancellation  # Set by the ASGI adapter to signal client disconnects
+        self._query_string = query_string
+        self.csp_nonce: Optional[str] = None  # Set by the state machine when the CSP policy uses nonces
+        self.background: Optional[BackgroundTasks] = None  # Created when a handler injects `background`
+        # (method, path, route match) once the route has been looked up, so it is only matched once
+        self._route_match: Optional[Tuple[HTTPMethod, str, Any]] = None
+        # Set the first time request_id/trace_id are resolved, so tracing and access logs see the same IDs
+        self._request_id: Optional[str] = None
+        self._trace_id: Optional[str] = None
+
+    @property
+    def headers(self) -> 'MultiValueHeaders':
+        """Request headers (case-insensitive)."""
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: Union[Dict[str, str], 'MultiValueHeaders', None]) -> None:
+        # Ensure headers is a MultiValueHeaders for case-insensitive header lookups
+        self._headers = value if isinstance(value, MultiValueHeaders) else MultiValueHeaders(value)
+
+    @property
+    def body(self) -> Optional[BinaryIO]:
+        """Request body stream."""
+        return self._body
+
+    @body.setter
+    def body(self, value: Optional[BinaryIO]) -> None:
+        # A new body (e.g. wrapped for decompression) invalidates anything parsed from the old one
+        self._body = value
+        self._body_cache = None
+
+    @property
+    def body_cache(self) -> Optional[RequestBodyCache]:
+        """Parse-once cache of the body's bytes, text and parsed values; None without a body."""
+        if self._body_cache is None and self._body is not None:
+            self._body_cache = RequestBodyCache(self._body, self.get_content_type())
+        return self._body_cache
+
+    @property
+    def query_params(self) -> Optional[QueryParams]:
+        """Query parameters, parsed from the raw query string on first access."""
+        if self._query_params is None and self._query_string is not None:
+            self._query_params = QueryParams.from_query_string(self._query_string)
+        return self._query_params
+
+    @query_params.setter
+    def query_params(self, value: Optional[Dict[str, Any]]) -> None:
+        if value is not None and not isinstance(value, QueryParams):
+            value = QueryParams(value)
+        self._query_params = value
+        self._query_string = None
+
+    def __repr__(self):
+        return f"Request(method={self.method!r}, path={self.path!r})"
 
     def get_accept_header(self) -> str:
         """Get the Accept header, defaulting to */* if not present."""
@@ -399,7 +703,6 @@ class Request:
                 return None
 
 
-@dataclass
 class Response:
     """Represents an HTTP response.
 
@@ -408,6 +711,8 @@ class Response:
     - bytes: Used directly
     - BinaryIO: File-like object that will be streamed (useful for large files, S3 objects, etc.)
     - Path: Local filesystem path to a file (will be served efficiently)
+    - Iterator/AsyncIterator: Generator (sync or async) of bytes or str chunks,
+      sent as each chunk is produced
     - dict/list: Will be JSON-encoded
     - None: Empty response body
 
@@ -417,33 +722,123 @@ class Response:
     - Content-Type is automatically detected from file extension
     - Content-Length is automatically set from file size
 
+    For iterator bodies:
+    - ASGI servers receive each chunk as it is produced, without Content-Length
+    - Lambda will collect the chunks and send the assembled body
+    - Range requests and content ETags are not supported (Accept-Ranges: none)
+
     Range Request Support:
     - range_start/range_end: Set by framework when processing Range header
     - Adapters use these fields to send only requested byte range
     - ASGI adapter uses zero-copy extension when possible
+
+    Construction only runs the initialization steps the arguments need: file
+    detection for Path bodies, ETag/Last-Modified for conditional fields and
+    Vary merging when there is something to merge. Response.fast() skips
+    straight to Content-Type and Content-Length for str/bytes bodies.
     """
 
-    status_code: int
-    body: Optional[Union[str, bytes, BinaryIO, Path, dict, list]] = None
-    headers: Optional[Union[Dict[str, str], 'MultiValueHeaders']] = None
-    content_type: Optional[str] = None
-    request: Optional['Request'] = None
-    available_content_types: Optional[list] = None
-    pre_calculated_headers: Optional[Union[Dict[str, str], 'MultiValueHeaders']] = None
-    etag: Optional[str] = None
-    last_modified: Optional[datetime] = None
-
-    # Range request fields (set by framework during range processing)
-    range_start: Optional[int] = None
-    range_end: Optional[int] = None
-
-    def __post_init__(self):
-        """Initialize Response object after dataclass creation."""
+    __slots__ = (
+        "status_code", "body", "headers", "content_type", "request", "available_content_types",
+        "pre_calculated_headers", "etag", "last_modified", "range_start", "range_end",
+    )
+
+    def __init__(
+        self,
+        status_code: int,
+        body: Optional[Union[str, bytes, BinaryIO, Path, dict, list,
+                             Iterable[Union[bytes, str]], AsyncIterable[Union[bytes, str]]]] = None,
+        headers: Optional[Union[Dict[str, str], 'MultiValueHeaders']] = None,
+        content_type: Optional[str] = None,
+        request: Optional['Request'] = None,
+        available_content_types: Optional[list] = None,
+        pre_calculated_headers: Optional[Union[Dict[str, str], 'MultiValueHeaders']] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+        range_start: Optional[int] = None,
+        range_end: Optional[int] = None,
+    ):
+        self.status_code = status_code
+        self.body: Any = body
+        self.headers: Optional[Union[Dict[str, str], MultiValueHeaders]] = headers
+        self.content_type = content_type
+        self.request = request
+        self.available_content_types = available_content_types
+        self.pre_calculated_headers = pre_calculated_headers
+        self.etag = etag
+        self.last_modified = last_modified
+        # Range request fields (set by framework during range processing)
+        self.range_start = range_start
+        self.range_end = range_end
+        self._initialize()
+
+    @classmethod
+    def fast(
+        cls,
+        status_code: int,
+        body: Any = None,
+        content_type: Optional[str] = None,
+        headers: Optional[Union[Dict[str, str], 'MultiValueHeaders']] = None,
+    ) -> 'Response':
+        """Create a response without the general-purpose initialization.
+
+        Equivalent to ``Response(status_code, body, content_type=content_type,
+        pre_calculated_headers=headers)`` for str, bytes and None bodies, but
+        only sets Content-Type and Content-Length. Other bodies fall back to
+        the regular constructor.
+
+        Args:
+            status_code: HTTP status code
+            body: Response body
+            content_type: Value for the Content-Type header
+            headers: Headers to copy into the response
+        """
+        if body is not None and not isinstance(body, (str, bytes)):
+            return cls(status_code, body, content_type=content_type, pre_calculated_headers=headers)
+
+        response = cls.__new__(cls)
+        response.status_code = status_code
+        response.body = body
+        response.content_type = content_type
+        response.request = None
+        response.available_content_types = None
+        response.pre_calculated_headers = headers
+        response.etag = None
+        response.last_modified = None
+        response.range_start = None
+        response.range_end = None
+
+        response_headers = MultiValueHeaders(headers) if headers else MultiValueHeaders()
+        if content_type:
+            response_headers["Content-Type"] = content_type
+        if status_code != HTTPStatus.NO_CONTENT:
+            response_headers["Content-Length"] = str(_body_length(body))
+        response.headers = response_headers
+        return response
+
+    def merge_headers(self, headers: Optional[Union[Dict[str, str], 'MultiValueHeaders']]) -> None:
+        """Merge pre-calculated headers into an existing response.
+
+        The response's own Content-Type, ETag, Last-Modified, Content-Length
+        and Vary values are re-applied on top, as if the headers had been
+        passed to the constructor.
+        """
+        self.pre_calculated_headers = headers
+        self._initialize()
+
+    def __repr__(self):
+        return f"Response(status_code={self.status_code!r}, content_type={self.content_type!r})"
+
+    def _initialize(self) -> None:
+        """Normalize headers and derive the headers implied by the other fields."""
         explicit_vary = self._initialize_headers()
-        self._handle_path_objects()
-        self._set_conditional_headers()
+        if isinstance(self.body, Path):
+            self._handle_path_objects()
+        if self.content_type or self.etag or self.last_modified:
+            self._set_conditional_headers()
         self._set_content_length()
-        self._merge_vary_headers(explicit_vary)
+        if explicit_vary or self.request is not None or self.available_content_types:
+            self._merge_vary_headers(explicit_vary)
 
     def _initialize_headers(self) -> Optional[str]:
         """Initialize headers dict and apply pre-calculated headers.
@@ -522,26 +917,10 @@ class Response:
             return
 
         # Don't set Content-Length for streaming bodies or Path (Path is handled separately)
-        if isinstance(self.body, (io.IOBase, Path)):
+        if isinstance(self.body, (io.IOBase, Path)) or is_iterator_body(self.body):
             return
 
-        if self.body is not None:
-            # Calculate byte length of body (only for non-streaming bodies)
-            import json
-            if isinstance(self.body, str):
-                body_bytes = self.body.encode('utf-8')
-            elif isinstance(self.body, (dict, list)):
-                body_bytes = json.dumps(self.body).encode('utf-8')
-            elif isinstance(self.body, bytes):
-                body_bytes = self.body
-            else:
-                body_bytes = str(self.body).encode('utf-8')
-
-            content_length = len(body_bytes) if body_bytes else 0
-            headers["Content-Length"] = str(content_length)
-        else:
-            # No body, set Content-Length to 0
-            headers["Content-Length"] = "0"
+        headers["Content-Length"] = str(_body_length(self.body))
 
     def _merge_vary_headers(self, explicit_vary: Optional[str]):
         """Merge Vary header values from multiple sources.
@@ -621,8 +1000,9 @@ class Response:
         Note:
             For streaming bodies (BinaryIO), this will read the entire stream to calculate
             the hash. The stream will be reset to the beginning after hashing.
+            Iterator bodies can only be consumed once, so they get no ETag.
         """
-        if self.body is None:
+        if self.body is None or is_iterator_body(self.body):
             return
 
         # Generate SHA-256 hash of content for ETag
@@ -655,6 +1035,21 @@ class Response:
         self.set_etag(etag, weak)
 
 
+def _body_length(body: Any) -> int:
+    """Byte length of a non-streaming response body as it will be sent."""
+    if body is None:
+        return 0
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        # ASCII text is one byte per character, so skip encoding a copy
+        return len(body) if body.isascii() else len(body.encode('utf-8'))
+    if isinstance(body, (dict, list)):
+        import json
+        return len(json.dumps(body).encode('utf-8'))
+    return len(str(body).encode('utf-8'))
+
+
 def parse_etags(etag_header: str) -> List[str]:
     """Parse comma-separated ETag values from a header.
 
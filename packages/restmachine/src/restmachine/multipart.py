@@ -0,0 +1,401 @@
+"""Streaming multipart/form-data parsing for RestMachine.
+
+The built-in ``multipart_body`` dependency parses ``multipart/form-data``
+request bodies incrementally: the body stream is read in chunks, form fields
+are decoded to strings, and file parts are written to temporary files (moved
+from memory to disk past a size threshold) or handed to a sink, so upload
+endpoints run in constant memory however large the files are.
+
+Example:
+    @app.post("/avatars")
+    def upload_avatar(multipart_body):
+        avatar = multipart_body["avatar"]        # UploadFile
+        caption = multipart_body.get("caption")  # str
+        store(avatar.filename, avatar.file)
+        return {"size": avatar.size}
+
+Limits on the number of parts and the size of each part are configured with
+``app.configure_multipart()``. Exceeding them is rejected with 413 Payload Too
+Large; malformed bodies fail to parse (422) like other built-in parsers.
+"""
+
+import tempfile
+from dataclasses import dataclass
+from email.message import Message
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Union, cast
+
+from .exceptions import MultipartError, RequestEntityTooLarge
+from .streaming import DEFAULT_SPOOL_THRESHOLD, validate_body_size
+
+DEFAULT_MAX_PARTS = 1000
+DEFAULT_MAX_FIELD_SIZE = 1024 * 1024
+DEFAULT_READ_SIZE = 64 * 1024
+
+# Part headers are held in memory, so they get a fixed limit
+MAX_HEADER_SIZE = 16 * 1024
+
+
+class FormField:
+    """A form field part (one without a filename).
+
+    Attributes:
+        name: Form field name
+        value: Decoded field value
+        content_type: Content-Type of the part (text/plain unless the client sent one)
+        headers: Part headers, with lowercase names
+    """
+
+    __slots__ = ("name", "value", "content_type", "headers")
+
+    def __init__(self, name: str, value: str, content_type: str, headers: Dict[str, str]):
+        self.name = name
+        self.value = value
+        self.content_type = content_type
+        self.headers = headers
+
+    def __repr__(self) -> str:
+        return f"FormField(name={self.name!r}, value={self.value!r})"
+
+
+class UploadFile:
+    """A file part of a multipart body.
+
+    The content is in ``file``, a temporary file positioned at the start, unless
+    the application configured a file sink, in which case ``file`` is None and
+    ``sink`` holds the object the sink returned.
+
+    Attributes:
+        name: Form field name
+        filename: Filename sent by the client (may be empty)
+        content_type: Content-Type of the part (application/octet-stream if not sent)
+        headers: Part headers, with lowercase names
+        size: Size of the content in bytes
+        file: Temporary file holding the content, or None when written to a sink
+        sink: Object returned by the file sink, if one is configured
+    """
+
+    def __init__(self, name: str, filename: str, content_type: str, headers: Dict[str, str]):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.headers = headers
+        self.size = 0
+        self.file: Optional[BinaryIO] = None
+        self.sink: Any = None
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the temporary file."""
+        if self.file is None:
+            raise ValueError(f"Upload {self.name!r} was written to a file sink")
+        return self.file.read(size)
+
+    def close(self):
+        """Close (and delete) the temporary file."""
+        if self.file is not None:
+            self.file.close()
+
+    def __repr__(self) -> str:
+        return f"UploadFile(name={self.name!r}, filename={self.filename!r}, size={self.size})"
+
+
+MultipartPart = Union[FormField, UploadFile]
+
+FileSink = Callable[[UploadFile], Any]
+
+
+@dataclass
+class MultipartConfig:
+    """Limits and storage for multipart/form-data parsing.
+
+    Attributes:
+        max_parts: Maximum number of parts in a body.
+        max_part_size: Maximum size of a file part in bytes, or None for no limit
+                       (the request's maximum body size still applies).
+        max_field_size: Maximum size of a form field in bytes. Fields are held in
+                        memory, so they are always limited.
+        spool_threshold: File parts larger than this are moved from memory to a
+                         temporary file on disk.
+        file_sink: Optional callable receiving each UploadFile (with name,
+                   filename and content_type set) and returning an object with
+                   a write(bytes) method the content is written to, instead of
+                   a temporary file. Its close() method, if any, is called at
+                   the end of the part. If the body fails to parse before the
+                   part is complete, its abort() method is called instead if it
+                   has one (so a partial upload can be discarded), otherwise
+                   close().
+        read_size: Number of bytes read from the request body at a time.
+    """
+    max_parts: int = DEFAULT_MAX_PARTS
+    max_part_size: Optional[int] = None
+    max_field_size: int = DEFAULT_MAX_FIELD_SIZE
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD
+    file_sink: Optional[FileSink] = None
+    read_size: int = DEFAULT_READ_SIZE
+
+    def validate(self):
+        """Validate the configuration.
+
+        Raises:
+            ValueError: If a limit is not a positive integer
+        """
+        for name in ("max_parts", "max_field_size", "spool_threshold", "read_size"):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"Multipart: {name} must be a positive integer, got {value!r}")
+        validate_body_size(self.max_part_size)
+
+
+class MultipartForm(Dict[str, Any]):
+    """Parsed multipart body.
+
+    Maps each field name to its value, like form_body: a str for form fields and
+    an UploadFile for file parts, or a list when a name appears more than once.
+    """
+
+    def __init__(self, parts: List[MultipartPart]):
+        super().__init__()
+        self.parts = parts
+        for part in parts:
+            value = part.value if isinstance(part, FormField) else part
+            if part.name not in self:
+                self[part.name] = value
+            elif isinstance(self[part.name], list):
+                self[part.name].append(value)
+            else:
+                self[part.name] = [self[part.name], value]
+
+    def getlist(self, name: str) -> List[Any]:
+        """All values for a field name (empty if it is missing)."""
+        value = self.get(name)
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    @property
+    def files(self) -> List[UploadFile]:
+        """All file parts, in the order they were sent."""
+        return [part for part in self.parts if isinstance(part, UploadFile)]
+
+    def close(self):
+        """Close the temporary files of all file parts."""
+        for upload in self.files:
+            upload.close()
+
+
+def get_boundary(content_type: str) -> bytes:
+    """Extract the boundary parameter from a multipart Content-Type.
+
+    Raises:
+        MultipartError: If the boundary is missing or invalid
+    """
+    message = Message()
+    message["content-type"] = content_type
+    boundary = message.get_param("boundary")
+    if not isinstance(boundary, str) or not 0 < len(boundary) <= 70:
+        raise MultipartError("Missing or invalid multipart boundary")
+    return boundary.encode("latin-1")
+
+
+def parse_multipart(stream: BinaryIO, content_type: str, config: Optional[MultipartConfig] = None) -> MultipartForm:
+    """Parse a multipart/form-data body into a MultipartForm."""
+    return MultipartForm(list(iter_multipart(stream, get_boundary(content_type), config)))
+
+
+def iter_multipart(stream: BinaryIO, boundary: bytes,
+                   config: Optional[MultipartConfig] = None) -> Iterator[MultipartPart]:
+    """Parse a multipart/form-data body incrementally, yielding each part once it is complete.
+
+    The stream is read config.read_size bytes at a time and at most about that
+    much is held in memory, apart from form field values.
+
+    Args:
+        stream: Request body stream
+        boundary: Boundary from the Content-Type header
+        config: Limits and file storage (defaults to MultipartConfig())
+
+    Raises:
+        MultipartError: If the body is malformed
+        RequestEntityTooLarge: If there are too many parts or a part is too large
+    """
+    config = config or MultipartConfig()
+    separator = b"\r\n--" + boundary
+    # The first boundary needn't follow a line break, so start with one
+    reader = _BodyReader(stream, config.read_size, initial=b"\r\n")
+
+    # Skip the preamble up to the first boundary
+    reader.skip_to(separator)
+    count = 0
+    while not reader.at_close_delimiter():
+        count += 1
+        if count > config.max_parts:
+            raise RequestEntityTooLarge(config.max_parts, f"Multipart body has more than {config.max_parts} parts")
+        headers = _parse_headers(reader.read_until(b"\r\n\r\n", MAX_HEADER_SIZE))
+        name, filename, content_type = _describe_part(headers)
+        if filename is None:
+            yield _read_field(reader, separator, name, content_type, headers, config)
+        else:
+            yield _read_file(reader, separator, UploadFile(name, filename, content_type, headers), config)
+
+
+class _BodyReader:
+    """Buffered reader over a body stream with boundary searches."""
+
+    def __init__(self, stream: BinaryIO, read_size: int, initial: bytes = b""):
+        self._read = getattr(stream, "read1", stream.read)
+        self._read_size = read_size
+        self._buffer = bytearray(initial)
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk; False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._read(self._read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _ensure(self, size: int):
+        while len(self._buffer) < size and self._fill():
+            pass
+
+    def skip_to(self, separator: bytes):
+        """Discard everything up to and including the first separator."""
+        while True:
+            index = self._buffer.find(separator)
+            if index >= 0:
+                del self._buffer[:index + len(separator)]
+                return
+            # Keep enough of the tail to match a separator split across chunks
+            del self._buffer[:max(len(self._buffer) - len(separator) + 1, 0)]
+            if not self._fill():
+                raise MultipartError("Multipart body has no boundary")
+
+    def at_close_delimiter(self) -> bool:
+        """After a delimiter: True for the closing "--", else consume the line break."""
+        self._ensure(2)
+        if self._buffer[:2] == b"--":
+            return True
+        line_end = self._buffer.find(b"\r\n")
+        while line_end < 0 and len(self._buffer) < MAX_HEADER_SIZE and self._fill():
+            line_end = self._buffer.find(b"\r\n")
+        # Only transport padding (linear whitespace) may follow the boundary
+        if line_end < 0 or self._buffer[:line_end].strip(b" \t"):
+            raise MultipartError("Malformed multipart boundary")
+        del self._buffer[:line_end + 2]
+        return False
+
+    def read_until(self, terminator: bytes, limit: int) -> bytes:
+        """Read and consume data up to a terminator (discarded)."""
+        start = 0
+        while True:
+            index = self._buffer.find(terminator, start)
+            if index >= 0:
+                data = bytes(self._buffer[:index])
+                del self._buffer[:index + len(terminator)]
+                return data
+            if len(self._buffer) > limit:
+                raise MultipartError("Multipart part headers too large")
+            start = max(len(self._buffer) - len(terminator) + 1, 0)
+            if not self._fill():
+                raise MultipartError("Unexpected end of multipart body")
+
+    def iter_until(self, separator: bytes) -> Iterator[bytes]:
+        """Yield data chunks up to a separator, then consume the separator."""
+        while True:
+            index = self._buffer.find(separator)
+            if index >= 0:
+                if index:
+                    yield bytes(self._buffer[:index])
+                del self._buffer[:index + len(separator)]
+                return
+            # The tail may be the start of a separator split across chunks
+            safe = len(self._buffer) - len(separator) + 1
+            if safe > 0:
+                yield bytes(self._buffer[:safe])
+                del self._buffer[:safe]
+            if not self._fill():
+                raise MultipartError("Unexpected end of multipart body")
+
+
+def _parse_headers(block: bytes) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    for line in block.decode("utf-8", errors="replace").split("\r\n"):
+        if not line:
+            continue
+        name, colon, value = line.partition(":")
+        if not colon:
+            raise MultipartError(f"Malformed multipart header: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _describe_part(headers: Dict[str, str]):
+    """Field name, filename (None for form fields) and content type of a part."""
+    disposition = headers.get("content-disposition")
+    if disposition is None:
+        raise MultipartError("Multipart part is missing Content-Disposition")
+    message = Message()
+    message["content-disposition"] = disposition
+    name = message.get_param("name", header="content-disposition")
+    if not isinstance(name, str):
+        raise MultipartError("Multipart part is missing a field name")
+    filename = message.get_filename()
+    default_type = "text/plain" if filename is None else "application/octet-stream"
+    return name, filename, headers.get("content-type", default_type)
+
+
+def _read_field(reader: _BodyReader, separator: bytes, name: str, content_type: str,
+                headers: Dict[str, str], config: MultipartConfig) -> FormField:
+    data = bytearray()
+    for chunk in reader.iter_until(separator):
+        data += chunk
+        if len(data) > config.max_field_size:
+            raise RequestEntityTooLarge(
+                config.max_field_size, f"Multipart field {name!r} exceeds {config.max_field_size} bytes"
+            )
+    message = Message()
+    message["content-type"] = content_type
+    charset = message.get_content_charset() or "utf-8"
+    try:
+        value = bytes(data).decode(charset)
+    except (LookupError, UnicodeDecodeError):
+        value = bytes(data).decode("latin-1")
+    return FormField(name, value, content_type, headers)
+
+
+def _read_file(reader: _BodyReader, separator: bytes, upload: UploadFile, config: MultipartConfig) -> UploadFile:
+    if config.file_sink is not None:
+        target = upload.sink = config.file_sink(upload)
+    else:
+        target = upload.file = cast(BinaryIO, tempfile.SpooledTemporaryFile(max_size=config.spool_threshold))
+    try:
+        for chunk in reader.iter_until(separator):
+            upload.size += len(chunk)
+            if config.max_part_size is not None and upload.size > config.max_part_size:
+                raise RequestEntityTooLarge(
+                    config.max_part_size, f"Multipart file {upload.name!r} exceeds {config.max_part_size} bytes"
+                )
+            target.write(chunk)
+    except BaseException:
+        if upload.file is not None:
+            upload.close()
+        else:
+            _abort_sink(target)
+        raise
+    if upload.file is not None:
+        upload.file.seek(0)
+    elif hasattr(target, "close"):
+        target.close()
+    return upload
+
+
+def _abort_sink(target: Any):
+    """Release a sink target whose part wasn't completed."""
+    abort = getattr(target, "abort", None)
+    if abort is None:
+        abort = getattr(target, "close", None)
+    if abort is not None:
+        abort()
@@ -0,0 +1,242 @@
+"""On-demand per-request profiling for RestMachine.
+
+Runs ``cProfile`` around a single request when it is triggered, either by a
+request header carrying a shared secret or by random sampling. The most recent
+profiles are kept in a ring buffer and can be listed, aggregated, formatted as
+text or dumped to ``.prof`` files for tools like snakeviz. Profiling is disabled
+unless configured, in which case the framework does no profiling work at all.
+
+Example:
+    app = RestApplication()
+
+    # Profile requests sent with "X-Restmachine-Profile: <token>", plus 0.1% of all traffic
+    profiler = app.enable_profiling(token=os.environ["PROFILE_TOKEN"], sample_rate=0.001)
+
+    # Later: print the slowest functions across all captured requests
+    print(profiler.format_stats())
+
+    # Or write a single request's profile for snakeviz
+    profiler.dump("request.prof", profile_id=3)
+
+Only one request is profiled at a time. ``cProfile`` (and on Python 3.12+
+``sys.monitoring``) allows a single active profiler per interpreter, so requests
+that would overlap an active profile run unprofiled and are counted in
+``RequestProfiler.skipped``.
+"""
+
+import cProfile
+import hmac
+import io
+import itertools
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from .models import Request
+
+PROFILE_HEADER = "X-Restmachine-Profile"
+PROFILE_ID_HEADER = "X-Restmachine-Profile-Id"
+
+T = TypeVar("T")
+
+
+@dataclass
+class ProfileRecord:
+    """A profile captured for one request.
+
+    Attributes:
+        profile_id: Sequential ID of the profile
+        timestamp: Unix time the request started
+        method: HTTP method
+        path: Request path
+        route: Matched route template, if any
+        status: Response status code
+        duration_ms: Time spent handling the request while profiled
+        trigger: What triggered profiling ("header" or "sampled")
+        stats: Collected profile statistics
+    """
+    profile_id: int
+    timestamp: float
+    method: str
+    path: str
+    route: Optional[str]
+    status: int
+    duration_ms: float
+    trigger: str
+    stats: pstats.Stats = field(repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary of the record without the profile statistics."""
+        return {
+            "profile_id": self.profile_id,
+            "timestamp": self.timestamp,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "trigger": self.trigger,
+        }
+
+
+def format_stats(stats: pstats.Stats, sort_by: str = "cumulative", limit: int = 40) -> str:
+    """Format profile statistics as the text table printed by pstats."""
+    stream = io.StringIO()
+    stats.stream = stream  # type: ignore[attr-defined]
+    stats.sort_stats(sort_by).print_stats(limit)
+    return stream.getvalue()
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps the most recent profiles.
+
+    Args:
+        header: Request header that triggers profiling when it carries the token
+        token: Shared secret for the header trigger. Without a token, requests can
+               only be profiled by sampling.
+        sample_rate: Fraction of requests to profile at random, from 0.0 to 1.0
+        capacity: Number of profiles to keep; the oldest are discarded first
+        sort_by: Default pstats sort key for format_stats()
+        limit: Default number of functions shown by format_stats()
+    """
+
+    def __init__(
+        self,
+        header: str = PROFILE_HEADER,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        capacity: int = 50,
+        sort_by: str = "cumulative",
+        limit: int = 40,
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Profiling: sample_rate must be between 0.0 and 1.0")
+        if capacity <= 0:
+            raise ValueError("Profiling: capacity must be positive")
+        if token is not None and not token:
+            raise ValueError("Profiling: token must not be empty")
+
+        self.header = header
+        self.token = token
+        self.sample_rate = sample_rate
+        self.sort_by = sort_by
+        self.limit = limit
+        self.skipped = 0
+        self.excluded_paths: List[str] = []
+
+        self._records: Deque[ProfileRecord] = deque(maxlen=capacity)
+        self._records_lock = threading.Lock()
+        self._active_lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def is_authorized(self, request: Request) -> bool:
+        """Whether the request carries the profiling token."""
+        if self.token is None:
+            return False
+        value = request.headers.get(self.header)
+        return value is not None and hmac.compare_digest(value.encode(), self.token.encode())
+
+    def get_trigger(self, request: Request) -> Optional[str]:
+        """Return why this request should be profiled, or None to skip it."""
+        path = request.path
+        if any(path == excluded or path.startswith(excluded + "/") for excluded in self.excluded_paths):
+            return None
+        if self.is_authorized(request):
+            return "header"
+        if self.sample_rate > 0.0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def run(self, func: Callable[[], T]) -> Tuple[T, Optional[pstats.Stats], float]:
+        """Call func under the profiler.
+
+        Returns:
+            The result of func, the collected statistics (None if another profile
+            was already running) and the elapsed time in seconds
+        """
+        if not self._active_lock.acquire(blocking=False):
+            self.skipped += 1
+            start = time.perf_counter()
+            return func(), None, time.perf_counter() - start
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiling tool (debugger, coverage) already owns the hook
+                self.skipped += 1
+                start = time.perf_counter()
+                return func(), None, time.perf_counter() - start
+
+            start = time.perf_counter()
+            try:
+                result = func()
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+        finally:
+            self._active_lock.release()
+
+        return result, pstats.Stats(profiler), duration
+
+    def add(self, stats: pstats.Stats, **fields: Any) -> ProfileRecord:
+        """Store a profile in the ring buffer and return its record."""
+        with self._records_lock:
+            record = ProfileRecord(profile_id=next(self._ids), stats=stats, **fields)
+            self._records.append(record)
+        return record
+
+    def records(self) -> List[ProfileRecord]:
+        """Stored profiles, oldest first."""
+        with self._records_lock:
+            return list(self._records)
+
+    def get(self, profile_id: int) -> Optional[ProfileRecord]:
+        """Look up a stored profile by ID."""
+        with self._records_lock:
+            return next((record for record in self._records if record.profile_id == profile_id), None)
+
+    def clear(self) -> None:
+        """Discard all stored profiles."""
+        with self._records_lock:
+            self._records.clear()
+
+    def aggregate(self, route: Optional[str] = None) -> Optional[pstats.Stats]:
+        """Combine stored profiles, optionally only those for one route template."""
+        records = [record for record in self.records() if route is None or record.route == route]
+        if not records:
+            return None
+        combined = pstats.Stats()
+        combined.add(*(record.stats for record in records))
+        return combined
+
+    def format_stats(self, profile_id: Optional[int] = None, route: Optional[str] = None,
+                     sort_by: Optional[str] = None, limit: Optional[int] = None) -> str:
+        """Format one profile, or the aggregate of stored profiles, as text."""
+        stats = self._select_stats(profile_id, route)
+        if stats is None:
+            return ""
+        return format_stats(stats, sort_by or self.sort_by, limit or self.limit)
+
+    def dump(self, path: str, profile_id: Optional[int] = None, route: Optional[str] = None) -> bool:
+        """Write one profile, or the aggregate of stored profiles, as a .prof file.
+
+        Returns:
+            False if there was nothing to write
+        """
+        stats = self._select_stats(profile_id, route)
+        if stats is None:
+            return False
+        stats.dump_stats(path)
+        return True
+
+    def _select_stats(self, profile_id: Optional[int], route: Optional[str]) -> Optional[pstats.Stats]:
+        if profile_id is None:
+            return self.aggregate(route)
+        record = self.get(profile_id)
+        return record.stats if record is not None else None
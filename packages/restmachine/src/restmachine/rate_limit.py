@@ -0,0 +1,250 @@
+"""Token-bucket rate limiting for RestMachine.
+
+Each client gets a bucket that holds up to ``burst`` tokens and refills at
+``limit`` tokens per ``period`` seconds. Every request takes one token;
+requests that find the bucket empty are rejected with 429 Too Many Requests
+and ``Retry-After``. The check runs right after the route is matched, before
+any other state or dependency, so rejecting an abusive client costs about a
+dict lookup.
+
+Clients are told about the limit with the ``RateLimit-Limit``,
+``RateLimit-Remaining``, ``RateLimit-Reset`` and ``RateLimit-Policy`` headers
+(IETF draft "RateLimit header fields for HTTP").
+
+Example:
+    app = RestApplication()
+    app.enable_rate_limit(limit=100, period=60, key=("api_key", "ip"))
+
+    @app.post("/login")
+    @app.rate_limit(limit=5, period=60)
+    def login(json_body):
+        ...
+
+Buckets are kept in a RateLimitStore. The default InMemoryRateLimitStore
+holds them in process, evicting the least recently used keys beyond
+``max_keys``; implement RateLimitStore to share buckets between processes
+(e.g. in Redis).
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .models import Request
+
+if TYPE_CHECKING:
+    from .application import RouteHandler
+
+DEFAULT_MAX_KEYS = 10000
+DEFAULT_API_KEY_HEADER = "X-API-Key"
+
+# Built-in key parts: the client address, the API key header and the route template
+KEY_PARTS = ("ip", "api_key", "route")
+
+RateLimitKey = Union[str, Sequence[str], Callable[[Request], str]]
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of taking a token from a bucket.
+
+    Attributes:
+        allowed: Whether the request may proceed.
+        remaining: Whole tokens left in the bucket.
+        reset_after: Seconds until the bucket is full again.
+        retry_after: Seconds until a token is available (0 when allowed).
+    """
+
+    allowed: bool
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+
+class RateLimitStore(ABC):
+    """Storage for token buckets, keyed by client."""
+
+    @abstractmethod
+    def consume(self, key: str, rate: float, capacity: int, cost: int = 1) -> RateLimitResult:
+        """Refill the bucket for key and take cost tokens from it if it has them.
+
+        Args:
+            key: Bucket key
+            rate: Tokens added per second
+            capacity: Maximum number of tokens in the bucket (new buckets start full)
+            cost: Tokens the request takes
+        """
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Token buckets held in process, bounded to the max_keys most recently used keys.
+
+    Buckets are updated without a lock. Under contention from several threads
+    a bucket can admit slightly more requests than its capacity, which keeps
+    the check to a few dict operations.
+    """
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS, clock: Callable[[], float] = time.monotonic):
+        if not isinstance(max_keys, int) or max_keys <= 0:
+            raise ValueError("max_keys must be a positive integer")
+        self.max_keys = max_keys
+        self._clock = clock
+        # Bucket per key: [tokens, time of the last refill]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, rate: float, capacity: int, cost: int = 1) -> RateLimitResult:
+        now = self._clock()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = [float(capacity), now]
+            buckets[key] = bucket
+            if len(buckets) > self.max_keys:
+                try:
+                    buckets.popitem(last=False)
+                except KeyError:
+                    pass
+            tokens = float(capacity)
+        else:
+            try:
+                buckets.move_to_end(key)
+            except KeyError:
+                # Evicted by another thread; the bucket still works for this request
+                pass
+            tokens = min(float(capacity), bucket[0] + (now - bucket[1]) * rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        bucket[0] = tokens
+        bucket[1] = now
+
+        return RateLimitResult(
+            allowed=allowed,
+            remaining=int(tokens),
+            reset_after=(capacity - tokens) / rate,
+            retry_after=0.0 if allowed else (cost - tokens) / rate,
+        )
+
+
+@dataclass
+class RateLimitConfig:
+    """Configuration for a token-bucket rate limit.
+
+    Attributes:
+        limit: Requests allowed per period (the refill rate).
+        period: Length of the period in seconds.
+        burst: Bucket capacity, i.e. requests allowed at once after a quiet spell.
+            Defaults to limit.
+        key: What identifies a client: "ip", "api_key", "route" (the route template),
+            a sequence of those combined, or a function from the Request to a key.
+        api_key_header: Request header holding the API key for the "api_key" key part.
+        store: Where buckets are kept (default: a new InMemoryRateLimitStore).
+        send_headers: Whether to add the RateLimit-* headers to admitted responses too.
+    """
+
+    limit: int
+    period: float = 60.0
+    burst: Optional[int] = None
+    key: RateLimitKey = "ip"
+    api_key_header: str = DEFAULT_API_KEY_HEADER
+    store: RateLimitStore = field(default_factory=InMemoryRateLimitStore)
+    send_headers: bool = True
+
+    def validate(self) -> None:
+        """Validate the configuration.
+
+        Raises:
+            ValueError: If a setting is out of range or a key part is unknown.
+        """
+        if not isinstance(self.limit, int) or self.limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        if self.period <= 0:
+            raise ValueError("period must be positive")
+        if self.burst is not None and (not isinstance(self.burst, int) or self.burst <= 0):
+            raise ValueError("burst must be a positive integer")
+        if not callable(self.key):
+            parts = (self.key,) if isinstance(self.key, str) else tuple(self.key)
+            if not parts:
+                raise ValueError("key needs at least one part")
+            for part in parts:
+                if part not in KEY_PARTS:
+                    raise ValueError(f"Unknown key part: {part!r} (expected one of {', '.join(KEY_PARTS)})")
+
+    @property
+    def capacity(self) -> int:
+        """Bucket capacity."""
+        return self.burst if self.burst is not None else self.limit
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.limit / self.period
+
+    def key_for(self, request: Request, route: Optional['RouteHandler']) -> str:
+        """Build the bucket key for a request."""
+        if callable(self.key):
+            return str(self.key(request))
+        if isinstance(self.key, str):
+            return self._key_part(self.key, request, route)
+        return "|".join(self._key_part(part, request, route) for part in self.key)
+
+    def _key_part(self, part: str, request: Request, route: Optional['RouteHandler']) -> str:
+        if part == "ip":
+            return request.client_ip or "-"
+        if part == "api_key":
+            return request.headers.get(self.api_key_header) or "-"
+        return route.path if route is not None else request.path
+
+    def check(self, request: Request, route: Optional['RouteHandler']) -> RateLimitResult:
+        """Take a token for the request from its client's bucket."""
+        return self.store.consume(self.key_for(request, route), self.rate, self.capacity)
+
+    def headers(self, result: RateLimitResult) -> Dict[str, str]:
+        """RateLimit-* (and, when rejected, Retry-After) headers describing result."""
+        headers = {
+            "RateLimit-Limit": str(self.capacity),
+            "RateLimit-Remaining": str(result.remaining),
+            "RateLimit-Reset": str(math.ceil(result.reset_after)),
+            "RateLimit-Policy": f"{self.capacity};w={_format_seconds(self.period)}",
+        }
+        if not result.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+        return headers
+
+
+def _format_seconds(seconds: float) -> str:
+    return str(int(seconds)) if float(seconds).is_integer() else str(seconds)
+
+
+def make_rate_limit_config(
+    limit: int,
+    period: float,
+    burst: Optional[int],
+    key: RateLimitKey,
+    api_key_header: str,
+    store: Optional[RateLimitStore],
+    send_headers: bool,
+) -> RateLimitConfig:
+    """Build and validate a RateLimitConfig from decorator and method arguments."""
+    kwargs: Dict[str, Any] = {}
+    if store is not None:
+        kwargs["store"] = store
+    config = RateLimitConfig(
+        limit=limit,
+        period=period,
+        burst=burst,
+        key=key,
+        api_key_header=api_key_header,
+        send_headers=send_headers,
+        **kwargs,
+    )
+    config.validate()
+    return config
+
@@ -0,0 +1,172 @@
+"""
+Parse-once cache for request bodies.
+
+Several dependencies can ask for the same request body: ``body`` for custom
+``@app.accepts`` parsers, ``json_body``/``form_body``/``text_body`` for the
+built-in parsers, and validators that depend on any of them. The cache reads
+the raw bytes from the body stream once, picks the charset once, and keeps
+each parsed representation so every dependency that asks for it gets the same
+value without going back to the stream.
+
+The raw bytes are held in memory for the rest of the request, so a body that
+was spooled to a temporary file (see ``BytesStreamBuffer``) is in memory as
+well once a built-in parser has read it. Handlers that must keep large
+uploads out of memory should read ``request.body`` incrementally instead of
+injecting ``body``, ``json_body``, ``form_body`` or ``text_body``.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, cast
+from urllib.parse import parse_qs
+
+
+def extract_charset(content_type: Optional[str]) -> Optional[str]:
+    """Extract the charset parameter from a Content-Type header.
+
+    Args:
+        content_type: Content-Type header value (e.g., "application/json; charset=utf-8")
+
+    Returns:
+        The charset parameter value, or None if not specified
+    """
+    if not content_type:
+        return None
+
+    # Split on semicolon to get parameters
+    parts = content_type.split(';')
+    for part in parts[1:]:  # Skip the media type itself
+        part = part.strip()
+        if part.lower().startswith('charset='):
+            charset = part.split('=', 1)[1].strip()
+            # Remove quotes if present
+            if charset.startswith('"') and charset.endswith('"'):
+                charset = charset[1:-1]
+            if charset.startswith("'") and charset.endswith("'"):
+                charset = charset[1:-1]
+            return charset
+    return None
+
+
+def decode_with_fallback(data: bytes, charset: Optional[str] = None) -> Tuple[str, str]:
+    """Decode bytes with the given charset, falling back to UTF-8 and then Latin1.
+
+    Args:
+        data: Bytes to decode
+        charset: Charset from the Content-Type header, if any
+
+    Returns:
+        The decoded text and the encoding that decoded it
+    """
+    if charset:
+        try:
+            return data.decode(charset), charset
+        except (UnicodeDecodeError, LookupError):
+            # Charset specified but failed - continue to fallbacks
+            pass
+
+    try:
+        return data.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # Latin1 (ISO-8859-1) maps every byte value to a code point, so it always succeeds
+    return data.decode('latin1'), 'latin1'
+
+
+def parse_form(text: str) -> Dict[str, Any]:
+    """Parse an application/x-www-form-urlencoded body, keeping repeated names as lists."""
+    parsed = parse_qs(text, keep_blank_values=True)
+    return {key: values[0] if len(values) == 1 else values for key, values in parsed.items()}
+
+
+class RequestBodyCache:
+    """Request body read once, with each parsed representation memoized.
+
+    The raw bytes are read from the stream on first use, and the stream is
+    rewound afterwards so parsers that read ``request.body`` directly still
+    see the whole body. Decoding and parsing errors are not cached; they
+    propagate to the caller each time.
+
+    Example::
+
+        cache = request.body_cache
+        cache.text()   # decoded once with the Content-Type charset
+        cache.json()   # parsed once from the decoded text
+        cache.parse("csv", parse_csv)  # memoize a custom representation
+    """
+
+    __slots__ = ("_body", "content_type", "_raw", "_text", "encoding", "_parsed")
+
+    def __init__(self, body: Any, content_type: Optional[str] = None):
+        self._body = body
+        self.content_type = content_type
+        self._raw: Optional[bytes] = None
+        self._text: Optional[str] = None
+        # Encoding used to decode the text, once text() has been called
+        self.encoding: Optional[str] = None
+        self._parsed: Dict[Any, Any] = {}
+
+    def raw(self) -> bytes:
+        """Return the raw body bytes, reading the stream on first call."""
+        if self._raw is None:
+            body = self._body
+            if body is None:
+                self._raw = b""
+            elif hasattr(body, 'read'):
+                self._raw = body.read() or b""
+                # Rewind so parsers that read the stream directly can re-read it
+                if hasattr(body, 'seek'):
+                    body.seek(0)
+            elif isinstance(body, bytes):
+                self._raw = body
+            else:
+                self._raw = str(body).encode('utf-8')
+        return self._raw
+
+    def text(self) -> str:
+        """Return the body decoded with the Content-Type charset, UTF-8 or Latin1."""
+        if self._text is None:
+            if isinstance(self._body, str):
+                self._text, self.encoding = self._body, 'utf-8'
+            else:
+                self._text, self.encoding = decode_with_fallback(self.raw(), extract_charset(self.content_type))
+        return self._text
+
+    def parse(self, kind: Any, parser: Callable[[str], Any]) -> Any:
+        """Parse the decoded text with parser once, and return the same value afterwards.
+
+        Args:
+            kind: Name of the representation, used as the cache key
+            parser: Function from the decoded text to the parsed value
+        """
+        if kind not in self._parsed:
+            self._parsed[kind] = parser(self.text())
+        return self._parsed[kind]
+
+    def json(self) -> Any:
+        """Return the body parsed as JSON."""
+        return self.parse("json", json.loads)
+
+    def form(self) -> Dict[str, Any]:
+        """Return the body parsed as application/x-www-form-urlencoded data."""
+        return cast(Dict[str, Any], self.parse("form", parse_form))
+
+    def validate_json(self, adapter: Any) -> Any:
+        """Return the body validated by a Pydantic TypeAdapter straight from the JSON bytes.
+
+        The raw bytes go to ``adapter.validate_json`` without building the
+        intermediate dicts; bodies declared in a charset other than UTF-8 are
+        validated from the decoded text instead. The validated value is
+        memoized per adapter.
+
+        Raises:
+            pydantic.ValidationError: If the body is not valid JSON or doesn't match the type
+        """
+        if adapter not in self._parsed:
+            charset = extract_charset(self.content_type)
+            if isinstance(self._body, str) or (charset and charset.lower().replace('_', '-') not in ('utf-8', 'utf8')):
+                data: Any = self.text()
+            else:
+                data = self.raw()
+            self._parsed[adapter] = adapter.validate_json(data)
+        return self._parsed[adapter]
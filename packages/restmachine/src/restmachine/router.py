@@ -1,10 +1,16 @@
 """Router module for organizing routes with mounting support."""
 
-from typing import Callable, List, Literal, Optional, Tuple, Dict, Any, Union, TYPE_CHECKING
-from .models import HTTPMethod
+from typing import Callable, List, Literal, Optional, Sequence, Tuple, Dict, Any, Union, TYPE_CHECKING
+from .models import HTTPMethod, Request
 from .dependencies import Dependency, AcceptsWrapper, DependencyScope
 from .cors import CORSConfig
 from .csp import CSPConfig
+from .executor import validate_execution_mode
+from .streaming import validate_body_size
+from .auto_etag import AutoETagConfig
+from .coalescing import SingleFlight
+from .concurrency import ConcurrencyLimiter, validate_priority
+from .rate_limit import DEFAULT_API_KEY_HEADER, RateLimitKey, RateLimitStore, make_rate_limit_config
 
 if TYPE_CHECKING:
     from .application import RouteHandler
@@ -279,6 +285,8 @@ class Router:
             normalized_route.content_renderers = route.content_renderers.copy()
             normalized_route.validation_wrappers = route.validation_wrappers.copy()
             normalized_route.cors_config = route.cors_config
+            normalized_route.execution_mode = route.execution_mode
+            normalized_route.max_body_size = route.max_body_size
             routes.append((normalized_path, normalized_route))
 
         # Add routes from mounted routers
@@ -330,6 +338,38 @@ class Router:
                 route.csp_config = func._restmachine_csp_config
                 delattr(func, '_restmachine_csp_config')  # Clean up marker
 
+            # Check if function has execution mode marker (from @execution decorator)
+            if hasattr(func, '_restmachine_execution_mode'):
+                route.execution_mode = func._restmachine_execution_mode
+                delattr(func, '_restmachine_execution_mode')  # Clean up marker
+
+            # Check if function has body size marker (from @max_body_size decorator)
+            if hasattr(func, '_restmachine_max_body_size'):
+                route.max_body_size = func._restmachine_max_body_size
+                delattr(func, '_restmachine_max_body_size')  # Clean up marker
+
+            # Check if function has admission marker (from @concurrency_limit decorator)
+            if hasattr(func, '_restmachine_concurrency'):
+                route.concurrency_priority, route.concurrency_limiter = func._restmachine_concurrency
+                delattr(func, '_restmachine_concurrency')  # Clean up marker
+
+            # Check if function has rate limit marker (from @rate_limit decorator)
+            if hasattr(func, '_restmachine_rate_limit'):
+                route.rate_limit = func._restmachine_rate_limit
+                route.rate_limit_exempt = route.rate_limit is None
+                delattr(func, '_restmachine_rate_limit')  # Clean up marker
+
+            # Check if function has automatic ETag marker (from @auto_etag decorator)
+            if hasattr(func, '_restmachine_auto_etag'):
+                route.auto_etag = func._restmachine_auto_etag
+                route.auto_etag_exempt = route.auto_etag is None
+                delattr(func, '_restmachine_auto_etag')  # Clean up marker
+
+            # Check if function has coalescing marker (from @coalesce decorator)
+            if hasattr(func, '_restmachine_single_flight'):
+                route.single_flight = func._restmachine_single_flight
+                delattr(func, '_restmachine_single_flight')  # Clean up marker
+
             self._routes.append(route)
 
             # Resolve state machine callbacks if app is available
@@ -589,6 +629,198 @@ class Router:
         # Return decorator function
         return decorator
 
+    def execution(self, mode: str):
+        """Route decorator choosing how the ASGI adapter runs this route.
+
+        Overrides the adapter's default execution mode for one endpoint:
+            ```python
+            @api_router.get("/health")
+            @api_router.execution("inline")
+            def health():
+                return {"status": "ok"}
+            ```
+
+        Args:
+            mode: "inline" to run on the event loop (only for CPU-trivial handlers
+                  that never block on I/O) or "thread" to run in the thread pool
+
+        Returns:
+            Decorator function
+        """
+        validate_execution_mode(mode)
+
+        def decorator(func: Callable):
+            # Mark the function so the route decorator can pick up the mode
+            func._restmachine_execution_mode = mode  # type: ignore
+            return func
+
+        return decorator
+
+    def max_body_size(self, limit: int):
+        """Route decorator limiting the size of request bodies for this endpoint.
+
+        Overrides the application's limit (see RestApplication.set_max_body_size):
+            ```python
+            @api_router.post("/avatars")
+            @api_router.max_body_size(5 * 1024 * 1024)
+            def upload_avatar(request):
+                ...
+            ```
+
+        Args:
+            limit: Maximum body size in bytes
+
+        Returns:
+            Decorator function
+        """
+        if limit is None:
+            raise ValueError("max_body_size() needs a limit; routes without one use the app-level limit")
+        validate_body_size(limit)
+
+        def decorator(func: Callable):
+            # Mark the function so the route decorator can pick up the limit
+            func._restmachine_max_body_size = limit  # type: ignore
+            return func
+
+        return decorator
+
+    def concurrency_limit(self, priority: str = "normal", limiter: Optional[ConcurrencyLimiter] = None):
+        """Route decorator setting how this endpoint is admitted under load.
+
+        See RestApplication.enable_concurrency_limit:
+            ```python
+            @api_router.get("/health")
+            @api_router.concurrency_limit(priority="critical")
+            def health():
+                return {"status": "ok"}
+            ```
+
+        Args:
+            priority: "critical" (never shed), "normal", or "low" (shed first)
+            limiter: A ConcurrencyLimiter for this route instead of the app-level one;
+                     one limiter can be shared by several routes
+
+        Returns:
+            Decorator function
+        """
+        validate_priority(priority)
+
+        def decorator(func: Callable):
+            # Mark the function so the route decorator can pick up the settings
+            func._restmachine_concurrency = (priority, limiter)  # type: ignore
+            return func
+
+        return decorator
+
+    def auto_etag(self, enabled: bool = True, weak: bool = False):
+        """Route decorator hashing this endpoint's response bodies into ETags.
+
+        Overrides the application setting (see RestApplication.enable_auto_etag);
+        pass False to turn automatic ETags off for the route:
+            ```python
+            @api_router.get("/report")
+            @api_router.auto_etag()
+            def report():
+                ...
+            ```
+
+        Args:
+            enabled: Whether to compute ETags for this route
+            weak: Send weak ETags
+
+        Returns:
+            Decorator function
+        """
+        config = AutoETagConfig(weak=weak) if enabled else None
+
+        def decorator(func: Callable):
+            # Mark the function so the route decorator can pick up the setting
+            func._restmachine_auto_etag = config  # type: ignore
+            return func
+
+        return decorator
+
+    def coalesce(
+        self,
+        vary: Sequence[str] = (),
+        headers: Optional[Callable[[Request], Dict[str, str]]] = None,
+    ):
+        """Route decorator sharing one response between identical concurrent GET requests.
+
+        The first request runs as usual; identical requests that arrive while it
+        is running wait for it and get a copy of its response, without running
+        the authorization callbacks (see restmachine.coalescing):
+            ```python
+            @api_router.get("/catalog")
+            @api_router.coalesce()
+            def catalog(products):
+                ...
+            ```
+
+        Args:
+            vary: Request headers that select the response, in addition to
+                  Accept, Accept-Encoding, Accept-Language, Authorization, Cookie,
+                  Origin, Range and the conditional request headers (the client
+                  address, TLS state and client certificate are always included)
+            headers: Function from the Request to headers that must differ per
+                     request (e.g. a request ID), set on every response
+
+        Returns:
+            Decorator function
+        """
+        single_flight = SingleFlight(vary, headers)
+
+        def decorator(func: Callable):
+            # Mark the function so the route decorator can pick up the coalescing group
+            func._restmachine_single_flight = single_flight  # type: ignore
+            return func
+
+        return decorator
+
+    def rate_limit(
+        self,
+        limit: Optional[int],
+        period: float = 60.0,
+        burst: Optional[int] = None,
+        key: RateLimitKey = "ip",
+        api_key_header: str = DEFAULT_API_KEY_HEADER,
+        store: Optional[RateLimitStore] = None,
+        send_headers: bool = True,
+    ):
+        """Route decorator giving this endpoint its own token-bucket rate limit.
+
+        Overrides the application's limit (see RestApplication.enable_rate_limit);
+        pass None to exempt the route from it:
+            ```python
+            @api_router.post("/login")
+            @api_router.rate_limit(5, period=60)
+            def login(json_body):
+                ...
+            ```
+
+        Args:
+            limit: Requests allowed per period, or None for no limit on this route
+            period: Length of the period in seconds
+            burst: Requests allowed at once after a quiet spell (defaults to limit)
+            key: "ip", "api_key", "route", a sequence of those, or a function of the Request
+            api_key_header: Header holding the API key for the "api_key" key part
+            store: Where buckets are kept (default: a new in-process store for this route)
+            send_headers: Whether to add RateLimit-* headers to admitted responses
+
+        Returns:
+            Decorator function
+        """
+        config = None
+        if limit is not None:
+            config = make_rate_limit_config(limit, period, burst, key, api_key_header, store, send_headers)
+
+        def decorator(func: Callable):
+            # Mark the function so the route decorator can pick up the limit
+            func._restmachine_rate_limit = config  # type: ignore
+            return func
+
+        return decorator
+
     def match_route(self, path: str, method: HTTPMethod) -> Optional[Tuple[Any, Dict[str, str]]]:
         """Match a route using the trie structure.
 
@@ -5,62 +5,80 @@ Following webmachine-ruby's pattern: each state is a method that returns
 either the next method to call or a Response object.
 """
 
-import inspect
 import json
 import logging
-from dataclasses import dataclass, field
+import time
 from http import HTTPStatus
-from typing import Union, Callable, Optional, cast, Any, Dict, List, get_origin, get_args, TYPE_CHECKING
+from typing import Union, Callable, Optional, cast, Any, Dict, List, get_origin, TYPE_CHECKING
 from datetime import datetime
 
 from restmachine.models import Request, Response, HTTPMethod, etags_match, MultiValueHeaders
+from restmachine.content_renderers import JSONRenderer, StreamingRenderer
 from restmachine.dependencies import DependencyWrapper
 from restmachine.error_models import ErrorResponse
-from restmachine.exceptions import PYDANTIC_AVAILABLE, ValidationError, AcceptsParsingError
+from restmachine.exceptions import PYDANTIC_AVAILABLE, ValidationError, AcceptsParsingError, RequestEntityTooLarge
+from restmachine.metrics import MetricUnit
+from restmachine.streaming import is_iterator_body
+from restmachine.compression import compress_response, decompress_request_body, is_supported_content_encoding
+from restmachine.validator_cache import ValidatorCache
 
 if TYPE_CHECKING:
     from restmachine.application import RestApplication, RouteHandler
+    from restmachine.coalescing import SingleFlight
+    from restmachine.concurrency import ConcurrencyLimiter
     from restmachine.content_renderers import ContentRenderer
     from restmachine.cors import CORSConfig
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
 class StateContext:
-    """Shared context for state machine execution.
+    """Per-request context for state machine execution.
 
     This contains all the information needed by state methods to make decisions
-    and perform their operations.
+    and perform their operations. One is created per request and passed to
+    every state, so the state machine itself holds no request state.
     """
-    app: 'RestApplication'
-    request: 'Request'
-    route_handler: Optional['RouteHandler'] = None
-    chosen_renderer: Optional['ContentRenderer'] = None
-    handler_dependencies: List[str] = field(default_factory=list)
-    dependency_callbacks: Dict[str, 'DependencyWrapper'] = field(default_factory=dict)
-    handler_result: Any = None
+
+    __slots__ = (
+        "app", "request", "route_handler", "chosen_renderer",
+        "handler_dependencies", "dependency_callbacks", "handler_result",
+        "limiter", "admitted_at", "rate_limit_headers",
+    )
+
+    def __init__(self, app: 'RestApplication', request: 'Request'):
+        self.app = app
+        self.request = request
+        self.route_handler: Optional['RouteHandler'] = None
+        self.chosen_renderer: Optional['ContentRenderer'] = None
+        self.handler_dependencies: List[str] = []
+        self.dependency_callbacks: Dict[str, 'DependencyWrapper'] = {}
+        self.handler_result: Any = None
+        # Concurrency limiter that admitted the request, released when it completes
+        self.limiter: Optional['ConcurrencyLimiter'] = None
+        self.admitted_at = 0.0
+        # RateLimit-* headers for the response, when the route is rate limited
+        self.rate_limit_headers: Optional[Dict[str, str]] = None
 
 
 class RequestStateMachine:
     """Webmachine-style state machine using methods for states.
 
-    Each state is a method that returns either:
+    Each state is a method that takes the request's StateContext and returns either:
     - Another method (next state)
     - A Response object (terminal state)
 
-    This eliminates all state object creation overhead.
+    This eliminates all state object creation overhead. The machine keeps no
+    per-request state, so one instance serves every request to an app,
+    including concurrent requests on worker threads.
     """
 
-    def __init__(self, app):
+    def __init__(self, app: 'RestApplication'):
         self.app = app
-        # ctx is initialized in process_request before any state methods are called
-        self.ctx: StateContext  # type: ignore[misc]
 
     def process_request(self, request: Request) -> Response:
         """Process a request through the state machine."""
-        # Initialize context
-        self.ctx = StateContext(app=self.app, request=request)
+        ctx = StateContext(self.app, request)
 
         # Preserve metrics if set by platform adapter
         metrics = self.app._dependency_cache.get("metrics")
@@ -68,78 +86,110 @@ class RequestStateMachine:
         if metrics is not None:
             self.app._dependency_cache.set("metrics", metrics)
 
-        logger.debug(f"State machine v2: {request.method.value} {request.path}")
+        response: Optional[Response] = None
+        try:
+            response = self._run_states(ctx)
+            if self.app._validator_cache is not None:
+                self._invalidate_cached_validators(ctx, response)
+            if ctx.rate_limit_headers is not None:
+                if response.headers is None:
+                    response.headers = MultiValueHeaders()
+                response.headers.update(ctx.rate_limit_headers)
+            return response
+        finally:
+            if ctx.limiter is not None:
+                ctx.limiter.release(
+                    time.perf_counter() - ctx.admitted_at,
+                    dropped=response is None or response.status_code >= 500,
+                )
+
+    def _run_states(self, ctx: StateContext, start: Optional[Callable] = None) -> Response:
+        """Run the states for a request, from start (default: the first state) until one returns a Response."""
+        request = ctx.request
+
+        # Check once so the hot loop below doesn't build log messages nobody will see
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug and start is None:
+            logger.debug("State machine v2: %s %s", request.method.value, request.path)
 
         # Start with first state method
-        current: Union[Callable, Response] = self.state_route_exists
+        current: Union[Callable, Response] = start if start is not None else self.state_route_exists
 
         state_count = 0
         max_states = 50
+        tracer = self.app._tracer
 
         # Execute state methods until we get a Response
         while not isinstance(current, Response):
             state_count += 1
 
             if state_count > max_states:
-                logger.error(f"State machine exceeded max states ({max_states})")
+                logger.error("State machine exceeded max states (%d)", max_states)
                 return self._create_error_response(
-                    HTTPStatus.INTERNAL_SERVER_ERROR,
+                    ctx, HTTPStatus.INTERNAL_SERVER_ERROR,
                     "Internal error: state machine loop detected"
                 )
 
-            state_name = current.__name__
-            logger.debug(f"  [{state_count}] → {state_name}")
+            if debug:
+                logger.debug("  [%d] → %s", state_count, current.__name__)
 
+            state = current
             try:
-                current = current()
+                if tracer is None:
+                    current = state(ctx)
+                else:
+                    with tracer.start_span(state.__name__):
+                        current = state(ctx)
             except Exception as e:
-                logger.error(f"Error in state {state_name}: {e}", exc_info=True)
+                logger.error("Error in state %s: %s", state.__name__, e, exc_info=True)
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.INTERNAL_SERVER_ERROR,
-                    f"Internal error in {state_name}: {str(e)}"
+                    ctx, HTTPStatus.INTERNAL_SERVER_ERROR,
+                    f"Internal error in {state.__name__}: {str(e)}"
                 )
 
-        logger.debug(f"  ✓ Complete in {state_count} states: {current.status_code}")
+        if debug:
+            logger.debug("  ✓ Complete in %d states: %s", state_count, current.status_code)
         return current
 
     # ========================================================================
     # STATE METHODS (following webmachine pattern)
     # ========================================================================
 
-    def state_route_exists(self) -> Union[Callable, Response]:
+    def state_route_exists(self, ctx: StateContext) -> Union[Callable, Response]:
         """B13: Check if route exists."""
-        route_match = self.app._find_route(self.ctx.request.method, self.ctx.request.path)
+        with self.app._start_span("route.match"):
+            route_match = self.app._match_request(ctx.request)
 
         if route_match is None:
-            if self.app._path_has_routes(self.ctx.request.path):
+            if self.app._path_has_routes(ctx.request.path):
                 # Check for CORS preflight (OPTIONS with Origin header) before returning 405
-                if self.ctx.request.method == HTTPMethod.OPTIONS:
-                    origin = self.ctx.request.headers.get("Origin")
+                if ctx.request.method == HTTPMethod.OPTIONS:
+                    origin = ctx.request.headers.get("Origin")
                     if origin:
                         # This is a CORS preflight request
                         # Try to find a route handler for other methods to get route-level CORS config
                         route_handler = None
                         for method in HTTPMethod:
                             if method != HTTPMethod.OPTIONS:
-                                match_result = self.app._root_router.match_route(self.ctx.request.path, method)
+                                match_result = self.app._root_router.match_route(ctx.request.path, method)
                                 if match_result:
                                     route_handler, _ = match_result
                                     break
 
                         # Get CORS config (checking route-level if we found a handler)
-                        cors_config = self.app._get_cors_config(route_handler, path=self.ctx.request.path)
+                        cors_config = self.app._get_cors_config(route_handler, path=ctx.request.path)
                         if cors_config and cors_config.matches_origin(origin):
                             # Set up minimal context for preflight response
-                            self.ctx.request.path_params = {}
-                            return self._create_cors_preflight_response(cors_config, origin)
+                            ctx.request.path_params = {}
+                            return self._create_cors_preflight_response(ctx, cors_config, origin)
 
                 # Get allowed methods for this path
-                allowed_methods = self.app._root_router.get_methods_for_path(self.ctx.request.path)
+                allowed_methods = self.app._root_router.get_methods_for_path(ctx.request.path)
                 allow_header = ", ".join([m.value for m in allowed_methods])
 
                 return self._create_error_response(
-                    HTTPStatus.METHOD_NOT_ALLOWED,
+                    ctx, HTTPStatus.METHOD_NOT_ALLOWED,
                     "Method Not Allowed",
                     headers={"Allow": allow_header}
                 )
@@ -147,124 +197,160 @@ class RequestStateMachine:
             callback = self.app._default_callbacks.get("route_not_found")
             if callback:
                 try:
-                    response = self.app._call_with_injection(callback, self.ctx.request, None)
+                    response = self.app._call_with_injection(callback, ctx.request, None)
                     if isinstance(response, Response):
                         return response
                 except Exception as e:
-                    logger.error(f"Error in route_not_found callback: {e}")
+                    logger.error("Error in route_not_found callback: %s", e)
 
-            return self._create_error_response(HTTPStatus.NOT_FOUND, "Not Found")
+            return self._create_error_response(ctx, HTTPStatus.NOT_FOUND, "Not Found")
 
         # Populate context
-        self.ctx.route_handler, path_params = route_match
-        self.ctx.request.path_params = path_params
-        self.ctx.handler_dependencies = list(self.ctx.route_handler.param_info.keys())
+        ctx.route_handler, path_params = route_match
+        ctx.request.path_params = path_params
+        self.app._dependency_cache.set("__current_route__", ctx.route_handler)
+        ctx.handler_dependencies = list(ctx.route_handler.param_info.keys())
 
         # Generate CSP nonce early if needed (before handler execution)
         csp_config = self.app._get_csp_config(
-            self.ctx.route_handler,
-            path=self.ctx.request.path,
-            request=self.ctx.request
+            ctx.route_handler,
+            path=ctx.request.path,
+            request=ctx.request
         )
         if csp_config and csp_config.nonce:
             import secrets
             nonce_value = secrets.token_urlsafe(32)
-            self.ctx.request.csp_nonce = nonce_value  # type: ignore
+            ctx.request.csp_nonce = nonce_value
 
         # Copy pre-resolved state callbacks
-        for state_name, callback in self.ctx.route_handler.state_callbacks.items():
+        for state_name, callback in ctx.route_handler.state_callbacks.items():
             wrapper = DependencyWrapper(callback, state_name, callback.__name__)
-            self.ctx.dependency_callbacks[state_name] = wrapper
+            ctx.dependency_callbacks[state_name] = wrapper
 
         # Handle CORS preflight (OPTIONS with Origin header)
-        if self.ctx.request.method == HTTPMethod.OPTIONS:
-            origin = self.ctx.request.headers.get("Origin")
+        if ctx.request.method == HTTPMethod.OPTIONS:
+            origin = ctx.request.headers.get("Origin")
             if origin:
                 # This is a CORS preflight request
-                cors_config = self.app._get_cors_config(self.ctx.route_handler)
+                cors_config = self.app._get_cors_config(ctx.route_handler)
                 if cors_config and cors_config.matches_origin(origin):
-                    return self._create_cors_preflight_response(cors_config, origin)
-
+                    return self._create_cors_preflight_response(ctx, cors_config, origin)
+
+        if self.app._rate_limit is not None or ctx.route_handler.rate_limit is not None:
+            return self.state_rate_limited
+        return self._admission_state(ctx)
+
+    def state_rate_limited(self, ctx: StateContext) -> Union[Callable, Response]:
+        """Reject the request with 429 if its client's token bucket is empty."""
+        config = self.app._get_rate_limit(ctx.route_handler)
+        if config is None:
+            return self._admission_state(ctx)
+
+        result = config.check(ctx.request, ctx.route_handler)
+        if not result.allowed:
+            return self._create_error_response(
+                ctx, HTTPStatus.TOO_MANY_REQUESTS, "Too Many Requests", headers=config.headers(result)
+            )
+        if config.send_headers:
+            ctx.rate_limit_headers = config.headers(result)
+        return self._admission_state(ctx)
+
+    def _admission_state(self, ctx: StateContext) -> Callable:
+        """State after routing and rate limiting: coalescing when enabled, else admission."""
+        if ctx.route_handler is not None and ctx.route_handler.single_flight is not None:
+            return self.state_coalesced
         return self.state_service_available
 
-    def state_service_available(self) -> Union[Callable, Response]:
+    def state_coalesced(self, ctx: StateContext) -> Response:
+        """Run the rest of the request, or share the response of an identical one in flight."""
+        route = cast("RouteHandler", ctx.route_handler)
+        single_flight = cast("SingleFlight", route.single_flight)
+        return single_flight.run(ctx.request, lambda: self._run_states(ctx, self.state_service_available))
+
+    def state_service_available(self, ctx: StateContext) -> Union[Callable, Response]:
         """B12: Check if service is available."""
-        callback = self._get_callback("service_available")
+        limiter = self.app._get_concurrency_limiter(ctx.route_handler)
+        if limiter is not None:
+            shed_response = self._admit_request(ctx, limiter)
+            if shed_response is not None:
+                return shed_response
+
+        callback = self._get_callback(ctx, "service_available")
         if callback:
             try:
                 available = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if not available:
                     return self._create_error_response(
-                        HTTPStatus.SERVICE_UNAVAILABLE, "Service Unavailable"
+                        ctx, HTTPStatus.SERVICE_UNAVAILABLE, "Service Unavailable"
                     )
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.SERVICE_UNAVAILABLE, f"Service check failed: {str(e)}"
+                    ctx, HTTPStatus.SERVICE_UNAVAILABLE, f"Service check failed: {str(e)}"
                 )
 
         return self.state_known_method
 
-    def state_known_method(self) -> Union[Callable, Response]:
+    def state_known_method(self, ctx: StateContext) -> Union[Callable, Response]:
         """B11: Check if HTTP method is known."""
-        callback = self._get_callback("known_method")
+        callback = self._get_callback(ctx, "known_method")
         if callback:
             try:
                 known = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if not known:
-                    return self._create_error_response(HTTPStatus.NOT_IMPLEMENTED, "Not Implemented")
+                    return self._create_error_response(ctx, HTTPStatus.NOT_IMPLEMENTED, "Not Implemented")
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.NOT_IMPLEMENTED, f"Method check failed: {str(e)}"
+                    ctx, HTTPStatus.NOT_IMPLEMENTED, f"Method check failed: {str(e)}"
                 )
         else:
             known_methods = {
                 HTTPMethod.GET, HTTPMethod.POST, HTTPMethod.PUT,
                 HTTPMethod.DELETE, HTTPMethod.PATCH, HTTPMethod.OPTIONS
             }
-            if self.ctx.request.method not in known_methods:
-                return self._create_error_response(HTTPStatus.NOT_IMPLEMENTED, "Not Implemented")
+            if ctx.request.method not in known_methods:
+                return self._create_error_response(ctx, HTTPStatus.NOT_IMPLEMENTED, "Not Implemented")
 
         return self.state_uri_too_long
 
-    def state_uri_too_long(self) -> Union[Callable, Response]:
+    def state_uri_too_long(self, ctx: StateContext) -> Union[Callable, Response]:
         """B10: Check if URI is too long."""
-        callback = self._get_callback("uri_too_long")
+        callback = self._get_callback(ctx, "uri_too_long")
         if callback:
             try:
                 too_long = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if too_long:
-                    return self._create_error_response(HTTPStatus.REQUEST_URI_TOO_LONG, "URI Too Long")
+                    return self._create_error_response(ctx, HTTPStatus.REQUEST_URI_TOO_LONG, "URI Too Long")
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.REQUEST_URI_TOO_LONG, f"URI check failed: {str(e)}"
+                    ctx, HTTPStatus.REQUEST_URI_TOO_LONG, f"URI check failed: {str(e)}"
                 )
 
         return self.state_method_allowed
 
-    def state_method_allowed(self) -> Union[Callable, Response]:
+    def state_method_allowed(self, ctx: StateContext) -> Union[Callable, Response]:
         """B9: Check if method is allowed."""
-        callback = self._get_callback("method_allowed")
+        callback = self._get_callback(ctx, "method_allowed")
         if callback:
             try:
                 allowed = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if not allowed:
                     # Get allowed methods for this path
-                    allowed_methods = self.app._root_router.get_methods_for_path(self.ctx.request.path)
+                    allowed_methods = self.app._root_router.get_methods_for_path(ctx.request.path)
                     allow_header = ", ".join([m.value for m in allowed_methods])
 
                     return self._create_error_response(
-                        HTTPStatus.METHOD_NOT_ALLOWED,
+                        ctx, HTTPStatus.METHOD_NOT_ALLOWED,
                         "Method Not Allowed",
                         headers={"Allow": allow_header}
                     )
@@ -272,152 +358,187 @@ class RequestStateMachine:
                 self.app._dependency_cache.set("exception", e)
 
                 # Get allowed methods for this path
-                allowed_methods = self.app._root_router.get_methods_for_path(self.ctx.request.path)
+                allowed_methods = self.app._root_router.get_methods_for_path(ctx.request.path)
                 allow_header = ", ".join([m.value for m in allowed_methods])
 
                 return self._create_error_response(
-                    HTTPStatus.METHOD_NOT_ALLOWED,
+                    ctx, HTTPStatus.METHOD_NOT_ALLOWED,
                     f"Method check failed: {str(e)}",
                     headers={"Allow": allow_header}
                 )
 
         return self.state_malformed_request
 
-    def state_malformed_request(self) -> Union[Callable, Response]:
+    def state_malformed_request(self, ctx: StateContext) -> Union[Callable, Response]:
         """B8: Check if request is malformed."""
-        callback = self._get_callback("malformed_request")
+        callback = self._get_callback(ctx, "malformed_request")
         if callback:
             try:
                 malformed = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if malformed:
-                    return self._create_error_response(HTTPStatus.BAD_REQUEST, "Bad Request")
+                    return self._create_error_response(ctx, HTTPStatus.BAD_REQUEST, "Bad Request")
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.BAD_REQUEST, f"Request validation failed: {str(e)}"
+                    ctx, HTTPStatus.BAD_REQUEST, f"Request validation failed: {str(e)}"
                 )
 
         return self.state_authorized
 
-    def state_authorized(self) -> Union[Callable, Response]:
+    def state_authorized(self, ctx: StateContext) -> Union[Callable, Response]:
         """B7: Check if request is authorized."""
-        callback = self._get_callback("authorized")
+        callback = self._get_callback(ctx, "authorized")
         if callback:
             try:
                 authorized = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if not authorized:
-                    return self._create_error_response(HTTPStatus.UNAUTHORIZED, "Unauthorized")
+                    return self._create_error_response(ctx, HTTPStatus.UNAUTHORIZED, "Unauthorized")
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.UNAUTHORIZED, f"Authorization check failed: {str(e)}"
+                    ctx, HTTPStatus.UNAUTHORIZED, f"Authorization check failed: {str(e)}"
                 )
 
         return self.state_forbidden
 
-    def state_forbidden(self) -> Union[Callable, Response]:
+    def state_forbidden(self, ctx: StateContext) -> Union[Callable, Response]:
         """B6: Check if access is forbidden."""
-        callback = self._get_callback("forbidden")
+        callback = self._get_callback(ctx, "forbidden")
         if callback:
             try:
-                if "forbidden" in self.ctx.dependency_callbacks:
-                    wrapper = self.ctx.dependency_callbacks["forbidden"]
+                if "forbidden" in ctx.dependency_callbacks:
+                    wrapper = ctx.dependency_callbacks["forbidden"]
                     try:
                         resolved_value = self.app._call_with_injection(
-                            wrapper.func, self.ctx.request, self.ctx.route_handler
+                            wrapper.func, ctx.request, ctx.route_handler
                         )
                         if resolved_value is None:
-                            return self._create_error_response(HTTPStatus.FORBIDDEN, "Forbidden")
+                            return self._create_error_response(ctx, HTTPStatus.FORBIDDEN, "Forbidden")
                     except Exception as e:
                         self.app._dependency_cache.set("exception", e)
-                        return self._create_error_response(HTTPStatus.FORBIDDEN, "Forbidden")
+                        return self._create_error_response(ctx, HTTPStatus.FORBIDDEN, "Forbidden")
                 else:
                     forbidden = self.app._call_with_injection(
-                        callback, self.ctx.request, self.ctx.route_handler
+                        callback, ctx.request, ctx.route_handler
                     )
                     if forbidden:
-                        return self._create_error_response(HTTPStatus.FORBIDDEN, "Forbidden")
+                        return self._create_error_response(ctx, HTTPStatus.FORBIDDEN, "Forbidden")
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.FORBIDDEN, f"Forbidden check failed: {str(e)}"
+                    ctx, HTTPStatus.FORBIDDEN, f"Forbidden check failed: {str(e)}"
                 )
 
         return self.state_content_headers_valid
 
-    def state_content_headers_valid(self) -> Union[Callable, Response]:
+    def state_content_headers_valid(self, ctx: StateContext) -> Union[Callable, Response]:
         """B5: Check if content headers are valid."""
-        callback = self._get_callback("valid_content_headers")
+        callback = self._get_callback(ctx, "valid_content_headers")
         if callback:
             try:
                 valid = self.app._call_with_injection(
-                    callback, self.ctx.request, self.ctx.route_handler
+                    callback, ctx.request, ctx.route_handler
                 )
                 if not valid:
-                    return self._create_error_response(HTTPStatus.BAD_REQUEST, "Invalid Content Headers")
+                    return self._create_error_response(ctx, HTTPStatus.BAD_REQUEST, "Invalid Content Headers")
             except Exception as e:
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.BAD_REQUEST, f"Content header validation failed: {str(e)}"
+                    ctx, HTTPStatus.BAD_REQUEST, f"Content header validation failed: {str(e)}"
+                )
+
+        # Decompress encoded request bodies as they are read
+        compression = self.app._compression
+        content_encoding = ctx.request.headers.get("Content-Encoding")
+        if content_encoding and compression is not None and compression.decompress_requests:
+            if not is_supported_content_encoding(content_encoding):
+                return self._create_error_response(
+                    ctx, HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Unsupported Content-Encoding: {content_encoding}"
                 )
+            if ctx.request.body is not None:
+                ctx.request.body = decompress_request_body(ctx.request.body, content_encoding, compression)
+
+        return self.state_valid_entity_length
+
+    def state_valid_entity_length(self, ctx: StateContext) -> Union[Callable, Response]:
+        """B4: Check the request body against the maximum body size.
+
+        Uses the declared Content-Length, and the bytes the adapter has
+        already received, so oversized bodies are rejected before the handler
+        reads them.
+        """
+        limit = self.app._get_max_body_size(ctx.route_handler)
+        if limit is not None:
+            content_length = ctx.request.headers.get("Content-Length")
+            received = getattr(ctx.request.body, "size", None)
+            too_large = isinstance(received, int) and received > limit
+            if content_length and content_length.strip().isdigit() and int(content_length) > limit:
+                too_large = True
+            if too_large:
+                return self._create_error_response(ctx, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Payload Too Large")
 
         return self.state_resource_exists
 
-    def state_resource_exists(self) -> Union[Callable, Response]:
+    def state_resource_exists(self, ctx: StateContext) -> Union[Callable, Response]:
         """G7: Check if resource exists."""
-        callback = self._get_callback("resource_exists")
+        if self.app._validator_cache is not None:
+            not_modified = self._cached_not_modified(ctx)
+            if not_modified is not None:
+                return not_modified
+
+        callback = self._get_callback(ctx, "resource_exists")
 
         if callback:
             try:
-                if "resource_exists" in self.ctx.dependency_callbacks:
-                    wrapper = self.ctx.dependency_callbacks["resource_exists"]
+                if "resource_exists" in ctx.dependency_callbacks:
+                    wrapper = ctx.dependency_callbacks["resource_exists"]
                     resolved_value = self.app._call_with_injection(
-                        wrapper.func, self.ctx.request, self.ctx.route_handler
+                        wrapper.func, ctx.request, ctx.route_handler
                     )
                     if resolved_value is None:
-                        if self.ctx.request.method == HTTPMethod.POST:
+                        if ctx.request.method == HTTPMethod.POST:
                             return self.state_content_types_provided
-                        return self._create_error_response(HTTPStatus.NOT_FOUND, "Not Found")
+                        return self._create_error_response(ctx, HTTPStatus.NOT_FOUND, "Not Found")
 
                     self.app._dependency_cache.set(wrapper.original_name, resolved_value)
                 else:
                     exists = self.app._call_with_injection(
-                        callback, self.ctx.request, self.ctx.route_handler
+                        callback, ctx.request, ctx.route_handler
                     )
                     if not exists:
-                        if self.ctx.request.method == HTTPMethod.POST:
+                        if ctx.request.method == HTTPMethod.POST:
                             return self.state_content_types_provided
-                        return self._create_error_response(HTTPStatus.NOT_FOUND, "Not Found")
+                        return self._create_error_response(ctx, HTTPStatus.NOT_FOUND, "Not Found")
 
             except Exception as e:
-                logger.error(f"Error in resource_exists check: {e}")
-                if self.ctx.request.method == HTTPMethod.POST:
+                logger.error("Error in resource_exists check: %s", e)
+                if ctx.request.method == HTTPMethod.POST:
                     return self.state_content_types_provided
                 self.app._dependency_cache.set("exception", e)
                 return self._create_error_response(
-                    HTTPStatus.NOT_FOUND, f"Resource check failed: {str(e)}"
+                    ctx, HTTPStatus.NOT_FOUND, f"Resource check failed: {str(e)}"
                 )
 
         # Check if we need conditional processing
-        if not self._needs_conditional_processing():
+        if not self._needs_conditional_processing(ctx):
             logger.debug("Skipping conditional states (not needed)")
             return self.state_content_types_provided
 
         return self.state_if_match
 
-    def state_if_match(self) -> Union[Callable, Response]:
+    def state_if_match(self, ctx: StateContext) -> Union[Callable, Response]:
         """G3: Process If-Match header."""
-        if_match_etags = self.ctx.request.get_if_match()
+        if_match_etags = ctx.request.get_if_match()
         if not if_match_etags:
             return self.state_if_unmodified_since
 
-        current_etag = self._get_resource_etag()
+        current_etag = self._get_resource_etag(ctx)
         if not current_etag:
-            return self._create_error_response(HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
+            return self._create_error_response(ctx, HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
 
         if "*" in if_match_etags:
             return self.state_if_unmodified_since
@@ -426,59 +547,59 @@ class RequestStateMachine:
             if etags_match(current_etag, requested_etag, strong_comparison=True):
                 return self.state_if_unmodified_since
 
-        return self._create_error_response(HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
+        return self._create_error_response(ctx, HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
 
-    def state_if_unmodified_since(self) -> Union[Callable, Response]:
+    def state_if_unmodified_since(self, ctx: StateContext) -> Union[Callable, Response]:
         """G4: Process If-Unmodified-Since header."""
-        if_unmodified_since = self.ctx.request.get_if_unmodified_since()
+        if_unmodified_since = ctx.request.get_if_unmodified_since()
         if not if_unmodified_since:
             return self.state_if_none_match
 
-        last_modified = self._get_resource_last_modified()
+        last_modified = self._get_resource_last_modified(ctx)
         if not last_modified:
-            return self._create_error_response(HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
+            return self._create_error_response(ctx, HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
 
         if last_modified > if_unmodified_since:
-            return self._create_error_response(HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
+            return self._create_error_response(ctx, HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
 
         return self.state_if_none_match
 
-    def state_if_none_match(self) -> Union[Callable, Response]:
+    def state_if_none_match(self, ctx: StateContext) -> Union[Callable, Response]:
         """G5: Process If-None-Match header."""
-        if_none_match_etags = self.ctx.request.get_if_none_match()
+        if_none_match_etags = ctx.request.get_if_none_match()
         if not if_none_match_etags:
             return self.state_if_modified_since
 
-        current_etag = self._get_resource_etag()
+        current_etag = self._get_resource_etag(ctx)
 
         if "*" in if_none_match_etags:
-            if self.ctx.request.method in [HTTPMethod.GET]:
+            if ctx.request.method in [HTTPMethod.GET]:
                 return Response(HTTPStatus.NOT_MODIFIED, headers={"ETag": current_etag} if current_etag else {})
             else:
-                return self._create_error_response(HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
+                return self._create_error_response(ctx, HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
 
         if not current_etag:
             return self.state_if_modified_since
 
         for requested_etag in if_none_match_etags:
             if etags_match(current_etag, requested_etag, strong_comparison=False):
-                if self.ctx.request.method in [HTTPMethod.GET]:
+                if ctx.request.method in [HTTPMethod.GET]:
                     return Response(HTTPStatus.NOT_MODIFIED, headers={"ETag": current_etag})
                 else:
-                    return self._create_error_response(HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
+                    return self._create_error_response(ctx, HTTPStatus.PRECONDITION_FAILED, "Precondition Failed")
 
         return self.state_if_modified_since
 
-    def state_if_modified_since(self) -> Union[Callable, Response]:
+    def state_if_modified_since(self, ctx: StateContext) -> Union[Callable, Response]:
         """G6: Process If-Modified-Since header."""
-        if self.ctx.request.method != HTTPMethod.GET:
+        if ctx.request.method != HTTPMethod.GET:
             return self.state_content_types_provided
 
-        if_modified_since = self.ctx.request.get_if_modified_since()
+        if_modified_since = ctx.request.get_if_modified_since()
         if not if_modified_since:
             return self.state_content_types_provided
 
-        last_modified = self._get_resource_last_modified()
+        last_modified = self._get_resource_last_modified(ctx)
         if not last_modified:
             return self.state_content_types_provided
 
@@ -487,16 +608,18 @@ class RequestStateMachine:
 
         return self.state_content_types_provided
 
-    def state_content_types_provided(self) -> Union[Callable, Response]:
+    def state_content_types_provided(self, ctx: StateContext) -> Union[Callable, Response]:
         """C3: Check if acceptable content types are provided."""
         available_types = list(self.app._content_renderers.keys())
 
-        if self.ctx.route_handler and self.ctx.route_handler.content_renderers:
-            available_types.extend(self.ctx.route_handler.content_renderers.keys())
+        if ctx.route_handler and ctx.route_handler.content_renderers:
+            available_types.extend(ctx.route_handler.content_renderers.keys())
         available_types = list(set(available_types))
 
         if not available_types:
-            logger.error(f"No content renderers available for {self.ctx.request.method.value} {self.ctx.request.path}")
+            logger.error(
+                "No content renderers available for %s %s", ctx.request.method.value, ctx.request.path
+            )
             return Response(
                 HTTPStatus.INTERNAL_SERVER_ERROR,
                 '{"error": "No content renderers available"}',
@@ -505,147 +628,226 @@ class RequestStateMachine:
 
         return self.state_content_types_accepted
 
-    def state_content_types_accepted(self) -> Union[Callable, Response]:
+    def state_content_types_accepted(self, ctx: StateContext) -> Union[Callable, Response]:
         """C4: Check if we can provide an acceptable content type."""
-        accept_header = self.ctx.request.get_accept_header()
+        accept_header = ctx.request.get_accept_header()
 
         # Try route-specific renderers first
-        if self.ctx.route_handler and self.ctx.route_handler.content_renderers:
-            for content_type, wrapper in self.ctx.route_handler.content_renderers.items():
+        if ctx.route_handler and ctx.route_handler.content_renderers:
+            for content_type, wrapper in ctx.route_handler.content_renderers.items():
                 if content_type in self.app._content_renderers:
                     renderer = self.app._content_renderers[content_type]
                     if renderer.can_render(accept_header):
-                        self.ctx.chosen_renderer = renderer
+                        ctx.chosen_renderer = renderer
                         return self.state_execute_and_render
 
         # Fall back to global renderers
         for renderer in self.app._content_renderers.values():
             if renderer.can_render(accept_header):
-                self.ctx.chosen_renderer = renderer
+                ctx.chosen_renderer = renderer
                 return self.state_execute_and_render
 
         # No acceptable content type found
         available_types = list(self.app._content_renderers.keys())
-        if self.ctx.route_handler and self.ctx.route_handler.content_renderers:
-            available_types.extend(self.ctx.route_handler.content_renderers.keys())
+        if ctx.route_handler and ctx.route_handler.content_renderers:
+            available_types.extend(ctx.route_handler.content_renderers.keys())
         available_types = list(set(available_types))
 
         return Response(
             HTTPStatus.NOT_ACCEPTABLE,
             f"Not Acceptable. Available types: {', '.join(available_types)}",
             headers={"Content-Type": "text/plain"},
-            request=self.ctx.request,
+            request=ctx.request,
             available_content_types=available_types,
         )
 
-    def state_execute_and_render(self) -> Response:
+    def state_execute_and_render(self, ctx: StateContext) -> Response:
         """Execute handler and render response (terminal state)."""
-        if not self.ctx.route_handler:
+        if not ctx.route_handler:
             raise RuntimeError("route_handler must be set before executing handler")
 
         processed_headers: Optional[MultiValueHeaders] = None
         try:
             # Process headers dependencies first
-            processed_headers = self._process_headers_dependencies()
+            processed_headers = self._process_headers_dependencies(ctx)
 
             # Execute the main handler
-            result = self.app._call_with_injection(
-                self.ctx.route_handler.handler,
-                self.ctx.request,
-                self.ctx.route_handler
-            )
+            with self.app._start_span("handler"):
+                result = self.app._call_with_injection(
+                    ctx.route_handler.handler,
+                    ctx.request,
+                    ctx.route_handler
+                )
 
             # Handle None result -> NO_CONTENT
             if result is None:
                 return Response(HTTPStatus.NO_CONTENT, pre_calculated_headers=processed_headers)
 
             # Add resource metadata headers (ETag, Last-Modified)
-            self._add_resource_metadata_to_headers(processed_headers)
+            self._add_resource_metadata_to_headers(ctx, processed_headers)
 
             # Validate and process return type if Pydantic is used
-            validated_result = self._validate_pydantic_return_type(result)
+            validated_result = self._validate_pydantic_return_type(ctx, result)
 
             # Handle validated None result
             if validated_result is None:
                 return Response(HTTPStatus.NO_CONTENT, pre_calculated_headers=processed_headers)
 
             # Render the result
-            return self._render_result(validated_result, processed_headers)
+            with self.app._start_span("render"):
+                return self._render_result(ctx, validated_result, processed_headers)
 
         except ValidationError as e:
             self.app._dependency_cache.set("exception", e)
-            return self._handle_validation_error(e, processed_headers)
+            return self._handle_validation_error(ctx, e, processed_headers)
         except AcceptsParsingError as e:
             self.app._dependency_cache.set("exception", e)
-            return self._handle_accepts_parsing_error(e, processed_headers)
+            return self._handle_accepts_parsing_error(ctx, e, processed_headers)
+        except RequestEntityTooLarge as e:
+            self.app._dependency_cache.set("exception", e)
+            return self._create_error_response(ctx, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Payload Too Large")
         except ValueError as e:
             self.app._dependency_cache.set("exception", e)
-            return self._handle_value_error(e, processed_headers)
+            return self._handle_value_error(ctx, e, processed_headers)
         except Exception as e:
             self.app._dependency_cache.set("exception", e)
-            return self._handle_general_error(e, processed_headers)
+            return self._handle_general_error(ctx, e, processed_headers)
 
     # ========================================================================
     # HELPER METHODS
     # ========================================================================
 
-    def _get_callback(self, state_name: str):
+    def _admit_request(self, ctx: StateContext, limiter: 'ConcurrencyLimiter') -> Optional[Response]:
+        """Admit the request under the concurrency limit, or return a 503 shedding it."""
+        priority = ctx.route_handler.concurrency_priority if ctx.route_handler else "normal"
+        admitted = limiter.try_acquire(priority)
+
+        metrics = self.app._dependency_cache.get("metrics")
+        if metrics is not None:
+            metrics.add_metric("concurrency.limit", limiter.limit, unit=MetricUnit.Count)
+            if not admitted:
+                metrics.add_metric("concurrency.shed", 1, unit=MetricUnit.Count)
+
+        if not admitted:
+            return self._create_error_response(
+                ctx, HTTPStatus.SERVICE_UNAVAILABLE, "Service Unavailable",
+                headers={"Retry-After": str(limiter.config.retry_after)}
+            )
+        ctx.limiter = limiter
+        ctx.admitted_at = time.perf_counter()
+        return None
+
+    def _get_callback(self, ctx: StateContext, state_name: str):
         """Get callback for a state."""
-        if state_name in self.ctx.dependency_callbacks:
-            return self.ctx.dependency_callbacks[state_name].func
+        if state_name in ctx.dependency_callbacks:
+            return ctx.dependency_callbacks[state_name].func
         return self.app._default_callbacks.get(state_name)
 
-    def _needs_conditional_processing(self) -> bool:
+    def _needs_conditional_processing(self, ctx: StateContext) -> bool:
         """Check if conditional request processing is needed."""
         has_route_support = False
-        if self.ctx.route_handler:
+        if ctx.route_handler:
             conditional_states = {'generate_etag', 'last_modified'}
-            has_route_support = bool(conditional_states & set(self.ctx.route_handler.state_callbacks.keys()))
+            has_route_support = bool(conditional_states & set(ctx.route_handler.state_callbacks.keys()))
 
         has_conditional_headers = (
-            self.ctx.request.headers.get('If-Match') or
-            self.ctx.request.headers.get('If-None-Match') or
-            self.ctx.request.headers.get('If-Modified-Since') or
-            self.ctx.request.headers.get('If-Unmodified-Since')
+            ctx.request.headers.get('If-Match') or
+            ctx.request.headers.get('If-None-Match') or
+            ctx.request.headers.get('If-Modified-Since') or
+            ctx.request.headers.get('If-Unmodified-Since')
         )
 
         return has_route_support or bool(has_conditional_headers)
 
-    def _get_resource_etag(self) -> Optional[str]:
+    def _get_resource_etag(self, ctx: StateContext) -> Optional[str]:
         """Get the current ETag for the resource."""
-        callback = self._get_callback("generate_etag")
+        callback = self._get_callback(ctx, "generate_etag")
         if callback:
             try:
-                etag = self.app._call_with_injection(callback, self.ctx.request, self.ctx.route_handler)
+                etag = self.app._call_with_injection(callback, ctx.request, ctx.route_handler)
                 if etag:
-                    return f'"{etag}"' if not etag.startswith('"') and not etag.startswith('W/') else etag
+                    etag = f'"{etag}"' if not etag.startswith('"') and not etag.startswith('W/') else etag
+                    if self.app._validator_cache is not None and ctx.request.method == HTTPMethod.GET:
+                        self.app._validator_cache.record(self._validator_cache_key(ctx), etag=etag)
+                    return cast(str, etag)
             except Exception as e:
-                logger.warning(f"ETag generation callback failed: {e}")
+                logger.warning("ETag generation callback failed: %s", e)
         return None
 
-    def _get_resource_last_modified(self) -> Optional[datetime]:
+    def _get_resource_last_modified(self, ctx: StateContext) -> Optional[datetime]:
         """Get the current Last-Modified timestamp for the resource."""
-        callback = self._get_callback("last_modified")
+        callback = self._get_callback(ctx, "last_modified")
         if callback:
             try:
-                result = self.app._call_with_injection(callback, self.ctx.request, self.ctx.route_handler)
+                result = self.app._call_with_injection(callback, ctx.request, ctx.route_handler)
+                if result and self.app._validator_cache is not None and ctx.request.method == HTTPMethod.GET:
+                    self.app._validator_cache.record(self._validator_cache_key(ctx), last_modified=result)
                 return cast(Optional[datetime], result)
             except Exception as e:
-                logger.warning(f"Last-Modified callback failed: {e}")
+                logger.warning("Last-Modified callback failed: %s", e)
         return None
 
-    def _create_error_response(self, status_code: int, message: str, details=None, **kwargs) -> Response:
+    def _validator_cache_key(self, ctx: StateContext) -> Any:
+        """Validator cache key for the matched route and path parameters."""
+        route = cast("RouteHandler", ctx.route_handler)
+        return ValidatorCache.key(route.path, ctx.request.path_params)
+
+    def _cached_not_modified(self, ctx: StateContext) -> Optional[Response]:
+        """Answer a conditional GET with 304 from cached validators, if they match."""
+        request = ctx.request
+        if request.method != HTTPMethod.GET:
+            return None
+        # Preconditions for writes and wildcards still need the resource itself
+        if request.headers.get("If-Match") or request.headers.get("If-Unmodified-Since"):
+            return None
+        if_none_match = request.get_if_none_match()
+        if_modified_since = None if if_none_match else request.get_if_modified_since()
+        if not if_none_match and not if_modified_since:
+            return None
+
+        cache = cast(ValidatorCache, self.app._validator_cache)
+        entry = cache.get(self._validator_cache_key(ctx))
+        if entry is None:
+            return None
+        if if_none_match:
+            if entry.etag is None or "*" in if_none_match:
+                return None
+            if not any(etags_match(entry.etag, etag, strong_comparison=False) for etag in if_none_match):
+                return None
+        elif entry.last_modified is None or entry.last_modified > cast(datetime, if_modified_since):
+            return None
+
+        cache.hits += 1
+        headers = {}
+        if entry.etag is not None:
+            headers["ETag"] = entry.etag
+        if entry.last_modified is not None:
+            headers["Last-Modified"] = entry.last_modified.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        return Response(HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    def _invalidate_cached_validators(self, ctx: StateContext, response: Response) -> None:
+        """Drop cached validators after a successful write to the resource."""
+        if (
+            ctx.route_handler is not None
+            and ctx.request.method not in (HTTPMethod.GET, HTTPMethod.OPTIONS)
+            and response.status_code < 400
+        ):
+            cast(ValidatorCache, self.app._validator_cache).discard(self._validator_cache_key(ctx))
+
+    def _create_error_response(
+        self, ctx: StateContext, status_code: int, message: str, details=None, **kwargs
+    ) -> Response:
         """Create an error response respecting content negotiation."""
         # Try custom error handlers first
-        custom_response = self._try_custom_error_handler(status_code, message, details, **kwargs)
+        custom_response = self._try_custom_error_handler(ctx, status_code, message, details, **kwargs)
         if custom_response:
             return custom_response
 
         # Get request/trace IDs for error response
-        request_id, trace_id = self._get_error_context_ids()
+        request_id, trace_id = self._get_error_context_ids(ctx)
 
         # Determine response format from Accept header
-        if self._prefers_json_error_response():
+        if self._prefers_json_error_response(ctx):
             error_response = ErrorResponse(
                 error=message,
                 details=details,
@@ -666,7 +868,7 @@ class RequestStateMachine:
                 **kwargs
             )
 
-    def _create_cors_preflight_response(self, cors_config: 'CORSConfig', origin: str) -> Response:
+    def _create_cors_preflight_response(self, ctx: StateContext, cors_config: 'CORSConfig', origin: str) -> Response:
         """Create a CORS preflight response (OPTIONS).
 
         Args:
@@ -678,7 +880,7 @@ class RequestStateMachine:
         """
         # Get allowed methods for this path
         allowed_methods = cors_config.get_allowed_methods(
-            self.ctx.request.path,
+            ctx.request.path,
             self.app._root_router
         )
 
@@ -708,152 +910,120 @@ class RequestStateMachine:
     # HELPER METHODS FOR state_execute_and_render
     # ========================================================================
 
-    def _process_headers_dependencies(self) -> MultiValueHeaders:
+    def _process_headers_dependencies(self, ctx: StateContext) -> MultiValueHeaders:
         """Process all headers dependencies and return final headers."""
         headers = self.app._dependency_cache.get("headers")
         if headers is None:
-            headers = self.app._get_initial_headers(self.ctx.request, self.ctx.route_handler)
+            headers = self.app._get_initial_headers(ctx.request, ctx.route_handler)
             self.app._dependency_cache.set("headers", headers)
 
         # Process each headers dependency in order
         for dep_name, wrapper in self.app._headers_dependencies.items():
             try:
                 updated_headers = self.app._call_with_injection(
-                    wrapper.func, self.ctx.request, self.ctx.route_handler
+                    wrapper.func, ctx.request, ctx.route_handler
                 )
                 if updated_headers and isinstance(updated_headers, dict):
                     headers.update(updated_headers)
                 self.app._dependency_cache.set("headers", headers)
             except Exception as e:
-                logger.warning(f"Headers dependency injection failed: {e}")
+                logger.warning("Headers dependency injection failed: %s", e)
 
         return cast(MultiValueHeaders, headers)
 
-    def _add_resource_metadata_to_headers(self, headers: MultiValueHeaders) -> None:
+    def _add_resource_metadata_to_headers(self, ctx: StateContext, headers: MultiValueHeaders) -> None:
         """Add ETag and Last-Modified headers if available."""
-        etag = self._get_resource_etag()
+        etag = self._get_resource_etag(ctx)
         if etag:
             headers["ETag"] = etag
 
-        last_modified = self._get_resource_last_modified()
+        last_modified = self._get_resource_last_modified(ctx)
         if last_modified:
             headers["Last-Modified"] = last_modified.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
-    def _validate_pydantic_return_type(self, result: Any) -> Any:
-        """Validate and convert Pydantic return types. Raises ValidationError on error."""
-        if not PYDANTIC_AVAILABLE or not self.ctx.route_handler:
-            return result
+    def _validate_pydantic_return_type(self, ctx: StateContext, result: Any) -> Any:
+        """Validate and convert Pydantic return types. Raises ValidationError on error.
 
-        return_annotation = self.ctx.route_handler.handler_signature.return_annotation
+        The route's compiled TypeAdapter validates the result. When it will be
+        rendered by the built-in JSON renderer, the adapter serializes it
+        straight to JSON bytes and a Response is returned; otherwise it is
+        dumped to Python data for the chosen renderer.
+        """
+        if not PYDANTIC_AVAILABLE or not ctx.route_handler:
+            return result
 
-        # Skip validation for types that don't need it
-        if self._should_skip_pydantic_validation(return_annotation):
+        return_annotation = ctx.route_handler.handler_signature.return_annotation
+        adapter = ctx.route_handler.return_adapter
+        if adapter is None:
             return None if return_annotation is type(None) else result
 
-        try:
-            # Handle list[PydanticModel]
-            if self._is_pydantic_list_type(return_annotation):
-                return self._validate_pydantic_list(result, return_annotation)
-
-            # Handle PydanticModel
-            if hasattr(return_annotation, "model_validate"):
-                return self._validate_pydantic_model(result, return_annotation)
+        # Leave non-list results of list[PydanticModel] routes alone
+        if get_origin(return_annotation) is list and not isinstance(result, list):
+            return result
 
+        try:
+            validated = adapter.validate_python(result)
         except ValidationError:
             raise  # Re-raise to be caught by state_execute_and_render
         except Exception as e:
-            logger.warning(f"Validation failed: {e}")
-
-        return result
-
-    def _should_skip_pydantic_validation(self, annotation: Any) -> bool:
-        """Check if annotation should skip Pydantic validation."""
-        if annotation is None or annotation is type(None) or annotation == inspect.Signature.empty:
-            return True
-        if hasattr(annotation, "__origin__") and annotation.__origin__ is Union:
-            return True
-        return False
-
-    def _is_pydantic_list_type(self, annotation: Any) -> bool:
-        """Check if annotation is list[PydanticModel]."""
-        if get_origin(annotation) is not list:
-            return False
-        args = get_args(annotation)
-        return bool(args and hasattr(args[0], "model_validate"))
-
-    def _validate_pydantic_list(self, result: Any, annotation: Any) -> Any:
-        """Validate and convert list of Pydantic models."""
-        if not isinstance(result, list):
+            logger.warning("Validation failed: %s", e)
             return result
 
-        pydantic_type = get_args(annotation)[0]
-        validated_list = []
-
-        for item in result:
-            if hasattr(item, "model_dump"):
-                validated_list.append(item.model_dump())
-            elif isinstance(item, dict):
-                validated_item = pydantic_type.model_validate(item)
-                validated_list.append(validated_item.model_dump())
-            else:
-                validated_item = pydantic_type.model_validate(item)
-                validated_list.append(validated_item.model_dump())
-
-        return validated_list
-
-    def _validate_pydantic_model(self, result: Any, annotation: Any) -> Any:
-        """Validate and convert Pydantic model."""
-        if isinstance(result, dict):
-            validated = annotation.model_validate(result)
-            return validated.model_dump()
-        elif hasattr(result, "model_dump"):
-            return result.model_dump()
-        else:
-            validated = annotation.model_validate(result)
-            return validated.model_dump()
+        if type(ctx.chosen_renderer) is JSONRenderer and not self._has_route_specific_renderer(ctx):
+            return Response.fast(
+                HTTPStatus.OK, adapter.dump_json(validated, indent=2), content_type=ctx.chosen_renderer.media_type
+            )
+        return adapter.dump_python(validated)
 
-    def _render_result(self, result: Any, headers: MultiValueHeaders) -> Response:
+    def _render_result(self, ctx: StateContext, result: Any, headers: MultiValueHeaders) -> Response:
         """Render the result using appropriate renderer."""
         # Check for route-specific renderer
-        if self._has_route_specific_renderer():
-            return self._render_with_route_specific_renderer(result, headers)
+        if self._has_route_specific_renderer(ctx):
+            return self._render_with_route_specific_renderer(ctx, result, headers)
 
         # Handle Response objects
         if isinstance(result, Response):
-            return self._finalize_response_object(result, headers)
+            return self._finalize_response_object(ctx, result, headers)
 
         # Handle Path objects - wrap in Response to preserve Path type
         from pathlib import Path
         if isinstance(result, Path):
             response = Response(HTTPStatus.OK, result)
-            return self._finalize_response_object(response, headers)
+            return self._finalize_response_object(ctx, response, headers)
+
+        # Handle generators - stream the chunks as-is unless a streaming renderer will encode the items
+        if is_iterator_body(result) and not isinstance(ctx.chosen_renderer, StreamingRenderer):
+            response = Response(HTTPStatus.OK, result)
+            return self._finalize_response_object(ctx, response, headers)
 
         # Use global renderer
-        return self._render_with_global_renderer(result, headers)
+        return self._render_with_global_renderer(ctx, result, headers)
 
-    def _has_route_specific_renderer(self) -> bool:
+    def _has_route_specific_renderer(self, ctx: StateContext) -> bool:
         """Check if route has a specific renderer for chosen media type."""
-        if not self.ctx.route_handler or not self.ctx.route_handler.content_renderers:
+        if not ctx.route_handler or not ctx.route_handler.content_renderers:
             return False
-        if not self.ctx.chosen_renderer:
+        if not ctx.chosen_renderer:
             return False
-        return self.ctx.chosen_renderer.media_type in self.ctx.route_handler.content_renderers
+        return ctx.chosen_renderer.media_type in ctx.route_handler.content_renderers
 
-    def _render_with_route_specific_renderer(self, result: Any, headers: MultiValueHeaders) -> Response:
+    def _render_with_route_specific_renderer(
+        self, ctx: StateContext, result: Any, headers: MultiValueHeaders
+    ) -> Response:
         """Render using route-specific content renderer."""
         # These checks are guaranteed by _has_route_specific_renderer
-        if not self.ctx.route_handler or not self.ctx.chosen_renderer:
+        if not ctx.route_handler or not ctx.chosen_renderer:
             raise RuntimeError("route_handler and chosen_renderer must be set")
 
-        wrapper = self.ctx.route_handler.content_renderers[self.ctx.chosen_renderer.media_type]
+        wrapper = ctx.route_handler.content_renderers[ctx.chosen_renderer.media_type]
 
         # Cache handler result for renderer to access
-        handler_func_name = self.ctx.route_handler.handler.__name__
+        handler_func_name = ctx.route_handler.handler.__name__
         self.app._dependency_cache.set(handler_func_name, result)
 
         # Call renderer with dependency injection
         rendered_result = self.app._call_with_injection(
-            wrapper.func, self.ctx.request, self.ctx.route_handler
+            wrapper.func, ctx.request, ctx.route_handler
         )
 
         # Get full content type including charset if specified
@@ -865,38 +1035,25 @@ class RequestStateMachine:
                 rendered_result.content_type = full_content_type
                 rendered_result.headers = rendered_result.headers or {}
                 rendered_result.headers["Content-Type"] = full_content_type
-            return self._finalize_response_object(rendered_result, headers)
+            return self._finalize_response_object(ctx, rendered_result, headers)
 
         # Renderer returned string/other
-        response = Response(
-            HTTPStatus.OK,
-            str(rendered_result),
-            content_type=full_content_type,
-            pre_calculated_headers=headers,
-        )
-        return self._finalize_response_object(response, headers)
+        response = Response.fast(HTTPStatus.OK, str(rendered_result), content_type=full_content_type, headers=headers)
+        return self._finalize_response_object(ctx, response, headers)
 
-    def _render_with_global_renderer(self, result: Any, headers: MultiValueHeaders) -> Response:
+    def _render_with_global_renderer(self, ctx: StateContext, result: Any, headers: MultiValueHeaders) -> Response:
         """Render using global content renderer."""
-        if self.ctx.chosen_renderer:
-            rendered_body = self.ctx.chosen_renderer.render(result, self.ctx.request)
-            response = Response(
-                HTTPStatus.OK,
-                rendered_body,
-                content_type=self.ctx.chosen_renderer.media_type,
-                pre_calculated_headers=headers,
+        if ctx.chosen_renderer:
+            rendered_body = ctx.chosen_renderer.render(result, ctx.request)
+            response = Response.fast(
+                HTTPStatus.OK, rendered_body, content_type=ctx.chosen_renderer.media_type, headers=headers
             )
         else:
             # Fallback to plain text
-            response = Response(
-                HTTPStatus.OK,
-                str(result),
-                content_type="text/plain",
-                pre_calculated_headers=headers,
-            )
-        return self._finalize_response_object(response, headers)
+            response = Response.fast(HTTPStatus.OK, str(result), content_type="text/plain", headers=headers)
+        return self._finalize_response_object(ctx, response, headers)
 
-    def _finalize_response_object(self, response: Response, headers: MultiValueHeaders) -> Response:
+    def _finalize_response_object(self, ctx: StateContext, response: Response, headers: MultiValueHeaders) -> Response:
         """Finalize a Response object with headers and content type."""
         # Validate Path responses
         response = self._validate_path_response(response)
@@ -904,25 +1061,69 @@ class RequestStateMachine:
             return response
 
         # Set content type
-        response = self._set_content_type(response)
+        response = self._set_content_type(ctx, response)
 
         # Apply headers
         response = self._apply_headers(response, headers)
 
         # Add OPTIONS Allow header
-        response = self._add_options_allow_header(response)
+        response = self._add_options_allow_header(ctx, response)
 
         # Add CORS headers
-        response = self._add_cors_headers(response)
+        response = self._add_cors_headers(ctx, response)
 
         # Add CSP headers
-        response = self._add_csp_headers(response)
+        response = self._add_csp_headers(ctx, response)
+
+        # Hash the body into an ETag, answering 304 when the client has it already
+        response = self._add_auto_etag(ctx, response)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return response
 
         # Process range requests
-        response = self._process_range_request(response)
+        response = self._process_range_request(ctx, response)
+
+        # Compress the body for the client's Accept-Encoding
+        response = self._compress_response(ctx, response)
+
+        return response
+
+    def _add_auto_etag(self, ctx: StateContext, response: Response) -> Response:
+        """Set an ETag hashed from the body if enabled, and convert to 304 if If-None-Match matches."""
+        if response.status_code != HTTPStatus.OK or ctx.request.method != HTTPMethod.GET:
+            return response
+        config = self.app._get_auto_etag(ctx.route_handler)
+        if config is None:
+            return response
+        if response.headers is None:
+            response.headers = MultiValueHeaders()
+        if "ETag" in response.headers:
+            return response
 
+        etag = config.etag_for(response.body)
+        if etag is None:
+            return response
+        response.headers["ETag"] = etag
+
+        if_none_match = ctx.request.get_if_none_match()
+        if if_none_match and (
+            "*" in if_none_match
+            or any(etags_match(etag, requested, strong_comparison=False) for requested in if_none_match)
+        ):
+            headers = response.headers.copy()
+            for name in ("Content-Type", "Content-Length", "Content-Encoding", "Content-Range"):
+                if name in headers:
+                    del headers[name]
+            return Response(HTTPStatus.NOT_MODIFIED, headers=headers)
         return response
 
+    def _compress_response(self, ctx: StateContext, response: Response) -> Response:
+        """Compress the response body if compression is enabled."""
+        compression = self.app._compression
+        if compression is None:
+            return response
+        return compress_response(response, ctx.request.headers.get("Accept-Encoding"), compression)
+
     def _validate_path_response(self, response: Response) -> Response:
         """Validate Path objects - return 404 if path doesn't exist."""
         from pathlib import Path
@@ -936,33 +1137,32 @@ class RequestStateMachine:
                 )
         return response
 
-    def _set_content_type(self, response: Response) -> Response:
+    def _set_content_type(self, ctx: StateContext, response: Response) -> Response:
         """Set content type from chosen renderer if not already set."""
         from pathlib import Path
 
-        # Path responses get Content-Type from file extension in Response.__post_init__
+        # Path responses get Content-Type from file extension when the Response is created
         if isinstance(response.body, Path):
             return response
 
         # Not a Path response - set content type from chosen renderer
-        if not response.content_type and self.ctx.chosen_renderer:
-            response.content_type = self.ctx.chosen_renderer.media_type
+        if not response.content_type and ctx.chosen_renderer:
+            response.content_type = ctx.chosen_renderer.media_type
             response.headers = response.headers or {}
-            response.headers["Content-Type"] = self.ctx.chosen_renderer.media_type
+            response.headers["Content-Type"] = ctx.chosen_renderer.media_type
 
         return response
 
     def _apply_headers(self, response: Response, headers: MultiValueHeaders) -> Response:
         """Apply processed headers to response."""
         if not response.pre_calculated_headers:
-            response.pre_calculated_headers = headers
-            response.__post_init__()
+            response.merge_headers(headers)
         return response
 
-    def _add_options_allow_header(self, response: Response) -> Response:
+    def _add_options_allow_header(self, ctx: StateContext, response: Response) -> Response:
         """Add Allow header for OPTIONS responses (RFC 9110 Section 10.2.1)."""
-        if self.ctx.request.method == HTTPMethod.OPTIONS:
-            allowed_methods = self.app._root_router.get_methods_for_path(self.ctx.request.path)
+        if ctx.request.method == HTTPMethod.OPTIONS:
+            allowed_methods = self.app._root_router.get_methods_for_path(ctx.request.path)
             allow_header = ", ".join([m.value for m in allowed_methods])
 
             if response.headers is None:
@@ -971,13 +1171,13 @@ class RequestStateMachine:
 
         return response
 
-    def _add_cors_headers(self, response: Response) -> Response:
+    def _add_cors_headers(self, ctx: StateContext, response: Response) -> Response:
         """Add CORS headers to actual responses (not preflight)."""
-        origin = self.ctx.request.headers.get("Origin")
+        origin = ctx.request.headers.get("Origin")
         if not origin:
             return response
 
-        cors_config = self.app._get_cors_config(self.ctx.route_handler, path=self.ctx.request.path)
+        cors_config = self.app._get_cors_config(ctx.route_handler, path=ctx.request.path)
         if not cors_config or not cors_config.matches_origin(origin):
             return response
 
@@ -1002,12 +1202,12 @@ class RequestStateMachine:
 
         return response
 
-    def _add_csp_headers(self, response: Response) -> Response:
+    def _add_csp_headers(self, ctx: StateContext, response: Response) -> Response:
         """Add CSP headers to response."""
         csp_config = self.app._get_csp_config(
-            self.ctx.route_handler,
-            path=self.ctx.request.path,
-            request=self.ctx.request
+            ctx.route_handler,
+            path=ctx.request.path,
+            request=ctx.request
         )
 
         if not csp_config:
@@ -1019,7 +1219,7 @@ class RequestStateMachine:
         # Use nonce if it was generated earlier (in state_route_exists)
         nonce_value = None
         if csp_config.nonce:
-            nonce_value = getattr(self.ctx.request, 'csp_nonce', None)
+            nonce_value = ctx.request.csp_nonce
 
         # Build CSP header
         header_value = csp_config.build_header(nonce_value=nonce_value)
@@ -1029,7 +1229,7 @@ class RequestStateMachine:
 
         return response
 
-    def _process_range_request(self, response: Response) -> Response:
+    def _process_range_request(self, ctx: StateContext, response: Response) -> Response:
         """Process Range header and prepare response for partial content.
 
         RFC 9110 Section 14: Range requests allow clients to request partial
@@ -1062,7 +1262,7 @@ class RequestStateMachine:
             return response
 
         # Check for Range header
-        range_header = self.ctx.request.headers.get("Range")
+        range_header = ctx.request.headers.get("Range")
         if not range_header:
             # No range requested - return normal response
             return response
@@ -1080,7 +1280,7 @@ class RequestStateMachine:
             return response
 
         # Check If-Range precondition
-        if not self._check_if_range_precondition(response):
+        if not self._check_if_range_precondition(ctx, response):
             # Precondition failed - return full response (200)
             return response
 
@@ -1166,7 +1366,7 @@ class RequestStateMachine:
 
         return None
 
-    def _check_if_range_precondition(self, response: Response) -> bool:
+    def _check_if_range_precondition(self, ctx: StateContext, response: Response) -> bool:
         """Check If-Range precondition header.
 
         RFC 9110 Section 13.1.5: If-Range allows conditional range request.
@@ -1176,7 +1376,7 @@ class RequestStateMachine:
             True if precondition passes or no If-Range header present.
             False if precondition fails (should send full 200 response).
         """
-        if_range = self.ctx.request.headers.get("If-Range")
+        if_range = ctx.request.headers.get("If-Range")
         if not if_range:
             return True  # No precondition
 
@@ -1200,19 +1400,20 @@ class RequestStateMachine:
     # ERROR HANDLING HELPERS
     # ========================================================================
 
-    def _handle_validation_error(self, e: ValidationError, headers: Optional[MultiValueHeaders]) -> Response:
+    def _handle_validation_error(
+        self, ctx: StateContext, e: ValidationError, headers: Optional[MultiValueHeaders]
+    ) -> Response:
         """Handle ValidationError with proper response."""
         fallback_headers = headers or MultiValueHeaders()
         # Sanitize error details to ensure JSON serializability
         error_details = self._sanitize_validation_errors(e.errors(include_url=False))
         response = self._create_error_response(
-            HTTPStatus.UNPROCESSABLE_ENTITY,
+            ctx, HTTPStatus.UNPROCESSABLE_ENTITY,
             "Validation failed",
             details=error_details
         )
         if fallback_headers:
-            response.pre_calculated_headers = fallback_headers
-            response.__post_init__()
+            response.merge_headers(fallback_headers)
         return response
 
     def _sanitize_validation_errors(self, errors: List[Any]) -> List[Dict[str, Any]]:
@@ -1237,21 +1438,22 @@ class RequestStateMachine:
             sanitized.append(sanitized_error)
         return sanitized
 
-    def _handle_accepts_parsing_error(self, e: AcceptsParsingError, headers: Optional[MultiValueHeaders]) -> Response:
+    def _handle_accepts_parsing_error(
+        self, ctx: StateContext, e: AcceptsParsingError, headers: Optional[MultiValueHeaders]
+    ) -> Response:
         """Handle AcceptsParsingError with proper response."""
         fallback_headers = headers or MultiValueHeaders()
-        response = self._create_error_response(HTTPStatus.UNPROCESSABLE_ENTITY, "Parsing failed")
+        response = self._create_error_response(ctx, HTTPStatus.UNPROCESSABLE_ENTITY, "Parsing failed")
 
         # Add error message if using default response
         if response.body == json.dumps({"error": "Parsing failed"}):
             response.body = json.dumps({"error": "Parsing failed", "message": e.message})
 
         if fallback_headers:
-            response.pre_calculated_headers = fallback_headers
-            response.__post_init__()
+            response.merge_headers(fallback_headers)
         return response
 
-    def _handle_value_error(self, e: ValueError, headers: Optional[MultiValueHeaders]) -> Response:
+    def _handle_value_error(self, ctx: StateContext, e: ValueError, headers: Optional[MultiValueHeaders]) -> Response:
         """Handle ValueError with appropriate HTTP status."""
         fallback_headers = headers or MultiValueHeaders()
         error_message = str(e)
@@ -1263,29 +1465,29 @@ class RequestStateMachine:
             status_code = HTTPStatus.BAD_REQUEST
             message = f"Bad Request: {error_message}"
 
-        response = self._create_error_response(status_code, message)
+        response = self._create_error_response(ctx, status_code, message)
         if fallback_headers:
-            response.pre_calculated_headers = fallback_headers
-            response.__post_init__()
+            response.merge_headers(fallback_headers)
         return response
 
-    def _handle_general_error(self, e: Exception, headers: Optional[MultiValueHeaders]) -> Response:
+    def _handle_general_error(self, ctx: StateContext, e: Exception, headers: Optional[MultiValueHeaders]) -> Response:
         """Handle general exceptions."""
         fallback_headers = headers or MultiValueHeaders()
         response = self._create_error_response(
-            HTTPStatus.INTERNAL_SERVER_ERROR,
+            ctx, HTTPStatus.INTERNAL_SERVER_ERROR,
             f"Internal Server Error: {str(e)}"
         )
         if fallback_headers:
-            response.pre_calculated_headers = fallback_headers
-            response.__post_init__()
+            response.merge_headers(fallback_headers)
         return response
 
     # ========================================================================
     # ERROR RESPONSE HELPERS
     # ========================================================================
 
-    def _try_custom_error_handler(self, status_code: int, message: str, details: Any, **kwargs) -> Optional[Response]:
+    def _try_custom_error_handler(
+        self, ctx: StateContext, status_code: int, message: str, details: Any, **kwargs
+    ) -> Optional[Response]:
         """Try to use a custom error handler. Returns None if not found or failed."""
         if not self.app._error_handlers:
             return None
@@ -1296,7 +1498,7 @@ class RequestStateMachine:
             return None
 
         # Choose appropriate handler based on content negotiation
-        accept_header = self.ctx.request.get_accept_header() if hasattr(self.ctx, 'request') else ""
+        accept_header = ctx.request.get_accept_header()
         chosen_handler = self._choose_error_handler(matching_handlers, accept_header)
         if not chosen_handler:
             return None
@@ -1305,12 +1507,12 @@ class RequestStateMachine:
         try:
             result = self.app._call_with_injection(
                 chosen_handler.handler,
-                self.ctx.request,
-                self.ctx.route_handler
+                ctx.request,
+                ctx.route_handler
             )
             return self._convert_custom_handler_result(result, chosen_handler, status_code, **kwargs)
         except Exception as e:
-            logger.error(f"Error in custom error handler: {e}")
+            logger.error("Error in custom error handler: %s", e)
             return None
 
     def _choose_error_handler(self, handlers: List[Any], accept_header: str) -> Optional[Any]:
@@ -1356,26 +1558,26 @@ class RequestStateMachine:
                 **kwargs
             )
 
-    def _get_error_context_ids(self) -> tuple[Optional[str], Optional[str]]:
+    def _get_error_context_ids(self, ctx: StateContext) -> tuple[Optional[str], Optional[str]]:
         """Get request_id and trace_id for error responses."""
         request_id = None
         trace_id = None
 
         try:
             request_id = self.app._resolve_dependency(
-                "request_id", None, self.ctx.request, self.ctx.route_handler
+                "request_id", None, ctx.request, ctx.route_handler
             )
             trace_id = self.app._resolve_dependency(
-                "trace_id", None, self.ctx.request, self.ctx.route_handler
+                "trace_id", None, ctx.request, ctx.route_handler
             )
         except Exception as e:
-            logger.warning(f"Failed to resolve request_id/trace_id: {e}")
+            logger.warning("Failed to resolve request_id/trace_id: %s", e)
 
         return request_id, trace_id
 
-    def _prefers_json_error_response(self) -> bool:
+    def _prefers_json_error_response(self, ctx: StateContext) -> bool:
         """Determine if client prefers JSON error response based on Accept header."""
-        accept_header = self.ctx.request.get_accept_header() if hasattr(self.ctx, 'request') else ""
+        accept_header = ctx.request.get_accept_header()
 
         if not accept_header:
             return True  # Default to JSON for RESTful APIs
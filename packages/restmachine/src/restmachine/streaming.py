@@ -5,22 +5,56 @@ This module provides file-like stream objects for handling large request and
 response bodies efficiently without loading everything into memory.
 """
 
+import asyncio
 import io
-from typing import cast
+import sys
+import tempfile
+import threading
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, AsyncIterable, Callable, Iterable, Optional, Union, cast
 
+from .exceptions import RequestEntityTooLarge
 
-class BytesStreamBuffer(io.BytesIO):
+ChunkIterator = Union[Iterable[Union[bytes, str]], AsyncIterable[Union[bytes, str]]]
+
+# Request bodies up to this size stay in memory; larger ones move to a temporary file
+DEFAULT_SPOOL_THRESHOLD = 1024 * 1024
+
+# The ASGI adapter stops receiving a request body while this many bytes are unread
+DEFAULT_HIGH_WATER = 1024 * 1024
+
+
+def validate_body_size(limit: Optional[int]) -> None:
+    """Check a maximum request body size (None means unlimited).
+
+    Raises:
+        ValueError: If limit is not a positive integer or None
     """
-    A bytes stream buffer that can be written to asynchronously and read synchronously.
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit <= 0):
+        raise ValueError(f"Maximum body size must be a positive number of bytes or None, got {limit!r}")
 
-    This class extends io.BytesIO to provide a file-like interface for streaming
-    request bodies. The ASGI adapter writes to this stream as body chunks arrive,
-    and the application reads from it.
+
+class BytesStreamBuffer(io.BufferedIOBase):
+    """
+    A thread-safe bytes stream that is written asynchronously and read synchronously.
+
+    This class provides a file-like interface for streaming request bodies. The
+    ASGI adapter writes to this stream as body chunks arrive, and the application
+    reads from it in a worker thread. Reads block until enough data has arrived
+    or the body is complete, so parsers always see the whole body. Data is held
+    in memory until it grows past spool_threshold bytes, then moved to a
+    temporary file, so large uploads don't hold the whole body in RAM.
 
     Features:
     - Supports incremental writes from async sources
+    - Blocking reads: read(n) waits for n bytes or EOF, read1() for any data
+    - Backpressure: wait_for_space() pauses the writer while more than
+      high_water bytes are unread, unless a reader is waiting for more than
+      that (read() to EOF, or read(n) with n > high_water)
     - Seekable for parsers that need it
     - Tracks EOF state
+    - Spills to a temporary file past spool_threshold bytes
+    - Optional max_size, past which reads raise RequestEntityTooLarge
     - Compatible with boto3 StreamingBody and similar interfaces
 
     Example:
@@ -28,22 +62,65 @@ class BytesStreamBuffer(io.BytesIO):
         # ASGI adapter creates stream and writes as chunks arrive
         stream = BytesStreamBuffer()
         async for chunk in receive_body_chunks():
+            await stream.wait_for_space()
             stream.write(chunk)
         stream.close_writing()
 
-        # Application reads from stream
+        # Application reads from stream (in another thread)
         data = stream.read()
 
-        # Or for streaming parsers:
-        import json
-        parsed = json.load(stream)
+        # Or process a large upload piece by piece
+        while chunk := stream.read1(64 * 1024):
+            process(chunk)
         ```
     """
 
-    def __init__(self):
+    def __init__(self, spool_threshold: int = DEFAULT_SPOOL_THRESHOLD, max_size: Optional[int] = None,
+                 high_water: int = DEFAULT_HIGH_WATER):
         super().__init__()
+        if spool_threshold <= 0:
+            raise ValueError("spool_threshold must be positive")
+        if high_water <= 0:
+            raise ValueError("high_water must be positive")
+        validate_body_size(max_size)
+        self.spool_threshold = spool_threshold
+        self.max_size = max_size
+        self.high_water = high_water
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+        # Guards everything below; readers wait on it for data or EOF
+        self._condition = threading.Condition()
         self._writing_finished = False
-        self._read_position = 0
+        self._released = False
+        self._size = 0
+        self._stored = 0
+        self._position = 0
+        self._error: Optional[BaseException] = None
+        # Unread bytes a blocked reader needs; the writer isn't paused until there are this many
+        self._wanted = 0
+        # Set (from the reading thread) when a paused writer may continue
+        self._space: Optional[asyncio.Event] = None
+        self._space_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def write(self, data) -> int:  # type: ignore[override]
+        """
+        Append data to the buffer and wake any blocked readers.
+
+        Once the body passes max_size the buffer is aborted with
+        RequestEntityTooLarge and further data is counted but not stored.
+        Data written after release() or close() is discarded.
+        """
+        with self._condition:
+            self._size += len(data)
+            if self._error is not None or self._released:
+                return len(data)
+            if self.max_size is not None and self._size > self.max_size:
+                self._abort(RequestEntityTooLarge(self.max_size))
+                return len(data)
+            self._file.seek(self._stored)
+            written = cast(int, self._file.write(data))
+            self._stored += written
+            self._condition.notify_all()
+            return written
 
     def close_writing(self):
         """
@@ -52,21 +129,191 @@ class BytesStreamBuffer(io.BytesIO):
         This should be called by the ASGI adapter once all body chunks
         have been received and written to the stream.
         """
-        self._writing_finished = True
-        # Reset to beginning for reading
-        self.seek(0)
+        with self._condition:
+            self._writing_finished = True
+            self._condition.notify_all()
+
+    def abort(self, error: BaseException):
+        """
+        Stop receiving the body; later reads raise error.
+
+        Used when the body is rejected part way through, e.g. for exceeding
+        the maximum body size, or the client disconnects before sending it all.
+        Readers blocked waiting for data are woken and raise error.
+        """
+        with self._condition:
+            self._abort(error)
+
+    def release(self):
+        """
+        Signal that the reader is finished with the body.
+
+        Wakes a writer paused by wait_for_space(); anything it writes from
+        now on is discarded rather than stored.
+        """
+        with self._condition:
+            self._released = True
+            self._wake_writer()
+
+    async def wait_for_space(self):
+        """
+        Wait while more than high_water bytes are written but not yet read.
+
+        Called by the writer before receiving the next chunk, so a client
+        can't send data faster than the application consumes it.
+        """
+        with self._condition:
+            if not self._is_full():
+                return
+            event = asyncio.Event()
+            self._space = event
+            self._space_loop = asyncio.get_running_loop()
+        await event.wait()
 
     @property
     def writing_finished(self) -> bool:
         """Check if writing is finished and stream is ready for reading."""
         return self._writing_finished
 
-    def __enter__(self):
-        return self
+    @property
+    def size(self) -> int:
+        """Number of bytes received so far (including any past max_size)."""
+        return self._size
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
-        return False
+    @property
+    def buffered(self) -> int:
+        """Number of bytes received but not yet read."""
+        with self._condition:
+            return max(self._stored - self._position, 0)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the body has been moved to a temporary file."""
+        return self._stored > self.spool_threshold
+
+    def _abort(self, error: BaseException):
+        self._error = error
+        self._writing_finished = True
+        self._condition.notify_all()
+        self._wake_writer()
+
+    def _is_full(self) -> bool:
+        if self._released or self._writing_finished or self.closed:
+            return False
+        return self._stored - self._position >= max(self.high_water, self._wanted)
+
+    def _wake_writer(self):
+        # Called with the lock held, from the reading thread or the event loop
+        if self._space is not None and not self._is_full():
+            cast(asyncio.AbstractEventLoop, self._space_loop).call_soon_threadsafe(self._space.set)
+            self._space = None
+
+    def _wait(self, ready: Callable[[], bool], wanted: int):
+        """Block until ready() is true or writing has finished, then check for errors.
+
+        wanted is the number of unread bytes the reader needs. While it waits,
+        the writer keeps receiving until there are that many, even past
+        high_water; otherwise a reader needing more than high_water bytes
+        would wait forever for a paused writer.
+        """
+        if not (self._writing_finished or ready()):
+            self._wanted = wanted
+            self._wake_writer()
+            try:
+                self._condition.wait_for(lambda: self._writing_finished or ready())
+            finally:
+                self._wanted = 0
+        if self._error is not None:
+            raise self._error
+
+    def _read_available(self, size: int) -> bytes:
+        """Read up to size bytes (all when negative) that have already been written."""
+        available = max(self._stored - self._position, 0)
+        size = available if size < 0 else min(size, available)
+        if size == 0:
+            return b""
+        self._file.seek(self._position)
+        data = cast(bytes, self._file.read(size))
+        self._position += len(data)
+        self._wake_writer()
+        return data
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Read size bytes, waiting until they arrive; read all (until EOF) when size is negative."""
+        size = -1 if size is None else size
+        with self._condition:
+            wanted = size if size >= 0 else sys.maxsize
+            self._wait(lambda: self._stored - self._position >= wanted, wanted)
+            return self._read_available(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        """Read up to size bytes, waiting only until some data is available."""
+        with self._condition:
+            self._wait(lambda: self._stored > self._position, 1)
+            return self._read_available(size)
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        """Read one line, waiting until it is complete or EOF."""
+        size = -1 if size is None else size
+        line = b""
+        with self._condition:
+            while size < 0 or len(line) < size:
+                self._wait(lambda: self._stored > self._position, 1)
+                self._file.seek(self._position)
+                part = cast(bytes, self._file.readline(-1 if size < 0 else size - len(line)))
+                self._position += len(part)
+                self._wake_writer()
+                line += part
+                if not part or line.endswith(b"\n"):
+                    break
+            return line
+
+    def getvalue(self) -> bytes:
+        """Return the whole body, waiting for EOF, without moving the read position."""
+        with self._condition:
+            self._wait(lambda: False, sys.maxsize)
+            self._file.seek(0)
+            return cast(bytes, self._file.read(self._stored))
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        with self._condition:
+            if whence == io.SEEK_END:
+                # The end isn't known until the whole body has arrived
+                self._wait(lambda: False, sys.maxsize)
+                base = self._stored
+            elif whence == io.SEEK_CUR:
+                base = self._position
+            else:
+                base = 0
+            if base + offset < 0:
+                raise ValueError(f"negative seek position {base + offset}")
+            self._position = base + offset
+            self._wake_writer()
+            return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self):
+        with self._condition:
+            self._released = True
+            self._file.close()
+            super().close()
+            self._wake_writer()
 
 
 class FileStreamWrapper:
@@ -124,3 +371,67 @@ class FileStreamWrapper:
             if not chunk:
                 break
             yield chunk
+
+
+def is_iterator_body(obj: Any) -> bool:
+    """Check if a response body is a sync or async iterator of chunks.
+
+    Generators, async generators and other iterator objects qualify. Strings,
+    bytes, dicts and lists are iterable but are sent as complete bodies, and
+    file-like objects are streamed with read() instead.
+
+    Args:
+        obj: Response body to check
+
+    Returns:
+        True if the body should be sent chunk by chunk as it is produced
+    """
+    if isinstance(obj, (str, bytes, bytearray, dict, list, io.IOBase)):
+        return False
+    return isinstance(obj, (Iterator, AsyncIterator))
+
+
+def encode_chunk(chunk: Union[bytes, str]) -> bytes:
+    """Encode a chunk produced by an iterator body (str chunks as UTF-8)."""
+    if isinstance(chunk, str):
+        return chunk.encode("utf-8")
+    return bytes(chunk)
+
+
+def collect_iterator_body(body: ChunkIterator) -> bytes:
+    """Consume a sync or async iterator body into a single bytes value.
+
+    Used where a complete body is required (e.g. Lambda proxy responses).
+    Async iterators are driven on a new event loop, so this must not be
+    called from a running loop. The iterator is closed afterwards.
+
+    Args:
+        body: Iterator of bytes or str chunks
+
+    Returns:
+        The concatenated body
+    """
+    if isinstance(body, AsyncIterator):
+        return asyncio.run(_collect_async(body))
+
+    chunks = []
+    try:
+        for chunk in cast(Iterable[Union[bytes, str]], body):
+            chunks.append(encode_chunk(chunk))
+    finally:
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+    return b"".join(chunks)
+
+
+async def _collect_async(body: AsyncIterator) -> bytes:
+    chunks = []
+    try:
+        async for chunk in body:
+            chunks.append(encode_chunk(chunk))
+    finally:
+        aclose = getattr(body, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return b"".join(chunks)
@@ -5,13 +5,15 @@ This is the third layer in Dave Farley's 4-layer testing architecture.
 Drivers know how to translate DSL requests into actual system calls.
 """
 
+import asyncio
 import io
 import json
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 
 from restmachine import RestApplication, HTTPMethod, Request as RestMachineRequest, BytesStreamBuffer
+from restmachine.streaming import collect_iterator_body, is_iterator_body
 from .dsl import HttpRequest, HttpResponse
 
 
@@ -42,6 +44,8 @@ class RestMachineDriver(DriverInterface):
 
         # Execute through the library
         rm_response = self.app.execute(rm_request)
+        # Run queued background tasks as a server would after sending the response
+        self.app._run_background_tasks(rm_request, rm_response)
 
         # Convert RestMachine response back to DSL response
         return self._convert_from_restmachine_response(rm_response)
@@ -142,6 +146,8 @@ class RestMachineDriver(DriverInterface):
             return self._read_path_body(body)
         elif isinstance(body, io.IOBase):
             return self._read_stream_body(body)
+        elif is_iterator_body(body):
+            return self._read_iterator_body(body)
         return body
 
     def _read_path_body(self, path: Path):
@@ -159,6 +165,16 @@ class RestMachineDriver(DriverInterface):
             # Keep as bytes if not valid UTF-8
             return body_bytes
 
+    def _read_iterator_body(self, body):
+        """Read body from a sync or async generator."""
+        body_bytes = collect_iterator_body(body)
+
+        # Try to decode as UTF-8
+        try:
+            return body_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            return body_bytes
+
     def _read_stream_body(self, stream: io.IOBase):
         """Read body from a stream."""
         body_bytes = stream.read()
@@ -177,8 +193,8 @@ class RestMachineDriver(DriverInterface):
 
         try:
             return json.loads(body) if isinstance(body, (str, bytes)) else body
-        except (json.JSONDecodeError, TypeError):
-            # Keep as string if not valid JSON
+        except (ValueError, TypeError):
+            # Keep as string (or bytes, e.g. a compressed body) if not valid JSON
             return body
 
     def get_openapi_spec(self) -> Dict[str, Any]:
@@ -193,6 +209,149 @@ class RestMachineDriver(DriverInterface):
             raise NotImplementedError("Application does not support OpenAPI generation")
 
 
+class AsgiDriver(DriverInterface):
+    """
+    Driver that executes requests through the ASGI adapter in-process.
+
+    Requests are converted to ASGI scope/receive/send calls on a private event
+    loop, so the full adapter path (scope parsing, thread pool hop, response
+    streaming) is exercised without opening sockets.
+    """
+
+    def __init__(self, app: RestApplication, extensions: Optional[Dict[str, Any]] = None, **adapter_kwargs: Any):
+        """Initialize with a RestApplication wrapped in an ASGIAdapter.
+
+        Args:
+            app: The RestMachine application
+            extensions: ASGI extensions to advertise in the scope, as a server would
+                        (e.g. {"http.response.pathsend": {}})
+            **adapter_kwargs: Passed to ASGIAdapter
+        """
+        from restmachine.adapters import ASGIAdapter
+
+        adapter_kwargs.setdefault("enable_metrics", False)
+        self.app = app
+        self.extensions = extensions
+        self.asgi_app = ASGIAdapter(app, **adapter_kwargs)
+        self._loop = asyncio.new_event_loop()
+
+    def execute(self, request: HttpRequest) -> HttpResponse:
+        """Execute request through the ASGI adapter."""
+        messages = self._loop.run_until_complete(self._call_asgi(request))
+        return self._convert_from_asgi_messages(messages)
+
+    def close(self):
+        """Close the driver's event loop."""
+        if not self._loop.is_closed():
+            self._loop.close()
+
+    async def _call_asgi(self, request: HttpRequest) -> List[Dict[str, Any]]:
+        """Run one request through the ASGI application and collect sent messages."""
+        from urllib.parse import urlencode
+
+        body = self._encode_body(request)
+        headers = [
+            [name.lower().encode("latin-1"), str(value).encode("latin-1")]
+            for name, value in request.headers.items()
+        ]
+        if body and not any(name == b"content-length" for name, _ in headers):
+            headers.append([b"content-length", str(len(body)).encode("latin-1")])
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method.upper(),
+            "scheme": "http",
+            "path": request.path,
+            "query_string": urlencode(request.query_params).encode("latin-1") if request.query_params else b"",
+            "headers": headers,
+        }
+        if self.extensions is not None:
+            scope["extensions"] = self.extensions
+
+        request_sent = False
+        response_complete = asyncio.Event()
+        messages: List[Dict[str, Any]] = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Like a server, only report the disconnect once the response is complete
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.zerocopysend":
+                # The file is only guaranteed to be open during send, so read it now
+                file = message["file"]
+                file.seek(message.get("offset", 0))
+                count = message.get("count")
+                message = {"type": "http.response.body", "body": file.read(-1 if count is None else count)}
+            messages.append(message)
+            if message["type"] != "http.response.start" and not message.get("more_body", False):
+                response_complete.set()
+
+        await self.asgi_app(scope, receive, send)
+        return messages
+
+    def _encode_body(self, request: HttpRequest) -> bytes:
+        """Encode the DSL request body as bytes."""
+        if request.body is None:
+            return b""
+        if isinstance(request.body, dict):
+            content_type = request.headers.get("Content-Type", "")
+            if "application/x-www-form-urlencoded" in content_type:
+                from urllib.parse import urlencode
+                return urlencode(request.body).encode("utf-8")
+            return json.dumps(request.body).encode("utf-8")
+        if isinstance(request.body, bytes):
+            return request.body
+        return str(request.body).encode("utf-8")
+
+    def _convert_from_asgi_messages(self, messages: List[Dict[str, Any]]) -> HttpResponse:
+        """Convert collected ASGI messages to a DSL HttpResponse."""
+        start = next(message for message in messages if message["type"] == "http.response.start")
+
+        headers: Dict[str, str] = {}
+        for name, value in start.get("headers", []):
+            header_name = name.decode("latin-1")
+            header_value = value.decode("latin-1")
+            headers[header_name] = f"{headers[header_name]}, {header_value}" if header_name in headers else header_value
+
+        body_bytes = b"".join(
+            message.get("body", b"") for message in messages if message["type"] == "http.response.body"
+        )
+        for message in messages:
+            if message["type"] == "http.response.pathsend":
+                body_bytes += Path(message["path"]).read_bytes()
+
+        content_type = headers.get("content-type")
+        body: Any = None
+        if body_bytes and start["status"] == 206:
+            # Partial content is returned as raw bytes, matching RestMachineDriver
+            body = body_bytes
+        elif body_bytes:
+            try:
+                body = body_bytes.decode("utf-8")
+            except UnicodeDecodeError:
+                body = body_bytes
+            if content_type and "application/json" in content_type and isinstance(body, str):
+                try:
+                    body = json.loads(body)
+                except json.JSONDecodeError:
+                    pass
+
+        return HttpResponse(
+            status_code=start["status"],
+            headers=headers,
+            body=body,
+            content_type=content_type,
+        )
+
+
 class HttpDriver(DriverInterface):
     """
     Driver that executes requests through actual HTTP calls.
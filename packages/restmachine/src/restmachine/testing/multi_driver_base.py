@@ -14,6 +14,7 @@ from .dsl import RestApiDsl
 from .drivers import (
     DriverInterface,
     RestMachineDriver,
+    AsgiDriver,
     MockDriver
 )
 
@@ -56,6 +57,7 @@ class MultiDriverTestBase(ABC):
         """Create a driver instance for the given driver name."""
         driver_map = {
             'direct': lambda app: RestMachineDriver(app),
+            'asgi': lambda app: AsgiDriver(app),
             'mock': lambda app: MockDriver()  # Note: MockDriver doesn't use app
         }
 
@@ -0,0 +1,527 @@
+"""Request tracing with an OpenTelemetry-compatible span model.
+
+This module provides a small tracing layer that records a span tree for every
+request: adapter parsing, route matching, each state machine state, each
+dependency, the handler, rendering and sending the response. Tracing is opt-in;
+when no tracer is configured the framework skips all span bookkeeping.
+
+Spans use W3C Trace Context identifiers (32 hex character trace IDs and 16 hex
+character span IDs), and incoming ``traceparent`` headers are honoured so that
+restmachine spans join an existing distributed trace.
+
+Example:
+    from restmachine import RestApplication
+    from restmachine.tracing import InMemorySpanExporter, Tracer
+
+    exporter = InMemorySpanExporter()
+    app = RestApplication()
+    app.set_tracer(Tracer(exporter))
+
+    @app.get("/users/{id}")
+    def get_user(id: str):
+        return {"user": id}
+
+    # After handling requests
+    for span in exporter.get_finished_spans():
+        print(span.name, span.duration_ns)
+
+To send spans to a real OpenTelemetry SDK, use ``OpenTelemetryTracer``, which
+delegates span creation to an ``opentelemetry.trace.Tracer``.
+"""
+
+import contextvars
+import logging
+import re
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .models import Request
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT_PATTERN = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanKind(str, Enum):
+    """Span kinds (mirrors OpenTelemetry's SpanKind)."""
+    INTERNAL = "INTERNAL"
+    SERVER = "SERVER"
+
+
+class StatusCode(str, Enum):
+    """Span status codes (mirrors OpenTelemetry's StatusCode)."""
+    UNSET = "UNSET"
+    OK = "OK"
+    ERROR = "ERROR"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifiers that tie a span into a trace."""
+    trace_id: str
+    span_id: str
+    trace_flags: int = 1
+    is_remote: bool = False
+
+    @property
+    def is_valid(self) -> bool:
+        """Check whether this context carries usable identifiers."""
+        return self.trace_id != _INVALID_TRACE_ID and self.span_id != _INVALID_SPAN_ID
+
+    def to_traceparent(self) -> str:
+        """Format this context as a W3C ``traceparent`` header value."""
+        return f"00-{self.trace_id}-{self.span_id}-{self.trace_flags:02x}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` header value.
+
+    Args:
+        value: The header value, e.g. ``00-<trace-id>-<parent-id>-01``
+
+    Returns:
+        A remote SpanContext, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    match = _TRACEPARENT_PATTERN.match(value.strip().lower())
+    if match is None:
+        return None
+
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff":
+        return None
+
+    context = SpanContext(trace_id=trace_id, span_id=span_id, trace_flags=int(flags, 16), is_remote=True)
+    return context if context.is_valid else None
+
+
+def generate_trace_id() -> str:
+    """Generate a random 128-bit trace ID as 32 hex characters."""
+    return secrets.token_hex(16)
+
+
+def generate_span_id() -> str:
+    """Generate a random 64-bit span ID as 16 hex characters."""
+    return secrets.token_hex(8)
+
+
+class Span:
+    """A timed operation within a trace.
+
+    Timestamps are nanoseconds since the epoch, matching OpenTelemetry.
+    """
+
+    def __init__(self,
+                 name: str,
+                 context: SpanContext,
+                 parent_id: Optional[str] = None,
+                 kind: SpanKind = SpanKind.INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None,
+                 start_time: Optional[int] = None,
+                 tracer: Optional["Tracer"] = None):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Dict[str, Any]] = []
+        self.status = StatusCode.UNSET
+        self.status_description: Optional[str] = None
+        self.start_time = start_time if start_time is not None else time.time_ns()
+        self.end_time: Optional[int] = None
+        self._tracer = tracer
+
+    @property
+    def trace_id(self) -> str:
+        """The 32 hex character trace ID."""
+        return self.context.trace_id
+
+    @property
+    def span_id(self) -> str:
+        """The 16 hex character span ID."""
+        return self.context.span_id
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        """Span duration in nanoseconds, or None if the span has not ended."""
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def is_recording(self) -> bool:
+        """Check whether this span is still collecting data."""
+        return self.end_time is None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set a single attribute on the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        """Set several attributes on the span."""
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Record a timestamped event on the span."""
+        self.events.append({"name": name, "timestamp": time.time_ns(), "attributes": attributes or {}})
+
+    def set_status(self, status: StatusCode, description: Optional[str] = None) -> None:
+        """Set the span status."""
+        self.status = status
+        self.status_description = description
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Record an exception as a span event."""
+        self.add_event("exception", {
+            "exception.type": type(exception).__name__,
+            "exception.message": str(exception),
+        })
+
+    def end(self, end_time: Optional[int] = None) -> None:
+        """End the span and hand it to the tracer's exporter."""
+        if self.end_time is not None:
+            return
+        self.end_time = end_time if end_time is not None else time.time_ns()
+        if self._tracer is not None:
+            self._tracer._on_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span to a dictionary for logging or export."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind.value,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ns": self.duration_ns,
+            "attributes": dict(self.attributes),
+            "events": list(self.events),
+            "status": self.status.value,
+        }
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name!r}, trace_id={self.trace_id!r}, span_id={self.span_id!r})"
+
+
+class SpanExporter(ABC):
+    """Abstract base class for span exporters.
+
+    Exporters receive spans as they finish. Implementations must be thread-safe,
+    since spans may end on worker threads.
+    """
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """Export finished spans.
+
+        Args:
+            spans: The spans that just ended
+        """
+        pass
+
+    def shutdown(self) -> None:
+        """Flush and release any resources held by the exporter."""
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Exporter that keeps finished spans in memory.
+
+    Intended for tests and benchmarks that need to assert on the span tree or
+    on where time was spent.
+
+    Example:
+        exporter = InMemorySpanExporter()
+        app.set_tracer(Tracer(exporter))
+
+        # ... handle a request ...
+        names = [span.name for span in exporter.get_finished_spans()]
+        assert "handler" in names
+    """
+
+    def __init__(self):
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        """Return a copy of all spans exported so far."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """Discard all exported spans."""
+        with self._lock:
+            self._spans.clear()
+
+
+class Tracer:
+    """Creates spans and tracks the active span.
+
+    The active span is stored in a context variable, so it follows asyncio tasks
+    and any worker thread that runs inside a copied context.
+
+    Args:
+        exporter: Optional exporter that receives spans as they end
+        service_name: Service name recorded on request spans
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, service_name: Optional[str] = None):
+        self.exporter = exporter
+        self.service_name = service_name
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            "restmachine_current_span", default=None
+        )
+
+    def current_span(self) -> Optional[Any]:
+        """Return the active span, or None if no span is active."""
+        return self._current.get()
+
+    @contextmanager
+    def start_span(self,
+                   name: str,
+                   attributes: Optional[Dict[str, Any]] = None,
+                   parent: Optional[SpanContext] = None,
+                   kind: SpanKind = SpanKind.INTERNAL,
+                   start_time: Optional[int] = None) -> Iterator[Any]:
+        """Start a span and make it active for the duration of the block.
+
+        Args:
+            name: Span name
+            attributes: Initial span attributes
+            parent: Explicit parent context (defaults to the active span)
+            kind: Span kind
+            start_time: Start timestamp in nanoseconds (defaults to now)
+
+        Yields:
+            The started span
+        """
+        span = self._create_span(name, attributes, parent, kind, start_time)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            span.set_status(StatusCode.ERROR, str(e))
+            raise
+        finally:
+            self._current.reset(token)
+            span.end()
+
+    def record_span(self,
+                    name: str,
+                    start_time: int,
+                    end_time: int,
+                    attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Record an already completed operation as a child of the active span.
+
+        Args:
+            name: Span name
+            start_time: Start timestamp in nanoseconds
+            end_time: End timestamp in nanoseconds
+            attributes: Span attributes
+        """
+        span = self._create_span(name, attributes, None, SpanKind.INTERNAL, start_time)
+        span.end(end_time)
+
+    @contextmanager
+    def request_span(self,
+                     request: "Request",
+                     parse_start: Optional[int] = None,
+                     parse_end: Optional[int] = None) -> Iterator[Any]:
+        """Start the root span for a request.
+
+        The parent is taken from the request's ``traceparent`` header if present.
+        When the adapter measured how long it took to build the request, pass the
+        timestamps and an ``adapter.parse`` child span is recorded.
+
+        Args:
+            request: The request being processed
+            parse_start: When the adapter started parsing the request
+            parse_end: When the adapter finished parsing the request
+
+        Yields:
+            The request span
+        """
+        attributes: Dict[str, Any] = {
+            "http.request.method": request.method.value,
+            "url.path": request.path,
+        }
+        if self.service_name:
+            attributes["service.name"] = self.service_name
+
+        parent = parse_traceparent(request.headers.get("traceparent"))
+        with self.start_span(
+            f"HTTP {request.method.value}",
+            attributes=attributes,
+            parent=parent,
+            kind=SpanKind.SERVER,
+            start_time=parse_start,
+        ) as span:
+            if parse_start is not None and parse_end is not None:
+                self.record_span("adapter.parse", parse_start, parse_end)
+            yield span
+
+    def shutdown(self) -> None:
+        """Shut down the exporter."""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+    def _create_span(self,
+                     name: str,
+                     attributes: Optional[Dict[str, Any]],
+                     parent: Optional[SpanContext],
+                     kind: SpanKind,
+                     start_time: Optional[int]) -> Span:
+        """Create a span parented to ``parent`` or the active span."""
+        if parent is None:
+            current = self._current.get()
+            if current is not None:
+                parent = current.context
+
+        if parent is not None:
+            context = SpanContext(parent.trace_id, generate_span_id(), parent.trace_flags)
+            parent_id: Optional[str] = parent.span_id
+        else:
+            context = SpanContext(generate_trace_id(), generate_span_id())
+            parent_id = None
+
+        return Span(name, context, parent_id, kind, attributes, start_time, tracer=self)
+
+    def _on_end(self, span: Span) -> None:
+        """Export a span that has just ended."""
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export([span])
+        except Exception as e:
+            logger.warning(f"Failed to export span {span.name}: {e}")
+
+
+class _OpenTelemetrySpan:
+    """Adapts an OpenTelemetry span to the interface restmachine uses."""
+
+    def __init__(self, span: Any):
+        self._span = span
+        span_context = span.get_span_context()
+        self.context = SpanContext(
+            trace_id=format(span_context.trace_id, "032x"),
+            span_id=format(span_context.span_id, "016x"),
+            trace_flags=int(span_context.trace_flags),
+        )
+
+    @property
+    def trace_id(self) -> str:
+        return self.context.trace_id
+
+    @property
+    def span_id(self) -> str:
+        return self.context.span_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self._span.set_attributes(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self._span.add_event(name, attributes or {})
+
+    def set_status(self, status: StatusCode, description: Optional[str] = None) -> None:
+        from opentelemetry.trace import Status
+        from opentelemetry.trace import StatusCode as OTelStatusCode
+        self._span.set_status(Status(OTelStatusCode[status.value], description))
+
+    def record_exception(self, exception: BaseException) -> None:
+        self._span.record_exception(exception)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that delegates to an OpenTelemetry SDK.
+
+    Spans are created through ``opentelemetry.trace`` so that the configured
+    OpenTelemetry span processors and exporters receive them. Requires the
+    ``opentelemetry-api`` package.
+
+    Example:
+        from opentelemetry import trace
+        from restmachine.tracing import OpenTelemetryTracer
+
+        app.set_tracer(OpenTelemetryTracer(trace.get_tracer("my-service")))
+
+    Args:
+        tracer: An ``opentelemetry.trace.Tracer`` (defaults to the global tracer)
+        service_name: Service name recorded on request spans
+    """
+
+    def __init__(self, tracer: Any = None, service_name: Optional[str] = None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryTracer requires opentelemetry-api. "
+                "Install it with: pip install opentelemetry-api"
+            ) from e
+
+        super().__init__(exporter=None, service_name=service_name)
+        self._otel_tracer = tracer if tracer is not None else trace.get_tracer("restmachine")
+
+    def current_span(self) -> Optional[Any]:
+        from opentelemetry import trace
+
+        span = trace.get_current_span()
+        if not span.get_span_context().is_valid:
+            return None
+        return _OpenTelemetrySpan(span)
+
+    @contextmanager
+    def start_span(self,
+                   name: str,
+                   attributes: Optional[Dict[str, Any]] = None,
+                   parent: Optional[SpanContext] = None,
+                   kind: SpanKind = SpanKind.INTERNAL,
+                   start_time: Optional[int] = None) -> Iterator[Any]:
+        from opentelemetry import trace
+
+        otel_context = None
+        if parent is not None:
+            remote = trace.SpanContext(
+                trace_id=int(parent.trace_id, 16),
+                span_id=int(parent.span_id, 16),
+                is_remote=parent.is_remote,
+                trace_flags=trace.TraceFlags(parent.trace_flags),
+            )
+            otel_context = trace.set_span_in_context(trace.NonRecordingSpan(remote))
+
+        with self._otel_tracer.start_as_current_span(
+            name,
+            context=otel_context,
+            kind=trace.SpanKind[kind.value],
+            attributes=attributes,
+            start_time=start_time,
+        ) as span:
+            yield _OpenTelemetrySpan(span)
+
+    def record_span(self,
+                    name: str,
+                    start_time: int,
+                    end_time: int,
+                    attributes: Optional[Dict[str, Any]] = None) -> None:
+        span = self._otel_tracer.start_span(name, attributes=attributes, start_time=start_time)
+        span.end(end_time=end_time)
+
@@ -0,0 +1,52 @@
+"""
+Compiled Pydantic TypeAdapters for request bodies and handler return values.
+
+Building a TypeAdapter compiles a validator and serializer for a type, so it
+is done once per annotation, when routes and validators are registered. The
+adapters validate request bodies straight from the raw JSON bytes and
+serialize return values straight to JSON bytes, without going through
+intermediate dicts in Python.
+"""
+
+from typing import Any, Dict, Optional, get_args, get_origin
+
+from .exceptions import PYDANTIC_AVAILABLE
+
+if PYDANTIC_AVAILABLE:
+    from pydantic import TypeAdapter
+
+# Adapter (or None for annotations that aren't models) by annotation
+_ADAPTERS: Dict[Any, Optional["TypeAdapter[Any]"]] = {}
+
+
+def is_model_annotation(annotation: Any) -> bool:
+    """Check if annotation is a Pydantic model class or a list of one."""
+    if get_origin(annotation) is list:
+        args = get_args(annotation)
+        return bool(args) and isinstance(args[0], type) and hasattr(args[0], "model_validate")
+    return isinstance(annotation, type) and hasattr(annotation, "model_validate")
+
+
+def model_type_adapter(annotation: Any) -> Optional["TypeAdapter[Any]"]:
+    """Return the compiled TypeAdapter for a model (or list of models) annotation.
+
+    Args:
+        annotation: Parameter or return annotation
+
+    Returns:
+        The shared TypeAdapter, or None if Pydantic isn't installed or the
+        annotation isn't a Pydantic model or a list of one
+    """
+    if not PYDANTIC_AVAILABLE:
+        return None
+    try:
+        return _ADAPTERS[annotation]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable annotation
+        return None
+
+    adapter = TypeAdapter(annotation) if is_model_annotation(annotation) else None
+    _ADAPTERS[annotation] = adapter
+    return adapter
@@ -0,0 +1,140 @@
+"""Cross-request cache of resource validators (ETag and Last-Modified).
+
+A conditional GET normally runs ``resource_exists``, ``generate_etag`` and
+``last_modified`` just to find out that the client's copy is still current,
+which usually means a database round trip per poll. With the validator cache
+enabled, the ETag and Last-Modified computed for a resource are remembered
+for ``ttl`` seconds, keyed by route and path parameters. While an entry is
+fresh, a GET whose ``If-None-Match`` or ``If-Modified-Since`` matches it is
+answered with 304 Not Modified straight after authorization, without calling
+``resource_exists`` or the validator callbacks.
+
+Entries are dropped when a POST, PUT, PATCH or DELETE to the same route and
+path parameters succeeds. Changes made elsewhere (other services, background
+jobs, an ORM hook) should invalidate the entry explicitly; otherwise clients
+may get 304 for up to ``ttl`` seconds after the resource changed.
+
+Example:
+    validators = app.enable_validator_cache(ttl=30)
+
+    @app.get("/items/{item_id}")
+    def get_item(item):
+        return item
+
+    # e.g. from an ORM after_save hook
+    def item_saved(item):
+        validators.invalidate("/items/{item_id}", item_id=item.id)
+
+The cache assumes validators depend only on the route and its path
+parameters, not on other request headers.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class CachedValidators:
+    """Validators remembered for one resource.
+
+    Attributes:
+        etag: Quoted ETag, if the route generates one.
+        last_modified: Last modification time, if the route reports one.
+        expires_at: Clock time after which the entry is no longer used.
+    """
+
+    __slots__ = ("etag", "last_modified", "expires_at")
+
+    def __init__(self, expires_at: float):
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
+        self.expires_at = expires_at
+
+
+class ValidatorCache:
+    """Thread-safe, bounded store of resource validators with a TTL.
+
+    Attributes:
+        ttl: Seconds an entry is used for after it was last recorded.
+        max_entries: Maximum number of resources remembered; the least
+            recently used are dropped first.
+        hits: Number of requests answered from the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CachedValidators]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(route_path: str, path_params: Optional[Dict[str, Any]] = None) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        """Cache key for a route template and its path parameter values."""
+        params = tuple(sorted((name, str(value)) for name, value in path_params.items())) if path_params else ()
+        return route_path, params
+
+    def get(self, key: Hashable) -> Optional[CachedValidators]:
+        """Return the fresh entry for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def record(self, key: Hashable, etag: Optional[str] = None, last_modified: Optional[datetime] = None) -> None:
+        """Remember a freshly computed ETag and/or Last-Modified for key."""
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = CachedValidators(expires_at)
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                entry.expires_at = expires_at
+            if etag is not None:
+                entry.etag = etag
+            if last_modified is not None:
+                entry.last_modified = last_modified
+
+    def invalidate(self, route_path: str, **path_params: Any) -> None:
+        """Forget the validators for a resource.
+
+        Args:
+            route_path: Route template, e.g. "/items/{item_id}"
+            **path_params: Path parameter values, e.g. item_id=42
+        """
+        self.discard(self.key(route_path, path_params))
+
+    def discard(self, key: Hashable) -> None:
+        """Forget the validators stored under key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all validators."""
+        with self._lock:
+            self._entries.clear()
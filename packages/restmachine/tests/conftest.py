@@ -7,6 +7,17 @@ MultiDriverTestBase and adds driver-specific markers.
 
 import pytest
 from tests.framework.multi_driver_base import MultiDriverTestBase
+from tests.performance.allocation_tracking import (  # noqa: F401
+    add_allocation_options,
+    allocation_baselines,
+    allocation_summary,
+    allocation_tracker,
+)
+
+
+def pytest_addoption(parser):
+    """Register the allocation benchmark options."""
+    add_allocation_options(parser)
 
 
 def pytest_configure(config):
@@ -14,6 +25,11 @@ def pytest_configure(config):
     config.option.anyio_backends = ["asyncio"]
 
 
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report allocation measurements taken during the session."""
+    allocation_summary(terminalreporter, config)
+
+
 def pytest_generate_tests(metafunc):
     """
     Pytest hook to automatically parametrize the 'api' fixture for MultiDriverTestBase subclasses.
@@ -66,6 +82,13 @@ def pytest_collection_modifyitems(config, items):
         'TestDeletePath',
         'TestErrorPaths',
         'TestCRUDCyclePath',
+        # Allocation (memory per request) tests
+        'TestSimpleGetAllocations',
+        'TestValidatedPostAllocations',
+        'TestConditionalAllocations',
+        'TestRangeAllocations',
+        'TestCorsPreflightAllocations',
+        'TestErrorAllocations',
         # Future performance tests (placeholders)
         'TestGetRequestPerformance',
         'TestPostRequestPerformance',
@@ -0,0 +1,256 @@
+"""
+Allocation tracking for memory-per-request benchmarks.
+
+Uses tracemalloc to measure how much memory a single request allocates at its
+peak, and how much is still retained after the request completes (leaks or
+unbounded caches). Results are keyed by test and driver so they can be saved as
+baselines and compared on later runs, similar to pytest-benchmark timings.
+
+Options (registered by the core and adapter conftests):
+    --allocation-save           Save measurements to the baseline file
+    --allocation-compare        Compare measurements against the baseline file
+    --allocation-compare-fail   Allowed regression in percent (default: 10)
+    --allocation-storage        Baseline file path
+"""
+
+import gc
+import json
+import statistics
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+DEFAULT_STORAGE = Path(__file__).parent / "baselines" / "allocations.json"
+DEFAULT_COMPARE_FAIL = 10.0
+
+# Retained memory is usually close to zero, so percentage comparisons alone
+# would fail on a handful of bytes of noise
+RETAINED_BYTES_SLACK = 256
+
+# Results of the current session, for the terminal summary
+_session_results: Dict[str, "AllocationStats"] = {}
+_summary_written = False
+
+
+@dataclass
+class AllocationStats:
+    """Memory measurements for one request path.
+
+    Attributes:
+        iterations: Number of measured requests
+        peak_bytes: Median peak memory allocated while handling one request
+        max_peak_bytes: Largest peak seen across all measured requests
+        retained_bytes: Memory still allocated after each request, on average
+        retained_blocks: Memory blocks still allocated after each request, on average
+    """
+    iterations: int
+    peak_bytes: int
+    max_peak_bytes: int
+    retained_bytes: float
+    retained_blocks: float
+
+
+def measure_allocations(func: Callable[[], Any], iterations: int = 200, warmup: int = 20) -> AllocationStats:
+    """Measure memory allocated by repeated calls to func.
+
+    The warmup calls populate lazy caches (routes, dependency signatures,
+    renderers) so that only steady-state allocations are measured.
+
+    Args:
+        func: Callable that performs one request
+        iterations: Number of measured calls
+        warmup: Number of unmeasured calls made first
+
+    Returns:
+        AllocationStats for the measured calls
+    """
+    for _ in range(warmup):
+        func()
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        peaks: List[int] = []
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+
+        # A real leak grows in every round, while one-off growth of amortized
+        # containers (dict resizes, free lists) shows up in only one of them
+        retained = min(_measure_retained(func, iterations) for _ in range(2))
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    retained_bytes, retained_blocks = retained
+    return AllocationStats(
+        iterations=iterations,
+        peak_bytes=int(statistics.median(peaks)),
+        max_peak_bytes=max(peaks),
+        retained_bytes=retained_bytes / iterations,
+        retained_blocks=retained_blocks / iterations,
+    )
+
+
+def _measure_retained(func: Callable[[], Any], iterations: int) -> Tuple[int, int]:
+    """Return the bytes and blocks still allocated after calling func repeatedly."""
+    gc.collect()
+    before_snapshot = _take_snapshot()
+    for _ in range(iterations):
+        func()
+    gc.collect()
+    after_snapshot = _take_snapshot()
+
+    differences = after_snapshot.compare_to(before_snapshot, "filename")
+    return (
+        sum(difference.size_diff for difference in differences),
+        sum(difference.count_diff for difference in differences),
+    )
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot that ignores tracemalloc's own bookkeeping."""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+
+
+class AllocationBaselines:
+    """Stores allocation measurements and compares them against saved baselines."""
+
+    def __init__(self, storage: Path, save: bool = False, compare: bool = False,
+                 compare_fail: float = DEFAULT_COMPARE_FAIL):
+        self.storage = storage
+        self.save_results = save
+        self.compare = compare
+        self.compare_fail = compare_fail
+        self.results: Dict[str, AllocationStats] = {}
+        self.baselines: Dict[str, Dict[str, Any]] = {}
+        if compare and storage.exists():
+            self.baselines = json.loads(storage.read_text())
+
+    def record(self, key: str, stats: AllocationStats) -> List[str]:
+        """Record a measurement and return any regressions against the baseline."""
+        self.results[key] = stats
+        if not self.compare:
+            return []
+
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            return []
+
+        regressions = []
+        allowed = 1 + self.compare_fail / 100
+        if stats.peak_bytes > baseline["peak_bytes"] * allowed:
+            regressions.append(
+                f"peak_bytes {stats.peak_bytes} exceeds baseline {baseline['peak_bytes']} "
+                f"by more than {self.compare_fail}%"
+            )
+        retained_limit = baseline["retained_bytes"] * allowed + RETAINED_BYTES_SLACK
+        if stats.retained_bytes > retained_limit:
+            regressions.append(
+                f"retained_bytes {stats.retained_bytes:.1f} exceeds baseline {baseline['retained_bytes']:.1f} "
+                f"by more than {self.compare_fail}%"
+            )
+        return regressions
+
+    def save(self) -> None:
+        """Merge the recorded measurements into the baseline file."""
+        if not self.save_results or not self.results:
+            return
+        existing: Dict[str, Any] = json.loads(self.storage.read_text()) if self.storage.exists() else {}
+        existing.update({key: asdict(stats) for key, stats in self.results.items()})
+        self.storage.parent.mkdir(parents=True, exist_ok=True)
+        self.storage.write_text(json.dumps(existing, indent=2, sort_keys=True) + "\n")
+
+
+class AllocationTracker:
+    """Per-test helper that measures a request path and checks it against baselines."""
+
+    def __init__(self, baselines: AllocationBaselines, key: str):
+        self.baselines = baselines
+        self.key = key
+
+    def measure(self, func: Callable[[], Any], iterations: int = 200, warmup: int = 20) -> AllocationStats:
+        """Measure func, record the result and fail the test on regression."""
+        stats = measure_allocations(func, iterations=iterations, warmup=warmup)
+        regressions = self.baselines.record(self.key, stats)
+        if regressions:
+            pytest.fail(f"Allocation regression in {self.key}: " + "; ".join(regressions))
+        return stats
+
+
+def add_allocation_options(parser) -> None:
+    """Register the allocation benchmark command line options."""
+    group = parser.getgroup("allocations", "allocation benchmarks")
+    try:
+        group.addoption("--allocation-save", action="store_true", default=False,
+                        help="Save allocation measurements as baselines")
+        group.addoption("--allocation-compare", action="store_true", default=False,
+                        help="Compare allocation measurements against saved baselines")
+        group.addoption("--allocation-compare-fail", type=float, default=DEFAULT_COMPARE_FAIL,
+                        help="Fail when an allocation measurement regresses by more than this percentage")
+        group.addoption("--allocation-storage", default=str(DEFAULT_STORAGE),
+                        help="Path of the allocation baseline file")
+    except ValueError:
+        # Already registered by another package's conftest in the same session
+        pass
+
+
+def _get_option(config, name: str, default: Any) -> Any:
+    """Read an option that may not be registered (e.g. when only imported)."""
+    try:
+        return config.getoption(name)
+    except ValueError:
+        return default
+
+
+@pytest.fixture(scope="session")
+def allocation_baselines(pytestconfig):
+    """Session-wide allocation results, saved to the baseline file at the end of the run."""
+    baselines = AllocationBaselines(
+        storage=Path(_get_option(pytestconfig, "--allocation-storage", DEFAULT_STORAGE)),
+        save=_get_option(pytestconfig, "--allocation-save", False),
+        compare=_get_option(pytestconfig, "--allocation-compare", False),
+        compare_fail=_get_option(pytestconfig, "--allocation-compare-fail", DEFAULT_COMPARE_FAIL),
+    )
+    baselines.results = _session_results
+    yield baselines
+    baselines.save()
+
+
+@pytest.fixture
+def allocation_tracker(request, allocation_baselines):
+    """Allocation tracker keyed by test class, test name and driver."""
+    callspec = getattr(request.node, "callspec", None)
+    driver_name: Optional[str] = callspec.params.get("api") if callspec else None
+    key = f"{request.cls.__name__}.{request.function.__name__}" if request.cls else request.function.__name__
+    if driver_name:
+        key = f"{key}[{driver_name}]"
+    return AllocationTracker(allocation_baselines, key)
+
+
+def allocation_summary(terminalreporter, config) -> None:
+    """Write a table of the allocation measurements taken in this session."""
+    global _summary_written
+    results = _session_results
+    if not results or _summary_written:
+        return
+    # Both the core and adapter conftests call this when run in one session
+    _summary_written = True
+    terminalreporter.section("allocations per request")
+    terminalreporter.write_line(f"{'Name':<70} {'peak B':>10} {'max peak B':>11} {'retained B':>11} {'blocks':>8}")
+    for key in sorted(results):
+        stats = results[key]
+        terminalreporter.write_line(
+            f"{key:<70} {stats.peak_bytes:>10} {stats.max_peak_bytes:>11} "
+            f"{stats.retained_bytes:>11.1f} {stats.retained_blocks:>8.2f}"
+        )
@@ -116,6 +116,20 @@ def create_comprehensive_performance_app() -> RestApplication:
 
     # Auth routes already defined above (check_auth handles /protected)
 
+    # ====================================================================
+    # TestPydanticPayloadPath routes
+    # ====================================================================
+    from typing import List
+    from tests.performance.test_state_machine_paths import RECORDS, Record, RecordBatch
+
+    @app.get("/records")
+    def list_records() -> List[Record]:
+        return RECORDS
+
+    @app.post("/records")
+    def create_records(json_body: RecordBatch) -> List[Record]:
+        return json_body.records
+
     # ====================================================================
     # Combined routes for POST/PUT/DELETE/GET on /resources
     # ====================================================================
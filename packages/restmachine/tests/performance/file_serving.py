@@ -0,0 +1,238 @@
+"""
+File serving benchmark for the ASGI adapter.
+
+Serves files from 1MB to 1GB through uvicorn and hypercorn and measures
+time to first byte and throughput for full downloads and a 1MB range from the
+middle of each file. The adapter sends Path bodies with whichever of
+http.response.pathsend / http.response.zerocopysend the server advertises and
+falls back to chunked reads otherwise, so the report shows the mechanism used.
+Pass --no-extensions to hide the server's extensions and measure the fallback.
+
+Files are written to a temporary directory (or --directory) and are not kept.
+1GB files are only included when requested with --sizes.
+
+Usage (from packages/restmachine):
+    python -m tests.performance.file_serving
+    python -m tests.performance.file_serving --server hypercorn --sizes 1MB 1GB
+    python -m tests.performance.file_serving --no-extensions --chunk-size 1048576
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from restmachine import RestApplication
+from restmachine.adapters import DEFAULT_FILE_CHUNK_SIZE, PATHSEND_EXTENSION, ZEROCOPYSEND_EXTENSION, ASGIAdapter
+from tests.performance.load_generator import serve
+
+MB = 1024 * 1024
+
+FILE_SIZES = {
+    "1MB": MB,
+    "16MB": 16 * MB,
+    "128MB": 128 * MB,
+    "1GB": 1024 * MB,
+}
+
+DEFAULT_SIZES = ("1MB", "16MB", "128MB")
+
+READ_SIZE = MB
+
+
+@dataclass
+class FileResult:
+    """Timings for downloading one file (or range) several times."""
+    server: str
+    mechanism: str
+    size: str
+    range: bool
+    bytes: int
+    repeats: int
+    ttfb_ms: float
+    total_ms: float
+    throughput_mb_s: float
+
+
+class ExtensionRecorder:
+    """ASGI middleware that records (or hides) the extensions a server advertises."""
+
+    def __init__(self, app, hide: bool = False):
+        self.app = app
+        self.hide = hide
+        self.extensions: Dict[str, Any] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.extensions = dict(scope.get("extensions") or {})
+            if self.hide:
+                scope = {**scope, "extensions": {}}
+        await self.app(scope, receive, send)
+
+    @property
+    def mechanism(self) -> str:
+        if self.hide:
+            return "chunked"
+        if PATHSEND_EXTENSION in self.extensions:
+            return "pathsend"
+        if ZEROCOPYSEND_EXTENSION in self.extensions:
+            return "zerocopysend"
+        return "chunked"
+
+
+def create_file_app(directory: Path) -> RestApplication:
+    """Application serving the files in directory at /files/{name}."""
+    app = RestApplication()
+
+    @app.get("/files/{name}")
+    def get_file(path_params):
+        return directory / path_params["name"]
+
+    return app
+
+
+def write_file(directory: Path, name: str, size: int) -> Path:
+    """Write a file of the given size without holding it all in memory."""
+    path = directory / name
+    block = bytes(range(256)) * (MB // 256)
+    with path.open("wb") as f:
+        remaining = size
+        while remaining > 0:
+            f.write(block[:min(len(block), remaining)])
+            remaining -= len(block)
+    return path
+
+
+async def download(host: str, port: int, path: str,
+                   byte_range: Optional[Tuple[int, int]] = None) -> Tuple[int, int, float, float]:
+    """Download a file over a new connection, discarding the body.
+
+    Returns:
+        Status code, body bytes received, time to first byte and total time in seconds
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=READ_SIZE * 2)
+    start = time.perf_counter()
+    try:
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: close"]
+        if byte_range:
+            lines.append(f"Range: bytes={byte_range[0]}-{byte_range[1]}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        ttfb = time.perf_counter() - start
+        status = int(status_line.split()[1])
+
+        content_length = None
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value.strip())
+
+        received = 0
+        while content_length is None or received < content_length:
+            chunk = await reader.read(READ_SIZE)
+            if not chunk:
+                break
+            received += len(chunk)
+        return status, received, ttfb, time.perf_counter() - start
+    finally:
+        writer.close()
+
+
+async def measure(host: str, port: int, path: str, expected: int, repeats: int,
+                  byte_range: Optional[Tuple[int, int]] = None) -> Tuple[float, float]:
+    """Median time to first byte and total time in milliseconds over several downloads."""
+    ttfbs: List[float] = []
+    totals: List[float] = []
+    for _ in range(repeats):
+        status, received, ttfb, total = await download(host, port, path, byte_range)
+        if status not in (200, 206) or received != expected:
+            raise RuntimeError(f"GET {path} returned {status} with {received} of {expected} bytes")
+        ttfbs.append(ttfb * 1000)
+        totals.append(total * 1000)
+    return statistics.median(ttfbs), statistics.median(totals)
+
+
+def run_benchmark(server: str, sizes: Sequence[str], directory: Path, repeats: int = 3,
+                  hide_extensions: bool = False, chunk_size: int = DEFAULT_FILE_CHUNK_SIZE) -> List[FileResult]:
+    """Serve files of each size through server and time full and range downloads."""
+    for size_name in sizes:
+        write_file(directory, f"{size_name}.bin", FILE_SIZES[size_name])
+
+    adapter = ASGIAdapter(create_file_app(directory), enable_metrics=False, file_chunk_size=chunk_size)
+    recorder = ExtensionRecorder(adapter, hide=hide_extensions)
+    results = []
+
+    with serve(recorder, server) as target:
+        for size_name in sizes:
+            size = FILE_SIZES[size_name]
+            path = f"/files/{size_name}.bin"
+            range_start = max(size // 2 - MB // 2, 0)
+            range_end = min(range_start + MB, size) - 1
+
+            for byte_range in (None, (range_start, range_end)):
+                expected = size if byte_range is None else range_end - range_start + 1
+                ttfb, total = asyncio.run(measure(target.host, target.port, path, expected, repeats, byte_range))
+                results.append(FileResult(
+                    server=server,
+                    mechanism=recorder.mechanism,
+                    size=size_name,
+                    range=byte_range is not None,
+                    bytes=expected,
+                    repeats=repeats,
+                    ttfb_ms=round(ttfb, 3),
+                    total_ms=round(total, 3),
+                    throughput_mb_s=round(expected / MB / (total / 1000), 1),
+                ))
+    return results
+
+
+def format_result(result: FileResult) -> str:
+    """One line summary of a result."""
+    kind = "range 1MB" if result.range else "full"
+    return (
+        f"{result.server:<10} {result.mechanism:<13} {result.size:>6} {kind:<10} "
+        f"ttfb {result.ttfb_ms:>8.2f} ms  total {result.total_ms:>10.2f} ms  "
+        f"{result.throughput_mb_s:>8.1f} MB/s"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="File serving benchmark for the RestMachine ASGI adapter")
+    parser.add_argument("--server", choices=["uvicorn", "hypercorn"], nargs="+", default=["uvicorn", "hypercorn"])
+    parser.add_argument("--sizes", choices=sorted(FILE_SIZES), nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=3, help="Downloads per file; the median is reported")
+    parser.add_argument("--no-extensions", action="store_true", help="Hide server extensions to force chunked reads")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_FILE_CHUNK_SIZE, help="Fallback read size")
+    parser.add_argument("--directory", type=Path, help="Where to write test files (default: a temporary directory)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    results: List[FileResult] = []
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmp:
+        for server in args.server:
+            results.extend(run_benchmark(
+                server, args.sizes, Path(tmp), repeats=args.repeats,
+                hide_extensions=args.no_extensions, chunk_size=args.chunk_size,
+            ))
+
+    for result in results:
+        print(format_result(result))
+    if args.output:
+        args.output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+        print(f"saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
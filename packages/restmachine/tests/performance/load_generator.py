@@ -0,0 +1,574 @@
+"""
+Open-loop load generator for the ASGI adapter.
+
+pytest-benchmark measures one request at a time (closed loop): the next request
+is only sent once the previous one has finished, so queueing in the thread pool
+and tail latency never show up. This harness sends requests at a fixed arrival
+rate regardless of how fast responses come back, and reports latency
+percentiles and the maximum sustainable request rate for a route mix.
+
+Latency is measured from the time each request was *scheduled* to be sent, not
+from when the generator got round to sending it, so a stalled generator or
+event loop counts against the result instead of hiding it (coordinated omission).
+
+Targets:
+- asgi: calls ASGIAdapter in-process (no sockets)
+- uvicorn / hypercorn: starts a local server in a background thread and sends
+  HTTP/1.1 requests over keep-alive connections
+
+Usage (from packages/restmachine):
+    python -m tests.performance.load_generator --rate 500 --duration 10
+    python -m tests.performance.load_generator --mix mixed --find-max --slo-ms 50
+    python -m tests.performance.load_generator --target uvicorn --rate 1000 --save
+    python -m tests.performance.load_generator --find-max --compare --compare-fail 10
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from restmachine import RestApplication
+from restmachine.adapters import ASGIAdapter
+
+DEFAULT_STORAGE_DIR = Path(__file__).parent / "baselines"
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+# A rate is sustainable if the target keeps up with it and stays within the latency SLO
+SUSTAINABLE_THROUGHPUT_RATIO = 0.95
+
+
+@dataclass
+class RouteSpec:
+    """One request in a route mix.
+
+    Attributes:
+        name: Name used when reporting per-route latency
+        method: HTTP method
+        path: Request path
+        headers: Request headers
+        body: Request body
+        weight: Relative frequency of this request in the mix
+    """
+    name: str
+    method: str = "GET"
+    path: str = "/"
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    weight: float = 1.0
+
+
+ROUTE_MIXES: Dict[str, List[RouteSpec]] = {
+    "simple": [
+        RouteSpec("simple_get", path="/simple", headers={"Accept": "application/json"}),
+    ],
+    "read-heavy": [
+        RouteSpec("simple_get", path="/simple", headers={"Accept": "application/json"}, weight=6),
+        RouteSpec("path_param_get", path="/items/42", headers={"Accept": "application/json"}, weight=3),
+        RouteSpec("not_modified", path="/items/42",
+                  headers={"Accept": "application/json", "If-None-Match": '"v1"'}, weight=1),
+    ],
+    "mixed": [
+        RouteSpec("simple_get", path="/simple", headers={"Accept": "application/json"}, weight=4),
+        RouteSpec("path_param_get", path="/items/42", headers={"Accept": "application/json"}, weight=3),
+        RouteSpec("create", method="POST", path="/items",
+                  headers={"Accept": "application/json", "Content-Type": "application/json"},
+                  body=b'{"name": "widget", "quantity": 3}', weight=2),
+        RouteSpec("not_found", path="/missing", headers={"Accept": "application/json"}, weight=1),
+    ],
+}
+
+
+def create_load_app() -> RestApplication:
+    """Create the application used by the predefined route mixes."""
+    app = RestApplication()
+
+    @app.get("/simple")
+    def get_simple():
+        return {"message": "Hello", "value": 42}
+
+    @app.generate_etag
+    def item_etag():
+        return '"v1"'
+
+    @app.get("/items/{id}")
+    def get_item(path_params, item_etag):
+        return {"id": path_params["id"], "name": "widget", "version": 1}
+
+    @app.post("/items")
+    def create_item(json_body):
+        return {"id": 1, **json_body}
+
+    return app
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    # Round first so float error (99.9 / 100 * 1000 = 999.0000000000001) doesn't bump the rank
+    rank = math.ceil(round(percent * len(sorted_values) / 100, 9))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def summarize_latencies(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """Summarize latencies as p50/p90/p99/p999, mean and max (milliseconds)."""
+    ordered = sorted(latencies_ms)
+    summary = {_percentile_name(percent): round(percentile(ordered, percent), 3) for percent in PERCENTILES}
+    summary["mean"] = round(sum(ordered) / len(ordered), 3) if ordered else 0.0
+    summary["max"] = round(ordered[-1], 3) if ordered else 0.0
+    return summary
+
+
+def _percentile_name(percent: float) -> str:
+    return "p" + f"{percent:g}".replace(".", "")
+
+
+@dataclass
+class LoadResult:
+    """Outcome of running a route mix at one arrival rate."""
+    target: str
+    mix: str
+    offered_rps: float
+    achieved_rps: float
+    duration_s: float
+    requests: int
+    errors: int
+    latency_ms: Dict[str, float]
+    routes: Dict[str, Dict[str, float]]
+
+    def is_sustainable(self, slo_ms: float) -> bool:
+        """Whether the target kept up with the offered rate within the p99 latency SLO."""
+        return (
+            self.errors == 0
+            and self.achieved_rps >= self.offered_rps * SUSTAINABLE_THROUGHPUT_RATIO
+            and self.latency_ms["p99"] <= slo_ms
+        )
+
+
+class LoadTarget(ABC):
+    """Something requests can be sent to."""
+
+    name = "target"
+
+    @abstractmethod
+    async def send(self, route: RouteSpec) -> int:
+        """Send one request and return the response status code."""
+
+    async def close(self) -> None:
+        """Release any connections held by the target."""
+
+
+class AsgiTarget(LoadTarget):
+    """Sends requests straight to an ASGI application, without sockets."""
+
+    name = "asgi"
+
+    def __init__(self, asgi_app):
+        self.asgi_app = asgi_app
+
+    async def send(self, route: RouteSpec) -> int:
+        path, _, query_string = route.path.partition("?")
+        headers = [[name.lower().encode("latin-1"), value.encode("latin-1")] for name, value in route.headers.items()]
+        if route.body:
+            headers.append([b"content-length", str(len(route.body)).encode("latin-1")])
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": route.method,
+            "scheme": "http",
+            "path": path,
+            "query_string": query_string.encode("latin-1"),
+            "headers": headers,
+        }
+        request_sent = False
+        response_complete = asyncio.Event()
+        status = 0
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": route.body, "more_body": False}
+            # Like a server, only report the disconnect once the response is complete
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif not message.get("more_body", False):
+                response_complete.set()
+
+        await self.asgi_app(scope, receive, send)
+        return status
+
+
+class HttpTarget(LoadTarget):
+    """Sends HTTP/1.1 requests to a server over a pool of keep-alive connections."""
+
+    name = "http"
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def send(self, route: RouteSpec) -> int:
+        reader, writer = self._idle.pop() if self._idle else await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(self._encode_request(route))
+            await writer.drain()
+            status, keep_alive = await self._read_response(reader, route.method)
+        except Exception:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def _encode_request(self, route: RouteSpec) -> bytes:
+        lines = [f"{route.method} {route.path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines.extend(f"{name}: {value}" for name, value in route.headers.items())
+        if route.body:
+            lines.append(f"Content-Length: {len(route.body)}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + route.body
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str) -> Tuple[int, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before response")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method != "HEAD" and status not in (204, 304) and status >= 200:
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                await self._read_chunked(reader)
+            elif "content-length" in headers:
+                await reader.readexactly(int(headers["content-length"]))
+
+        return status, headers.get("connection", "").lower() != "close"
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                return
+
+
+async def run_open_loop(target: LoadTarget, routes: Sequence[RouteSpec], rate: float, duration: float,
+                        mix: str = "custom", seed: int = 0, timeout: float = 10.0) -> LoadResult:
+    """Send requests at a fixed arrival rate and collect their latencies.
+
+    Args:
+        target: Where to send requests
+        routes: Route mix to draw requests from, by weight
+        rate: Arrival rate in requests per second
+        duration: How long to generate load for, in seconds
+        mix: Name of the route mix, for reporting
+        seed: Random seed for choosing routes, so runs are repeatable
+        timeout: Per-request timeout in seconds; timed out requests count as errors
+
+    Returns:
+        LoadResult with overall and per-route latency percentiles
+    """
+    rng = random.Random(seed)
+    weights = [route.weight for route in routes]
+    total = max(int(rate * duration), 1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def timed_request(route: RouteSpec, scheduled: float) -> Tuple[str, float, bool]:
+        try:
+            status = await asyncio.wait_for(target.send(route), timeout)
+            ok = status < 500
+        except Exception:
+            ok = False
+        return route.name, (loop.time() - scheduled) * 1000, ok
+
+    tasks = []
+    for index in range(total):
+        scheduled = start + index / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        route = rng.choices(routes, weights)[0]
+        tasks.append(asyncio.ensure_future(timed_request(route, scheduled)))
+
+    samples = await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+
+    by_route: Dict[str, List[float]] = {}
+    for name, latency, _ in samples:
+        by_route.setdefault(name, []).append(latency)
+
+    return LoadResult(
+        target=target.name,
+        mix=mix,
+        offered_rps=rate,
+        achieved_rps=round(total / elapsed, 1),
+        duration_s=round(elapsed, 3),
+        requests=total,
+        errors=sum(1 for _, _, ok in samples if not ok),
+        latency_ms=summarize_latencies([latency for _, latency, _ in samples]),
+        routes={name: summarize_latencies(latencies) for name, latencies in sorted(by_route.items())},
+    )
+
+
+async def find_max_sustainable_rate(target: LoadTarget, routes: Sequence[RouteSpec], slo_ms: float,
+                                    start_rate: float = 100.0, max_rate: float = 100_000.0,
+                                    duration: float = 5.0, growth: float = 2.0, refine_steps: int = 3,
+                                    mix: str = "custom") -> Tuple[Optional[LoadResult], List[LoadResult]]:
+    """Find the highest arrival rate the target sustains within the p99 latency SLO.
+
+    The rate is multiplied by ``growth`` until a run is not sustainable, then the
+    boundary is narrowed by bisection.
+
+    Returns:
+        The best sustainable result (None if even start_rate is too high) and every run made
+    """
+    runs: List[LoadResult] = []
+    best: Optional[LoadResult] = None
+    failed_rate: Optional[float] = None
+    rate = start_rate
+
+    while rate <= max_rate:
+        result = await run_open_loop(target, routes, rate, duration, mix=mix)
+        runs.append(result)
+        if not result.is_sustainable(slo_ms):
+            failed_rate = rate
+            break
+        best = result
+        rate *= growth
+
+    if best is not None and failed_rate is not None:
+        low, high = best.offered_rps, failed_rate
+        for _ in range(refine_steps):
+            rate = round((low + high) / 2)
+            result = await run_open_loop(target, routes, rate, duration, mix=mix)
+            runs.append(result)
+            if result.is_sustainable(slo_ms):
+                best, low = result, rate
+            else:
+                high = rate
+
+    return best, runs
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def serve(asgi_app, server: str) -> Iterator[HttpTarget]:
+    """Run a local uvicorn or hypercorn server in a background thread."""
+    port = _free_port()
+    if server == "uvicorn":
+        import uvicorn
+
+        uvicorn_server = uvicorn.Server(uvicorn.Config(asgi_app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=uvicorn_server.run, daemon=True)
+        thread.start()
+
+        def stop():
+            uvicorn_server.should_exit = True
+    elif server == "hypercorn":
+        from hypercorn.asyncio import serve as hypercorn_serve
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"127.0.0.1:{port}"]
+        config.loglevel = "warning"
+        loop = asyncio.new_event_loop()
+        shutdown = asyncio.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(hypercorn_serve(asgi_app, config, shutdown_trigger=shutdown.wait))
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+        def stop():
+            loop.call_soon_threadsafe(shutdown.set)
+    else:
+        raise ValueError(f"Unknown server '{server}', expected 'uvicorn' or 'hypercorn'")
+
+    _wait_for_port(port)
+    target = HttpTarget("127.0.0.1", port)
+    target.name = server
+    try:
+        yield target
+    finally:
+        stop()
+        thread.join(timeout=10)
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start listening on port {port}")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def results_path(storage_dir: Path, target: str, mix: str) -> Path:
+    """Path of the saved results for a target and route mix."""
+    return storage_dir / f"load-{target}-{mix}.json"
+
+
+def save_results(path: Path, results: Sequence[LoadResult], max_rps: Optional[float]) -> Dict[str, Any]:
+    """Append a run to the results file, tagged with the current commit."""
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_revision(),
+        "max_sustainable_rps": max_rps,
+        "results": [asdict(result) for result in results],
+    }
+    history = json.loads(path.read_text()) if path.exists() else []
+    history.append(entry)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2) + "\n")
+    return entry
+
+
+def compare_results(path: Path, results: Sequence[LoadResult], max_rps: Optional[float],
+                    fail_percent: float) -> List[str]:
+    """Compare a run against the last saved run and describe any regressions."""
+    if not path.exists():
+        return []
+    history = json.loads(path.read_text())
+    if not history:
+        return []
+    baseline = history[-1]
+    allowed = fail_percent / 100
+    regressions = []
+
+    baseline_rps = baseline.get("max_sustainable_rps")
+    if baseline_rps and max_rps is not None and max_rps < baseline_rps * (1 - allowed):
+        regressions.append(f"max sustainable RPS {max_rps:g} is below baseline {baseline_rps:g}")
+
+    baseline_by_rate = {result["offered_rps"]: result for result in baseline["results"]}
+    for result in results:
+        previous = baseline_by_rate.get(result.offered_rps)
+        if previous is None:
+            continue
+        for name in ("p50", "p99"):
+            if result.latency_ms[name] > previous["latency_ms"][name] * (1 + allowed):
+                regressions.append(
+                    f"{name} at {result.offered_rps:g} RPS is {result.latency_ms[name]:.2f}ms, "
+                    f"baseline {previous['latency_ms'][name]:.2f}ms"
+                )
+    return regressions
+
+
+def format_result(result: LoadResult) -> str:
+    """One line summary of a run."""
+    latency = result.latency_ms
+    return (
+        f"{result.target:<10} {result.mix:<11} offered {result.offered_rps:>8g} rps  "
+        f"achieved {result.achieved_rps:>8g} rps  errors {result.errors:>4}  "
+        f"p50 {latency['p50']:>7.2f}  p90 {latency['p90']:>7.2f}  "
+        f"p99 {latency['p99']:>7.2f}  p999 {latency['p999']:>7.2f}  max {latency['max']:>7.2f} ms"
+    )
+
+
+async def _run(args: argparse.Namespace, target: LoadTarget) -> Tuple[List[LoadResult], Optional[float]]:
+    routes = ROUTE_MIXES[args.mix]
+    try:
+        if args.find_max:
+            best, runs = await find_max_sustainable_rate(
+                target, routes, slo_ms=args.slo_ms, start_rate=args.rate, duration=args.duration, mix=args.mix
+            )
+            return runs, best.offered_rps if best else None
+        result = await run_open_loop(target, routes, args.rate, args.duration, mix=args.mix)
+        return [result], None
+    finally:
+        await target.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the RestMachine ASGI adapter")
+    parser.add_argument("--target", choices=["asgi", "uvicorn", "hypercorn"], default="asgi")
+    parser.add_argument("--mix", choices=sorted(ROUTE_MIXES), default="read-heavy")
+    parser.add_argument("--rate", type=float, default=500.0, help="Arrival rate (or starting rate with --find-max)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per run")
+    parser.add_argument("--find-max", action="store_true", help="Search for the maximum sustainable rate")
+    parser.add_argument("--slo-ms", type=float, default=50.0, help="p99 latency limit for --find-max")
+    parser.add_argument("--save", action="store_true", help="Append results to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="Compare against the last saved results")
+    parser.add_argument("--compare-fail", type=float, default=10.0, help="Allowed regression in percent")
+    parser.add_argument("--storage", type=Path, default=DEFAULT_STORAGE_DIR)
+    args = parser.parse_args(argv)
+
+    asgi_app = ASGIAdapter(create_load_app(), enable_metrics=False)
+    if args.target == "asgi":
+        results, max_rps = asyncio.run(_run(args, AsgiTarget(asgi_app)))
+    else:
+        with serve(asgi_app, args.target) as http_target:
+            results, max_rps = asyncio.run(_run(args, http_target))
+
+    for result in results:
+        print(format_result(result))
+    if args.find_max:
+        print(f"max sustainable rate: {max_rps:g} rps" if max_rps else "max sustainable rate: none")
+
+    path = results_path(args.storage, args.target, args.mix)
+    status = 0
+    if args.compare:
+        regressions = compare_results(path, results, max_rps, args.compare_fail)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        status = 1 if regressions else 0
+    if args.save:
+        save_results(path, results, max_rps)
+        print(f"saved to {path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Peak memory benchmark for streaming content renderers.
+
+Renders a large collection of rows through the ASGI adapter (in-process, the
+body is counted and discarded) and reports the peak RSS growth of the process,
+time to first byte and total time for each variant:
+
+- buffered: handler returns a list, JSONRenderer builds the whole string
+- streaming-list: handler returns a list, StreamingJSONRenderer encodes it in chunks
+- streaming: handler returns a generator, StreamingJSONRenderer encodes it in chunks
+- ndjson / csv: handler returns a generator, NDJSONRenderer / CSVRenderer
+
+Peak RSS is a high-water mark for the whole process, so every measurement runs
+in a fresh subprocess.
+
+Usage (from packages/restmachine):
+    python -m tests.performance.streaming_renderers
+    python -m tests.performance.streaming_renderers --rows 1000000 --variants buffered streaming
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from restmachine import CSVRenderer, NDJSONRenderer, RestApplication, StreamingJSONRenderer
+from restmachine.adapters import ASGIAdapter
+
+VARIANTS = {
+    # name: (Accept header, handler returns a generator)
+    "buffered": ("application/json", False),
+    "streaming-list": ("application/json", False),
+    "streaming": ("application/json", True),
+    "ndjson": ("application/x-ndjson", True),
+    "csv": ("text/csv", True),
+}
+
+DEFAULT_ROWS = 200_000
+
+
+@dataclass
+class RenderResult:
+    """Memory and timing for rendering one response."""
+    variant: str
+    rows: int
+    bytes: int
+    body_messages: int
+    peak_rss_mb: float
+    ttfb_ms: float
+    total_ms: float
+
+
+def generate_rows(count: int) -> Iterator[Dict[str, Any]]:
+    """Rows shaped like a typical ORM export."""
+    for i in range(count):
+        yield {
+            "id": i,
+            "name": f"user-{i}",
+            "email": f"user-{i}@example.com",
+            "score": i * 0.5,
+            "active": i % 2 == 0,
+        }
+
+
+def create_render_app(variant: str, rows: int) -> RestApplication:
+    """Application serving /rows with the renderer and handler style of variant."""
+    app = RestApplication()
+    if variant != "buffered":
+        app.add_content_renderer(StreamingJSONRenderer())
+    app.add_content_renderer(NDJSONRenderer())
+    app.add_content_renderer(CSVRenderer())
+    lazy = VARIANTS[variant][1]
+
+    @app.get("/rows")
+    def get_rows():
+        return generate_rows(rows) if lazy else list(generate_rows(rows))
+
+    return app
+
+
+def _max_rss_bytes() -> int:
+    """Peak RSS of this process (ru_maxrss is KB on Linux, bytes on macOS)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+async def render_once(adapter: ASGIAdapter, accept: str, keep_body: bool = False) -> Dict[str, Any]:
+    """Send one request through the adapter, counting and (unless keep_body) discarding the body."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/rows",
+        "scheme": "http",
+        "headers": [[b"accept", accept.encode("latin-1")]],
+        "query_string": b"",
+    }
+    received = False
+    done = asyncio.Event()
+    stats: Dict[str, Any] = {"status": None, "bytes": 0, "messages": 0, "ttfb": None, "body": []}
+    start = time.perf_counter()
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+            return
+        body = message.get("body", b"")
+        if body:
+            if stats["ttfb"] is None:
+                stats["ttfb"] = time.perf_counter() - start
+            stats["bytes"] += len(body)
+            stats["messages"] += 1
+            if keep_body:
+                stats["body"].append(body)
+        if not message.get("more_body", False):
+            done.set()
+
+    await adapter(scope, receive, send)
+    stats["total"] = time.perf_counter() - start
+    return stats
+
+
+def measure_in_process(variant: str, rows: int) -> RenderResult:
+    """Measure one variant in this process (use run_variant for a clean process)."""
+    adapter = ASGIAdapter(create_render_app(variant, rows), enable_metrics=False)
+    baseline = _max_rss_bytes()
+    stats = asyncio.run(render_once(adapter, VARIANTS[variant][0]))
+    if stats["status"] != 200:
+        raise RuntimeError(f"{variant} returned {stats['status']}")
+    return RenderResult(
+        variant=variant,
+        rows=rows,
+        bytes=stats["bytes"],
+        body_messages=stats["messages"],
+        peak_rss_mb=round((_max_rss_bytes() - baseline) / (1024 * 1024), 1),
+        ttfb_ms=round((stats["ttfb"] or 0.0) * 1000, 3),
+        total_ms=round(stats["total"] * 1000, 3),
+    )
+
+
+def run_variant(variant: str, rows: int) -> RenderResult:
+    """Measure one variant in a fresh subprocess."""
+    output = subprocess.run(
+        [sys.executable, "-m", "tests.performance.streaming_renderers", "--worker", variant, "--rows", str(rows)],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return RenderResult(**json.loads(output.strip().splitlines()[-1]))
+
+
+def format_result(result: RenderResult) -> str:
+    """One line summary of a result."""
+    return (
+        f"{result.variant:<15} {result.rows:>9} rows {result.bytes / (1024 * 1024):>8.1f} MB "
+        f"in {result.body_messages:>6} messages  peak RSS +{result.peak_rss_mb:>7.1f} MB  "
+        f"ttfb {result.ttfb_ms:>9.2f} ms  total {result.total_ms:>9.2f} ms"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Peak memory benchmark for RestMachine streaming renderers")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--variants", choices=list(VARIANTS), nargs="+", default=list(VARIANTS))
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--worker", choices=list(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(asdict(measure_in_process(args.worker, args.rows))))
+        return 0
+
+    results: List[RenderResult] = [run_variant(variant, args.rows) for variant in args.variants]
+    for result in results:
+        print(format_result(result))
+    if args.output:
+        args.output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+        print(f"saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
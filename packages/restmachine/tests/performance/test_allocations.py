@@ -0,0 +1,234 @@
+"""
+Allocation benchmarks: memory per request for common state machine paths.
+
+Each test measures the peak memory allocated while handling one request and the
+memory retained once it completes, using tracemalloc (see allocation_tracking.py).
+Latency benchmarks hide allocation churn that later shows up as GC pauses and
+higher memory use under load, so these are tracked separately.
+
+Paths:
+- Simple GET
+- JSON POST with Pydantic validation
+- Conditional GET returning 304 Not Modified
+- Range request returning 206 Partial Content
+- CORS preflight
+- Error responses (404, 400, 500)
+
+Save and compare baselines with:
+    pytest packages/restmachine/tests/performance/test_allocations.py -m performance --allocation-save
+    pytest packages/restmachine/tests/performance/test_allocations.py -m performance --allocation-compare
+"""
+
+from pydantic import BaseModel
+
+from restmachine import RestApplication, Response
+from tests.framework import MultiDriverTestBase
+
+# A retained block per request means request objects are leaking; stay well below it
+MAX_RETAINED_BLOCKS_PER_REQUEST = 0.5
+
+
+class Item(BaseModel):
+    name: str
+    quantity: int
+
+
+class TestSimpleGetAllocations(MultiDriverTestBase):
+    """Allocations for the simplest GET path."""
+
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+
+        @app.get("/simple")
+        def get_simple():
+            return {"message": "Hello", "value": 42}
+
+        @app.get("/resource/{id}")
+        def get_resource(path_params):
+            return {"id": path_params["id"], "data": "example"}
+
+        return app
+
+    def test_simple_get_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.get("/simple").accepts("application/json")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code == 200
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+    def test_path_param_get_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.get("/resource/123").accepts("application/json")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).get_json_body()["id"] == "123"
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+
+class TestValidatedPostAllocations(MultiDriverTestBase):
+    """Allocations for a JSON POST validated with Pydantic."""
+
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+
+        @app.validates
+        def item(json_body) -> Item:
+            return Item.model_validate(json_body)
+
+        @app.post("/items")
+        def create_item(item):
+            return {"name": item.name, "quantity": item.quantity}
+
+        return app
+
+    def test_validated_post_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.post("/items").with_json_body({"name": "widget", "quantity": 3}).accepts(
+            "application/json"
+        )
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code == 200
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+
+class TestConditionalAllocations(MultiDriverTestBase):
+    """Allocations for a conditional GET answered with 304 Not Modified."""
+
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+
+        @app.generate_etag
+        def item_etag():
+            return '"v1"'
+
+        @app.get("/items/{id}")
+        def get_item(path_params, item_etag):
+            return {"id": path_params["id"], "version": 1}
+
+        return app
+
+    def test_not_modified_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.get("/items/1").with_header("If-None-Match", '"v1"').accepts("application/json")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code == 304
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+
+class TestRangeAllocations(MultiDriverTestBase):
+    """Allocations for a range request answered with 206 Partial Content."""
+
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+        content = b"0123456789" * 1000
+
+        @app.get("/data.bin")
+        def get_data():
+            return Response(200, content, headers={"Content-Type": "application/octet-stream"})
+
+        return app
+
+    def test_range_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.get("/data.bin").with_header("Range", "bytes=0-499")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code == 206
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+
+class TestCorsPreflightAllocations(MultiDriverTestBase):
+    """Allocations for a CORS preflight request."""
+
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+        app.cors(origins=["https://app.example.com"])
+
+        @app.get("/api/data")
+        def get_data():
+            return {"data": "value"}
+
+        return app
+
+    def test_cors_preflight_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = (
+            api_client.options("/api/data")
+            .with_header("Origin", "https://app.example.com")
+            .with_header("Access-Control-Request-Method", "GET")
+        )
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        response = api_client.execute(request)
+        assert response.status_code == 204
+        assert response.get_header("Access-Control-Allow-Origin") == "https://app.example.com"
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+
+class TestErrorAllocations(MultiDriverTestBase):
+    """Allocations for error responses."""
+
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+
+        @app.validates
+        def item(json_body) -> Item:
+            return Item.model_validate(json_body)
+
+        @app.post("/items")
+        def create_item(item):
+            return {"name": item.name}
+
+        @app.get("/broken")
+        def broken():
+            raise RuntimeError("boom")
+
+        return app
+
+    def test_not_found_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.get("/missing").accepts("application/json")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code == 404
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+    def test_validation_error_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.post("/items").with_json_body({"name": "widget"}).accepts("application/json")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code in (400, 422)
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
+
+    def test_server_error_allocations(self, api, allocation_tracker):
+        api_client, driver_name = api
+        request = api_client.get("/broken").accepts("application/json")
+
+        stats = allocation_tracker.measure(lambda: api_client.execute(request))
+
+        assert api_client.execute(request).status_code == 500
+        assert stats.retained_blocks < MAX_RETAINED_BLOCKS_PER_REQUEST
@@ -0,0 +1,46 @@
+"""
+Tests for the file serving benchmark.
+
+These serve a 1MB file through each installed server to check the harness and
+that every mechanism returns the right bytes; use file_serving.py directly (or
+tox -e benchmark-files) for real measurements up to 1GB.
+"""
+
+import pytest
+
+from tests.performance.file_serving import FILE_SIZES, ExtensionRecorder, run_benchmark, write_file
+
+
+class TestFileServingHarness:
+    """Tests for the benchmark helpers."""
+
+    def test_write_file_size(self, tmp_path):
+        path = write_file(tmp_path, "small.bin", 1000)
+
+        assert path.stat().st_size == 1000
+
+    @pytest.mark.parametrize("extensions, hide, mechanism", [
+        ({"http.response.pathsend": {}, "http.response.zerocopysend": {}}, False, "pathsend"),
+        ({"http.response.zerocopysend": {}}, False, "zerocopysend"),
+        ({}, False, "chunked"),
+        ({"http.response.pathsend": {}}, True, "chunked"),
+    ])
+    def test_mechanism_follows_advertised_extensions(self, extensions, hide, mechanism):
+        recorder = ExtensionRecorder(app=None, hide=hide)
+        recorder.extensions = extensions
+
+        assert recorder.mechanism == mechanism
+
+
+class TestFileServingThroughServers:
+    """Serve a small file through real servers."""
+
+    @pytest.mark.parametrize("server", ["uvicorn", "hypercorn"])
+    @pytest.mark.parametrize("hide_extensions", [False, True])
+    def test_full_and_range_downloads(self, tmp_path, server, hide_extensions):
+        pytest.importorskip(server)
+
+        results = run_benchmark(server, ["1MB"], tmp_path, repeats=1, hide_extensions=hide_extensions)
+
+        assert [(result.range, result.bytes) for result in results] == [(False, FILE_SIZES["1MB"]), (True, 1024 * 1024)]
+        assert all(result.throughput_mb_s > 0 for result in results)
@@ -0,0 +1,97 @@
+"""
+Microbenchmarks for MultiValueHeaders.
+
+Every request builds a header container from the server's raw headers, and
+every response builds one (often two, with pre-calculated headers merged in)
+and encodes it for sending. These benchmarks cover those operations on a
+realistic set of headers.
+
+Run with:
+    pytest packages/restmachine/tests/performance/test_headers.py -m performance
+"""
+
+from restmachine.models import MultiValueHeaders
+
+ASGI_REQUEST_HEADERS = [
+    (b"host", b"api.example.com"),
+    (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, deflate, br"),
+    (b"accept-language", b"en-US,en;q=0.9"),
+    (b"authorization", b"Bearer eyJhbGciOiJIUzI1NiJ9.e30.signature"),
+    (b"cookie", b"session=abc123"),
+    (b"cookie", b"theme=dark"),
+    (b"x-request-id", b"7f6c2e0a-1b1d-4c8e-9f0e-2d2f5b7a9c31"),
+    (b"x-forwarded-for", b"203.0.113.7"),
+]
+
+EVENT_HEADERS: dict = {}
+for _name, _value in ASGI_REQUEST_HEADERS:
+    EVENT_HEADERS.setdefault(_name.decode().title(), []).append(_value.decode())
+
+RESPONSE_HEADERS = {
+    "Content-Type": "application/json",
+    "Cache-Control": "no-store",
+    "X-Request-ID": "7f6c2e0a-1b1d-4c8e-9f0e-2d2f5b7a9c31",
+}
+
+
+def build_response_headers():
+    headers = MultiValueHeaders(RESPONSE_HEADERS)
+    headers["Content-Length"] = "42"
+    headers["Vary"] = "Accept"
+    headers.add("Set-Cookie", "session=abc123; HttpOnly")
+    headers.add("Set-Cookie", "theme=dark")
+    return headers
+
+
+class TestHeaderBenchmarks:
+    """Benchmarks for the common header operations."""
+
+    def test_request_headers_from_asgi(self, benchmark):
+        def build_and_read():
+            headers = MultiValueHeaders.from_asgi(ASGI_REQUEST_HEADERS)
+            return headers.get("Accept"), headers.get("Authorization"), headers.get("If-None-Match")
+
+        accept, authorization, if_none_match = benchmark(build_and_read)
+
+        assert accept == "application/json"
+        assert if_none_match is None
+
+    def test_request_headers_from_event(self, benchmark):
+        headers = benchmark(MultiValueHeaders.from_dict, EVENT_HEADERS, True)
+
+        assert headers.get_all("cookie") == ["session=abc123", "theme=dark"]
+
+    def test_response_headers_build(self, benchmark):
+        headers = benchmark(build_response_headers)
+
+        assert len(headers) == 6
+
+    def test_update_with_pre_calculated_headers(self, benchmark):
+        pre_calculated = build_response_headers()
+
+        def merge():
+            headers = MultiValueHeaders({"Content-Type": "text/plain", "ETag": '"v1"'})
+            headers.update(pre_calculated)
+            return headers
+
+        headers = benchmark(merge)
+
+        assert headers["Content-Type"] == "application/json"
+        assert headers["ETag"] == '"v1"'
+
+    def test_copy(self, benchmark):
+        headers = build_response_headers()
+
+        copied = benchmark(headers.copy)
+
+        assert copied.items_all() == headers.items_all()
+
+    def test_encode_for_asgi(self, benchmark):
+        def build_and_encode():
+            return build_response_headers().to_asgi()
+
+        encoded = benchmark(build_and_encode)
+
+        assert [b"content-length", b"42"] in [[name.lower(), value] for name, value in encoded]
@@ -0,0 +1,116 @@
+"""
+Tests for the open-loop load generator.
+
+These run short, low-rate loads against the in-process ASGI target to check the
+harness itself; use load_generator.py directly (or tox -e benchmark-load) for
+real measurements.
+"""
+
+import json
+
+import pytest
+
+from restmachine.adapters import ASGIAdapter
+from tests.performance.load_generator import (
+    ROUTE_MIXES,
+    AsgiTarget,
+    LoadResult,
+    compare_results,
+    create_load_app,
+    find_max_sustainable_rate,
+    percentile,
+    results_path,
+    run_open_loop,
+    save_results,
+    summarize_latencies,
+)
+
+
+def make_result(rate, p50=1.0, p99=5.0, errors=0, achieved=None):
+    latency = {"p50": p50, "p90": p50, "p99": p99, "p999": p99, "mean": p50, "max": p99}
+    return LoadResult(
+        target="asgi", mix="simple", offered_rps=rate, achieved_rps=achieved or rate, duration_s=1.0,
+        requests=int(rate), errors=errors, latency_ms=latency, routes={},
+    )
+
+
+class TestLatencySummary:
+    """Tests for percentile calculation."""
+
+    def test_nearest_rank_percentiles(self):
+        values = [float(value) for value in range(1, 1001)]
+
+        assert percentile(values, 50) == 500
+        assert percentile(values, 99) == 990
+        assert percentile(values, 99.9) == 999
+        assert percentile(values, 100) == 1000
+
+    def test_summary_keys(self):
+        summary = summarize_latencies([3.0, 1.0, 2.0])
+
+        assert set(summary) == {"p50", "p90", "p99", "p999", "mean", "max"}
+        assert summary["p50"] == 2.0
+        assert summary["max"] == 3.0
+
+    def test_empty_latencies(self):
+        assert summarize_latencies([])["p99"] == 0.0
+
+    def test_sustainable_requires_throughput_latency_and_no_errors(self):
+        assert make_result(100, p99=5.0).is_sustainable(slo_ms=10)
+        assert not make_result(100, p99=20.0).is_sustainable(slo_ms=10)
+        assert not make_result(100, errors=1).is_sustainable(slo_ms=10)
+        assert not make_result(100, achieved=80).is_sustainable(slo_ms=10)
+
+
+class TestOpenLoop:
+    """Tests for generating load against the in-process ASGI target."""
+
+    @pytest.mark.anyio
+    async def test_sends_requests_at_offered_rate(self):
+        target = AsgiTarget(ASGIAdapter(create_load_app(), enable_metrics=False))
+
+        result = await run_open_loop(target, ROUTE_MIXES["mixed"], rate=200, duration=0.5, mix="mixed")
+
+        assert result.requests == 100
+        assert result.errors == 0
+        assert result.achieved_rps > 150
+        assert result.latency_ms["p50"] <= result.latency_ms["p99"] <= result.latency_ms["max"]
+        assert set(result.routes) <= {"simple_get", "path_param_get", "create", "not_found"}
+
+    @pytest.mark.anyio
+    async def test_find_max_sustainable_rate(self):
+        target = AsgiTarget(ASGIAdapter(create_load_app(), enable_metrics=False))
+
+        best, runs = await find_max_sustainable_rate(
+            target, ROUTE_MIXES["simple"], slo_ms=1000, start_rate=50, max_rate=200, duration=0.2
+        )
+
+        assert best is not None
+        assert [run.offered_rps for run in runs] == [50, 100, 200]
+
+
+class TestResultStorage:
+    """Tests for saving and comparing load results."""
+
+    def test_save_appends_history(self, tmp_path):
+        path = results_path(tmp_path, "asgi", "simple")
+
+        save_results(path, [make_result(100)], max_rps=100)
+        save_results(path, [make_result(100)], max_rps=120)
+
+        history = json.loads(path.read_text())
+        assert [entry["max_sustainable_rps"] for entry in history] == [100, 120]
+
+    def test_compare_detects_regressions(self, tmp_path):
+        path = results_path(tmp_path, "asgi", "simple")
+        save_results(path, [make_result(100, p99=5.0)], max_rps=1000)
+
+        assert compare_results(path, [make_result(100, p99=5.2)], max_rps=980, fail_percent=10) == []
+
+        regressions = compare_results(path, [make_result(100, p99=8.0)], max_rps=500, fail_percent=10)
+        assert len(regressions) == 2
+
+    def test_compare_without_baseline(self, tmp_path):
+        path = results_path(tmp_path, "asgi", "simple")
+
+        assert compare_results(path, [make_result(100)], max_rps=None, fail_percent=10) == []
@@ -10,16 +10,34 @@ State Machine Paths:
 - GET + Auth: ~9 states
 - GET + Conditional: ~12 states
 - POST Create: ~8 states
+- Pydantic payloads: typed bodies and list[Model] results
 - Error paths: 1-10 states
 
 This allows us to benchmark the state machine optimization and compare
 old vs new implementations.
 """
 
+from typing import List
+
+from pydantic import BaseModel
+
 from restmachine import RestApplication
 from tests.framework import MultiDriverTestBase
 
 
+class Record(BaseModel):
+    id: int
+    name: str
+    tags: List[str]
+
+
+class RecordBatch(BaseModel):
+    records: List[Record]
+
+
+RECORDS = [{"id": i, "name": f"record-{i}", "tags": ["a", "b"]} for i in range(200)]
+
+
 class TestSimpleGetPath(MultiDriverTestBase):
     """Benchmark: Simple GET path (~7 states).
 
@@ -262,6 +280,44 @@ class TestPostCreatePath(MultiDriverTestBase):
         assert data["name"] == "New Resource"
 
 
+class TestPydanticPayloadPath(MultiDriverTestBase):
+    """Benchmark: large Pydantic-typed bodies and results.
+
+    The typed json_body is validated straight from the body bytes and the
+    list[Model] result is serialized straight to JSON by the route's
+    compiled TypeAdapters.
+    """
+
+    def create_app(self) -> RestApplication:
+        app = RestApplication()
+
+        @app.get("/records")
+        def list_records() -> List[Record]:
+            return RECORDS
+
+        @app.post("/records")
+        def create_records(json_body: RecordBatch) -> List[Record]:
+            return json_body.records
+
+        return app
+
+    def test_get_model_list(self, api, benchmark):
+        """Benchmark GET returning 200 models."""
+        api_client, driver_name = api
+
+        result = benchmark(api_client.get_resource, "/records")
+
+        assert len(api_client.expect_successful_retrieval(result)) == 200
+
+    def test_post_model_batch(self, api, benchmark):
+        """Benchmark POST validating a batch of 200 models."""
+        api_client, driver_name = api
+
+        result = benchmark(api_client.create_resource, "/records", {"records": RECORDS})
+
+        assert api_client.expect_successful_creation(result)[-1]["name"] == "record-199"
+
+
 class TestPutUpdatePath(MultiDriverTestBase):
     """Benchmark: PUT update path (~9 states)."""
 
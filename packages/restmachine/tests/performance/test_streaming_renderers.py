@@ -0,0 +1,51 @@
+"""
+Tests for the streaming renderer memory benchmark.
+
+These render a modest number of rows to check the harness and that streaming
+keeps peak memory below the buffered renderer; use streaming_renderers.py
+directly for real measurements.
+"""
+
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from restmachine.adapters import ASGIAdapter
+from tests.performance.streaming_renderers import VARIANTS, create_render_app, render_once, run_variant
+
+ROWS = 100_000
+
+
+class TestStreamingRendererHarness:
+    """Tests for the benchmark helpers."""
+
+    @pytest.mark.parametrize("variant", list(VARIANTS))
+    def test_variants_render_every_row(self, variant):
+        adapter = ASGIAdapter(create_render_app(variant, 50), enable_metrics=False)
+
+        stats = asyncio.run(render_once(adapter, VARIANTS[variant][0], keep_body=True))
+        body = b"".join(stats["body"]).decode()
+
+        if variant == "csv":
+            rows = list(csv.DictReader(io.StringIO(body)))
+        elif variant == "ndjson":
+            rows = [json.loads(line) for line in body.splitlines()]
+        else:
+            rows = json.loads(body)
+        assert [int(row["id"]) for row in rows] == list(range(50))
+
+
+class TestStreamingRendererMemory:
+    """Compare peak RSS of streamed and buffered rendering."""
+
+    def test_streaming_uses_less_memory(self):
+        buffered = run_variant("buffered", ROWS)
+        streaming = run_variant("streaming", ROWS)
+
+        assert streaming.bytes > 0
+        assert streaming.body_messages > 1
+        assert streaming.peak_rss_mb < buffered.peak_rss_mb / 2
+        assert streaming.ttfb_ms < buffered.ttfb_ms
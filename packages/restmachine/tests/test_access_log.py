@@ -0,0 +1,242 @@
+"""Tests for structured access logging."""
+
+import itertools
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueListener
+
+import pytest
+
+from restmachine import HTTPMethod, Request, Response, RestApplication, access_log
+from restmachine.access_log import AccessLogConfig, AccessLogFormatter, AccessLogger
+from restmachine.tracing import InMemorySpanExporter, Tracer
+
+# Loggers are global, so give each app its own to keep tests independent
+_logger_ids = itertools.count()
+
+
+class ListHandler(logging.Handler):
+    """Handler that keeps formatted records in memory."""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(AccessLogFormatter())
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def create_app(**access_log_kwargs):
+    app = RestApplication()
+    handler = ListHandler()
+    access_logger = app.access_log(
+        handlers=[handler],
+        logger_name=f"restmachine.access.test{next(_logger_ids)}",
+        **access_log_kwargs,
+    )
+
+    @app.get("/users/{user_id}")
+    def get_user(user_id: str):
+        return {"id": user_id}
+
+    @app.post("/users")
+    def create_user(json_body):
+        return json_body
+
+    return app, access_logger, handler
+
+
+def get_records(access_logger, handler):
+    """Flush the background writer and return the parsed records."""
+    access_logger.stop()
+    return [json.loads(line) for line in handler.lines]
+
+
+class TestAccessLogRecords:
+    """Tests for access log record contents."""
+
+    def test_one_record_per_request(self):
+        app, access_logger, handler = create_app()
+
+        app.execute(Request(method=HTTPMethod.GET, path="/users/42", headers={"Accept": "application/json"}))
+        app.execute(Request(method=HTTPMethod.GET, path="/missing", headers={"Accept": "application/json"}))
+
+        records = get_records(access_logger, handler)
+        assert len(records) == 2
+
+        record = records[0]
+        assert record["method"] == "GET"
+        assert record["path"] == "/users/42"
+        assert record["route"] == "/users/{user_id}"
+        assert record["status"] == 200
+        assert record["duration_ms"] >= 0
+        assert record["response_bytes"] == len(b'{\n  "id": "42"\n}')
+        assert record["request_id"]
+        assert record["trace_id"]
+        assert "timestamp" in record
+
+        assert records[1]["status"] == 404
+        assert records[1]["route"] is None
+
+    def test_request_bytes_from_content_length(self):
+        import io
+
+        app, access_logger, handler = create_app()
+        body = b'{"name": "Alice"}'
+
+        app.execute(Request(
+            method=HTTPMethod.POST,
+            path="/users",
+            headers={"Content-Type": "application/json", "Content-Length": str(len(body))},
+            body=io.BytesIO(body),
+        ))
+
+        records = get_records(access_logger, handler)
+        assert records[0]["request_bytes"] == len(body)
+
+    @pytest.mark.parametrize("path, header", [("/ids", "req-1"), ("/users/1", None)])
+    def test_ids_resolved_once(self, path, header):
+        app, access_logger, handler = create_app()
+        exporter = InMemorySpanExporter()
+        app.set_tracer(Tracer(exporter))
+        counter = itertools.count(1)
+
+        @app.request_id
+        def next_request_id():
+            return f"req-{next(counter)}"
+
+        @app.get("/ids")
+        def ids(request_id):
+            return Response(200, "{}", headers={"X-Request-ID": request_id}, content_type="application/json")
+
+        response = app.execute(Request(method=HTTPMethod.GET, path=path, headers={"Accept": "application/json"}))
+
+        root = next(span for span in exporter.get_finished_spans() if span.name == "HTTP GET")
+        assert get_records(access_logger, handler)[0]["request_id"] == "req-1"
+        assert root.attributes["restmachine.request_id"] == "req-1"
+        assert response.headers.get("X-Request-ID") == header
+        assert next(counter) == 2
+
+    def test_ids_survive_interleaved_requests(self, monkeypatch):
+        app, access_logger, handler = create_app()
+        counter = itertools.count(1)
+
+        @app.request_id
+        def next_request_id():
+            return f"req-{next(counter)}"
+
+        process_request = app._state_machine.process_request
+
+        def interleaved(request):
+            response = process_request(request)
+            if request.path == "/users/1":
+                # Another request runs before this one is logged and resets the dependency cache
+                app.execute(Request(method=HTTPMethod.GET, path="/users/2", headers={}))
+            return response
+
+        monkeypatch.setattr(app._state_machine, "process_request", interleaved)
+        app.execute(Request(method=HTTPMethod.GET, path="/users/1", headers={}))
+
+        records = {record["path"]: record["request_id"] for record in get_records(access_logger, handler)}
+        assert records == {"/users/2": "req-1", "/users/1": "req-2"}
+
+    def test_ids_can_be_omitted(self):
+        app, access_logger, handler = create_app(include_ids=False)
+
+        app.execute(Request(method=HTTPMethod.GET, path="/users/1", headers={}))
+
+        record = get_records(access_logger, handler)[0]
+        assert "request_id" not in record
+        assert "trace_id" not in record
+
+
+class TestAccessLogSampling:
+    """Tests for per-status-class sampling."""
+
+    def test_sample_rate_zero_skips_status_class(self):
+        app, access_logger, handler = create_app(sample_rates={"2xx": 0.0})
+
+        app.execute(Request(method=HTTPMethod.GET, path="/users/1", headers={}))
+        app.execute(Request(method=HTTPMethod.GET, path="/missing", headers={}))
+
+        records = get_records(access_logger, handler)
+        assert [record["status"] for record in records] == [404]
+
+    def test_partial_sample_rate(self, monkeypatch):
+        import restmachine.access_log as access_log_module
+
+        app, access_logger, handler = create_app(sample_rates={"2xx": 0.5})
+        values = iter([0.1, 0.9])
+        monkeypatch.setattr(access_log_module.random, "random", lambda: next(values))
+
+        app.execute(Request(method=HTTPMethod.GET, path="/users/1", headers={}))
+        app.execute(Request(method=HTTPMethod.GET, path="/users/2", headers={}))
+
+        records = get_records(access_logger, handler)
+        assert [record["path"] for record in records] == ["/users/1"]
+
+    @pytest.mark.parametrize("sample_rates", [{"6xx": 1.0}, {"2xx": 1.5}, {"4xx": -0.1}])
+    def test_invalid_sample_rates(self, sample_rates):
+        with pytest.raises(ValueError):
+            AccessLogConfig(sample_rates=sample_rates).validate()
+
+    def test_disabled_logger_skips_records(self):
+        app, access_logger, handler = create_app()
+        access_logger.logger.setLevel(logging.WARNING)
+
+        app.execute(Request(method=HTTPMethod.GET, path="/users/1", headers={}))
+
+        assert get_records(access_logger, handler) == []
+
+
+class TestAccessLogWriter:
+    """Tests for the background writer."""
+
+    def test_full_queue_drops_records(self):
+        # Not started, so nothing drains the queue
+        access_logger = AccessLogger(AccessLogConfig(queue_size=1, handlers=[ListHandler()]))
+
+        access_logger._queue_handler.handle(logging.makeLogRecord({"access": {"status": 200}}))
+        access_logger._queue_handler.handle(logging.makeLogRecord({"access": {"status": 200}}))
+
+        assert access_logger.dropped == 1
+
+    def test_shutdown_flushes_records(self):
+        app, access_logger, handler = create_app()
+
+        app.execute(Request(method=HTTPMethod.GET, path="/users/1", headers={}))
+        app.shutdown_sync()
+
+        assert len(handler.lines) == 1
+
+    def test_concurrent_first_requests_start_one_writer(self, monkeypatch):
+        started = []
+
+        class SlowListener(QueueListener):
+            def __init__(self, *args, **kwargs):
+                started.append(self)
+                time.sleep(0.01)  # Widen the window between checking for a writer and setting it
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(access_log, "QueueListener", SlowListener)
+        app, access_logger, handler = create_app()
+        ready = threading.Barrier(8)
+
+        def first_request(n):
+            ready.wait()
+            app.execute(Request(method=HTTPMethod.GET, path=f"/users/{n}", headers={}))
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(first_request, range(8)))
+
+        assert len(started) == 1
+        assert len(get_records(access_logger, handler)) == 8
+
+    def test_access_log_disabled_by_default(self):
+        app = RestApplication()
+
+        assert app._access_logger is None
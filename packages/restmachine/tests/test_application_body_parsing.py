@@ -23,7 +23,7 @@ class TestBodyParsingVariants(MultiDriverTestBase):
         @app.post("/upload-multipart")
         def handle_multipart(multipart_body):
             """Handle multipart form data."""
-            # multipart_body should be the raw multipart content
+            # multipart_body maps field names to their values
             return {"received": True, "content_length": len(multipart_body) if multipart_body else 0}
 
         @app.post("/upload-form")
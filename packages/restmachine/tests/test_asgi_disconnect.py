@@ -0,0 +1,198 @@
+"""
+Tests for client disconnect detection in the ASGI adapter.
+"""
+
+import asyncio
+import io
+import threading
+
+import pytest
+
+from restmachine import HTTPMethod, Request, Response, RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.cancellation import CancellationToken, ClientDisconnected
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_scope(path, method="GET"):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "scheme": "http",
+        "headers": [[b"accept", b"application/json"]],
+        "query_string": b"",
+    }
+
+
+class Client:
+    """Fake ASGI server side of one request that can disconnect on cue."""
+
+    def __init__(self, chunks=None):
+        self.chunks = list(chunks or [b""])
+        self.disconnect = asyncio.Event()
+        self.sent = []
+
+    async def receive(self):
+        if self.chunks:
+            body = self.chunks.pop(0)
+            return {"type": "http.request", "body": body, "more_body": bool(self.chunks)}
+        await self.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.sent.append(message)
+        # Give the adapter's disconnect watcher a chance to run, like a real socket write
+        await asyncio.sleep(0)
+
+
+class TestDisconnectWhileHandling:
+    """Tests for disconnects while the handler is running or queued."""
+
+    async def test_running_handler_sees_cancellation(self):
+        app = RestApplication()
+        observed = threading.Event()
+
+        @app.get("/slow")
+        def slow(cancellation):
+            if cancellation.wait(timeout=5):
+                observed.set()
+            return {"done": True}
+
+        adapter = ASGIAdapter(app, enable_metrics=False)
+        client = Client()
+        asyncio.get_running_loop().call_later(0.05, client.disconnect.set)
+
+        await asyncio.wait_for(adapter(make_scope("/slow"), client.receive, client.send), timeout=2)
+
+        assert client.sent == []
+        assert adapter.aborted_requests == 1
+        assert await asyncio.get_running_loop().run_in_executor(None, observed.wait, 2)
+
+    async def test_queued_request_never_runs(self):
+        app = RestApplication()
+        release = threading.Event()
+        calls = []
+
+        @app.get("/work/{n}")
+        def work(n):
+            calls.append(n)
+            release.wait(timeout=5)
+            return {"n": n}
+
+        adapter = ASGIAdapter(app, enable_metrics=False, max_workers=1)
+        first, second = Client(), Client()
+
+        first_task = asyncio.create_task(adapter(make_scope("/work/1"), first.receive, first.send))
+        await asyncio.sleep(0.05)
+        second.disconnect.set()
+        await adapter(make_scope("/work/2"), second.receive, second.send)
+
+        release.set()
+        await first_task
+        adapter.executor.shutdown()
+
+        assert calls == ["1"]
+        assert second.sent == []
+        assert first.sent[0]["status"] == 200
+        assert adapter.aborted_requests == 1
+
+    async def test_disconnect_during_request_body(self):
+        app = RestApplication()
+
+        @app.post("/upload")
+        def upload(request, cancellation):
+            cancellation.wait(timeout=5)
+            return {"ok": True}
+
+        adapter = ASGIAdapter(app, enable_metrics=False)
+        client = Client()
+        chunks = [b"part one"]
+
+        async def receive():
+            # The rest of the body never arrives; the client goes away instead
+            if chunks:
+                return {"type": "http.request", "body": chunks.pop(0), "more_body": True}
+            return {"type": "http.disconnect"}
+
+        await asyncio.wait_for(adapter(make_scope("/upload", "POST"), receive, client.send), timeout=2)
+
+        assert client.sent == []
+        assert adapter.aborted_requests == 1
+
+
+class TestDisconnectWhileSending:
+    """Tests for disconnects while a streamed response body is sent."""
+
+    async def test_stream_closed_early(self):
+        app = RestApplication()
+        stream = io.BytesIO(b"x" * (1024 * 1024))
+
+        @app.get("/download")
+        def download():
+            return Response(200, body=stream, content_type="application/octet-stream")
+
+        adapter = ASGIAdapter(app, enable_metrics=False)
+        client = Client()
+        original_send = client.send
+
+        async def send(message):
+            await original_send(message)
+            if message["type"] == "http.response.body":
+                client.disconnect.set()
+                await asyncio.sleep(0)
+
+        await adapter(make_scope("/download"), client.receive, send)
+
+        body_messages = [message for message in client.sent if message["type"] == "http.response.body"]
+        assert 0 < len(body_messages) < 10
+        assert stream.closed
+        assert adapter.aborted_requests == 1
+
+    async def test_completed_response_is_not_aborted(self):
+        app = RestApplication()
+
+        @app.get("/download")
+        def download():
+            return Response(200, body=io.BytesIO(b"x" * 100_000), content_type="application/octet-stream")
+
+        adapter = ASGIAdapter(app, enable_metrics=False)
+        client = Client()
+
+        await adapter(make_scope("/download"), client.receive, client.send)
+
+        assert client.sent[-1]["more_body"] is False
+        assert adapter.aborted_requests == 0
+
+
+class TestCancellationToken:
+    """Tests for the cancellation dependency outside the ASGI adapter."""
+
+    def test_token(self):
+        token = CancellationToken()
+        token.raise_if_cancelled()
+
+        token.cancel()
+
+        assert token.cancelled
+        assert token.wait(timeout=0)
+        with pytest.raises(ClientDisconnected):
+            token.raise_if_cancelled()
+
+    def test_dependency_without_adapter_is_never_cancelled(self):
+        app = RestApplication()
+
+        @app.get("/check")
+        def check(cancellation):
+            return {"cancelled": cancellation.cancelled}
+
+        response = app.execute(Request(method=HTTPMethod.GET, path="/check", headers={"Accept": "application/json"}))
+
+        assert response.status_code == 200
+        assert '"cancelled": false' in response.body
@@ -0,0 +1,222 @@
+"""
+Tests for the ASGI adapter's executor strategy for synchronous handlers.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from restmachine import RestApplication, Router
+from restmachine.adapters import ASGIAdapter
+from restmachine.executor import HandlerExecutor
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def create_app():
+    app = RestApplication()
+
+    @app.get("/thread")
+    def in_thread():
+        return {"thread": threading.current_thread().name}
+
+    @app.get("/inline")
+    @app.execution("inline")
+    def inline():
+        return {"thread": threading.current_thread().name}
+
+    @app.post("/upload")
+    @app.execution("inline")
+    def upload():
+        return {"thread": threading.current_thread().name}
+
+    api = Router()
+
+    @api.get("/status")
+    @api.execution("thread")
+    def status():
+        return {"thread": threading.current_thread().name}
+
+    app.mount("/api", api)
+    return app
+
+
+async def call(adapter, path, method="GET", chunks=None):
+    import json
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "scheme": "http",
+        "headers": [[b"accept", b"application/json"], [b"content-type", b"application/json"]],
+        "query_string": b"",
+    }
+    messages = list(chunks or [b""])
+
+    async def receive():
+        body = messages.pop(0) if messages else b""
+        return {"type": "http.request", "body": body, "more_body": bool(messages)}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await adapter(scope, receive, send)
+    assert sent[0]["status"] == 200
+    return json.loads(b"".join(message.get("body", b"") for message in sent[1:]))
+
+
+class TestExecutionModes:
+    """Tests for choosing where handlers run."""
+
+    async def test_default_runs_in_thread_pool(self):
+        adapter = ASGIAdapter(create_app(), enable_metrics=False)
+
+        body = await call(adapter, "/thread")
+
+        assert body["thread"] != threading.current_thread().name
+        stats = adapter.executor.stats()
+        assert (stats.submitted, stats.completed, stats.inline) == (1, 1, 0)
+
+    async def test_dedicated_pool(self):
+        adapter = ASGIAdapter(create_app(), enable_metrics=False, max_workers=2)
+
+        body = await call(adapter, "/thread")
+
+        assert body["thread"].startswith("restmachine-handler")
+        assert adapter.executor.stats().max_workers == 2
+        adapter.executor.shutdown()
+
+    async def test_inline_route_runs_on_event_loop(self):
+        adapter = ASGIAdapter(create_app(), enable_metrics=False)
+
+        body = await call(adapter, "/inline")
+
+        assert body["thread"] == threading.current_thread().name
+        assert adapter.executor.stats().inline == 1
+
+    async def test_route_override_of_inline_default(self):
+        adapter = ASGIAdapter(create_app(), enable_metrics=False, execution="inline")
+
+        assert (await call(adapter, "/thread"))["thread"] == threading.current_thread().name
+        assert (await call(adapter, "/api/status"))["thread"] != threading.current_thread().name
+
+    async def test_streamed_body_always_runs_in_thread(self):
+        adapter = ASGIAdapter(create_app(), enable_metrics=False)
+
+        body = await call(adapter, "/upload", method="POST", chunks=[b'{"name": ', b'"widget"}'])
+
+        assert body["thread"] != threading.current_thread().name
+
+    @pytest.mark.parametrize("path, method, chunks", [
+        ("/thread", "GET", None),
+        ("/upload", "POST", [b'{"name": ', b'"widget"}']),
+    ])
+    async def test_route_matched_once(self, monkeypatch, path, method, chunks):
+        app = create_app()
+        matches = []
+        match_route = app._root_router.match_route
+        monkeypatch.setattr(app._root_router, "match_route", lambda *args: matches.append(args) or match_route(*args))
+        adapter = ASGIAdapter(app, enable_metrics=False)
+
+        await call(adapter, path, method=method, chunks=chunks)
+
+        assert len(matches) == 1
+
+    async def test_concurrent_requests_share_state_machine(self):
+        import time
+
+        app = RestApplication()
+
+        @app.get("/items/{item_id}")
+        def get_item(path_params):
+            time.sleep(0.01)
+            return {"id": path_params["item_id"]}
+
+        state_machine = app._state_machine
+        adapter = ASGIAdapter(app, enable_metrics=False, max_workers=8)
+
+        bodies = await asyncio.gather(*(call(adapter, f"/items/{i}") for i in range(16)))
+
+        # Request state lives in each request's StateContext, not on the shared machine
+        assert [body["id"] for body in bodies] == [str(i) for i in range(16)]
+        assert app._state_machine is state_machine
+        adapter.executor.shutdown()
+
+
+class TestExecutorConfiguration:
+    """Tests for validating executor options."""
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            RestApplication().execution("fast")
+        with pytest.raises(ValueError):
+            ASGIAdapter(RestApplication(), execution="fast")
+
+    @pytest.mark.parametrize("kwargs", [
+        {"max_workers": 0},
+        {"max_workers": 2, "executor": HandlerExecutor()},
+    ])
+    def test_invalid_options(self, kwargs):
+        with pytest.raises(ValueError):
+            ASGIAdapter(RestApplication(), enable_metrics=False, **kwargs)
+
+    async def test_shared_handler_executor(self):
+        executor = HandlerExecutor(max_workers=1)
+        adapter = ASGIAdapter(create_app(), enable_metrics=False, executor=executor)
+
+        await call(adapter, "/thread")
+
+        assert executor.stats().completed == 1
+        executor.shutdown()
+
+
+class TestExecutorStats:
+    """Tests for queue depth and wait time tracking."""
+
+    async def test_queue_depth_and_wait_time(self):
+        executor = HandlerExecutor(max_workers=1)
+        release = threading.Event()
+
+        first = asyncio.create_task(executor.run(release.wait))
+        second = asyncio.create_task(executor.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        assert (stats.running, stats.queue_depth) == (1, 1)
+
+        release.set()
+        assert (await second)[0] == "done"
+        await first
+
+        stats = executor.stats()
+        assert stats.max_queue_depth >= 1
+        assert stats.queue_depth == 0
+        assert stats.wait_time_ms_max >= 40
+        assert stats.wait_time_ms_mean > 0
+        executor.shutdown()
+
+    async def test_cancelled_while_queued(self):
+        executor = HandlerExecutor(max_workers=1)
+        release = threading.Event()
+
+        first = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(lambda: "never"))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        release.set()
+        await first
+
+        assert executor.stats().queue_depth == 0
+        executor.shutdown()
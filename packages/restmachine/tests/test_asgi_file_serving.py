@@ -0,0 +1,124 @@
+"""
+Tests for serving Path bodies through the ASGI adapter.
+
+The adapter picks pathsend, zerocopysend or chunked reads depending on the
+extensions the server advertises in scope["extensions"].
+"""
+
+import pytest
+
+from restmachine import RestApplication
+from restmachine.adapters import PATHSEND_EXTENSION, ZEROCOPYSEND_EXTENSION, ASGIAdapter
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def create_adapter(path, **adapter_kwargs):
+    app = RestApplication()
+
+    @app.get("/file")
+    def get_file():
+        return path
+
+    return ASGIAdapter(app, enable_metrics=False, **adapter_kwargs)
+
+
+async def call(adapter, extensions=None, headers=None):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/file",
+        "scheme": "http",
+        "headers": [[name.encode(), value.encode()] for name, value in (headers or {}).items()],
+        "query_string": b"",
+    }
+    if extensions is not None:
+        scope["extensions"] = extensions
+
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == ZEROCOPYSEND_EXTENSION:
+            # Record what the server would send while the file is still open
+            message = dict(message)
+            message["file"].seek(message["offset"])
+            message["data"] = message["file"].read(message["count"])
+        messages.append(message)
+
+    await adapter(scope, receive, send)
+    return messages
+
+
+def body_of(messages):
+    return b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+
+
+class TestFullFileResponses:
+    """Tests for sending whole files."""
+
+    async def test_pathsend_when_advertised(self, file_path):
+        messages = await call(create_adapter(file_path), {PATHSEND_EXTENSION: {}, ZEROCOPYSEND_EXTENSION: {}})
+
+        assert [message["type"] for message in messages] == ["http.response.start", PATHSEND_EXTENSION]
+        assert messages[1]["path"] == str(file_path.absolute())
+        assert "extensions" not in messages[0]
+
+    async def test_zerocopysend_when_advertised(self, file_path):
+        messages = await call(create_adapter(file_path), {ZEROCOPYSEND_EXTENSION: {}})
+
+        assert [message["type"] for message in messages] == ["http.response.start", ZEROCOPYSEND_EXTENSION]
+        assert messages[1]["offset"] == 0
+        assert messages[1]["count"] == len(CONTENT)
+        assert messages[1]["data"] == CONTENT
+        assert messages[1]["file"].closed
+
+    async def test_chunked_fallback_without_extensions(self, file_path):
+        messages = await call(create_adapter(file_path, file_chunk_size=4096))
+
+        body_messages = messages[1:]
+        assert [len(message["body"]) for message in body_messages] == [4096, 4096, 2048]
+        assert [message["more_body"] for message in body_messages] == [True, True, False]
+        assert body_of(messages) == CONTENT
+
+    async def test_empty_file_completes_response(self, tmp_path):
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+
+        messages = await call(create_adapter(path))
+
+        assert messages[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+    def test_invalid_chunk_size(self, file_path):
+        with pytest.raises(ValueError):
+            create_adapter(file_path, file_chunk_size=0)
+
+
+class TestFileRangeResponses:
+    """Tests for sending byte ranges of files."""
+
+    async def test_zerocopysend_with_offset_and_count(self, file_path):
+        messages = await call(create_adapter(file_path), {ZEROCOPYSEND_EXTENSION: {}}, {"range": "bytes=100-299"})
+
+        assert messages[0]["status"] == 206
+        assert messages[1]["type"] == ZEROCOPYSEND_EXTENSION
+        assert (messages[1]["offset"], messages[1]["count"]) == (100, 200)
+        assert messages[1]["data"] == CONTENT[100:300]
+
+    async def test_pathsend_alone_falls_back_to_reading(self, file_path):
+        messages = await call(create_adapter(file_path), {PATHSEND_EXTENSION: {}}, {"range": "bytes=100-299"})
+
+        assert messages[0]["status"] == 206
+        assert {message["type"] for message in messages[1:]} == {"http.response.body"}
+        assert body_of(messages) == CONTENT[100:300]
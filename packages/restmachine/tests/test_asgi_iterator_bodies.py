@@ -0,0 +1,169 @@
+"""
+Tests for generator (sync and async iterator) response bodies.
+"""
+
+import asyncio
+
+import pytest
+
+from restmachine import HTTPMethod, Request, Response, RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.streaming import collect_iterator_body, is_iterator_body
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_scope(path):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "scheme": "http",
+        "headers": [[b"accept", b"text/plain"]],
+        "query_string": b"",
+    }
+
+
+async def call(adapter, path, disconnect_after=None):
+    """Run one request, optionally disconnecting after some body messages."""
+    sent = []
+    disconnected = asyncio.Event()
+    received = [False]
+
+    async def receive():
+        if not received[0]:
+            received[0] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        bodies = [m for m in sent if m["type"] == "http.response.body"]
+        if disconnect_after is not None and len(bodies) >= disconnect_after:
+            disconnected.set()
+        await asyncio.sleep(0)
+
+    await adapter(make_scope(path), receive, send)
+    return sent
+
+
+def create_app(events):
+    app = RestApplication()
+
+    @app.get("/sync")
+    def sync_export():
+        def rows():
+            try:
+                for i in range(3):
+                    yield f"row {i}\n"
+            finally:
+                events.append("sync closed")
+        return Response(200, body=rows(), content_type="text/plain")
+
+    @app.get("/async")
+    def async_export():
+        async def rows():
+            try:
+                for i in range(3):
+                    yield f"row {i}\n".encode()
+            finally:
+                events.append("async closed")
+        return Response(200, body=rows(), content_type="text/plain")
+
+    @app.get("/endless")
+    def endless():
+        def rows():
+            try:
+                while True:
+                    yield b"x" * 1024
+            finally:
+                events.append("endless closed")
+        return Response(200, body=rows(), content_type="application/octet-stream")
+
+    @app.get("/bare")
+    def bare():
+        return (chunk for chunk in ["a", "", "b"])
+
+    return app
+
+
+class TestIteratorResponseModel:
+    """Tests for how Response treats iterator bodies."""
+
+    def test_detection(self):
+        def gen():
+            yield b""
+
+        async def agen():
+            yield b""
+
+        assert is_iterator_body(gen())
+        assert is_iterator_body(agen())
+        assert is_iterator_body(iter([b"a"]))
+        for body in ["text", b"bytes", {"a": 1}, [1, 2], None]:
+            assert not is_iterator_body(body)
+
+    def test_no_content_length_or_etag(self):
+        response = Response(200, body=iter([b"a", b"b"]))
+        response.generate_etag_from_content()
+
+        assert "Content-Length" not in response.headers
+        assert "ETag" not in response.headers
+
+    def test_collect(self):
+        async def agen():
+            yield "a"
+            yield b"b"
+
+        assert collect_iterator_body(iter(["a", b"b"])) == b"ab"
+        assert collect_iterator_body(agen()) == b"ab"
+
+    def test_returned_generator_is_not_rendered(self):
+        app = create_app([])
+
+        response = app.execute(Request(method=HTTPMethod.GET, path="/bare", headers={"Accept": "text/plain"}))
+
+        assert response.status_code == 200
+        assert is_iterator_body(response.body)
+        assert response.headers["Accept-Ranges"] == "none"
+        assert collect_iterator_body(response.body) == b"ab"
+
+
+class TestAsgiIteratorBodies:
+    """Tests for sending iterator bodies through the ASGI adapter."""
+
+    @pytest.mark.parametrize("path", ["/sync", "/async"])
+    async def test_chunks_sent_as_produced(self, path):
+        events = []
+        adapter = ASGIAdapter(create_app(events), enable_metrics=False)
+
+        sent = await call(adapter, path)
+
+        headers = dict(sent[0]["headers"])
+        assert b"content-length" not in headers
+        assert [m["body"] for m in sent[1:]] == [b"row 0\n", b"row 1\n", b"row 2\n", b""]
+        assert [m["more_body"] for m in sent[1:]] == [True, True, True, False]
+        assert events == [f"{path[1:]} closed"]
+
+    async def test_empty_chunks_skipped(self):
+        adapter = ASGIAdapter(create_app([]), enable_metrics=False)
+
+        sent = await call(adapter, "/bare")
+
+        assert [m["body"] for m in sent[1:]] == [b"a", b"b", b""]
+
+    async def test_disconnect_closes_generator(self):
+        events = []
+        adapter = ASGIAdapter(create_app(events), enable_metrics=False)
+
+        sent = await asyncio.wait_for(call(adapter, "/endless", disconnect_after=3), timeout=2)
+
+        assert len(sent) < 10
+        assert events == ["endless closed"]
+        assert adapter.aborted_requests == 1
@@ -0,0 +1,274 @@
+"""
+Tests for streaming request bodies: blocking reads and backpressure.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from restmachine import RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.cancellation import ClientDisconnected
+from restmachine.streaming import BytesStreamBuffer
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def read_in_thread(func):
+    """Start func in a thread; returns the thread and a list receiving its result or error."""
+    result = []
+
+    def run():
+        try:
+            result.append(func())
+        except Exception as e:
+            result.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+class TestBlockingBuffer:
+    """Tests for reads that wait for the writer."""
+
+    def test_read_waits_for_data(self):
+        buffer = BytesStreamBuffer()
+        thread, result = read_in_thread(lambda: buffer.read(10))
+
+        buffer.write(b"01234")
+        time.sleep(0.01)
+        assert result == []
+        buffer.write(b"56789")
+        thread.join(timeout=1)
+
+        assert result == [b"0123456789"]
+
+    def test_read_all_waits_for_eof(self):
+        buffer = BytesStreamBuffer()
+        thread, result = read_in_thread(buffer.read)
+
+        buffer.write(b"abc")
+        buffer.write(b"def")
+        time.sleep(0.01)
+        assert result == []
+        buffer.close_writing()
+        thread.join(timeout=1)
+
+        assert result == [b"abcdef"]
+
+    def test_read1_and_readline(self):
+        buffer = BytesStreamBuffer()
+        buffer.write(b"first li")
+        thread, result = read_in_thread(buffer.readline)
+        buffer.write(b"ne\nsecond")
+
+        thread.join(timeout=1)
+
+        assert result == [b"first line\n"]
+        assert buffer.read1(100) == b"second"
+        buffer.seek(0)
+        assert buffer.read(5) == b"first"
+
+    def test_abort_wakes_reader(self):
+        buffer = BytesStreamBuffer()
+        thread, result = read_in_thread(buffer.read)
+
+        buffer.abort(ClientDisconnected("gone"))
+        thread.join(timeout=1)
+
+        assert isinstance(result[0], ClientDisconnected)
+
+    async def test_writer_waits_for_reader(self):
+        buffer = BytesStreamBuffer(high_water=4)
+        buffer.write(b"12345678")
+
+        waiting = asyncio.ensure_future(buffer.wait_for_space())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await asyncio.get_running_loop().run_in_executor(None, buffer.read, 6)
+        await asyncio.wait_for(waiting, timeout=1)
+        assert buffer.buffered == 2
+
+    async def test_large_read_lifts_backpressure(self):
+        buffer = BytesStreamBuffer(high_water=4)
+        buffer.write(b"12345678")
+        waiting = asyncio.ensure_future(buffer.wait_for_space())
+        await asyncio.sleep(0)
+
+        thread, result = read_in_thread(lambda: buffer.read(12))
+        await asyncio.wait_for(waiting, timeout=1)
+        buffer.write(b"9abc")
+        thread.join(timeout=1)
+
+        assert result == [b"123456789abc"]
+
+    async def test_release_resumes_writer(self):
+        buffer = BytesStreamBuffer(high_water=4)
+        buffer.write(b"12345678")
+
+        waiting = asyncio.ensure_future(buffer.wait_for_space())
+        await asyncio.sleep(0)
+        buffer.release()
+        await asyncio.wait_for(waiting, timeout=1)
+        buffer.write(b"discarded")
+
+        assert buffer.size == 17
+        assert buffer.buffered == 8
+
+
+def make_scope(path, content_type=b"application/json"):
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "scheme": "http",
+        "headers": [[b"content-type", content_type]],
+        "query_string": b"",
+    }
+
+
+async def call(adapter, path, chunks, delay=0.0, on_receive=None, disconnect=False, content_type=b"application/json"):
+    """Send chunks as separate http.request messages, optionally pausing between them."""
+    sent = []
+    index = [0]
+    done = asyncio.Event()
+
+    async def receive():
+        if index[0] < len(chunks):
+            if index[0] and delay:
+                await asyncio.sleep(delay)
+            index[0] += 1
+            if on_receive is not None:
+                on_receive(index[0])
+            return {"type": "http.request", "body": chunks[index[0] - 1], "more_body": True}
+        if index[0] == len(chunks) and not disconnect:
+            index[0] += 1
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if not disconnect:
+            await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+
+    await asyncio.wait_for(adapter(make_scope(path, content_type), receive, send), timeout=5)
+    return sent, index[0]
+
+
+# Several times the default high water mark
+SIZE = 3 * 1024 * 1024
+
+
+def create_app(consumed):
+    app = RestApplication()
+
+    @app.post("/echo")
+    def echo(json_body):
+        return json_body
+
+    @app.post("/count")
+    def count(request):
+        total = 0
+        while True:
+            chunk = request.body.read1(100)
+            if not chunk:
+                break
+            total += len(chunk)
+            consumed[0] = total
+            time.sleep(0.001)
+        return {"bytes": total}
+
+    @app.post("/length")
+    def length(request):
+        return {"bytes": len(request.body.read())}
+
+    @app.post("/json")
+    def json_length(json_body):
+        return {"bytes": len(json_body["data"])}
+
+    @app.post("/form")
+    def form(form_body):
+        return {"bytes": len(form_body["data"])}
+
+    @app.post("/ignore")
+    def ignore():
+        return {"ok": True}
+
+    return app
+
+
+class TestAsgiRequestStreaming:
+    """Tests for request bodies that arrive in several messages."""
+
+    async def test_multi_chunk_json_body(self):
+        adapter = ASGIAdapter(create_app([0]), enable_metrics=False)
+        payload = {"name": "widget", "tags": ["a", "b"] * 50}
+        data = json.dumps(payload).encode()
+        chunks = [data[i:i + 64] for i in range(0, len(data), 64)]
+
+        sent, _ = await call(adapter, "/echo", chunks, delay=0.005)
+
+        assert sent[0]["status"] == 200
+        assert json.loads(sent[1]["body"]) == payload
+
+    async def test_body_then_empty_final_message(self):
+        adapter = ASGIAdapter(create_app([0]), enable_metrics=False)
+
+        sent, _ = await call(adapter, "/echo", [b'{"a": 1}'], delay=0.01)
+
+        assert sent[0]["status"] == 200
+        assert json.loads(sent[1]["body"]) == {"a": 1}
+
+    @pytest.mark.parametrize("path, content_type, body", [
+        ("/length", b"application/octet-stream", b"x" * SIZE),
+        ("/json", b"application/json", b'{"data": "' + b"x" * SIZE + b'"}'),
+        ("/form", b"application/x-www-form-urlencoded", b"data=" + b"x" * SIZE),
+    ])
+    async def test_body_larger_than_high_water(self, path, content_type, body):
+        adapter = ASGIAdapter(create_app([0]), enable_metrics=False)
+        chunks = [body[i:i + 64 * 1024] for i in range(0, len(body), 64 * 1024)]
+
+        sent, _ = await call(adapter, path, chunks, content_type=content_type)
+
+        assert sent[0]["status"] == 200
+        assert json.loads(sent[1]["body"]) == {"bytes": SIZE}
+
+    async def test_receive_paused_at_high_water(self):
+        consumed = [0]
+        unread = []
+        adapter = ASGIAdapter(create_app(consumed), enable_metrics=False, body_high_water=300)
+
+        sent, _ = await call(
+            adapter, "/count", [b"x" * 100] * 50,
+            on_receive=lambda count: unread.append((count - 1) * 100 - consumed[0]),
+        )
+
+        assert json.loads(sent[1]["body"]) == {"bytes": 5000}
+        assert max(unread) < 300 + 100
+
+    async def test_unread_body_is_drained(self):
+        adapter = ASGIAdapter(create_app([0]), enable_metrics=False, body_high_water=100)
+
+        sent, received = await call(adapter, "/ignore", [b"x" * 100] * 20)
+
+        assert sent[0]["status"] == 200
+        assert received == 21
+
+    async def test_disconnect_wakes_waiting_handler(self):
+        adapter = ASGIAdapter(create_app([0]), enable_metrics=False)
+
+        await call(adapter, "/echo", [b'{"a": '], delay=0.01, disconnect=True)
+
+        assert adapter.aborted_requests == 1
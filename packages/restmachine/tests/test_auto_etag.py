@@ -0,0 +1,112 @@
+"""
+Tests for automatic ETags computed from response bodies.
+"""
+
+import io
+
+from restmachine import Response, RestApplication
+from restmachine.auto_etag import AutoETagConfig, content_hash
+from tests.framework import MultiDriverTestBase
+
+
+class TestContentHash:
+    """Tests for hashing the supported body types."""
+
+    def test_bytes_and_str(self):
+        assert content_hash(b"hello") == content_hash("hello")
+        assert content_hash(b"hello") != content_hash(b"hello!")
+
+    def test_file(self, tmp_path):
+        path = tmp_path / "report.csv"
+        path.write_bytes(b"a,b\n" * 50000)
+
+        assert content_hash(path) == content_hash(b"a,b\n" * 50000)
+
+    def test_seekable_stream_is_rewound(self):
+        stream = io.BytesIO(b"header" + b"x" * 100000)
+        stream.seek(6)
+
+        assert content_hash(stream) == content_hash(b"x" * 100000)
+        assert stream.tell() == 6
+
+    def test_unhashable_bodies(self):
+        assert content_hash(iter([b"a", b"b"])) is None
+        assert content_hash(None) is None
+
+    def test_weak(self):
+        assert AutoETagConfig().etag_for(b"a") == f'"{content_hash(b"a")}"'
+        assert AutoETagConfig(weak=True).etag_for(b"a") == f'W/"{content_hash(b"a")}"'
+
+
+def create_app():
+    app = RestApplication()
+    app.enable_auto_etag()
+
+    @app.get("/catalog")
+    def catalog():
+        return {"products": ["a", "b"]}
+
+    @app.get("/events")
+    @app.auto_etag(False)
+    def events():
+        return {"events": []}
+
+    @app.get("/versioned")
+    def versioned():
+        return Response(200, '{"version": 3}', headers={"ETag": '"v3"'}, content_type="application/json")
+
+    @app.post("/catalog")
+    def add_product():
+        return {"added": True}
+
+    return app
+
+
+class TestAutoETagRoutes(MultiDriverTestBase):
+    """Automatic ETags and 304 responses on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_app()
+
+    def test_not_modified(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/catalog")
+        etag = response.get_header("ETag")
+        assert etag.startswith('"')
+
+        cached = api_client.execute(
+            api_client.get("/catalog").with_header("If-None-Match", etag).accepts("application/json")
+        )
+        api_client.expect_not_modified(cached)
+        assert cached.get_header("ETag") == etag
+
+    def test_mismatch_returns_body(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.get("/catalog").with_header("If-None-Match", '"stale"').accepts("application/json")
+        )
+
+        assert api_client.expect_successful_retrieval(response) == {"products": ["a", "b"]}
+
+    def test_opted_out_route(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/events")
+
+        assert response.get_header("ETag") is None
+
+    def test_existing_etag_is_kept(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/versioned")
+
+        assert response.get_header("ETag") == '"v3"'
+
+    def test_only_get(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.post("/catalog").with_json_body({}).accepts("application/json"))
+
+        assert response.get_header("ETag") is None
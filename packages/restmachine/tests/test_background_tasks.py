@@ -0,0 +1,210 @@
+"""
+Tests for background tasks run after the response is sent.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+
+import pytest
+
+from restmachine import Response, RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.background import BackgroundRunner, BackgroundTasks
+from tests.framework import MultiDriverTestBase
+
+
+class TestBackgroundTasks:
+    """Tests for queueing tasks."""
+
+    def test_invalid_tasks(self):
+        tasks = BackgroundTasks()
+
+        with pytest.raises(TypeError):
+            tasks.add("not callable")
+
+        async def notify(event):
+            pass
+
+        coroutine = notify("created")
+        with pytest.raises(TypeError):
+            tasks.add(coroutine, "extra")
+        coroutine.close()
+        assert len(tasks) == 0
+
+    def test_discard_closes_coroutines(self):
+        async def notify():
+            pass
+
+        tasks = BackgroundTasks()
+        coroutine = notify()
+        tasks.add(coroutine)
+        tasks.discard()
+
+        assert len(tasks) == 0
+        assert coroutine.cr_frame is None
+
+
+class TestBackgroundRunner:
+    """Tests for running tasks with bounded concurrency."""
+
+    def test_run_counts_outcomes(self, caplog):
+        results = []
+
+        def fail():
+            raise RuntimeError("webhook down")
+
+        async def notify(event):
+            results.append(event)
+
+        tasks = BackgroundTasks()
+        tasks.add(results.append, "audit")
+        tasks.add(fail)
+        tasks.add(notify, "created")
+        tasks.add(notify("updated"))
+        runner = BackgroundRunner()
+
+        with caplog.at_level("ERROR", logger="restmachine.background"):
+            runner.run(tasks)
+
+        assert sorted(results) == ["audit", "created", "updated"]
+        assert (runner.completed, runner.failed, runner.pending) == (3, 1, 0)
+        assert "fail failed" in caplog.text
+
+    def test_concurrency_is_bounded(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            threading.Event().wait(0.01)
+            with lock:
+                running.pop()
+
+        tasks = BackgroundTasks()
+        for _ in range(8):
+            tasks.add(work)
+        BackgroundRunner(max_concurrency=2).run(tasks)
+
+        assert max(peak) == 2
+
+    def test_drain(self):
+        release = threading.Event()
+        tasks = BackgroundTasks()
+        tasks.add(release.wait, 5)
+        runner = BackgroundRunner()
+        runner.submit(tasks)
+
+        assert runner.drain(timeout=0.01) is False
+        release.set()
+        assert runner.shutdown(timeout=5) is True
+        assert runner.completed == 1
+
+    @pytest.mark.anyio
+    async def test_coroutines_run_on_the_loop(self):
+        loop = asyncio.get_running_loop()
+        loops = []
+
+        async def notify():
+            loops.append(asyncio.get_running_loop())
+
+        tasks = BackgroundTasks()
+        tasks.add(notify)
+        tasks.add(lambda: loops.append(None))
+        await BackgroundRunner().run_async(tasks)
+
+        assert loops.count(loop) == 1 and len(loops) == 2
+
+    @pytest.mark.parametrize("settings", [{"max_concurrency": 0}, {"drain_timeout": -1}])
+    def test_invalid_settings(self, settings):
+        with pytest.raises(ValueError):
+            BackgroundRunner(**settings)
+
+
+def create_app(events):
+    app = RestApplication()
+
+    @app.post("/orders/{order_id}")
+    def create_order(order_id, background):
+        background.add(events[order_id].append, "created")
+        return {"id": order_id}
+
+    @app.post("/rejected/{order_id}")
+    def reject_order(order_id, background):
+        background.add(events[order_id].append, "created")
+        return Response(409, '{"error": "conflict"}', content_type="application/json")
+
+    return app
+
+
+class TestBackgroundTaskRoutes(MultiDriverTestBase):
+    """Tasks queued by handlers run after the response on every driver."""
+
+    events = defaultdict(list)
+
+    def create_app(self) -> RestApplication:
+        return create_app(self.events)
+
+    def test_tasks_run(self, api):
+        api_client, driver_name = api
+        order_id = f"{driver_name}-1"
+
+        response = api_client.execute(
+            api_client.post(f"/orders/{order_id}").with_json_body({}).accepts("application/json")
+        )
+
+        assert response.status_code == 200
+        assert self.events[order_id] == ["created"]
+
+    def test_failed_requests_drop_tasks(self, api):
+        api_client, driver_name = api
+        order_id = f"{driver_name}-2"
+
+        response = api_client.execute(
+            api_client.post(f"/rejected/{order_id}").with_json_body({}).accepts("application/json")
+        )
+
+        assert response.status_code == 409
+        assert self.events[order_id] == []
+
+
+class TestASGIBackgroundTasks:
+    """Tasks run once the response body has been sent."""
+
+    @pytest.mark.anyio
+    async def test_tasks_run_after_response(self):
+        app = RestApplication()
+        sent = []
+        seen_by_task = []
+
+        @app.get("/report")
+        def report(background):
+            background.add(lambda: seen_by_task.extend(message["type"] for message in sent))
+            return {"ok": True}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/report", "headers": [], "query_string": b""}
+        await ASGIAdapter(app, enable_metrics=False)(scope, receive, send)
+
+        assert seen_by_task == ["http.response.start", "http.response.body"]
+
+    @pytest.mark.anyio
+    async def test_shutdown_drains_pending_tasks(self):
+        app = RestApplication()
+        release = threading.Event()
+        tasks = BackgroundTasks()
+        tasks.add(release.wait, 5)
+        app._background.submit(tasks)
+        asyncio.get_running_loop().call_later(0.01, release.set)
+
+        await app.shutdown()
+
+        assert (app._background.pending, app._background.completed) == (0, 1)
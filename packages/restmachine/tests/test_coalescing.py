@@ -0,0 +1,258 @@
+"""
+Tests for request coalescing (single-flight) of identical concurrent GET requests.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from restmachine import HTTPMethod, Request, Response, RestApplication
+from restmachine.coalescing import SingleFlight
+from tests.framework import MultiDriverTestBase
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def get(**headers):
+    return Request(method=HTTPMethod.GET, path="/catalog", headers={"Accept": "application/json", **headers})
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight keys and sharing."""
+
+    def test_keys(self):
+        single_flight = SingleFlight(vary=["X-Tenant"])
+
+        assert single_flight.key_for(get()) == single_flight.key_for(get())
+        paged = Request(method=HTTPMethod.GET, path="/catalog", query_params={"page": "2"},
+                        headers={"Accept": "application/json"})
+        assert single_flight.key_for(get()) != single_flight.key_for(paged)
+        assert single_flight.key_for(get()) != single_flight.key_for(get(Accept="text/html"))
+        assert single_flight.key_for(get()) != single_flight.key_for(get(Authorization="Bearer a"))
+        assert single_flight.key_for(get(Origin="https://a.example")) != single_flight.key_for(
+            get(Origin="https://b.example")
+        )
+        assert single_flight.key_for(get()) != single_flight.key_for(get(**{"X-Tenant": "a"}))
+        assert single_flight.key_for(Request(method=HTTPMethod.POST, path="/catalog")) is None
+
+    def test_keys_include_client_identity(self):
+        single_flight = SingleFlight()
+
+        def request(**kwargs):
+            return Request(method=HTTPMethod.GET, path="/catalog", headers={"Accept": "application/json"}, **kwargs)
+
+        cert = {"subject": {"CN": "alice"}, "serial": "01"}
+        same_cert = {"serial": "01", "subject": {"CN": "alice"}}
+        assert single_flight.key_for(request(client_cert=cert)) == single_flight.key_for(request(client_cert=same_cert))
+        keys = {
+            single_flight.key_for(request()),
+            single_flight.key_for(request(tls=True)),
+            single_flight.key_for(request(client_ip="10.0.0.1")),
+            single_flight.key_for(request(client_ip="10.0.0.2")),
+            single_flight.key_for(request(client_cert=cert)),
+            single_flight.key_for(request(client_cert={"subject": {"CN": "bob"}, "serial": "02"})),
+        }
+        assert len(keys) == 6
+
+    def test_duplicates_share_the_leader_response(self):
+        request_ids = itertools.count(1)
+        single_flight = SingleFlight(headers=lambda request: {"X-Request-ID": str(next(request_ids))})
+        release = threading.Event()
+        calls = []
+
+        def execute():
+            calls.append(1)
+            release.wait(5)
+            return Response(200, b'{"items": []}', content_type="application/json")
+
+        with ThreadPoolExecutor(4) as pool:
+            leader = pool.submit(single_flight.run, get(), execute)
+            wait_for(lambda: single_flight._calls)
+            followers = [pool.submit(single_flight.run, get(), execute) for _ in range(3)]
+            wait_for(lambda: next(iter(single_flight._calls.values())).waiters == 3)
+            release.set()
+            responses = [leader.result()] + [follower.result() for follower in followers]
+
+        assert len(calls) == 1
+        assert single_flight.shared_count == 3
+        assert {response.body for response in responses} == {b'{"items": []}'}
+        assert len({response.headers["X-Request-ID"] for response in responses}) == 4
+        assert len({id(response.headers) for response in responses}) == 4
+
+    def test_unshareable_responses_are_not_shared(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def execute():
+            calls.append(1)
+            release.wait(5)
+            return Response(200, b"{}", headers={"Set-Cookie": "session=abc"})
+
+        with ThreadPoolExecutor(2) as pool:
+            leader = pool.submit(single_flight.run, get(), execute)
+            wait_for(lambda: single_flight._calls)
+            follower = pool.submit(single_flight.run, get(), execute)
+            wait_for(lambda: next(iter(single_flight._calls.values())).waiters == 1)
+            release.set()
+            leader.result()
+            follower.result()
+
+        assert len(calls) == 2
+        assert single_flight.shared_count == 0
+
+
+def create_app(release=None, calls=None):
+    app = RestApplication()
+
+    @app.get("/catalog")
+    @app.coalesce(headers=lambda request: {"X-Request-ID": request.headers.get("X-Request-ID", "-")})
+    def catalog():
+        if calls is not None:
+            calls.append(1)
+        if release is not None:
+            release.wait(5)
+        return {"products": ["a", "b"]}
+
+    return app
+
+
+class TestApplicationCoalescing:
+    """Concurrent duplicates handled by RestApplication.execute in threads."""
+
+    def test_threads(self):
+        release = threading.Event()
+        calls = []
+        app = create_app(release, calls)
+        single_flight = app._find_route(HTTPMethod.GET, "/catalog")[0].single_flight
+
+        with ThreadPoolExecutor(3) as pool:
+            leader = pool.submit(app.execute, get(**{"X-Request-ID": "1"}))
+            wait_for(lambda: calls)
+            followers = [pool.submit(app.execute, get(**{"X-Request-ID": str(n)})) for n in (2, 3)]
+            wait_for(lambda: next(iter(single_flight._calls.values())).waiters == 2)
+            release.set()
+            responses = [leader.result()] + [follower.result() for follower in followers]
+
+        assert len(calls) == 1
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert [response.headers["X-Request-ID"] for response in responses] == ["1", "2", "3"]
+        assert len({response.body for response in responses}) == 1
+
+    def test_origins_are_not_shared(self):
+        release = threading.Event()
+        calls = []
+        app = create_app(release, calls)
+        app.cors(origins=["https://a.example", "https://b.example"])
+
+        with ThreadPoolExecutor(2) as pool:
+            futures = [
+                pool.submit(app.execute, get(Origin=origin)) for origin in ("https://a.example", "https://b.example")
+            ]
+            wait_for(lambda: len(calls) == 2)
+            release.set()
+            responses = [future.result() for future in futures]
+
+        assert [response.headers["Access-Control-Allow-Origin"] for response in responses] == [
+            "https://a.example", "https://b.example"
+        ]
+
+    def test_client_certificates_are_not_shared(self):
+        release = threading.Event()
+        calls = []
+        app = create_app(release, calls)
+
+        @app.default_authorized
+        def has_certificate(request):
+            return request.client_cert is not None
+
+        def request(client_cert):
+            return Request(method=HTTPMethod.GET, path="/catalog", headers={"Accept": "application/json"},
+                           tls=True, client_cert=client_cert)
+
+        with ThreadPoolExecutor(2) as pool:
+            authorized = pool.submit(app.execute, request({"subject": {"CN": "alice"}}))
+            wait_for(lambda: calls)
+            anonymous = pool.submit(app.execute, request(None))
+            assert anonymous.result(timeout=5).status_code == 401
+            release.set()
+            assert authorized.result().status_code == 200
+
+
+class TestASGICoalescing:
+    """Duplicates wait on the event loop instead of taking a worker thread."""
+
+    @pytest.mark.anyio
+    async def test_followers_wait_on_event_loop(self):
+        from restmachine.adapters import ASGIAdapter
+
+        release = threading.Event()
+        calls = []
+        app = create_app(release, calls)
+        single_flight = app._find_route(HTTPMethod.GET, "/catalog")[0].single_flight
+        asgi_app = ASGIAdapter(app, max_workers=1)
+
+        async def call(request_id):
+            scope = {
+                "type": "http",
+                "method": "GET",
+                "path": "/catalog",
+                "headers": [[b"accept", b"application/json"], [b"x-request-id", request_id.encode()]],
+                "query_string": b"",
+            }
+            sent = []
+            received = asyncio.Event()
+
+            async def receive():
+                if received.is_set():
+                    await asyncio.sleep(10)
+                received.set()
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                sent.append(message)
+
+            await asgi_app(scope, receive, send)
+            return sent
+
+        leader = asyncio.ensure_future(call("1"))
+        while not calls:
+            await asyncio.sleep(0.001)
+        # The only worker is busy with the leader, so these can only be answered by sharing
+        followers = [asyncio.ensure_future(call(str(n))) for n in (2, 3)]
+        while len(next(iter(single_flight._calls.values())).futures) < 2:
+            await asyncio.sleep(0.001)
+        release.set()
+        results = await asyncio.gather(leader, *followers)
+
+        assert len(calls) == 1
+        assert [sent[0]["status"] for sent in results] == [200, 200, 200]
+        assert len({sent[1]["body"] for sent in results}) == 1
+        request_ids = [{name.lower(): value for name, value in sent[0]["headers"]}[b"x-request-id"] for sent in results]
+        assert request_ids == [b"1", b"2", b"3"]
+
+
+class TestCoalescedRoutes(MultiDriverTestBase):
+    """Coalesced routes behave like any other route on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_app()
+
+    def test_get(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.get("/catalog").with_header("X-Request-ID", "abc").accepts("application/json")
+        )
+
+        assert api_client.expect_successful_retrieval(response) == {"products": ["a", "b"]}
+        assert response.get_header("X-Request-ID") == "abc"
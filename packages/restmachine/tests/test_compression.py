@@ -0,0 +1,337 @@
+"""
+Tests for response compression and request body decompression.
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.compression import (
+    ZSTD_AVAILABLE,
+    CompressionConfig,
+    DecompressingStream,
+    negotiate_encoding,
+)
+from restmachine.exceptions import RequestEntityTooLarge
+from tests.framework import MultiDriverTestBase
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+ITEMS = [{"id": i, "name": f"item-{i}"} for i in range(50)]
+
+
+def create_compressed_app():
+    app = RestApplication()
+    app.enable_compression(minimum_size=100)
+
+    @app.get("/items")
+    def list_items():
+        return ITEMS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        def lines():
+            for item in ITEMS:
+                yield json.dumps(item) + "\n"
+        return lines()
+
+    @app.get("/image")
+    def image():
+        from restmachine import Response
+        return Response(200, b"\x89PNG" + b"\x00" * 1000, content_type="image/png")
+
+    @app.post("/echo")
+    def echo(json_body):
+        return {"count": len(json_body)}
+
+    return app
+
+
+def decode_json(response):
+    """Decode a JSON body; HTTP clients decompress transparently, other drivers return the raw bytes."""
+    body = response.body
+    if isinstance(body, bytes):
+        body = gzip.decompress(body).decode("utf-8")
+    return json.loads(body) if isinstance(body, str) else body
+
+
+class TestEncodingNegotiation:
+    """Tests for Accept-Encoding negotiation and the content type allowlist."""
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("", None),
+        ("gzip", "gzip"),
+        ("deflate, gzip", "gzip"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("br", None),
+        ("*", "gzip"),
+        ("*;q=0.5, gzip;q=0", "deflate"),
+        ("identity", None),
+        ("GZIP;Q=1", "gzip"),
+    ])
+    def test_negotiate(self, header, expected):
+        assert negotiate_encoding(header, ("gzip", "deflate")) == expected
+
+    @pytest.mark.parametrize("content_type, expected", [
+        ("application/json", True),
+        ("text/html; charset=utf-8", True),
+        ("application/problem+json", True),
+        ("image/svg+xml", True),
+        ("image/png", False),
+        ("application/octet-stream", False),
+        (None, False),
+    ])
+    def test_content_type_allowlist(self, content_type, expected):
+        assert CompressionConfig().is_compressible(content_type) is expected
+
+    def test_invalid_config(self):
+        app = RestApplication()
+
+        with pytest.raises(ValueError):
+            app.enable_compression(minimum_size=-1)
+        with pytest.raises(ValueError):
+            app.enable_compression(encodings=["br"])
+        with pytest.raises(ValueError):
+            app.enable_compression(max_decompressed_size=0)
+
+    @pytest.mark.skipif(ZSTD_AVAILABLE, reason="zstd is available")
+    def test_zstd_requires_support(self):
+        with pytest.raises(ValueError):
+            RestApplication().enable_compression(encodings=["zstd"])
+
+
+class TestResponseCompression(MultiDriverTestBase):
+    """Compressed responses on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_compressed_app()
+
+    def get(self, api_client, path, encoding="gzip"):
+        return api_client.execute(
+            api_client.get(path).accepts("application/json").with_header("Accept-Encoding", encoding)
+        )
+
+    def test_gzip_response(self, api):
+        api_client, driver_name = api
+
+        response = self.get(api_client, "/items")
+
+        assert response.status_code == 200
+        assert response.get_header("Content-Encoding") == "gzip"
+        assert "Accept-Encoding" in response.get_header("Vary")
+        assert decode_json(response) == ITEMS
+
+    def test_identity_when_not_accepted(self, api):
+        api_client, driver_name = api
+
+        response = self.get(api_client, "/items", encoding="identity")
+
+        assert response.get_header("Content-Encoding") is None
+        assert "Accept-Encoding" in response.get_header("Vary")
+        assert api_client.expect_successful_retrieval(response) == ITEMS
+
+    def test_small_response_not_compressed(self, api):
+        api_client, driver_name = api
+
+        response = self.get(api_client, "/small")
+
+        assert response.get_header("Content-Encoding") is None
+        assert api_client.expect_successful_retrieval(response) == {"ok": True}
+
+    def test_gzip_request_body(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.post("/echo")
+            .with_bytes_body(gzip.compress(json.dumps(ITEMS).encode()))
+            .with_header("Content-Type", "application/json")
+            .with_header("Content-Encoding", "gzip")
+            .with_header("Accept-Encoding", "identity")
+            .accepts("application/json")
+        )
+
+        assert api_client.expect_successful_creation(response) == {"count": 50}
+
+    def test_unsupported_request_encoding(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.post("/echo")
+            .with_bytes_body(b"\x00\x01")
+            .with_header("Content-Type", "application/json")
+            .with_header("Content-Encoding", "compress")
+        )
+
+        assert response.status_code == 415
+
+
+class TestCompressionDetails:
+    """Tests for the compressed representation itself."""
+
+    def get(self, path, encoding="gzip", **headers):
+        app = create_compressed_app()
+        return app.execute(Request(
+            method=HTTPMethod.GET,
+            path=path,
+            headers={"Accept": "application/json", "Accept-Encoding": encoding, **headers},
+        ))
+
+    def test_content_length_matches_compressed_body(self):
+        response = self.get("/items")
+
+        assert response.headers["Content-Length"] == str(len(response.body))
+        assert json.loads(gzip.decompress(response.body)) == ITEMS
+
+    def test_deflate(self):
+        response = self.get("/items", encoding="deflate")
+
+        assert response.headers["Content-Encoding"] == "deflate"
+        assert json.loads(zlib.decompress(response.body)) == ITEMS
+
+    def test_stream_compressed_per_chunk(self):
+        response = self.get("/stream")
+
+        chunks = list(response.body)
+        decompressor = zlib.decompressobj(31)
+        first = decompressor.decompress(chunks[0])
+
+        assert "Content-Length" not in response.headers
+        # Each chunk is flushed, so it can be decoded as soon as it arrives
+        assert json.loads(first) == ITEMS[0]
+        assert gzip.decompress(b"".join(chunks)).decode().splitlines() == [json.dumps(item) for item in ITEMS]
+
+    def test_content_type_not_in_allowlist(self):
+        response = self.get("/image")
+
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" not in response.headers.get("Vary", "")
+
+    def test_strong_etag_weakened(self):
+        app = create_compressed_app()
+
+        @app.get("/tagged")
+        def tagged():
+            from restmachine import Response
+            return Response(200, json.dumps(ITEMS), content_type="application/json", etag='"v1"')
+
+        response = app.execute(Request(
+            method=HTTPMethod.GET, path="/tagged", headers={"Accept-Encoding": "gzip"}
+        ))
+
+        assert response.headers["ETag"] == 'W/"v1"'
+
+    def test_range_request_not_compressed(self):
+        response = self.get("/items", Range="bytes=0-9")
+
+        assert response.status_code == 206
+        assert "Content-Encoding" not in response.headers
+
+    def test_compression_disabled_by_default(self):
+        app = RestApplication()
+
+        @app.get("/items")
+        def list_items():
+            return ITEMS
+
+        response = app.execute(Request(method=HTTPMethod.GET, path="/items", headers={"Accept-Encoding": "gzip"}))
+
+        assert "Content-Encoding" not in response.headers
+
+
+class TestRequestDecompression:
+    """Tests for decompressing request bodies as they are read."""
+
+    def test_streamed_in_small_reads(self):
+        data = b"".join(json.dumps(item).encode() for item in ITEMS)
+        stream = DecompressingStream(io.BytesIO(gzip.compress(data)), "gzip", max_size=10_000, read_size=16)
+
+        chunks = iter(lambda: stream.read(100), b"")
+
+        assert b"".join(chunks) == data
+        stream.seek(0)
+        assert stream.read() == data
+
+    def test_decompression_bomb_rejected(self):
+        bomb = gzip.compress(b"\x00" * 10_000_000)
+        source = io.BytesIO(bomb)
+        stream = DecompressingStream(source, "gzip", max_size=1_000_000, read_size=1024)
+
+        with pytest.raises(RequestEntityTooLarge):
+            stream.read()
+        # Decompression stopped at the limit instead of expanding the whole body
+        assert source.tell() < len(bomb)
+
+    def test_truncated_body(self):
+        stream = DecompressingStream(io.BytesIO(gzip.compress(b"x" * 1000)[:-8]), "gzip", max_size=10_000)
+
+        with pytest.raises(ValueError):
+            stream.read()
+
+    def test_bomb_returns_413(self):
+        app = create_compressed_app()
+        app.enable_compression(max_decompressed_size=1000)
+
+        response = app.execute(Request(
+            method=HTTPMethod.POST,
+            path="/echo",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            body=io.BytesIO(gzip.compress(b"[" + b"0, " * 1000 + b"0]")),
+        ))
+
+        assert response.status_code == 413
+
+
+class TestAsgiCompression:
+    """Compressed streaming through the ASGI adapter."""
+
+    async def test_streaming_response(self):
+        adapter = ASGIAdapter(create_compressed_app(), enable_metrics=False)
+        sent = []
+        done = asyncio.Event()
+        requested = [False]
+
+        async def receive():
+            if not requested[0]:
+                requested[0] = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                done.set()
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/stream",
+            "scheme": "http",
+            "headers": [[b"accept-encoding", b"gzip"]],
+            "query_string": b"",
+        }
+        await asyncio.wait_for(adapter(scope, receive, send), timeout=5)
+
+        headers = {name.lower(): value for name, value in sent[0]["headers"]}
+        body = b"".join(message.get("body", b"") for message in sent[1:])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        assert len(sent) > 3
+        assert len(gzip.decompress(body).splitlines()) == 50
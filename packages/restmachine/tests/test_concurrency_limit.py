@@ -0,0 +1,153 @@
+"""
+Tests for adaptive concurrency limiting and load shedding.
+"""
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.concurrency import (
+    AIMDLimit,
+    ConcurrencyLimitConfig,
+    ConcurrencyLimiter,
+    GradientLimit,
+)
+from restmachine.metrics import MetricsCollector
+from tests.framework import MultiDriverTestBase
+
+
+class TestConcurrencyLimitConfig:
+    """Tests for ConcurrencyLimitConfig validation."""
+
+    @pytest.mark.parametrize("settings", [
+        {"algorithm": "vegas"},
+        {"min_limit": 0},
+        {"initial_limit": 5, "max_limit": 4},
+        {"backoff_ratio": 1.0},
+        {"low_priority_ratio": 0},
+        {"retry_after": -1},
+    ])
+    def test_invalid_settings(self, settings):
+        with pytest.raises(ValueError):
+            ConcurrencyLimitConfig(**settings).validate()
+
+    def test_invalid_priority(self):
+        with pytest.raises(ValueError, match="Invalid priority"):
+            RestApplication().concurrency_limit(priority="urgent")
+
+
+class TestLimitAlgorithms:
+    """Tests for the AIMD and gradient limit algorithms."""
+
+    def test_aimd_grows_while_in_use_and_backs_off(self):
+        aimd = AIMDLimit(ConcurrencyLimitConfig(latency_threshold=0.5, backoff_ratio=0.5, max_limit=11))
+
+        assert aimd.update(10, 0.1, inflight=5, dropped=False) == 11
+        assert aimd.update(11, 0.1, inflight=6, dropped=False) == 11
+        assert aimd.update(10, 0.1, inflight=1, dropped=False) == 10
+        assert aimd.update(10, 0.9, inflight=5, dropped=False) == 5
+        assert aimd.update(10, 0.1, inflight=5, dropped=True) == 5
+
+    def test_gradient_shrinks_when_latency_rises(self):
+        gradient = GradientLimit(ConcurrencyLimitConfig(smoothing=1.0, queue_size=0, tolerance=1.0))
+        for _ in range(10):
+            assert gradient.update(20, 0.01, inflight=20, dropped=False) == 20
+
+        assert gradient.update(20, 0.04, inflight=20, dropped=False) == 10
+        assert gradient.update(20, 0.04, inflight=2, dropped=False) == 20
+
+
+class TestConcurrencyLimiter:
+    """Tests for admission by priority."""
+
+    def test_priorities(self):
+        limiter = ConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=5, low_priority_ratio=0.6))
+
+        assert all(limiter.try_acquire() for _ in range(3))
+        assert not limiter.try_acquire("low")
+        assert limiter.try_acquire() and limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.try_acquire("critical")
+        assert limiter.stats() == {"algorithm": "aimd", "limit": 5, "inflight": 6, "shed": 2}
+
+    def test_release_updates_limit(self):
+        limiter = ConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=4, latency_threshold=0.1, backoff_ratio=0.5))
+        limiter.try_acquire()
+
+        limiter.release(1.0)
+
+        assert limiter.inflight == 0
+        assert limiter.limit == 2
+
+
+def create_app(limiter=None, report_limiter=None):
+    app = RestApplication()
+    if limiter is not None:
+        app.set_concurrency_limiter(limiter)
+
+    @app.get("/items")
+    def list_items():
+        return {"items": []}
+
+    @app.get("/health")
+    @app.concurrency_limit(priority="critical")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/reports")
+    @app.concurrency_limit(limiter=report_limiter)
+    def reports():
+        return {"reports": []}
+
+    return app
+
+
+class TestLoadShedding(MultiDriverTestBase):
+    """Requests over the limit are shed with 503 on every driver."""
+
+    limiter = ConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=1, max_limit=1, retry_after=3))
+    report_limiter = ConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=1, max_limit=1))
+
+    def create_app(self) -> RestApplication:
+        return create_app(self.limiter, self.report_limiter)
+
+    def test_admitted_under_limit(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/items")
+
+        assert api_client.expect_successful_retrieval(response) == {"items": []}
+        assert self.limiter.inflight == 0
+
+    def test_shed_over_limit(self, api):
+        api_client, driver_name = api
+        assert self.limiter.try_acquire()
+        try:
+            shed = api_client.get_resource("/items")
+            health = api_client.get_resource("/health")
+            reports = api_client.get_resource("/reports")
+        finally:
+            self.limiter.release(0.0)
+
+        assert shed.status_code == 503
+        assert shed.get_header("Retry-After") == "3"
+        assert api_client.expect_successful_retrieval(health) == {"status": "ok"}
+        # Routes with their own limiter don't count against the app-level one
+        assert api_client.expect_successful_retrieval(reports) == {"reports": []}
+
+
+class TestConcurrencyMetrics:
+    """Limit and shed metrics."""
+
+    def test_metrics(self):
+        limiter = ConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=1))
+        app = create_app(limiter)
+        metrics = MetricsCollector()
+        limiter.try_acquire()
+
+        app._dependency_cache.set("metrics", metrics)
+        response = app.execute(Request(method=HTTPMethod.GET, path="/items", headers={"Accept": "application/json"}))
+
+        assert response.status_code == 503
+        assert [value.value for value in metrics.metrics["concurrency.limit"]] == [1]
+        assert [value.value for value in metrics.metrics["concurrency.shed"]] == [1]
+        assert limiter.inflight == 1
@@ -5,6 +5,7 @@ Covers:
 - CaseInsensitiveDict with non-string keys and deletion
 - Request conditional header parsing (weak ETags, alternative date formats)
 - Response ETag/Last-Modified methods
+- Slotted Request/Response objects and Response.fast()
 - Utility functions (parse_etags, etags_match)
 """
 
@@ -390,6 +391,35 @@ class TestMultiValueHeadersClass:
         assert "user=john_doe" in all_cookies
         assert "preferences=dark_mode" in all_cookies
 
+    def test_set_keeps_position_and_drops_duplicates(self):
+        """Test that set() replaces a header in place and removes its other values."""
+        headers = MultiValueHeaders([("A", "1"), ("X-Tag", "a"), ("B", "2"), ("x-tag", "b")])
+
+        headers.set("X-TAG", "c")
+
+        assert headers.items_all() == [("A", "1"), ("X-TAG", "c"), ("B", "2")]
+        assert headers.get("b") == "2"
+
+    def test_from_dict(self):
+        """Test building headers from an event-style dict of values or lists."""
+        headers = MultiValueHeaders.from_dict(
+            {"Accept": "text/html", "Cookie": ["a=1", "b=2"], "X-Empty": None}, lowercase=True
+        )
+
+        assert headers.items_all() == [("accept", "text/html"), ("cookie", "a=1"), ("cookie", "b=2")]
+        assert headers.get_all("COOKIE") == ["a=1", "b=2"]
+
+    def test_to_asgi_cached_until_mutated(self):
+        """Test that the encoded ASGI header list is reused until the headers change."""
+        headers = MultiValueHeaders({"Content-Type": "text/plain"})
+
+        first = headers.to_asgi()
+        first.append((b"x-extra", b"1"))
+
+        assert headers.to_asgi() == [[b"Content-Type", b"text/plain"]]
+        headers.add("Set-Cookie", "a=1")
+        assert headers.to_asgi() == [[b"Content-Type", b"text/plain"], [b"Set-Cookie", b"a=1"]]
+
 
 class TestRequestConditionalHeaderParsing:
     """Test Request methods for parsing conditional headers."""
@@ -600,6 +630,53 @@ class TestResponseETagMethods:
         assert "Authorization" in response.headers["Vary"]
 
 
+class TestResponseConstruction:
+    """Test slotted Request/Response objects and the Response fast paths."""
+
+    def test_no_instance_dict(self):
+        """Test that requests and responses don't allocate a __dict__."""
+        request = Request(method=HTTPMethod.GET, path="/")
+        response = Response(200, "ok")
+
+        assert not hasattr(request, "__dict__")
+        assert not hasattr(response, "__dict__")
+        assert request.csp_nonce is None
+
+    def test_fast_matches_constructor(self):
+        """Test that Response.fast() produces the same headers as the constructor."""
+        pre_calculated = MultiValueHeaders({"X-Request-ID": "abc", "Vary": "Origin"})
+
+        fast = Response.fast(200, "héllo", content_type="text/plain", headers=pre_calculated)
+        full = Response(200, "héllo", content_type="text/plain", pre_calculated_headers=pre_calculated)
+
+        assert fast.headers.items_all() == full.headers.items_all()
+        assert fast.headers["Content-Length"] == "6"
+        assert fast.pre_calculated_headers is pre_calculated
+        # The response gets its own copy of the headers
+        assert "Content-Type" not in pre_calculated
+
+    def test_fast_falls_back_for_other_bodies(self):
+        """Test that Response.fast() uses the full constructor for non-text bodies."""
+        response = Response.fast(200, {"a": 1}, content_type="application/json")
+
+        assert response.headers["Content-Length"] == str(len('{"a": 1}'))
+
+    def test_fast_no_content(self):
+        """Test that Response.fast() leaves Content-Length off 204 responses."""
+        assert "Content-Length" not in Response.fast(204).headers
+
+    def test_merge_headers_reapplies_own_headers(self):
+        """Test that merge_headers() keeps the response's own Content-Type and Vary."""
+        response = Response(200, "ok", headers={"Vary": "Cookie"}, content_type="text/plain")
+
+        response.merge_headers({"Content-Type": "text/html", "Vary": "Origin", "X-Extra": "1"})
+
+        assert response.headers["Content-Type"] == "text/plain"
+        assert response.headers["Vary"] == "Cookie"
+        assert response.headers["X-Extra"] == "1"
+        assert response.headers["Content-Length"] == "2"
+
+
 class TestParseETagsFunction:
     """Test parse_etags() utility function."""
 
@@ -0,0 +1,250 @@
+"""
+Tests for the streaming multipart/form-data parser and the multipart_body dependency.
+"""
+
+import asyncio
+import io
+import json
+
+import pytest
+
+from restmachine import RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.exceptions import MultipartError, RequestEntityTooLarge
+from restmachine.multipart import FormField, MultipartConfig, UploadFile, iter_multipart, parse_multipart
+from tests.framework import MultiDriverTestBase
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+BOUNDARY = "formboundary42"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def encode_parts(parts, preamble=b"", epilogue=b""):
+    """Build a multipart body from (name, value, filename) tuples."""
+    body = preamble
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n".encode()
+        if filename is not None:
+            body += b"Content-Type: application/octet-stream\r\n"
+        body += b"\r\n" + (value if isinstance(value, bytes) else value.encode()) + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode() + epilogue
+
+
+def parse(body, **config):
+    return parse_multipart(io.BytesIO(body), CONTENT_TYPE, MultipartConfig(**config))
+
+
+class TestMultipartParser:
+    """Tests for parsing multipart bodies."""
+
+    def test_fields_and_files(self):
+        payload = bytes(range(256)) * 10
+        form = parse(encode_parts([
+            ("title", "Holiday", None),
+            ("tag", "sea", None),
+            ("tag", "sun", None),
+            ("photo", payload, "beach.jpg"),
+        ]))
+
+        assert form["title"] == "Holiday"
+        assert form.getlist("tag") == ["sea", "sun"]
+        assert form.getlist("missing") == []
+        photo = form["photo"]
+        assert isinstance(photo, UploadFile)
+        assert photo.filename == "beach.jpg"
+        assert photo.content_type == "application/octet-stream"
+        assert photo.size == len(payload)
+        assert photo.read() == payload
+        assert form.files == [photo]
+
+    @pytest.mark.parametrize("read_size", [1, 2, 3, 7, 16])
+    def test_boundaries_split_across_reads(self, read_size):
+        body = encode_parts(
+            [("a", "1\r\n--not-the-boundary", None), ("file", b"\r\n--formboundary4\r\n", "f.bin")],
+            preamble=b"ignored preamble\r\n",
+            epilogue=b"ignored epilogue",
+        )
+
+        form = parse(body, read_size=read_size)
+
+        assert form["a"] == "1\r\n--not-the-boundary"
+        assert form["file"].read() == b"\r\n--formboundary4\r\n"
+
+    def test_iter_yields_parts_in_order(self):
+        body = encode_parts([("a", "1", None), ("b", b"data", "b.txt")])
+
+        parts = list(iter_multipart(io.BytesIO(body), BOUNDARY.encode()))
+
+        assert [type(part) for part in parts] == [FormField, UploadFile]
+        assert [part.name for part in parts] == ["a", "b"]
+
+    def test_file_sink(self):
+        written = {}
+
+        class Sink(io.BytesIO):
+            def __init__(self, upload):
+                super().__init__()
+                self.upload = upload
+
+            def close(self):
+                written[self.upload.filename] = self.getvalue()
+                super().close()
+
+        form = parse(encode_parts([("doc", b"x" * 1000, "doc.txt")]), file_sink=Sink, read_size=64)
+
+        assert written == {"doc.txt": b"x" * 1000}
+        assert form["doc"].file is None
+        assert form["doc"].size == 1000
+
+    @pytest.mark.parametrize("abortable", [False, True])
+    def test_file_sink_released_on_truncated_body(self, abortable):
+        sinks = []
+
+        class Sink(io.BytesIO):
+            def __init__(self, upload):
+                super().__init__()
+                self.aborted = False
+                sinks.append(self)
+
+        class AbortableSink(Sink):
+            def abort(self):
+                self.aborted = True
+
+        body = encode_parts([("doc", b"x" * 1000, "doc.txt")])[:500]
+        with pytest.raises(MultipartError):
+            parse(body, file_sink=AbortableSink if abortable else Sink, read_size=64)
+
+        assert len(sinks) == 1
+        assert sinks[0].aborted is abortable
+        assert sinks[0].closed is not abortable
+
+    def test_too_many_parts(self):
+        with pytest.raises(RequestEntityTooLarge):
+            parse(encode_parts([("a", "1", None)] * 3), max_parts=2)
+
+    def test_part_size_limits(self):
+        with pytest.raises(RequestEntityTooLarge):
+            parse(encode_parts([("f", b"x" * 100, "f.bin")]), max_part_size=99)
+        with pytest.raises(RequestEntityTooLarge):
+            parse(encode_parts([("a", "x" * 100, None)]), max_field_size=99)
+
+    @pytest.mark.parametrize("body", [
+        b"no boundary here",
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"a\"\r\n\r\ntruncated".encode(),
+        f"--{BOUNDARY}\r\nContent-Type: text/plain\r\n\r\nvalue\r\n--{BOUNDARY}--".encode(),
+    ])
+    def test_malformed_bodies(self, body):
+        with pytest.raises(MultipartError):
+            parse(body)
+
+    def test_missing_boundary_parameter(self):
+        with pytest.raises(MultipartError):
+            parse_multipart(io.BytesIO(b""), "multipart/form-data")
+
+    def test_invalid_config(self):
+        app = RestApplication()
+
+        with pytest.raises(ValueError):
+            app.configure_multipart(max_parts=0)
+        with pytest.raises(ValueError):
+            app.configure_multipart(max_part_size=-1)
+
+
+def create_upload_app():
+    app = RestApplication()
+    app.configure_multipart(max_parts=4)
+
+    @app.post("/upload")
+    def upload(multipart_body):
+        return {
+            "fields": {name: value for name, value in multipart_body.items() if isinstance(value, str)},
+            "files": {upload.name: [upload.filename, upload.size] for upload in multipart_body.files},
+        }
+
+    return app
+
+
+class TestMultipartBody(MultiDriverTestBase):
+    """The multipart_body dependency on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_upload_app()
+
+    def post(self, api_client, body, content_type=CONTENT_TYPE):
+        return api_client.execute(
+            api_client.post("/upload")
+            .with_text_body(body.decode("latin-1"))
+            .with_header("Content-Type", content_type)
+            .accepts("application/json")
+        )
+
+    def test_upload(self, api):
+        api_client, driver_name = api
+
+        response = self.post(api_client, encode_parts([("title", "Report", None), ("report", "a,b\n1,2\n", "r.csv")]))
+
+        assert api_client.expect_successful_creation(response) == {
+            "fields": {"title": "Report"},
+            "files": {"report": ["r.csv", 8]},
+        }
+
+    def test_too_many_parts(self, api):
+        api_client, driver_name = api
+
+        response = self.post(api_client, encode_parts([("a", "1", None)] * 5))
+
+        assert response.status_code == 413
+
+    def test_malformed_body(self, api):
+        api_client, driver_name = api
+
+        response = self.post(api_client, b"not multipart", content_type="multipart/form-data")
+
+        assert response.status_code == 422
+
+
+class TestAsgiMultipartStreaming:
+    """Uploads are parsed while the body is still arriving."""
+
+    async def test_large_upload_in_many_messages(self):
+        adapter = ASGIAdapter(create_upload_app(), enable_metrics=False, body_high_water=4096)
+        body = encode_parts([("title", "big", None), ("blob", b"z" * 200_000, "blob.bin")])
+        chunks = [body[i:i + 1000] for i in range(0, len(body), 1000)]
+        sent = []
+        done = asyncio.Event()
+        index = [0]
+
+        async def receive():
+            if index[0] < len(chunks):
+                index[0] += 1
+                return {"type": "http.request", "body": chunks[index[0] - 1], "more_body": index[0] < len(chunks)}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body":
+                done.set()
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/upload",
+            "scheme": "http",
+            "headers": [[b"content-type", CONTENT_TYPE.encode()]],
+            "query_string": b"",
+        }
+        await asyncio.wait_for(adapter(scope, receive, send), timeout=5)
+
+        assert sent[0]["status"] == 200
+        assert json.loads(sent[1]["body"])["files"] == {"blob": ["blob.bin", 200_000]}
@@ -0,0 +1,173 @@
+"""Tests for on-demand per-request profiling."""
+
+import json
+import pstats
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.profiling import PROFILE_HEADER, PROFILE_ID_HEADER, RequestProfiler
+
+TOKEN = "s3cret"
+
+
+def create_app(**profiling_kwargs):
+    app = RestApplication()
+    profiler = app.enable_profiling(**profiling_kwargs)
+
+    @app.get("/users/{user_id}")
+    def get_user(user_id: str):
+        return {"id": user_id}
+
+    return app, profiler
+
+
+def get_request(path, headers=None):
+    return Request(method=HTTPMethod.GET, path=path, headers={"Accept": "application/json", **(headers or {})})
+
+
+class TestProfilingTriggers:
+    """Tests for deciding which requests are profiled."""
+
+    def test_profiling_disabled_by_default(self):
+        app = RestApplication()
+
+        assert app._profiler is None
+
+    def test_header_with_token_profiles_request(self):
+        app, profiler = create_app(token=TOKEN)
+
+        response = app.execute(get_request("/users/1", {PROFILE_HEADER: TOKEN}))
+
+        assert response.status_code == 200
+        record = profiler.records()[0]
+        assert response.headers[PROFILE_ID_HEADER] == str(record.profile_id)
+        assert record.route == "/users/{user_id}"
+        assert record.path == "/users/1"
+        assert record.status == 200
+        assert record.trigger == "header"
+        assert record.duration_ms > 0
+
+    @pytest.mark.parametrize("headers", [{}, {PROFILE_HEADER: "wrong"}])
+    def test_requests_without_token_are_not_profiled(self, headers):
+        app, profiler = create_app(token=TOKEN)
+
+        response = app.execute(get_request("/users/1", headers))
+
+        assert profiler.records() == []
+        assert PROFILE_ID_HEADER not in response.headers
+
+    def test_header_ignored_without_token(self):
+        app, profiler = create_app()
+
+        app.execute(get_request("/users/1", {PROFILE_HEADER: "anything"}))
+
+        assert profiler.records() == []
+
+    def test_sampled_requests_are_profiled(self):
+        app, profiler = create_app(sample_rate=1.0)
+
+        response = app.execute(get_request("/users/1"))
+
+        assert profiler.records()[0].trigger == "sampled"
+        assert PROFILE_ID_HEADER not in response.headers
+
+    @pytest.mark.parametrize("kwargs", [{"sample_rate": 1.5}, {"capacity": 0}, {"token": ""}])
+    def test_invalid_configuration(self, kwargs):
+        with pytest.raises(ValueError):
+            RequestProfiler(**kwargs)
+
+    def test_admin_path_requires_token(self):
+        with pytest.raises(ValueError):
+            RestApplication().enable_profiling(admin_path="/_profiles")
+
+
+class TestProfileStorage:
+    """Tests for the profile ring buffer."""
+
+    def test_ring_buffer_keeps_latest_profiles(self):
+        app, profiler = create_app(sample_rate=1.0, capacity=2)
+
+        for user_id in range(3):
+            app.execute(get_request(f"/users/{user_id}"))
+
+        assert [record.path for record in profiler.records()] == ["/users/1", "/users/2"]
+        assert profiler.get(1) is None
+
+    def test_format_and_aggregate(self):
+        app, profiler = create_app(sample_rate=1.0)
+        app.execute(get_request("/users/1"))
+        app.execute(get_request("/users/2"))
+
+        assert "process_request" in profiler.format_stats(profile_id=1)
+        assert "process_request" in profiler.format_stats(route="/users/{user_id}")
+        assert profiler.format_stats(route="/other") == ""
+
+    def test_dump_writes_prof_file(self, tmp_path):
+        app, profiler = create_app(sample_rate=1.0)
+        app.execute(get_request("/users/1"))
+        path = tmp_path / "request.prof"
+
+        assert profiler.dump(str(path), profile_id=1)
+        assert pstats.Stats(str(path)).total_calls > 0
+        assert not profiler.dump(str(path), profile_id=99)
+
+    def test_overlapping_profiles_are_skipped(self):
+        profiler = RequestProfiler(sample_rate=1.0)
+
+        # Simulate another request being profiled on a different thread
+        with profiler._active_lock:
+            result, stats, _ = profiler.run(lambda: "done")
+
+        assert result == "done"
+        assert stats is None
+        assert profiler.skipped == 1
+
+
+class TestProfilingAdminRoutes:
+    """Tests for the admin routes that expose stored profiles."""
+
+    def test_list_and_view_profiles(self):
+        app, profiler = create_app(token=TOKEN, admin_path="/_profiles")
+        app.execute(get_request("/users/1", {PROFILE_HEADER: TOKEN}))
+
+        response = app.execute(get_request("/_profiles", {PROFILE_HEADER: TOKEN}))
+        profiles = json.loads(response.body)["profiles"]
+        assert [profile["path"] for profile in profiles] == ["/users/1"]
+
+        response = app.execute(get_request("/_profiles/1", {PROFILE_HEADER: TOKEN, "Accept": "text/plain"}))
+        assert response.status_code == 200
+        assert "process_request" in response.body
+
+        response = app.execute(get_request("/_profiles/aggregate", {PROFILE_HEADER: TOKEN, "Accept": "text/plain"}))
+        assert response.status_code == 200
+
+        # Admin requests carry the token but are not profiled themselves
+        assert len(profiler.records()) == 1
+
+    def test_admin_routes_require_token(self):
+        app, _ = create_app(token=TOKEN, admin_path="/_profiles")
+
+        first = app.execute(get_request("/_profiles"))
+        second = app.execute(get_request("/_profiles/1", {PROFILE_HEADER: "wrong"}))
+
+        assert (first.status_code, second.status_code) == (403, 403)
+        # Each request gets its own response, so per-request headers can't leak between them
+        assert first is not second and first.headers is not second.headers
+
+    def test_only_admin_paths_are_excluded(self):
+        app, profiler = create_app(token=TOKEN, admin_path="/_profiles")
+
+        @app.get("/_profilesX")
+        def lookalike():
+            return {}
+
+        app.execute(get_request("/_profiles/1", {PROFILE_HEADER: TOKEN}))
+        app.execute(get_request("/_profilesX", {PROFILE_HEADER: TOKEN}))
+
+        assert [record.path for record in profiler.records()] == ["/_profilesX"]
+
+    def test_unknown_profile(self):
+        app, _ = create_app(token=TOKEN, admin_path="/_profiles")
+
+        assert app.execute(get_request("/_profiles/42", {PROFILE_HEADER: TOKEN})).status_code == 404
@@ -0,0 +1,132 @@
+"""
+Tests for query parameters with repeated names and lazily decoded request data.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.models import MultiValueHeaders, QueryParams
+from tests.framework import MultiDriverTestBase
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def create_search_app():
+    app = RestApplication()
+
+    @app.get("/search")
+    def search(query_params):
+        return {"q": query_params.get("q"), "tags": query_params.getlist("tag")}
+
+    return app
+
+
+class TestQueryParams:
+    """Tests for the QueryParams multi-dict."""
+
+    def test_repeated_names(self):
+        params = QueryParams.from_query_string(b"tag=a&page=2&tag=b&tag=c")
+
+        assert params["tag"] == "a"
+        assert params.getlist("tag") == ["a", "b", "c"]
+        assert params.getlist("page") == ["2"]
+        assert params.getlist("missing") == []
+        assert params == {"tag": "a", "page": "2"}
+        assert params.multi_items() == [("tag", "a"), ("tag", "b"), ("tag", "c"), ("page", "2")]
+
+    def test_decoding(self):
+        params = QueryParams.from_query_string("name=J%C3%BCrgen&empty=&plus=a+b")
+
+        assert params == {"name": "Jürgen", "plus": "a b"}
+
+    def test_assignment_replaces_all_values(self):
+        params = QueryParams({"tag": ["a", "b"]})
+
+        params["tag"] = "c"
+        params.update(page="1")
+
+        assert params.getlist("tag") == ["c"]
+        assert params.copy().multi_items() == [("tag", "c"), ("page", "1")]
+        assert json.dumps(params) == '{"tag": "c", "page": "1"}'
+
+
+class TestLazyRequest:
+    """Tests for request data decoded on first access."""
+
+    def test_query_string_parsed_on_first_access(self):
+        request = Request(method=HTTPMethod.GET, path="/", query_string=b"a=1&a=2")
+
+        assert request._query_params is None
+        assert request.query_params.getlist("a") == ["1", "2"]
+        assert request.query_params is request.query_params
+
+    def test_query_params_assignment(self):
+        request = Request(method=HTTPMethod.GET, path="/", query_string=b"a=1")
+
+        request.query_params = {"b": "2"}
+
+        assert isinstance(request.query_params, QueryParams)
+        assert request.query_params == {"b": "2"}
+
+    def test_no_query_string(self):
+        assert Request(method=HTTPMethod.GET, path="/").query_params is None
+        assert Request(method=HTTPMethod.GET, path="/", query_string=b"").query_params == {}
+
+    def test_asgi_headers_decoded_on_first_access(self):
+        raw = [(b"Accept", b"text/html"), (b"x-tag", b"a"), (b"x-tag", b"b")]
+        headers = MultiValueHeaders.from_asgi(raw)
+
+        assert headers._raw is raw
+        assert headers.get("accept") == "text/html"
+        assert headers.get_all("X-Tag") == ["a", "b"]
+        assert not hasattr(headers, "_raw")
+
+
+class TestQueryParamsAcrossDrivers(MultiDriverTestBase):
+    """The query_params dependency on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_search_app()
+
+    def test_single_values(self, api):
+        api_client, driver_name = api
+
+        response = api_client.search_resources("/search", {"q": "shoes", "tag": "red"})
+
+        assert api_client.expect_successful_retrieval(response) == {"q": "shoes", "tags": ["red"]}
+
+
+class TestAsgiQueryParams:
+    """Repeated query parameters through the ASGI adapter."""
+
+    async def test_repeated_names(self):
+        adapter = ASGIAdapter(create_search_app(), enable_metrics=False)
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/search",
+            "scheme": "http",
+            "headers": [[b"accept", b"application/json"]],
+            "query_string": b"q=shoes&tag=red&tag=blue",
+        }
+        await asyncio.wait_for(adapter(scope, receive, send), timeout=5)
+
+        assert sent[0]["status"] == 200
+        assert json.loads(sent[1]["body"]) == {"q": "shoes", "tags": ["red", "blue"]}
@@ -0,0 +1,226 @@
+"""
+Tests for token-bucket rate limiting.
+"""
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.rate_limit import InMemoryRateLimitStore, RateLimitConfig
+from tests.framework import MultiDriverTestBase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestInMemoryRateLimitStore:
+    """Tests for the in-process token bucket store."""
+
+    def test_bucket_empties_and_refills(self):
+        clock = FakeClock()
+        store = InMemoryRateLimitStore(clock=clock)
+
+        assert store.consume("a", rate=1.0, capacity=2).remaining == 1
+        assert store.consume("a", rate=1.0, capacity=2).remaining == 0
+        rejected = store.consume("a", rate=1.0, capacity=2)
+        assert not rejected.allowed
+        assert rejected.retry_after == pytest.approx(1.0)
+        assert rejected.reset_after == pytest.approx(2.0)
+
+        clock.now = 1.5
+        assert store.consume("a", rate=1.0, capacity=2).allowed
+        assert not store.consume("a", rate=1.0, capacity=2).allowed
+
+    def test_buckets_never_exceed_capacity(self):
+        clock = FakeClock()
+        store = InMemoryRateLimitStore(clock=clock)
+        store.consume("a", rate=1.0, capacity=2)
+
+        clock.now = 100.0
+
+        assert store.consume("a", rate=1.0, capacity=2).remaining == 1
+
+    def test_least_recently_used_keys_are_evicted(self):
+        store = InMemoryRateLimitStore(max_keys=2)
+        store.consume("a", rate=1.0, capacity=1)
+        store.consume("b", rate=1.0, capacity=1)
+        store.consume("a", rate=1.0, capacity=1)
+
+        store.consume("c", rate=1.0, capacity=1)
+
+        assert len(store) == 2
+        assert set(store._buckets) == {"a", "c"}
+
+    def test_invalid_max_keys(self):
+        with pytest.raises(ValueError):
+            InMemoryRateLimitStore(max_keys=0)
+
+
+class TestRateLimitConfig:
+    """Tests for RateLimitConfig validation, keys and headers."""
+
+    @pytest.mark.parametrize("settings", [
+        {"limit": 0},
+        {"limit": 1.5},
+        {"limit": 10, "period": 0},
+        {"limit": 10, "burst": 0},
+        {"limit": 10, "key": "user"},
+        {"limit": 10, "key": ()},
+    ])
+    def test_invalid_settings(self, settings):
+        with pytest.raises(ValueError):
+            RateLimitConfig(**settings).validate()
+
+    def test_composite_key(self):
+        config = RateLimitConfig(limit=10, key=("api_key", "ip", "route"))
+        request = Request(
+            method=HTTPMethod.GET, path="/items/1", headers={"X-API-Key": "k1"}, client_ip="10.0.0.1"
+        )
+
+        assert config.key_for(request, None) == "k1|10.0.0.1|/items/1"
+        assert config.key_for(Request(method=HTTPMethod.GET, path="/"), None) == "-|-|/"
+
+    def test_headers(self):
+        config = RateLimitConfig(limit=10, period=60, burst=5)
+        request = Request(method=HTTPMethod.GET, path="/", client_ip="10.0.0.1")
+
+        headers = config.headers(config.check(request, None))
+
+        assert headers == {
+            "RateLimit-Limit": "5",
+            "RateLimit-Remaining": "4",
+            "RateLimit-Reset": "6",
+            "RateLimit-Policy": "5;w=60",
+        }
+
+    def test_invalid_decorator_arguments(self):
+        with pytest.raises(ValueError, match="limit"):
+            RestApplication().rate_limit(-1)
+
+
+def create_app():
+    app = RestApplication()
+    app.enable_rate_limit(2, period=60, key="api_key")
+
+    @app.get("/items")
+    def list_items():
+        return {"items": []}
+
+    @app.get("/health")
+    @app.rate_limit(None)
+    def health():
+        return {"status": "ok"}
+
+    @app.post("/login")
+    @app.rate_limit(1, period=300, key="api_key")
+    def login():
+        return {"token": "abc"}
+
+    @app.get("/search")
+    @app.rate_limit(1, period=60, key="api_key", send_headers=False)
+    def search():
+        return {"results": []}
+
+    return app
+
+
+class TestRateLimiting(MultiDriverTestBase):
+    """Requests over the limit are rejected with 429 on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_app()
+
+    def request(self, api_client, method, path, client):
+        return api_client.execute(
+            getattr(api_client, method)(path).with_header("X-API-Key", client).accepts("application/json")
+        )
+
+    def test_rejected_over_limit(self, api):
+        api_client, driver_name = api
+        client = f"{driver_name}-items"
+
+        first = self.request(api_client, "get", "/items", client)
+        second = self.request(api_client, "get", "/items", client)
+        rejected = self.request(api_client, "get", "/items", client)
+        other_client = self.request(api_client, "get", "/items", f"{client}-other")
+
+        assert api_client.expect_successful_retrieval(first) == {"items": []}
+        assert first.get_header("RateLimit-Limit") == "2"
+        assert first.get_header("RateLimit-Remaining") == "1"
+        assert first.get_header("RateLimit-Policy") == "2;w=60"
+        assert second.get_header("RateLimit-Remaining") == "0"
+        assert rejected.status_code == 429
+        assert rejected.get_header("Retry-After") == "30"
+        assert rejected.get_header("RateLimit-Remaining") == "0"
+        assert other_client.status_code == 200
+
+    def test_exempt_route(self, api):
+        api_client, driver_name = api
+        client = f"{driver_name}-health"
+
+        responses = [self.request(api_client, "get", "/health", client) for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert responses[0].get_header("RateLimit-Limit") is None
+
+    def test_route_limit_overrides_app_limit(self, api):
+        api_client, driver_name = api
+        client = f"{driver_name}-login"
+
+        first = self.request(api_client, "post", "/login", client)
+        rejected = self.request(api_client, "post", "/login", client)
+
+        assert first.status_code == 200
+        assert first.get_header("RateLimit-Policy") == "1;w=300"
+        assert rejected.status_code == 429
+        assert rejected.get_header("Retry-After") == "300"
+
+    def test_headers_only_on_rejection(self, api):
+        api_client, driver_name = api
+        client = f"{driver_name}-search"
+
+        first = self.request(api_client, "get", "/search", client)
+        rejected = self.request(api_client, "get", "/search", client)
+
+        assert first.status_code == 200
+        assert first.get_header("RateLimit-Limit") is None
+        assert rejected.status_code == 429
+        assert rejected.get_header("RateLimit-Limit") == "1"
+
+
+class TestClientIp:
+    """The "ip" key uses the client address reported by the server."""
+
+    @pytest.mark.anyio
+    async def test_asgi_client_address(self):
+        from restmachine.adapters import ASGIAdapter
+
+        app = RestApplication()
+
+        @app.get("/ip")
+        def client_ip(request):
+            return request.client_ip
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/ip",
+            "headers": [[b"accept", b"text/plain"]],
+            "query_string": b"",
+            "client": ("203.0.113.7", 50000),
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await ASGIAdapter(app)(scope, receive, send)
+
+        assert sent[1]["body"] == b"203.0.113.7"
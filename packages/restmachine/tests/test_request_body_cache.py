@@ -0,0 +1,152 @@
+"""
+Tests for the parse-once request body cache shared by the body dependencies.
+"""
+
+import asyncio
+import io
+import json
+from typing import List
+
+import pytest
+from pydantic import BaseModel, TypeAdapter
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.request_body import RequestBodyCache
+from restmachine.streaming import BytesStreamBuffer
+from tests.framework import MultiDriverTestBase
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO that counts full reads."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            self.reads += 1
+        return super().read(size)
+
+
+class TestRequestBodyCache:
+    """Tests for RequestBodyCache."""
+
+    def test_stream_read_once_and_rewound(self):
+        stream = CountingStream(b'{"a": [1, 2]}')
+        cache = RequestBodyCache(stream, "application/json")
+
+        assert cache.text() == '{"a": [1, 2]}'
+        assert cache.json() is cache.json()
+        assert cache.raw() == b'{"a": [1, 2]}'
+        assert stream.reads == 1
+        # Parsers that read the stream directly still see the whole body
+        assert stream.read() == b'{"a": [1, 2]}'
+
+    def test_charset_from_content_type(self):
+        cache = RequestBodyCache(io.BytesIO("café".encode("latin-1")), "text/plain; charset=ISO-8859-1")
+
+        assert cache.text() == "café"
+        assert cache.encoding == "ISO-8859-1"
+
+    def test_charset_fallbacks(self):
+        unknown = RequestBodyCache(io.BytesIO("café".encode()), 'text/plain; charset="x-unknown"')
+        invalid_utf8 = RequestBodyCache(io.BytesIO(b"caf\xe9"), "text/plain")
+
+        assert (unknown.text(), unknown.encoding) == ("café", "utf-8")
+        assert (invalid_utf8.text(), invalid_utf8.encoding) == ("café", "latin1")
+
+    def test_form_and_custom_representations(self):
+        cache = RequestBodyCache(b"tag=a&tag=b&name=x")
+        calls = []
+
+        def count_pairs(text):
+            calls.append(text)
+            return text.count("&") + 1
+
+        assert cache.form() == {"tag": ["a", "b"], "name": "x"}
+        assert cache.parse("pairs", count_pairs) == 3
+        assert cache.parse("pairs", count_pairs) == 3
+        assert len(calls) == 1
+
+    def test_validate_json(self):
+        adapter = TypeAdapter(ItemList)
+        stream = CountingStream('{"items": [{"name": "é"}]}'.encode())
+        utf8 = RequestBodyCache(stream, "application/json")
+        latin1 = RequestBodyCache(
+            io.BytesIO('{"items": [{"name": "é"}]}'.encode("latin-1")), "application/json; charset=latin-1"
+        )
+
+        assert utf8.validate_json(adapter) is utf8.validate_json(adapter)
+        assert utf8.validate_json(adapter).items[0].name == "é"
+        assert stream.reads == 1
+        assert latin1.validate_json(adapter).items[0].name == "é"
+
+    @pytest.mark.anyio
+    async def test_large_streamed_body(self):
+        data = json.dumps({"data": "x" * (2 * 1024 * 1024)}).encode()
+        stream = BytesStreamBuffer(spool_threshold=64 * 1024, high_water=64 * 1024)
+        cache = RequestBodyCache(stream, "application/json")
+        parsed = asyncio.get_running_loop().run_in_executor(None, cache.json)
+
+        for i in range(0, len(data), 16 * 1024):
+            await stream.wait_for_space()
+            stream.write(data[i:i + 16 * 1024])
+        stream.close_writing()
+
+        assert len((await asyncio.wait_for(parsed, timeout=5))["data"]) == 2 * 1024 * 1024
+        assert stream.spilled
+
+    def test_request_body_assignment_resets_cache(self):
+        request = Request(method=HTTPMethod.POST, path="/", body=io.BytesIO(b"old"))
+        first = request.body_cache
+
+        request.body = io.BytesIO(b"new")
+
+        assert first.text() == "old"
+        assert request.body_cache is not first
+        assert request.body_cache.text() == "new"
+        assert Request(method=HTTPMethod.GET, path="/").body_cache is None
+
+
+class Item(BaseModel):
+    name: str
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+
+
+def create_app():
+    app = RestApplication()
+
+    @app.validates
+    def item_list(json_body) -> ItemList:
+        return ItemList.model_validate(json_body)
+
+    @app.post("/items")
+    def create_items(json_body, body, item_list):
+        return {"count": len(json_body["items"]), "names": [item.name for item in item_list.items], "chars": len(body)}
+
+    return app
+
+
+class TestSharedBodyParsing(MultiDriverTestBase):
+    """Body dependencies share one read of the body on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_app()
+
+    def test_dependencies_share_parsed_body(self, api):
+        api_client, driver_name = api
+        payload = {"items": [{"name": "ünïcode"}, {"name": "plain"}]}
+
+        response = api_client.execute(
+            api_client.post("/items").with_json_body(payload).accepts("application/json")
+        )
+
+        assert api_client.expect_successful_creation(response) == {
+            "count": 2,
+            "names": ["ünïcode", "plain"],
+            "chars": len(json.dumps(payload)),
+        }
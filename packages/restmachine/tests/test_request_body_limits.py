@@ -0,0 +1,203 @@
+"""
+Tests for request body size limits and spooling large bodies to disk.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication, Router
+from restmachine.adapters import ASGIAdapter
+from restmachine.exceptions import RequestEntityTooLarge
+from restmachine.streaming import BytesStreamBuffer
+from tests.framework import MultiDriverTestBase
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def create_limited_app():
+    app = RestApplication()
+    app.set_max_body_size(16)
+
+    @app.post("/notes")
+    def create_note(text_body):
+        return {"length": len(text_body)}
+
+    @app.post("/uploads")
+    @app.max_body_size(1024)
+    def upload(text_body):
+        return {"length": len(text_body)}
+
+    return app
+
+
+class TestBodyBuffer:
+    """Tests for the spooled BytesStreamBuffer."""
+
+    def test_small_body_stays_in_memory(self):
+        buffer = BytesStreamBuffer(spool_threshold=8)
+        buffer.write(b"hello")
+        buffer.close_writing()
+
+        assert not buffer.spilled
+        assert buffer.size == 5
+        assert buffer.read() == b"hello"
+
+    def test_large_body_spills_to_disk(self):
+        buffer = BytesStreamBuffer(spool_threshold=8)
+        for _ in range(4):
+            buffer.write(b"0123456789")
+        buffer.close_writing()
+
+        assert buffer.spilled
+        assert buffer.size == 40
+        assert buffer.read(10) == b"0123456789"
+        assert buffer.getvalue() == b"0123456789" * 4
+
+    def test_max_size_aborts_writing(self):
+        buffer = BytesStreamBuffer(max_size=8)
+        buffer.write(b"12345")
+        buffer.write(b"67890")
+        buffer.write(b"more")
+
+        assert buffer.writing_finished
+        with pytest.raises(RequestEntityTooLarge) as exc_info:
+            buffer.read()
+        assert exc_info.value.limit == 8
+
+    def test_invalid_limits(self):
+        app = RestApplication()
+        router = Router()
+
+        for limit in [0, -1, True, "10"]:
+            with pytest.raises(ValueError):
+                app.set_max_body_size(limit)
+        with pytest.raises(ValueError):
+            router.max_body_size(None)
+        with pytest.raises(ValueError):
+            ASGIAdapter(app, body_spool_threshold=0)
+
+
+class TestBodyLimits(MultiDriverTestBase):
+    """App and route body limits return 413 on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_limited_app()
+
+    def test_body_within_app_limit(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.post("/notes").with_text_body("short"))
+
+        assert api_client.expect_successful_creation(response) == {"length": 5}
+
+    def test_body_over_app_limit(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.post("/notes").with_text_body("x" * 17))
+
+        assert response.status_code == 413
+
+    def test_route_limit_overrides_app_limit(self, api):
+        api_client, driver_name = api
+
+        allowed = api_client.execute(api_client.post("/uploads").with_text_body("x" * 1000))
+        rejected = api_client.execute(api_client.post("/uploads").with_text_body("x" * 1025))
+
+        assert api_client.expect_successful_creation(allowed) == {"length": 1000}
+        assert rejected.status_code == 413
+
+
+class TestMountedBodyLimits:
+    """Route limits survive mounting a router."""
+
+    def test_mounted_route_keeps_limit(self):
+        router = Router()
+
+        @router.post("/files")
+        @router.max_body_size(4)
+        def upload(text_body):
+            return {"length": len(text_body)}
+
+        app = RestApplication()
+        app.mount("/api", router)
+
+        response = app.execute(Request(
+            method=HTTPMethod.POST,
+            path="/api/files",
+            headers={"Content-Type": "text/plain", "Content-Length": "10"},
+        ))
+
+        assert response.status_code == 413
+
+
+def make_scope(path, headers):
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "scheme": "http",
+        "headers": [[b"content-type", b"text/plain"]] + headers,
+        "query_string": b"",
+    }
+
+
+async def call(adapter, path, chunks, headers=()):
+    """Send a chunked body and record how many body messages were received."""
+    sent = []
+    received = [0]
+    done = asyncio.Event()
+
+    async def receive():
+        if received[0] < len(chunks):
+            received[0] += 1
+            return {
+                "type": "http.request",
+                "body": chunks[received[0] - 1],
+                "more_body": received[0] < len(chunks),
+            }
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+
+    await adapter(make_scope(path, list(headers)), receive, send)
+    return sent, received[0]
+
+
+class TestAsgiBodyLimits:
+    """Tests for early rejection of large bodies in the ASGI adapter."""
+
+    async def test_declared_length_rejected_without_receiving(self):
+        adapter = ASGIAdapter(create_limited_app(), enable_metrics=False)
+
+        sent, received = await call(adapter, "/notes", [b"x" * 10] * 10, [[b"content-length", b"100"]])
+
+        assert sent[0]["status"] == 413
+        # At most one message, read by the disconnect watcher rather than the body
+        assert received <= 1
+
+    async def test_chunked_body_stops_at_limit(self):
+        adapter = ASGIAdapter(create_limited_app(), enable_metrics=False)
+
+        sent, received = await call(adapter, "/notes", [b"x" * 10] * 10)
+
+        assert sent[0]["status"] == 413
+        assert received < 10
+
+    async def test_large_body_spooled(self):
+        adapter = ASGIAdapter(create_limited_app(), enable_metrics=False, body_spool_threshold=64)
+
+        sent, received = await call(adapter, "/uploads", [b"x" * 100] * 5)
+
+        assert sent[0]["status"] == 200
+        assert json.loads(sent[1]["body"]) == {"length": 500}
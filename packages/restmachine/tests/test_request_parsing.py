@@ -478,6 +478,8 @@ class TestParserErrorHandling(MultiDriverTestBase):
 class TestBasicContentHandling(MultiDriverTestBase):
     """Test basic content type parsing and handling across all drivers."""
 
+    ENABLED_DRIVERS = ['direct', 'asgi']
+
     def create_app(self) -> RestApplication:
         """Create app with basic content type handling."""
         app = RestApplication()
@@ -0,0 +1,165 @@
+"""
+Streaming content renderer tests.
+
+Tests for StreamingJSONRenderer, NDJSONRenderer and CSVRenderer: Accept
+negotiation, incremental encoding of iterables, and rendering of single values.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from restmachine import (
+    CSVRenderer,
+    HTTPMethod,
+    NDJSONRenderer,
+    Request,
+    RestApplication,
+    StreamingJSONRenderer,
+)
+from restmachine.streaming import is_iterator_body
+from tests.framework import MultiDriverTestBase
+
+
+def users(count):
+    for i in range(count):
+        yield {"id": i, "name": f"user-{i}"}
+
+
+def create_streaming_app():
+    app = RestApplication()
+    app.add_content_renderer(StreamingJSONRenderer(chunk_size=16))
+    app.add_content_renderer(NDJSONRenderer())
+    app.add_content_renderer(CSVRenderer())
+
+    @app.get("/users")
+    def list_users():
+        return users(3)
+
+    @app.get("/users/list")
+    def list_users_eagerly():
+        return list(users(2))
+
+    @app.get("/users/none")
+    def no_users():
+        return iter([])
+
+    @app.get("/user")
+    def get_user():
+        return {"id": 1, "name": "user-1"}
+
+    return app
+
+
+class TestStreamingRenderers(MultiDriverTestBase):
+    """Streaming renderers take part in content negotiation on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_streaming_app()
+
+    def test_json_array(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.get("/users").accepts("application/json"))
+
+        assert api_client.expect_successful_retrieval(response) == list(users(3))
+        assert "Content-Length" not in response.headers
+
+    def test_empty_json_array(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.get("/users/none").accepts("application/json"))
+
+        assert api_client.expect_successful_retrieval(response) == []
+
+    def test_ndjson(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.get("/users").accepts("application/x-ndjson"))
+
+        assert response.status_code == 200
+        assert response.content_type == "application/x-ndjson"
+        assert [json.loads(line) for line in response.body.splitlines()] == list(users(3))
+
+    def test_csv(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.get("/users/list").accepts("text/csv"))
+
+        assert response.status_code == 200
+        assert response.content_type == "text/csv"
+        assert list(csv.DictReader(io.StringIO(response.body))) == [
+            {"id": "0", "name": "user-0"},
+            {"id": "1", "name": "user-1"},
+        ]
+
+    def test_single_value_json_matches_buffered_renderer(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.get("/user").accepts("application/json"))
+
+        assert api_client.expect_successful_retrieval(response) == {"id": 1, "name": "user-1"}
+        assert response.headers.get("Content-Length") is not None
+
+    def test_unregistered_type_not_acceptable(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(api_client.get("/users").accepts("application/xml"))
+
+        assert response.status_code == 406
+
+
+class TestStreamingRendererEncoding:
+    """Tests for chunking and item encoding."""
+
+    def render(self, renderer, data):
+        request = Request(method=HTTPMethod.GET, path="/", headers={})
+        return renderer.render(data, request)
+
+    def test_chunks_are_bounded(self):
+        chunks = list(self.render(NDJSONRenderer(chunk_size=64), users(100)))
+
+        assert len(chunks) > 10
+        assert all(len(chunk) < 64 + 32 for chunk in chunks)
+        assert "".join(chunks).count("\n") == 100
+
+    def test_generator_consumed_lazily(self):
+        consumed = []
+
+        def rows():
+            for row in users(3):
+                consumed.append(row["id"])
+                yield row
+
+        chunks = self.render(StreamingJSONRenderer(chunk_size=1), rows())
+
+        assert is_iterator_body(chunks)
+        assert consumed == []
+        next(chunks)
+        assert consumed == [0]
+
+    def test_csv_fieldnames_and_sequences(self):
+        renderer = CSVRenderer(fieldnames=["name", "email"])
+
+        body = "".join(self.render(renderer, [{"name": "a", "id": 1}]))
+        rows = "".join(self.render(CSVRenderer(delimiter=";"), [("a", 1), ("b", 2)]))
+
+        assert body == "name,email\r\na,\r\n"
+        assert rows == "a;1\r\nb;2\r\n"
+
+    def test_pydantic_items(self):
+        pydantic = pytest.importorskip("pydantic")
+
+        class User(pydantic.BaseModel):
+            id: int
+            name: str
+
+        body = "".join(self.render(StreamingJSONRenderer(), [User(id=1, name="a")]))
+
+        assert json.loads(body) == [{"id": 1, "name": "a"}]
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            NDJSONRenderer(chunk_size=0)
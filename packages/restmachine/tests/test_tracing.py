@@ -0,0 +1,231 @@
+"""Tests for request tracing spans."""
+
+import json
+
+import pytest
+
+from restmachine import HTTPMethod, Request, RestApplication
+from restmachine.adapters import ASGIAdapter
+from restmachine.tracing import (
+    InMemorySpanExporter,
+    SpanContext,
+    SpanKind,
+    StatusCode,
+    Tracer,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+def create_traced_app():
+    """Create an application with an in-memory span exporter."""
+    exporter = InMemorySpanExporter()
+    app = RestApplication()
+    app.set_tracer(Tracer(exporter))
+
+    @app.dependency()
+    def database():
+        return {"1": {"name": "Alice"}}
+
+    @app.get("/users/{user_id}")
+    def get_user(user_id: str, database):
+        return database[user_id]
+
+    @app.get("/broken")
+    def broken():
+        raise RuntimeError("boom")
+
+    return app, exporter
+
+
+def get_request(path, headers=None):
+    return Request(method=HTTPMethod.GET, path=path, headers=headers or {"Accept": "application/json"})
+
+
+class TestTraceparent:
+    """Tests for W3C traceparent parsing."""
+
+    def test_parses_valid_header(self):
+        context = parse_traceparent(TRACEPARENT)
+
+        assert context == SpanContext(TRACE_ID, PARENT_ID, trace_flags=1, is_remote=True)
+        assert context.to_traceparent() == TRACEPARENT
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+    ])
+    def test_rejects_invalid_header(self, value):
+        assert parse_traceparent(value) is None
+
+
+class TestTracer:
+    """Tests for span creation and export."""
+
+    def test_child_span_inherits_trace(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.start_span("parent") as parent:
+            with tracer.start_span("child") as child:
+                assert tracer.current_span() is child
+
+        assert tracer.current_span() is None
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert [span.name for span in exporter.get_finished_spans()] == ["child", "parent"]
+
+    def test_exception_marks_span_as_error(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with pytest.raises(ValueError):
+            with tracer.start_span("failing"):
+                raise ValueError("bad")
+
+        span = exporter.get_finished_spans()[0]
+        assert span.status == StatusCode.ERROR
+        assert span.events[0]["attributes"]["exception.type"] == "ValueError"
+
+    def test_record_span_uses_given_timestamps(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.start_span("parent") as parent:
+            tracer.record_span("earlier", 100, 250)
+
+        span = exporter.get_finished_spans()[0]
+        assert span.name == "earlier"
+        assert span.duration_ns == 150
+        assert span.parent_id == parent.span_id
+
+    def test_clear_exporter(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.start_span("span"):
+            pass
+        exporter.clear()
+
+        assert exporter.get_finished_spans() == []
+
+
+class TestApplicationTracing:
+    """Tests for the span tree emitted by the application."""
+
+    def test_request_span_tree(self):
+        app, exporter = create_traced_app()
+
+        response = app.execute(get_request("/users/1"))
+
+        assert response.status_code == 200
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        root = spans["HTTP GET"]
+        assert root.parent_id is None
+        assert root.kind == SpanKind.SERVER
+        assert root.attributes["http.route"] == "/users/{user_id}"
+        assert root.attributes["http.response.status_code"] == 200
+        assert root.attributes["restmachine.trace_id"] == root.trace_id
+        assert "restmachine.request_id" in root.attributes
+
+        for name in ["state_route_exists", "state_execute_and_render"]:
+            assert spans[name].parent_id == root.span_id
+        assert spans["route.match"].parent_id == spans["state_route_exists"].span_id
+        assert spans["handler"].parent_id == spans["state_execute_and_render"].span_id
+        assert spans["render"].parent_id == spans["state_execute_and_render"].span_id
+        assert spans["dependency.database"].parent_id == spans["handler"].span_id
+        assert all(span.trace_id == root.trace_id for span in spans.values())
+
+    def test_incoming_traceparent_is_propagated(self):
+        app, exporter = create_traced_app()
+
+        app.execute(get_request("/users/1", {"Accept": "application/json", "traceparent": TRACEPARENT}))
+
+        root = next(span for span in exporter.get_finished_spans() if span.name == "HTTP GET")
+        assert root.trace_id == TRACE_ID
+        assert root.parent_id == PARENT_ID
+
+    def test_trace_id_dependency_uses_active_trace(self):
+        app, exporter = create_traced_app()
+
+        @app.get("/trace")
+        def get_trace(trace_id):
+            return {"trace_id": trace_id}
+
+        response = app.execute(get_request("/trace", {"Accept": "application/json", "traceparent": TRACEPARENT}))
+
+        assert json.loads(response.body)["trace_id"] == TRACE_ID
+
+    def test_custom_trace_id_provider_takes_precedence(self):
+        app, exporter = create_traced_app()
+
+        @app.trace_id
+        def custom_trace_id(request):
+            return "custom-trace"
+
+        app.execute(get_request("/users/1"))
+
+        root = next(span for span in exporter.get_finished_spans() if span.name == "HTTP GET")
+        assert root.attributes["restmachine.trace_id"] == "custom-trace"
+
+    def test_handler_error_marks_spans(self):
+        app, exporter = create_traced_app()
+
+        response = app.execute(get_request("/broken"))
+
+        assert response.status_code == 500
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert spans["handler"].status == StatusCode.ERROR
+        assert spans["HTTP GET"].status == StatusCode.ERROR
+
+    def test_tracing_disabled_by_default(self):
+        app = RestApplication()
+
+        @app.get("/")
+        def home():
+            return {"ok": True}
+
+        assert app._tracer is None
+        assert app.execute(get_request("/")).status_code == 200
+
+
+class TestASGITracing:
+    """Tests for adapter spans in the ASGI adapter."""
+
+    @pytest.mark.anyio
+    async def test_asgi_request_includes_parse_and_send_spans(self):
+        app, exporter = create_traced_app()
+        asgi_app = ASGIAdapter(app, enable_metrics=False)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/users/1",
+            "headers": [[b"accept", b"application/json"], [b"traceparent", TRACEPARENT.encode()]],
+            "query_string": b"",
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi_app(scope, receive, send)
+
+        assert sent[0]["status"] == 200
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        root = spans["HTTP GET"]
+        assert root.trace_id == TRACE_ID
+        assert spans["adapter.parse"].parent_id == root.span_id
+        assert spans["adapter.send"].parent_id == root.span_id
+        assert spans["state_route_exists"].parent_id == root.span_id
+        assert root.start_time <= spans["adapter.parse"].start_time
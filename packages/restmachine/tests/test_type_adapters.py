@@ -0,0 +1,173 @@
+"""
+Tests for the compiled Pydantic TypeAdapters used for typed request bodies and return values.
+"""
+
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from restmachine import RestApplication, application
+from restmachine.type_adapters import is_model_annotation, model_type_adapter
+from tests.framework import MultiDriverTestBase, RestApiDsl, RestMachineDriver
+
+
+class Item(BaseModel):
+    name: str = Field(..., min_length=1)
+    quantity: int = 1
+
+
+class Event(BaseModel):
+    title: str
+    day: date
+
+
+class TestModelTypeAdapter:
+    """Tests for model_type_adapter."""
+
+    def test_models_and_lists_of_models(self):
+        assert is_model_annotation(Item)
+        assert is_model_annotation(List[Item])
+        assert is_model_annotation(list[Item])
+        assert not is_model_annotation(dict)
+        assert not is_model_annotation(List[int])
+
+    def test_adapters_are_shared_per_annotation(self):
+        adapter = model_type_adapter(List[Item])
+
+        assert adapter is model_type_adapter(List[Item])
+        assert adapter.validate_json(b'[{"name": "a"}]') == [Item(name="a")]
+        assert model_type_adapter(dict) is None
+        assert model_type_adapter(List[dict]) is None
+
+
+def create_app():
+    app = RestApplication()
+
+    @app.validates
+    def item(json_body: Item) -> Item:
+        return json_body
+
+    @app.post("/items")
+    def create_item(item: Item, json_body: Item) -> Item:
+        # The validator and the handler share the same validated body
+        assert item is json_body
+        return item
+
+    @app.post("/batch")
+    def create_batch(json_body: List[Item]) -> List[Item]:
+        return json_body
+
+    @app.get("/items")
+    def list_items() -> List[Item]:
+        return [{"name": "a", "quantity": 2, "ignored": True}, Item(name="b")]
+
+    @app.get("/events/next")
+    def next_event() -> Event:
+        return {"title": "Launch", "day": "2024-05-01"}
+
+    @app.get("/broken")
+    def broken() -> Item:
+        return {"quantity": "many"}
+
+    return app
+
+
+class TestTypedBodiesAndResults(MultiDriverTestBase):
+    """Typed json_body parameters and model return annotations on every driver."""
+
+    def create_app(self) -> RestApplication:
+        return create_app()
+
+    def test_typed_json_body(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.post("/items").with_json_body({"name": "widget"}).accepts("application/json")
+        )
+
+        assert api_client.expect_successful_creation(response) == {"name": "widget", "quantity": 1}
+
+    def test_typed_json_body_list(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.post("/batch")
+            .with_bytes_body(b'[{"name": "a"}, {"name": "b", "quantity": 3}]')
+            .with_header("Content-Type", "application/json")
+            .accepts("application/json")
+        )
+
+        assert api_client.expect_successful_creation(response) == [
+            {"name": "a", "quantity": 1},
+            {"name": "b", "quantity": 3},
+        ]
+
+    def test_invalid_body(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.post("/items").with_json_body({"name": ""}).accepts("application/json")
+        )
+
+        api_client.expect_validation_error(response)
+
+    def test_malformed_json(self, api):
+        api_client, driver_name = api
+
+        response = api_client.execute(
+            api_client.post("/items")
+            .with_bytes_body(b'{"name": ')
+            .with_header("Content-Type", "application/json")
+            .accepts("application/json")
+        )
+
+        assert api_client.expect_validation_error(response)["error"] == "Parsing failed"
+
+    def test_list_result_serialized_by_adapter(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/items")
+
+        assert api_client.expect_successful_retrieval(response) == [
+            {"name": "a", "quantity": 2},
+            {"name": "b", "quantity": 1},
+        ]
+
+    def test_result_serialized_in_json_mode(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/events/next")
+
+        assert api_client.expect_successful_retrieval(response) == {"title": "Launch", "day": "2024-05-01"}
+
+    def test_invalid_result(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_resource("/broken")
+
+        api_client.expect_validation_error(response)
+
+    def test_other_renderers_get_python_data(self, api):
+        api_client, driver_name = api
+
+        response = api_client.get_as_html("/items")
+
+        assert response.status_code == 200
+        assert "quantity" in response.get_text_body()
+        assert "ignored" not in response.get_text_body()
+
+
+class TestCompiledAdapters:
+    """Adapters are compiled when routes and validators are registered."""
+
+    def test_no_lookup_per_request(self, monkeypatch):
+        client = RestApiDsl(RestMachineDriver(create_app()))
+
+        def lookup(annotation):
+            raise AssertionError("model_type_adapter called while handling a request")
+
+        monkeypatch.setattr(application, "model_type_adapter", lookup)
+        response = client.execute(client.post("/items").with_json_body({"name": "widget"}).accepts("application/json"))
+
+        assert client.expect_successful_creation(response) == {"name": "widget", "quantity": 1}
@@ -0,0 +1,147 @@
+"""
+Tests for the cross-request validator cache used to answer conditional GETs.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+from restmachine import RestApplication
+from restmachine.validator_cache import ValidatorCache
+from tests.framework import MultiDriverTestBase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestValidatorCacheStore:
+    """Tests for ValidatorCache entries, expiry and invalidation."""
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = ValidatorCache(ttl=10, clock=clock)
+        key = ValidatorCache.key("/items/{item_id}", {"item_id": "1"})
+
+        cache.record(key, etag='"v1"')
+        cache.record(key, last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        entry = cache.get(key)
+        assert (entry.etag, entry.last_modified) == ('"v1"', datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+        clock.now = 10
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        cache = ValidatorCache()
+        cache.record(ValidatorCache.key("/items/{item_id}", {"item_id": "42"}), etag='"v1"')
+        cache.record(ValidatorCache.key("/items/{item_id}", {"item_id": "43"}), etag='"v1"')
+
+        cache.invalidate("/items/{item_id}", item_id=42)
+
+        assert cache.get(ValidatorCache.key("/items/{item_id}", {"item_id": "42"})) is None
+        assert cache.get(ValidatorCache.key("/items/{item_id}", {"item_id": "43"})) is not None
+
+    def test_least_recently_used_entries_are_dropped(self):
+        cache = ValidatorCache(max_entries=2)
+        for name in ("a", "b", "a", "c"):
+            cache.record(ValidatorCache.key(f"/{name}"), etag='"v1"')
+
+        assert cache.get(ValidatorCache.key("/a")) is not None
+        assert cache.get(ValidatorCache.key("/b")) is None
+
+    @pytest.mark.parametrize("settings", [{"ttl": 0}, {"max_entries": 0}])
+    def test_invalid_settings(self, settings):
+        with pytest.raises(ValueError):
+            ValidatorCache(**settings)
+
+
+UPDATED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def create_app(calls):
+    app = RestApplication()
+    app.enable_validator_cache(ttl=60)
+    versions = Counter()
+
+    @app.resource_exists
+    def item(request):
+        calls["item"] += 1
+        item_id = request.path_params["item_id"]
+        return {"id": item_id, "version": versions[item_id]}
+
+    @app.generate_etag
+    def item_etag(request):
+        calls["etag"] += 1
+        return f"v{versions[request.path_params['item_id']]}"
+
+    @app.last_modified
+    def item_modified():
+        return UPDATED
+
+    @app.get("/items/{item_id}")
+    def get_item(item, item_etag, item_modified):
+        return item
+
+    @app.put("/items/{item_id}")
+    def update_item(item, request):
+        versions[request.path_params["item_id"]] += 1
+        return {"updated": True}
+
+    return app
+
+
+class TestCachedConditionalGet(MultiDriverTestBase):
+    """Conditional GETs are answered from cached validators on every driver."""
+
+    calls = Counter()
+
+    def create_app(self) -> RestApplication:
+        return create_app(self.calls)
+
+    def test_not_modified_without_callbacks(self, api):
+        api_client, driver_name = api
+        path = f"/items/{driver_name}-1"
+
+        response = api_client.get_resource(path)
+        assert response.get_header("ETag") == '"v0"'
+        calls_before = dict(self.calls)
+
+        for request in (
+            api_client.get(path).with_header("If-None-Match", '"v0"'),
+            api_client.get(path).with_header("If-Modified-Since", "Mon, 01 Jan 2024 00:00:00 GMT"),
+        ):
+            cached = api_client.execute(request.accepts("application/json"))
+            api_client.expect_not_modified(cached)
+            assert cached.get_header("ETag") == '"v0"'
+
+        assert dict(self.calls) == calls_before
+
+    def test_write_invalidates(self, api):
+        api_client, driver_name = api
+        path = f"/items/{driver_name}-2"
+        api_client.get_resource(path)
+
+        api_client.execute(api_client.put(path).with_json_body({}).accepts("application/json"))
+        response = api_client.execute(
+            api_client.get(path).with_header("If-None-Match", '"v0"').accepts("application/json")
+        )
+
+        assert api_client.expect_successful_retrieval(response) == {"id": f"{driver_name}-2", "version": 1}
+        assert response.get_header("ETag") == '"v1"'
+
+    def test_mismatch_runs_normally(self, api):
+        api_client, driver_name = api
+        path = f"/items/{driver_name}-3"
+        api_client.get_resource(path)
+
+        response = api_client.execute(
+            api_client.get(path).with_header("If-None-Match", '"stale"').accepts("application/json")
+        )
+
+        assert api_client.expect_successful_retrieval(response)["version"] == 0